@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Round-trip benchmark for DatabaseManager.process_device_discovery.
+
+Persists one synthetic 48-port stack (200 VLANs, 100 neighbors, 4 stack
+members) through the per-row path and the batched path, counting every
+statement, executemany batch and commit sent to the server. The per-row
+path is also shown with a SELECT 1 liveness probe on every call. A counting
+connection stands in for SQL Server, so no database is required. With
+fast_executemany a staged executemany is a single round trip.
+
+Usage:
+    python benchmarks/bench_db_round_trips.py [--vlans 200] [--neighbors 100] [--latency-ms 2]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netwalker.connection.data_models import NeighborInfo, StackMemberInfo, VLANInfo  # noqa: E402
+from netwalker.database.connection_pool import PooledConnection  # noqa: E402
+from netwalker.database.database_manager import DatabaseManager  # noqa: E402
+
+
+class CountingCursor:
+    """Cursor that records round trips and returns empty/identity results"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.fast_executemany = False
+        self.rowcount = 0
+        self._last_sql = ''
+
+    def execute(self, sql, params=None):
+        self.connection.round_trips += 1
+        self.rowcount = 1
+        self._last_sql = sql
+        return self
+
+    def executemany(self, sql, rows):
+        rows = list(rows)
+        self.connection.round_trips += 1 if self.fast_executemany else len(rows)
+        self._last_sql = sql
+
+    def fetchone(self):
+        if '@@IDENTITY' in self._last_sql:
+            self.connection.next_id += 1
+            return (self.connection.next_id,)
+        return None
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class CountingConnection:
+    """Connection that counts cursor round trips and commits"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.commits = 0
+        self.next_id = 0
+
+    def cursor(self):
+        return CountingCursor(self)
+
+    def commit(self):
+        self.round_trips += 1
+        self.commits += 1
+
+    def rollback(self):
+        self.round_trips += 1
+
+
+def build_device_info(vlan_count: int, neighbor_count: int) -> dict:
+    """Build a synthetic stacked access switch"""
+    return {
+        'hostname': 'BENCH-STACK-01',
+        'primary_ip': '10.10.0.1',
+        'serial_number': 'FOC0000BENCH',
+        'platform': 'IOS-XE',
+        'hardware_model': 'C9300-48P',
+        'software_version': '17.9.4',
+        'capabilities': ['Router', 'Switch'],
+        'uptime': '12 weeks, 3 days, 4 hours, 5 minutes',
+        'connection_method': 'SSH',
+        'interfaces': [
+            {'interface_name': f"Vlan{i}", 'ip_address': f"10.20.{i}.1",
+             'subnet_mask': '255.255.255.0', 'interface_type': 'svi'}
+            for i in range(1, 49)
+        ],
+        'vlans': [
+            VLANInfo(vlan_id=i, vlan_name=f"VLAN{i:04d}", port_count=i % 48,
+                     portchannel_count=0, connected_port_count=i % 24,
+                     device_hostname='BENCH-STACK-01', device_ip='10.10.0.1')
+            for i in range(1, vlan_count + 1)
+        ],
+        'stack_members': [
+            StackMemberInfo(switch_number=n, role='Member', priority=1, hardware_model='C9300-48P',
+                            serial_number=f"FOC000{n}BENCH", mac_address=None,
+                            software_version='17.9.4', state='Ready')
+            for n in range(1, 5)
+        ],
+        'neighbors': [
+            NeighborInfo(device_id=f"BENCH-AP-{i:03d}", local_interface=f"GigabitEthernet1/0/{i % 48 + 1}",
+                         remote_interface='GigabitEthernet0', platform='cisco AIR-AP3802I',
+                         capabilities=['Trans-Bridge'], protocol='CDP')
+            for i in range(neighbor_count)
+        ],
+    }
+
+
+def run(batch_writes: bool, pooled: bool, device_info: dict) -> CountingConnection:
+    """Persist device_info once and return the counting connection"""
+    db_manager = DatabaseManager({'enabled': True, 'batch_writes': batch_writes})
+    counting = CountingConnection()
+    # A raw connection is probed with SELECT 1 on every call; a pooled one only when idle
+    db_manager.connection = PooledConnection(lambda: counting) if pooled else counting
+    success, _ = db_manager.process_device_discovery(device_info)
+    assert success, "process_device_discovery failed"
+    return counting
+
+
+def main():
+    parser = argparse.ArgumentParser(description="process_device_discovery round-trip benchmark")
+    parser.add_argument('--vlans', type=int, default=200, help='VLANs on the device (default: 200)')
+    parser.add_argument('--neighbors', type=int, default=100, help='CDP neighbors (default: 100)')
+    parser.add_argument('--latency-ms', type=float, default=2.0,
+                        help='Assumed network round-trip time to SQL Server (default: 2ms)')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    device_info = build_device_info(args.vlans, args.neighbors)
+
+    scenarios = (
+        ('per-row, probe every call', False, False),
+        ('per-row, pooled', False, True),
+        ('batched, pooled', True, True),
+    )
+    for label, batch_writes, pooled in scenarios:
+        connection = run(batch_writes, pooled, device_info)
+        estimate = connection.round_trips * args.latency_ms / 1000
+        print(f"{label:26s}: {connection.round_trips:6d} round trips, {connection.commits:4d} commits "
+              f"(~{estimate:.2f}s at {args.latency_ms:g}ms RTT)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+End-to-end discovery benchmark against the device simulator.
+
+Builds a synthetic CDP mesh (NX-OS core, IOS-XE distribution, IOS access,
+PAN-OS firewalls at the edge), seeds DiscoveryEngine with the core and walks
+the whole mesh. Reports devices per minute, p50/p99 per-device latency
+(connect to close), peak RSS and, with --database, the number of database
+round trips (a counting connection stands in for SQL Server). With --stream,
+completed devices are spilled to disk (stream_results) and read back once
+the way report generation does; compare peak RSS with and without it.
+
+The inproc transport connects discovery straight to the simulator; the ssh
+and telnet transports run the real ConnectionManager (netmiko/scrapli)
+against simulator servers on 127.x.y.z loopback addresses.
+
+Usage:
+    python benchmarks/bench_discovery_throughput.py [--nodes 1000] [--latency-ms 20] [--jitter-ms 5]
+        [--auth-failure-rate 0.01] [--concurrent] [--workers 10] [--transport inproc|ssh|telnet] [--fast-close] [--database] [--stream]
+"""
+
+import argparse
+import logging
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netwalker.config import Credentials  # noqa: E402
+from netwalker.discovery.discovery_engine import DiscoveryEngine  # noqa: E402
+from netwalker.filtering.filter_manager import FilterManager  # noqa: E402
+from netwalker.simulator import (  # noqa: E402
+    DeviceBehavior, SimulatedNetwork, SimulatorConnectionManager, SimulatorSSHServer, SimulatorTelnetServer
+)
+
+
+class TimedConnections:
+    """Wraps a connection manager and records connect-to-close time per device"""
+
+    def __init__(self, connection_manager):
+        self._connection_manager = connection_manager
+        self._opened = {}
+        self._lock = threading.Lock()
+        self.latencies = []
+
+    def connect_device(self, host, credentials, db_manager=None, neighbor_platform=None):
+        start_time = time.perf_counter()
+        connection, result = self._connection_manager.connect_device(host, credentials, db_manager, neighbor_platform)
+        with self._lock:
+            if connection is None:
+                self.latencies.append(time.perf_counter() - start_time)
+            else:
+                self._opened[host] = start_time
+        return connection, result
+
+    def close_connection(self, host):
+        closed = self._connection_manager.close_connection(host)
+        with self._lock:
+            start_time = self._opened.pop(host, None)
+            if start_time is not None:
+                self.latencies.append(time.perf_counter() - start_time)
+        return closed
+
+    def __getattr__(self, name):
+        return getattr(self._connection_manager, name)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def build_connection_manager(args, network, behavior):
+    """Return (connection manager, server or None) for the chosen transport"""
+    if args.transport == 'inproc':
+        return SimulatorConnectionManager(network, behavior), None
+
+    from netwalker.connection.connection_manager import ConnectionManager
+
+    if args.transport == 'ssh':
+        server = SimulatorSSHServer(network, behavior)
+        port = server.start()
+        # Telnet fallback points at a closed port so failed logins fail fast
+        return ConnectionManager(ssh_port=port, telnet_port=1, timeout=10, max_workers=args.workers,
+                                 fast_close=args.fast_close), server
+
+    server = SimulatorTelnetServer(network, behavior)
+    port = server.start()
+    return ConnectionManager(ssh_port=1, telnet_port=port, timeout=10, max_workers=args.workers,
+                             fast_close=args.fast_close), server
+
+
+def build_db_manager():
+    """DatabaseManager writing through a counting connection"""
+    from bench_db_round_trips import CountingConnection
+    from netwalker.database.database_manager import DatabaseManager
+
+    db_manager = DatabaseManager({'enabled': True, 'batch_writes': True})
+    db_manager.connection = CountingConnection()
+    return db_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end discovery benchmark against the device simulator")
+    parser.add_argument('--nodes', type=int, default=1000, help='Devices in the mesh (default: 1000)')
+    parser.add_argument('--fanout', type=int, default=8, help='Children per switch (default: 8)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Per-command latency (default: 0)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform +/- jitter per command (default: 0)')
+    parser.add_argument('--login-ms', type=float, default=0.0, help='Login latency (default: 0)')
+    parser.add_argument('--auth-failure-rate', type=float, default=0.0,
+                        help='Fraction of devices that reject the credentials (default: 0)')
+    parser.add_argument('--concurrent', action='store_true', help='Use concurrent discovery')
+    parser.add_argument('--workers', type=int, default=10, help='Concurrent discovery workers (default: 10)')
+    parser.add_argument('--transport', choices=['inproc', 'ssh', 'telnet'], default='inproc',
+                        help='How discovery reaches the simulator (default: inproc)')
+    parser.add_argument('--fast-close', action='store_true',
+                        help='Hand session teardown to the background reaper (ssh/telnet transports)')
+    parser.add_argument('--database', action='store_true', help='Persist results and count DB round trips')
+    parser.add_argument('--stream', action='store_true', help='Spill completed devices to disk (stream_results)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for jitter and auth failures')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    address_base = '10.0.0.0' if args.transport == 'inproc' else '127.1.0.0'
+    network = SimulatedNetwork.build_mesh(args.nodes, fanout=args.fanout, address_base=address_base)
+    behavior = DeviceBehavior(command_latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              login_latency_ms=args.login_ms, auth_failure_rate=args.auth_failure_rate,
+                              seed=args.seed)
+
+    config = {
+        'max_discovery_depth': 64,
+        'discovery_timeout_seconds': 24 * 3600,
+        'discovery_protocols': ['CDP'],
+        'site_boundary_pattern': None,
+        'concurrent_discovery': args.concurrent,
+        'max_concurrent_connections': args.workers,
+        'connection_timeout_seconds': 30,
+        'stream_results': args.stream,
+    }
+    connection_manager, server = build_connection_manager(args, network, behavior)
+    timed = TimedConnections(connection_manager)
+    db_manager = build_db_manager() if args.database else None
+
+    engine = DiscoveryEngine(timed, FilterManager(config), config, Credentials('bench', 'bench'), db_manager)
+    core = network.devices[0]
+    engine.add_seed_device(core.hostname, core.ip_address)
+
+    start_time = time.perf_counter()
+    try:
+        summary = engine.discover_topology()
+    finally:
+        elapsed = time.perf_counter() - start_time
+        if server is not None:
+            server.stop()
+
+    # Read every device back in full, as report generation does
+    inventory = engine.get_inventory()
+    neighbor_count = sum(len(info.get('neighbors') or []) for info in inventory.stream_devices().values())
+    spill_stats = inventory.get_spill_stats()
+    inventory.close()
+
+    # ru_maxrss is KiB on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    walked = summary['successful_connections'] + summary['failed_connections']
+
+    mode = f"concurrent x{args.workers}" if args.concurrent else "serial"
+    print(f"Mesh: {args.nodes} devices, fanout {args.fanout}, transport {args.transport}, {mode}, "
+          f"latency {args.latency_ms:g}+/-{args.jitter_ms:g}ms, auth failure rate {args.auth_failure_rate:g}")
+    print(f"Walked            : {walked} devices ({summary['successful_connections']} connected, "
+          f"{summary['failed_connections']} failed) in {elapsed:.2f}s")
+    print(f"Throughput        : {walked / elapsed * 60 if elapsed else 0:.0f} devices/min")
+    print(f"Per-device latency: p50 {percentile(timed.latencies, 0.50) * 1000:.1f}ms, "
+          f"p99 {percentile(timed.latencies, 0.99) * 1000:.1f}ms")
+    print(f"Peak RSS          : {peak_rss_mb:.1f} MB ({neighbor_count} neighbor entries read back)")
+    if spill_stats:
+        print(f"Spilled           : {spill_stats['devices_spilled']} devices, "
+              f"{spill_stats['bytes_written'] / (1024 * 1024):.1f} MB")
+    if db_manager is not None:
+        print(f"DB round trips    : {db_manager.connection.round_trips} "
+              f"({db_manager.connection.round_trips / max(1, summary['successful_connections']):.1f} per device)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for FilterManager.should_filter_device.
+
+Makes 1M filter decisions over a pool of distinct neighbors (a walk sees
+the same neighbor from every device that reports it) against a realistic
+exclusion set. Compares the per-call evaluation FilterManager used to do
+(fnmatch per pattern, ip_network parsed per range per call), the compiled
+criteria without a cache, and FilterManager with its verdict cache. The
+per-call evaluation is timed on a sample and scaled up.
+
+Usage:
+    python benchmarks/bench_filter_decisions.py [--decisions 1000000] [--devices 5000] [--patterns 50] [--ranges 200]
+"""
+
+import argparse
+import fnmatch
+import ipaddress
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netwalker.filtering.filter_manager import FilterManager  # noqa: E402
+
+
+def build_config(pattern_count: int, range_count: int, rng: random.Random) -> dict:
+    """Exclusion set shaped like a large site's netwalker.ini"""
+    return {
+        'hostname_excludes': [f"LUM{chr(65 + i % 26)}{i:02d}*" for i in range(pattern_count - 2)] + ['*-AP-*', 'SEP*'],
+        'ip_excludes': [f"10.{rng.randrange(256)}.{rng.randrange(256)}.0/{rng.choice((16, 20, 24, 28))}"
+                        for _ in range(range_count)],
+        'platform_excludes': ['linux', 'windows', 'vmware', 'cisco ip phone', 'axis'],
+        'capability_excludes': ['phone', 'host', 'camera', 'printer'],
+    }
+
+
+def build_devices(count: int, rng: random.Random) -> list:
+    """Distinct (hostname, ip, platform, capabilities) neighbor tuples"""
+    platforms = ['cisco WS-C3850-48P', 'N9K-C93180YC-EX', 'Linux', 'Cisco IP Phone 8845', 'cisco AIR-AP3802I']
+    capabilities = [['Switch', 'IGMP'], ['Router', 'Switch'], ['Host'], ['Phone', 'Host'], ['Trans-Bridge']]
+    devices = []
+    for i in range(count):
+        kind = rng.randrange(len(platforms))
+        hostname = rng.choice([f"BLD{i % 90:02d}-SW{i:05d}", f"BLD{i % 90:02d}-AP-{i:04d}", f"SEP{i:012X}"])
+        devices.append((hostname, f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                        platforms[kind], capabilities[kind]))
+    return devices
+
+
+def per_call_verdict(config: dict, hostname: str, ip_address: str, platform, capabilities) -> bool:
+    """The evaluation FilterManager ran on every call before compiling, minus logging"""
+    hostname_lower = hostname.lower()
+    for pattern in config['hostname_excludes']:
+        if fnmatch.fnmatch(hostname_lower, pattern.lower()):
+            return True
+    try:
+        ip = ipaddress.ip_address(ip_address)
+        for cidr_range in config['ip_excludes']:
+            if ip in ipaddress.ip_network(cidr_range, strict=False):
+                return True
+    except ValueError:
+        pass
+    if platform:
+        platform_lower = platform.lower()
+        if any(excluded in platform_lower for excluded in config['platform_excludes']):
+            return True
+    if capabilities:
+        capabilities_lower = [cap.lower().strip() for cap in capabilities]
+        has_infrastructure = bool({'router', 'switch'}.intersection(set(capabilities_lower)))
+        for excluded_cap in config['capability_excludes']:
+            for cap in capabilities_lower:
+                if re.search(r'\b' + re.escape(excluded_cap) + r'\b', cap):
+                    return not has_infrastructure
+    return False
+
+
+def timed(label: str, decisions: int, sample: int, evaluate, stream) -> list:
+    """Time evaluate over the first sample decisions and scale to decisions"""
+    start_time = time.perf_counter()
+    verdicts = [evaluate(*device) for device in stream[:sample]]
+    elapsed = (time.perf_counter() - start_time) * decisions / sample
+    scaled = " (scaled from sample)" if sample < decisions else ""
+    print(f"{label:24s}: {elapsed:8.2f}s for {decisions} decisions, "
+          f"{elapsed / decisions * 1e6:7.2f}us/decision{scaled}")
+    return verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FilterManager decision microbenchmark")
+    parser.add_argument('--decisions', type=int, default=1_000_000, help='Decisions to make (default: 1000000)')
+    parser.add_argument('--devices', type=int, default=5000, help='Distinct neighbors (default: 5000)')
+    parser.add_argument('--patterns', type=int, default=50, help='Hostname exclusion patterns (default: 50)')
+    parser.add_argument('--ranges', type=int, default=200, help='Excluded CIDR ranges (default: 200)')
+    parser.add_argument('--per-call-sample', type=int, default=20_000,
+                        help='Decisions timed for the per-call evaluation (default: 20000)')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    config = build_config(args.patterns, args.ranges, rng)
+    devices = build_devices(args.devices, rng)
+    stream = [devices[rng.randrange(len(devices))] for _ in range(args.decisions)]
+
+    filter_manager = FilterManager(config)
+    compiled = filter_manager.compiled
+    print(f"{args.decisions} decisions over {args.devices} devices, {args.patterns} hostname patterns, "
+          f"{args.ranges} CIDR ranges")
+
+    sample = min(args.per_call_sample, args.decisions)
+    reference = timed('per-call evaluation', args.decisions, sample,
+                      lambda *device: per_call_verdict(config, *device), stream)
+    uncached = timed('compiled, no cache', args.decisions, args.decisions,
+                     lambda h, i, p, c: compiled.evaluate(h, i, p, tuple(c) if c else None) is not None, stream)
+    cached = timed('compiled + verdict LRU', args.decisions, args.decisions,
+                   filter_manager.should_filter_device, stream)
+
+    assert reference == uncached[:sample] == cached[:sample], "verdicts differ between implementations"
+    stats = filter_manager.get_filter_stats()
+    print(f"Filtered {sum(cached)} of {args.decisions} decisions; verdict cache "
+          f"{stats['verdict_cache_hits']} hits, {stats['verdict_cache_misses']} misses")
+
+
+if __name__ == '__main__':
+    main()
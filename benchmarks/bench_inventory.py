@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for DeviceInventory.
+
+Fills an inventory with 1k, 10k and 50k devices and reports inventory
+memory per device (device dictionaries excluded) plus the cost of the reads
+the site, report and statistics code makes: repeated get_all_devices calls,
+status/IP/platform lookups and hostname lookups. A linear scan over the
+snapshot stands in for the scan get_devices_by_status used to do.
+
+Usage:
+    python benchmarks/bench_inventory.py [--sizes 1000,10000,50000] [--lookups 10000]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netwalker.discovery.discovery_engine import DeviceInventory  # noqa: E402
+
+STATUSES = ['connected'] * 90 + ['failed'] * 6 + ['filtered'] * 3 + ['boundary']
+PLATFORMS = ['cisco WS-C3850-48P', 'N9K-C93180YC-EX', 'cisco C9300-48U', 'PA-3220']
+
+
+def build_devices(count: int, rng: random.Random) -> list:
+    """(device key, device info, status) tuples for count devices"""
+    devices = []
+    for i in range(count):
+        hostname = f"S{i % 400:03d}-CORE-A" if i % 100 == 0 else f"S{i % 400:03d}-SW{i:05d}"
+        ip_address = f"10.{i // 65536}.{i // 256 % 256}.{i % 256}"
+        info = {'hostname': hostname, 'primary_ip': ip_address, 'platform': rng.choice(PLATFORMS)}
+        devices.append((f"{hostname}:{ip_address}", info, rng.choice(STATUSES)))
+    return devices
+
+
+def site_of(hostname: str):
+    """Site for *-CORE-* boundary hostnames"""
+    return hostname.split('-')[0] if '-CORE-' in hostname else None
+
+
+def per_call_us(count: int, call) -> float:
+    """Average microseconds per call over count calls"""
+    start_time = time.perf_counter()
+    for i in range(count):
+        call(i)
+    return (time.perf_counter() - start_time) / count * 1e6
+
+
+def run(size: int, lookups: int, rng: random.Random):
+    devices = build_devices(size, rng)
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    inventory = DeviceInventory(site_resolver=site_of)
+    for device_key, info, status in devices:
+        inventory.add_device(device_key, info, status)
+    add_us = (time.perf_counter() - start_time) / size * 1e6
+    inventory_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    picks = [devices[rng.randrange(size)] for _ in range(lookups)]
+    snapshot_us = per_call_us(lookups, lambda i: inventory.get_all_devices())
+    status_us = per_call_us(min(lookups, 200), lambda i: inventory.get_devices_by_status('boundary'))
+    scan_us = per_call_us(min(lookups, 200), lambda i: {
+        key: info for key, info in inventory.get_all_devices().items()
+        if inventory.get_device_status(key) == 'boundary'
+    })
+    ip_us = per_call_us(lookups, lambda i: inventory.get_devices_by_ip(picks[i][1]['primary_ip']))
+    hostname_us = per_call_us(lookups, lambda i: inventory.find_device_by_hostname(picks[i][1]['hostname']))
+
+    print(f"{size:>6} devices: {inventory_bytes / size:6.0f} B/device, add {add_us:5.1f}us, "
+          f"get_all_devices {snapshot_us:5.2f}us, by status {status_us:7.1f}us (scan {scan_us:8.1f}us), "
+          f"by IP {ip_us:5.2f}us, by hostname {hostname_us:5.2f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeviceInventory scaling benchmark")
+    parser.add_argument('--sizes', default='1000,10000,50000', help='Inventory sizes (default: 1000,10000,50000)')
+    parser.add_argument('--lookups', type=int, default=10000, help='Lookups timed per size (default: 10000)')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    for size in [int(size) for size in args.sizes.split(',')]:
+        run(size, args.lookups, rng)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for discovery queue membership checks.
+
+Feeds synthetic CDP neighbors through DiscoveryEngine._process_neighbors and
+reports the per-neighbor cost. Every neighbor is offered twice so half of the
+calls exercise the "already queued" path. The legacy linear queue scan is
+timed on a smaller sample for comparison since it grows quadratically.
+
+Usage:
+    python benchmarks/bench_neighbor_queue.py [--neighbors 50000] [--legacy-neighbors 5000]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netwalker.connection.data_models import NeighborInfo  # noqa: E402
+from netwalker.discovery.discovery_engine import DiscoveryEngine, DiscoveryNode  # noqa: E402
+
+
+def build_neighbors(count: int):
+    """Build synthetic neighbors with unique hostnames and IPs"""
+    return [
+        NeighborInfo(
+            device_id=f"SYN-SW{i:06d}",
+            local_interface=f"Gi1/0/{i % 48 + 1}",
+            remote_interface="Gi1/0/1",
+            platform="cisco WS-C3850",
+            capabilities=["Switch"],
+            ip_address=f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+        )
+        for i in range(count)
+    ]
+
+
+def build_engine() -> DiscoveryEngine:
+    """Create a DiscoveryEngine with mocked collaborators"""
+    filter_manager = Mock()
+    filter_manager.should_filter_device.return_value = False
+    config = {
+        'max_discovery_depth': 5,
+        'discovery_timeout_seconds': 3600,
+        'enable_progress_tracking': False,
+    }
+    return DiscoveryEngine(Mock(), filter_manager, config, Mock())
+
+
+def bench_process_neighbors(count: int) -> float:
+    """Time _process_neighbors with each neighbor offered twice"""
+    engine = build_engine()
+    parent = DiscoveryNode(hostname="SYN-CORE", ip_address="10.255.255.1", depth=0)
+    neighbors = build_neighbors(count)
+
+    start = time.perf_counter()
+    engine._process_neighbors(neighbors + neighbors, parent)
+    elapsed = time.perf_counter() - start
+
+    assert len(engine.discovery_queue) == count
+    return elapsed
+
+
+def bench_legacy_scan(count: int) -> float:
+    """Time the previous linear scan of a plain deque for the same workload"""
+    queue = deque()
+    keys = [f"SYN-SW{i:06d}:10.0.0.{i & 255}" for i in range(count)]
+
+    start = time.perf_counter()
+    for key in keys + keys:
+        if any(n.device_key == key for n in queue):
+            continue
+        hostname, ip_address = key.split(':')
+        queue.append(DiscoveryNode(hostname=hostname, ip_address=ip_address, depth=1))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discovery queue membership microbenchmark")
+    parser.add_argument('--neighbors', type=int, default=50000,
+                        help='Number of unique synthetic neighbors (default: 50000)')
+    parser.add_argument('--legacy-neighbors', type=int, default=5000,
+                        help='Number of neighbors for the legacy linear scan (0 to skip)')
+    args = parser.parse_args()
+
+    # Keep per-neighbor logging out of the measurement
+    logging.disable(logging.CRITICAL)
+
+    elapsed = bench_process_neighbors(args.neighbors)
+    offered = args.neighbors * 2
+    print(f"_process_neighbors: {offered} neighbors in {elapsed:.3f}s "
+          f"({elapsed / offered * 1e6:.1f} us/neighbor)")
+
+    if args.legacy_neighbors > 0:
+        legacy = bench_legacy_scan(args.legacy_neighbors)
+        legacy_offered = args.legacy_neighbors * 2
+        print(f"legacy queue scan:  {legacy_offered} neighbors in {legacy:.3f}s "
+              f"({legacy / legacy_offered * 1e6:.1f} us/neighbor)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark for VLAN connected-port counting.
+
+Times VLANCollector._update_connected_port_counts on stack switch output,
+once with the connected-interface set built per device and once with the
+legacy per-port scan of the whole interface status map.
+
+By default a 9-member stack is generated in 'show vlan brief' /
+'show interfaces status' format: 450 interfaces, 300 VLANs, every access
+port in a few VLANs and the uplinks trunked in all of them. With --archive,
+every capture in a raw output archive (archive_raw_output) that recorded
+both commands is replayed instead.
+
+Usage:
+    python benchmarks/bench_vlan_connected_ports.py [--members 9] [--vlans 300] [--archive DIR] [--repeat 3]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netwalker.connection.data_models import VLANInfo  # noqa: E402
+from netwalker.vlan.vlan_collector import VLANCollector  # noqa: E402
+from netwalker.interface_names import interface_match_key  # noqa: E402
+from netwalker.vlan.vlan_parser import VLANParser  # noqa: E402
+
+VLAN_COMMANDS = ('show vlan brief', 'show vlan')
+STATUS_COMMANDS = ('show interfaces status', 'show interface status')
+
+
+def stack_outputs(members: int, vlan_count: int):
+    """(vlan output, interface status output) for a generated stack"""
+    access = [f"Gi{member}/0/{port}" for member in range(1, members + 1) for port in range(1, 49)]
+    uplinks = [f"Te{member}/1/{port}" for member in range(1, members + 1) for port in range(1, 3)]
+
+    status_lines = ["Port      Name               Status       Vlan       Duplex  Speed Type"]
+    for index, port in enumerate(access + uplinks):
+        status = 'notconnect' if index % 3 == 0 else 'connected'
+        status_lines.append(f"{port:<9} {'':<18} {status:<12} {index % vlan_count + 1:<10} a-full  a-1000 10/100/1000BaseTX")
+
+    vlan_lines = [
+        "VLAN Name                             Status    Ports",
+        "---- -------------------------------- --------- -------------------------------",
+    ]
+    for vlan_id in range(1, vlan_count + 1):
+        ports = [port for index, port in enumerate(access) if index % vlan_count == vlan_id - 1 or index % 97 == vlan_id % 97]
+        vlan_lines.append(f"{vlan_id:<4} {f'USERS_{vlan_id:04d}':<32} active    {', '.join(ports + uplinks)}")
+
+    return "\n".join(vlan_lines) + "\n", "\n".join(status_lines) + "\n"
+
+
+def archived_outputs(directory: str):
+    """(hostname, vlan output, interface status output) for archived captures"""
+    from netwalker.connection.output_archive import OutputArchive
+
+    archive = OutputArchive(directory)
+    for capture in archive.latest_captures():
+        outputs = archive.load_outputs(capture)
+        vlan_output = next((outputs[command] for command in VLAN_COMMANDS if outputs.get(command)), None)
+        status_output = next((outputs[command] for command in STATUS_COMMANDS if outputs.get(command)), None)
+        if vlan_output and status_output:
+            yield capture.hostname or capture.host, vlan_output, status_output
+
+
+def legacy_count(parser: VLANParser, vlan_ports_str: str, interface_status: dict) -> int:
+    """Per-port scan normalizing every status entry, as the count used to work"""
+    count = 0
+    for port in parser.port_pattern.findall(vlan_ports_str):
+        normalized_port = interface_match_key(port)
+        for interface_name, status in interface_status.items():
+            if interface_match_key.__wrapped__(interface_name) == normalized_port and status == 'connected':
+                count += 1
+                break
+    return count
+
+
+def run(name: str, vlan_output: str, status_output: str, repeat: int):
+    parser = VLANParser()
+    collector = VLANCollector.__new__(VLANCollector)
+    collector.logger = Mock()
+    collector.vlan_parser = parser
+
+    interface_status = parser.parse_interface_status(status_output, 'IOS-XE')
+    vlans = parser.parse_vlan_output(vlan_output, 'IOS-XE', name, '')
+    if not vlans:
+        vlans = [VLANInfo(vlan_id=i, vlan_name='', port_count=0, portchannel_count=0, connected_port_count=0,
+                          device_hostname=name, device_ip='') for i in range(1, 4095)]
+
+    def timed(count_ports):
+        best = float('inf')
+        for _ in range(repeat):
+            interface_match_key.cache_clear()
+            collector.vlan_parser.count_connected_ports_in_vlan = count_ports
+            start_time = time.perf_counter()
+            collector._update_connected_port_counts(vlans, vlan_output, interface_status, 'IOS-XE')
+            best = min(best, time.perf_counter() - start_time)
+        return best, [vlan.connected_port_count for vlan in vlans]
+
+    # The legacy count ignores the connected set and scans the raw status map per port
+    legacy_time, legacy_counts = timed(lambda ports, connected: legacy_count(parser, ports, interface_status))
+    indexed_time, indexed_counts = timed(VLANParser.count_connected_ports_in_vlan.__get__(parser))
+    assert indexed_counts == legacy_counts, "connected port counts differ"
+
+    print(f"{name}: {len(interface_status)} connected interfaces, {len(vlans)} VLANs - "
+          f"legacy scan {legacy_time * 1000:8.1f}ms, indexed {indexed_time * 1000:6.2f}ms "
+          f"({legacy_time / indexed_time:,.0f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VLAN connected-port counting benchmark")
+    parser.add_argument('--members', type=int, default=9, help='Stack members of the generated stack (default: 9)')
+    parser.add_argument('--vlans', type=int, default=300, help='VLANs on the generated stack (default: 300)')
+    parser.add_argument('--archive', help='Raw output archive directory to replay instead of the generated stack')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per variant, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.archive:
+        devices = list(archived_outputs(args.archive))
+        if not devices:
+            print(f"No captures with VLAN and interface status output in {args.archive}")
+            return
+        for hostname, vlan_output, status_output in devices:
+            run(hostname, vlan_output, status_output, args.repeat)
+    else:
+        vlan_output, status_output = stack_outputs(args.members, args.vlans)
+        run(f"{args.members}-member stack", vlan_output, status_output, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
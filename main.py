@@ -11,6 +11,7 @@ Author: Mark Oldham
 import sys
 import argparse
 import logging
+import multiprocessing
 import signal
 import threading
 import socket
@@ -126,6 +127,24 @@ Version: {__version__}
         help='Maximum concurrent connections (overrides config file)'
     )
 
+    parser.add_argument(
+        '--concurrent-discovery',
+        action='store_true',
+        help='Walk each depth level concurrently using --max-connections workers'
+    )
+
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Skip stack and VLAN collection on devices unchanged since the last walk (requires database)'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted discovery from its checkpoint file'
+    )
+
     # Output options
     parser.add_argument(
         '--reports-dir',
@@ -275,6 +294,15 @@ def convert_args_to_config(args):
     if args.max_connections is not None:
         config_overrides['max_concurrent_connections'] = args.max_connections
 
+    if getattr(args, 'concurrent_discovery', False):
+        config_overrides['concurrent_discovery'] = True
+
+    if getattr(args, 'incremental', False):
+        config_overrides['incremental_discovery'] = True
+
+    if getattr(args, 'resume', False):
+        config_overrides['resume_discovery'] = True
+
     # Output settings
     if args.reports_dir:
         config_overrides['reports_directory'] = args.reports_dir
@@ -309,6 +337,7 @@ def handle_execute_command(args):
             - filter: Device name filter pattern
             - command: Command to execute
             - output: Output directory for Excel file
+            - workers: Devices processed at once (optional)
 
     Returns:
         Exit code (0 for success, non-zero for failure)
@@ -333,7 +362,8 @@ def handle_execute_command(args):
             config_file=args.config,
             device_filter=args.filter,
             command=args.command,
-            output_dir=args.output
+            output_dir=args.output,
+            max_workers=getattr(args, 'workers', None)
         )
 
         # Execute commands on filtered devices
@@ -416,6 +446,87 @@ def handle_inventory_command(args):
         return 1
 
 
+def handle_reparse_command(args):
+    """
+    Handle the 'reparse' command to rebuild inventory from the raw output archive.
+
+    Args:
+        args: Parsed command-line arguments containing:
+            - config: Configuration file path
+            - archive: Optional archive directory override
+            - workers: Optional worker process count
+            - since: Optional ISO timestamp of the oldest capture to use
+            - no_database: Skip database writes
+            - no_reports: Skip report generation
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    from netwalker.config.config_manager import ConfigurationManager
+    from netwalker.database import DatabaseManager
+    from netwalker.discovery.archive_reparser import ArchiveReparser
+
+    print_console_banner()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        config_manager = ConfigurationManager(args.config)
+        parsed_config = config_manager.load_configuration()
+        output_config = parsed_config['output']
+        archive_directory = args.archive or output_config.archive_directory
+
+        if not os.path.exists(os.path.join(archive_directory, 'index.jsonl')):
+            print(f"[FAIL] No raw output archive found in {archive_directory}")
+            print("  Enable archive_raw_output in the [output] section and run discovery first")
+            return 1
+
+        collector_config = {
+            'reports_directory': output_config.reports_directory,
+            'discovery_protocols': parsed_config['discovery'].protocols,
+        }
+        reparser = ArchiveReparser(archive_directory, collector_config, args.workers)
+
+        print(f"Re-parsing raw output archive: {archive_directory}")
+        inventory = reparser.reparse(since=args.since)
+        stats = reparser.get_stats()
+        print(f"\n[OK] Re-parsed {stats['devices_reparsed']} devices "
+              f"({stats['devices_failed']} failed) in {stats['elapsed_seconds']:.1f}s")
+
+        if not args.no_database:
+            db_manager = DatabaseManager(parsed_config.get('database', {}))
+            if db_manager.enabled:
+                if db_manager.connect():
+                    try:
+                        stored = reparser.store_inventory(db_manager, inventory)
+                        print(f"[OK] Stored {stored} devices in database")
+                    finally:
+                        db_manager.disconnect()
+                else:
+                    print("[FAIL] Could not connect to database")
+
+        if not args.no_reports:
+            from netwalker.reports.excel_generator import ExcelReportGenerator
+
+            report_config = dict(collector_config)
+            report_config['database'] = parsed_config['database']
+            report_config['output'] = output_config
+            report_path = ExcelReportGenerator(report_config).generate_inventory_report(
+                inventory.get_all_devices()
+            )
+            print(f"[OK] Generated inventory report: {report_path}")
+
+        return 0
+
+    except Exception as e:
+        print(f"\n[FAIL] Error re-parsing archive: {e}")
+        logging.exception("Unexpected error in archive re-parse")
+        return 1
+
+
 def handle_ipv4_prefix_inventory_command(args):
     """
     Handle the 'ipv4-prefix-inventory' command to collect IPv4 prefixes.
@@ -540,7 +651,7 @@ def main():
     use_new_cli = (
         '--help' in sys.argv or
         '-h' in sys.argv or
-        any(arg in ['execute', 'ipv4-prefix-inventory', 'visio', 'discover', 'inventory'] for arg in sys.argv[1:])
+        any(arg in ['execute', 'ipv4-prefix-inventory', 'visio', 'discover', 'inventory', 'reparse'] for arg in sys.argv[1:])
     )
     
     if use_new_cli:
@@ -561,6 +672,8 @@ def main():
                 return handle_discover_with_new_cli(args)
             elif args.command == 'inventory':
                 return handle_inventory_command(args)
+            elif args.command == 'reparse':
+                return handle_reparse_command(args)
             else:
                 # No command specified, show help
                 parse_cli_args(['--help'])
@@ -974,4 +1087,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Lets reparse worker processes start in the frozen Windows build instead of re-running the CLI
+    multiprocessing.freeze_support()
     sys.exit(main())
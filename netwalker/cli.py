@@ -58,6 +58,24 @@ def create_parser():
         help="Number of concurrent connections (overrides config file)"
     )
     
+    discovery_parser.add_argument(
+        '--concurrent-discovery',
+        action='store_true',
+        help='Walk each depth level concurrently using the configured connection count'
+    )
+    
+    discovery_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Skip stack and VLAN collection on devices unchanged since the last walk (requires database)'
+    )
+    
+    discovery_parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted discovery from its checkpoint file'
+    )
+    
     discovery_parser.add_argument(
         "--timeout", "-t",
         type=int,
@@ -216,6 +234,12 @@ def create_parser():
         default='.',
         help='Output directory for Excel file (default: current directory)'
     )
+
+    execute_parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        help='Devices processed at once (default: [command_executor] max_workers)'
+    )
     
     # Inventory export command
     inventory_parser = subparsers.add_parser(
@@ -250,6 +274,46 @@ def create_parser():
         help='Output directory for reports (overrides config file)'
     )
     
+    # Offline re-parse command
+    reparse_parser = subparsers.add_parser(
+        'reparse',
+        help='Rebuild inventory, database rows and reports from the raw output archive'
+    )
+
+    reparse_parser.add_argument(
+        '--config', '-c',
+        default='netwalker.ini',
+        help='Configuration file path (default: netwalker.ini)'
+    )
+
+    reparse_parser.add_argument(
+        '--archive', '-a',
+        help='Archive directory (overrides archive_directory in config file)'
+    )
+
+    reparse_parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        help='Worker processes (default: one per CPU)'
+    )
+
+    reparse_parser.add_argument(
+        '--since',
+        help='Ignore captures older than this ISO timestamp (e.g. 2026-01-31T00:00)'
+    )
+
+    reparse_parser.add_argument(
+        '--no-database',
+        action='store_true',
+        help='Do not write re-parsed devices to the database'
+    )
+
+    reparse_parser.add_argument(
+        '--no-reports',
+        action='store_true',
+        help='Do not generate reports'
+    )
+
     # Version
     parser.add_argument(
         "--version",
@@ -83,6 +83,32 @@ discovery_timeout = 300
 discovery_protocols = CDP,LLDP
 # Enable progress tracking display (true/false)
 enable_progress_tracking = true
+# Walk each depth level concurrently using concurrent_connections workers (true/false)
+concurrent_discovery = false
+# Collect several sites at once, walking each site depth level concurrently (true/false)
+site_collection_parallel = false
+# Maximum number of sites collected at once when site_collection_parallel is enabled
+site_collection_max_workers = 4
+# Maximum concurrent device connections within one site (concurrent_connections caps the total)
+max_connections_per_site = 4
+# Only collect stack and VLAN details from devices whose version, uptime, serial
+# or neighbors changed since the last walk stored in the database (true/false)
+incremental_discovery = false
+# Discovery log detail at INFO level: summary (progress, warnings and errors only),
+# device (one decision trail per device) or neighbor (also every neighbor decision).
+# Lines below the chosen detail are still written when log_level is DEBUG
+discovery_log_verbosity = summary
+# Keep only a summary of each completed device in memory and write its neighbor,
+# VLAN and stack details to a local spill file, read back when reports are
+# generated. Keeps memory bounded on very large walks (true/false)
+stream_results = false
+# Directory for the spill file (blank = system temp directory)
+spill_directory = 
+# Save the discovery queue, visited devices and inventory every N seconds so an
+# interrupted walk can be continued with --resume (0 = disabled)
+checkpoint_interval = 300
+# Checkpoint file (removed when discovery finishes)
+checkpoint_file = ./netwalker_checkpoint.db
 
 [filtering]
 # Include devices matching these wildcards (comma-separated)
@@ -115,6 +141,10 @@ excel_format = xlsx
 visio_enabled = true
 # Site boundary pattern for creating separate workbooks (wildcard pattern)
 site_boundary_pattern = *-CORE-*
+# Keep a compressed archive of every raw command output for 'netwalker reparse' (true/false)
+archive_raw_output = false
+# Directory for the raw command output archive
+archive_directory = ./archive
 
 [connection]
 # SSH port number
@@ -133,6 +163,8 @@ ssl_key_file =
 ssl_ca_bundle = 
 # Skip devices after this many consecutive connection failures (0 = never skip)
 skip_after_failures = 3
+# Close sessions with a single exit on a background thread instead of waiting on exit/logout (true/false)
+fast_close = false
 
 [vlan_collection]
 # Enable VLAN collection during discovery (true/false)
@@ -165,6 +197,12 @@ trust_server_certificate = true
 connection_timeout = 30
 # Command timeout in seconds
 command_timeout = 60
+# Write each discovered device in a single transaction using bulk MERGE (true/false)
+batch_writes = false
+# Seconds a database connection may sit idle before it is health checked
+health_check_interval = 60
+# Load device platform and failure counts in one query at the start of discovery (true/false)
+preload_metadata = true
 
 [ipv4_prefix_inventory]
 # Enable collection from global routing table (true/false)
@@ -185,6 +223,10 @@ track_summarization = true
 concurrent_devices = 5
 # Command timeout in seconds
 command_timeout = 30
+# Hold prefixes in compact NumPy columns for very large inventories (true/false, needs numpy)
+columnar_prefix_table = false
+# Send per-VRF commands in batches instead of one round trip each (true/false)
+batch_vrf_commands = false
 """
         
         # Write configuration file
@@ -203,6 +245,16 @@ command_timeout = 30
             config.connection_timeout = self._config.getint('discovery', 'connection_timeout', fallback=config.connection_timeout)
             config.discovery_timeout = self._config.getint('discovery', 'discovery_timeout', fallback=config.discovery_timeout)
             config.enable_progress_tracking = self._config.getboolean('discovery', 'enable_progress_tracking', fallback=config.enable_progress_tracking)
+            config.concurrent_discovery = self._config.getboolean('discovery', 'concurrent_discovery', fallback=config.concurrent_discovery)
+            config.site_collection_parallel = self._config.getboolean('discovery', 'site_collection_parallel', fallback=config.site_collection_parallel)
+            config.site_collection_max_workers = self._config.getint('discovery', 'site_collection_max_workers', fallback=config.site_collection_max_workers)
+            config.max_connections_per_site = self._config.getint('discovery', 'max_connections_per_site', fallback=config.max_connections_per_site)
+            config.incremental_discovery = self._config.getboolean('discovery', 'incremental_discovery', fallback=config.incremental_discovery)
+            config.discovery_log_verbosity = self._config.get('discovery', 'discovery_log_verbosity', fallback=config.discovery_log_verbosity).strip().lower()
+            config.stream_results = self._config.getboolean('discovery', 'stream_results', fallback=config.stream_results)
+            config.spill_directory = self._config.get('discovery', 'spill_directory', fallback=config.spill_directory).strip()
+            config.checkpoint_interval = self._config.getint('discovery', 'checkpoint_interval', fallback=config.checkpoint_interval)
+            config.checkpoint_file = self._config.get('discovery', 'checkpoint_file', fallback=config.checkpoint_file).strip()
             
             protocols_str = self._config.get('discovery', 'discovery_protocols', fallback='CDP,LLDP')
             config.protocols = [p.strip() for p in protocols_str.split(',') if p.strip()]
@@ -218,6 +270,10 @@ command_timeout = 30
             config.discovery_timeout = self._cli_overrides['discovery_timeout']
         if 'enable_progress_tracking' in self._cli_overrides:
             config.enable_progress_tracking = self._cli_overrides['enable_progress_tracking']
+        if 'concurrent_discovery' in self._cli_overrides:
+            config.concurrent_discovery = self._cli_overrides['concurrent_discovery']
+        if 'incremental_discovery' in self._cli_overrides:
+            config.incremental_discovery = self._cli_overrides['incremental_discovery']
             
         return config
     
@@ -276,6 +332,8 @@ command_timeout = 30
             config.logs_directory = self._config.get('output', 'logs_directory', fallback=config.logs_directory)
             config.excel_format = self._config.get('output', 'excel_format', fallback=config.excel_format)
             config.visio_enabled = self._config.getboolean('output', 'visio_enabled', fallback=config.visio_enabled)
+            config.archive_raw_output = self._config.getboolean('output', 'archive_raw_output', fallback=config.archive_raw_output)
+            config.archive_directory = self._config.get('output', 'archive_directory', fallback=config.archive_directory)
             
             # Handle site boundary pattern with proper blank detection and Unicode support
             # Use has_option to distinguish between missing and blank values
@@ -321,6 +379,7 @@ command_timeout = 30
             config.ssl_key_file = self._config.get('connection', 'ssl_key_file', fallback=config.ssl_key_file)
             config.ssl_ca_bundle = self._config.get('connection', 'ssl_ca_bundle', fallback=config.ssl_ca_bundle)
             config.skip_after_failures = self._config.getint('connection', 'skip_after_failures', fallback=config.skip_after_failures)
+            config.fast_close = self._config.getboolean('connection', 'fast_close', fallback=config.fast_close)
             
             # Convert empty strings to None for optional SSL file paths
             if config.ssl_cert_file == '':
@@ -371,7 +430,10 @@ command_timeout = 30
             'password': 'FluffyBunnyHitbyaBus',
             'trust_server_certificate': True,
             'connection_timeout': 30,
-            'command_timeout': 60
+            'command_timeout': 60,
+            'batch_writes': False,
+            'health_check_interval': 60,
+            'preload_metadata': True
         }
         
         if self._config.has_section('database'):
@@ -408,6 +470,9 @@ command_timeout = 30
             config['trust_server_certificate'] = self._config.getboolean('database', 'trust_server_certificate', fallback=config['trust_server_certificate'])
             config['connection_timeout'] = self._config.getint('database', 'connection_timeout', fallback=config['connection_timeout'])
             config['command_timeout'] = self._config.getint('database', 'command_timeout', fallback=config['command_timeout'])
+            config['batch_writes'] = self._config.getboolean('database', 'batch_writes', fallback=config['batch_writes'])
+            config['health_check_interval'] = self._config.getint('database', 'health_check_interval', fallback=config['health_check_interval'])
+            config['preload_metadata'] = self._config.getboolean('database', 'preload_metadata', fallback=config['preload_metadata'])
         
         return config
     
@@ -464,6 +529,14 @@ command_timeout = 30
                 'ipv4_prefix_inventory', 'command_timeout', 
                 fallback=config.command_timeout
             )
+            config.columnar_prefix_table = self._config.getboolean(
+                'ipv4_prefix_inventory', 'columnar_prefix_table', 
+                fallback=config.columnar_prefix_table
+            )
+            config.batch_vrf_commands = self._config.getboolean(
+                'ipv4_prefix_inventory', 'batch_vrf_commands', 
+                fallback=config.batch_vrf_commands
+            )
         
         return config
     
@@ -15,6 +15,16 @@ class DiscoveryConfig:
     discovery_timeout: int = 300  # Total discovery process timeout (5 minutes)
     protocols: List[str] = None
     enable_progress_tracking: bool = True
+    concurrent_discovery: bool = False  # Walk each depth level across concurrent_connections workers
+    site_collection_parallel: bool = False  # Collect sites concurrently during site collection
+    site_collection_max_workers: int = 4  # Sites collected at once
+    max_connections_per_site: int = 4  # Concurrent device connections within one site
+    incremental_discovery: bool = False  # Skip stack/VLAN collection on devices unchanged since last walk
+    discovery_log_verbosity: str = 'summary'  # summary, device or neighbor - per-device/neighbor lines at INFO
+    stream_results: bool = False  # Spill full device results to disk as devices complete
+    spill_directory: str = ''  # Spill file directory, blank for the system temp directory
+    checkpoint_interval: int = 300  # Seconds between discovery checkpoints, 0 disables
+    checkpoint_file: str = './netwalker_checkpoint.db'  # Checkpoint file used by --resume
     
     def __post_init__(self):
         if self.protocols is None:
@@ -67,6 +77,8 @@ class OutputConfig:
     excel_format: str = "xlsx"
     visio_enabled: bool = True
     site_boundary_pattern: Optional[str] = "*-CORE-*"
+    archive_raw_output: bool = False
+    archive_directory: str = "./archive"
     
     def __post_init__(self):
         """Validate configuration after initialization"""
@@ -111,6 +123,7 @@ class ConnectionConfig:
     ssl_key_file: Optional[str] = None
     ssl_ca_bundle: Optional[str] = None
     skip_after_failures: int = 3
+    fast_close: bool = False
 
 
 @dataclass
@@ -0,0 +1,277 @@
+"""
+Command Plan for NetWalker
+
+Declares, per platform, every show command device collection may run, and
+provides a per-device command session that runs each command at most once,
+skips commands that do not apply to the platform, and times each command so
+the device, stack and VLAN collectors share one set of outputs.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+CDP_NEIGHBORS_COMMAND = 'show cdp neighbors detail'
+LLDP_NEIGHBORS_COMMAND = 'show lldp neighbors detail'
+
+# Neighbor commands are dropped from a plan when their protocol is not configured
+PROTOCOL_COMMANDS = {
+    'CDP': CDP_NEIGHBORS_COMMAND,
+    'LLDP': LLDP_NEIGHBORS_COMMAND,
+}
+
+# Commands each collector may run, in collection order. Commands built at run
+# time (such as 'show module <n>') are not listed and always run.
+PLATFORM_COMMANDS: Dict[str, Tuple[str, ...]] = {
+    'IOS': (
+        'show version',
+        'show ip interface brief',
+        'show ip route connected',
+        'show vtp status',
+        CDP_NEIGHBORS_COMMAND,
+        LLDP_NEIGHBORS_COMMAND,
+        'show switch',
+        'show mod',
+        'show inventory',
+        'show vlan brief',
+        'show interfaces status',
+    ),
+    'IOS-XE': (
+        'show version',
+        'show ip interface brief',
+        'show ip route connected',
+        'show vtp status',
+        CDP_NEIGHBORS_COMMAND,
+        LLDP_NEIGHBORS_COMMAND,
+        'show switch',
+        'show mod',
+        'show inventory',
+        'show vlan brief',
+        'show interfaces status',
+    ),
+    'NX-OS': (
+        'show version',
+        'show ip interface brief',
+        'show ip route connected',
+        CDP_NEIGHBORS_COMMAND,
+        LLDP_NEIGHBORS_COMMAND,
+        'show vlan',
+        'show interface status',
+    ),
+    'PAN-OS': (
+        'show system info',
+        'show high-availability state',
+    ),
+}
+
+# Every command NetWalker knows about; an unknown platform may run any of them
+KNOWN_COMMANDS: Tuple[str, ...] = tuple(dict.fromkeys(
+    command for commands in PLATFORM_COMMANDS.values() for command in commands
+))
+
+
+def execute_command(connection: Any, command: str, timeout: int = 30) -> Optional[str]:
+    """
+    Run a command on a netmiko or scrapli connection and return its output
+
+    Args:
+        connection: Active device connection
+        command: Command to run
+        timeout: Read timeout in seconds for connections that support one
+
+    Returns:
+        Command output, or None for an unknown connection type
+
+    Raises:
+        Exception: Whatever the connection raised while running the command
+    """
+    if hasattr(connection, 'send_command') and hasattr(connection, 'device_type'):
+        # Netmiko connection - returns string directly
+        return connection.send_command(command, read_timeout=timeout)
+    elif hasattr(connection, 'send_command') and hasattr(connection, 'transport'):
+        # Scrapli connection - returns response object with .result attribute
+        response = connection.send_command(command)
+        return response.result if hasattr(response, 'result') else str(response)
+    elif hasattr(connection, 'send_command'):
+        # Generic connection (for testing) - try scrapli format first
+        try:
+            response = connection.send_command(command)
+            if hasattr(response, 'result'):
+                return response.result
+            return str(response)
+        except TypeError:
+            # If scrapli format fails, try netmiko format
+            return connection.send_command(command, read_timeout=timeout)
+    else:
+        logger.error(f"Unknown connection type: {type(connection)}")
+        return None
+
+
+class CommandPlan:
+    """
+    Ordered, de-duplicated set of commands collection runs on one platform.
+
+    Known commands that are not in the plan do not apply to the platform and
+    are skipped; commands NetWalker does not know about always run.
+    """
+
+    def __init__(self, platform: str, commands: Iterable[str]):
+        """
+        Initialize command plan.
+
+        Args:
+            platform: Platform the plan is for
+            commands: Commands that apply to the platform, duplicates are dropped
+        """
+        self.platform = platform
+        self.commands: Tuple[str, ...] = tuple(dict.fromkeys(commands))
+        self.skipped = frozenset(KNOWN_COMMANDS) - frozenset(self.commands)
+
+    @classmethod
+    def for_platform(cls, platform: Optional[str],
+                     protocols: Optional[Iterable[str]] = None) -> 'CommandPlan':
+        """
+        Build the plan for a platform
+
+        Args:
+            platform: Detected platform (IOS, IOS-XE, NX-OS, PAN-OS), anything
+                else gets every known command
+            protocols: Enabled discovery protocols, None enables CDP and LLDP
+
+        Returns:
+            CommandPlan for the platform
+        """
+        platform = (platform or 'Unknown').upper()
+        commands = PLATFORM_COMMANDS.get(platform, KNOWN_COMMANDS)
+
+        if protocols is not None:
+            enabled = {protocol.strip().upper() for protocol in protocols}
+            disabled = {command for protocol, command in PROTOCOL_COMMANDS.items() if protocol not in enabled}
+            commands = [command for command in commands if command not in disabled]
+
+        return cls(platform, commands)
+
+    def applies(self, command: str) -> bool:
+        """Check whether a command should be run on this platform"""
+        return command not in self.skipped
+
+
+class CommandSession:
+    """
+    Memoized command runner for one device connection.
+
+    Each command runs at most once per session; later requests for the same
+    command are served from the stored output. Failed commands and empty
+    outputs are not stored, so callers may retry them. Safe to use from
+    helper threads.
+    """
+
+    def __init__(self, connection: Any, plan: CommandPlan, host: str = "", capture: Any = None):
+        """
+        Initialize command session.
+
+        Args:
+            connection: Active device connection
+            plan: Command plan for the device platform
+            host: Device hostname or IP, for logging
+            capture: Optional output archive CaptureWriter that receives every
+                raw output the session sees
+        """
+        self.connection = connection
+        self.plan = plan
+        self.host = host
+        self.capture = capture
+
+        self._lock = threading.Lock()
+        self._outputs: Dict[str, Optional[str]] = {}
+        self._timings: Dict[str, float] = {}
+
+        # Statistics
+        self.commands_run = 0
+        self.commands_reused = 0
+        self.commands_skipped = 0
+
+    def set_plan(self, plan: CommandPlan):
+        """Switch to the plan for the platform detected from 'show version'"""
+        self.plan = plan
+        logger.debug(f"[COMMAND PLAN] {self.host}: using {plan.platform} plan ({len(plan.commands)} commands)")
+
+    def seed(self, command: str, output: str):
+        """
+        Store output captured outside the session, such as the connect-time probe
+
+        Args:
+            command: Command that produced the output
+            output: Command output
+        """
+        with self._lock:
+            self._outputs[command] = output
+        self._archive(command, output)
+
+    def run(self, command: str, timeout: int = 30) -> Optional[str]:
+        """
+        Run a command, reusing its output if it already ran in this session
+
+        Args:
+            command: Command to run
+            timeout: Read timeout in seconds
+
+        Returns:
+            Command output, or None if the command does not apply to the platform
+
+        Raises:
+            Exception: Whatever the connection raised while running the command
+        """
+        if not self.plan.applies(command):
+            with self._lock:
+                self.commands_skipped += 1
+            logger.debug(f"[COMMAND PLAN] {self.host}: skipping '{command}' (not used on {self.plan.platform})")
+            return None
+
+        with self._lock:
+            if command in self._outputs:
+                self.commands_reused += 1
+                return self._outputs[command]
+
+        start = time.perf_counter()
+        output = execute_command(self.connection, command, timeout)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.commands_run += 1
+            self._timings[command] = self._timings.get(command, 0.0) + elapsed
+            if output and output.strip():
+                self._outputs[command] = output
+
+        logger.debug(f"[COMMAND PLAN] {self.host}: '{command}' took {elapsed:.2f}s")
+        self._archive(command, output)
+        return output
+
+    def _archive(self, command: str, output: Optional[str]):
+        """Pass an output to the archive capture; archive errors never fail collection"""
+        if self.capture is None:
+            return
+        try:
+            self.capture.store(command, output)
+        except Exception as e:
+            logger.warning(f"[ARCHIVE] {self.host}: could not archive '{command}': {e}")
+
+    def get_timings(self) -> Dict[str, float]:
+        """Get seconds spent per command, in the order commands first ran"""
+        with self._lock:
+            return dict(self._timings)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get run, reuse and skip counters and total command time"""
+        with self._lock:
+            return {
+                'platform': self.plan.platform,
+                'commands_run': self.commands_run,
+                'commands_reused': self.commands_reused,
+                'commands_skipped': self.commands_skipped,
+                'command_seconds': sum(self._timings.values())
+            }
@@ -3,6 +3,7 @@ Connection Manager for NetWalker using scrapli and netmiko libraries
 """
 
 import logging
+import queue
 import time
 import threading
 from typing import Optional, Tuple, Dict, Any
@@ -27,7 +28,8 @@ class ConnectionManager:
     """Manages network device connections with SSH/Telnet fallback using scrapli and netmiko"""
 
     def __init__(self, ssh_port: int = 22, telnet_port: int = 23, timeout: int = 30,
-                 ssl_verify: bool = False, ssl_cert_file: str = None, ssl_key_file: str = None, ssl_ca_bundle: str = None):
+                 ssl_verify: bool = False, ssl_cert_file: str = None, ssl_key_file: str = None, ssl_ca_bundle: str = None,
+                 max_workers: int = 10, fast_close: bool = False):
         self.ssh_port = ssh_port
         self.telnet_port = telnet_port
         self.timeout = timeout
@@ -38,7 +40,16 @@ class ConnectionManager:
         self.logger = logging.getLogger(__name__)
         self._active_connections: Dict[str, Any] = {}
         self._connection_locks: Dict[str, threading.Lock] = {}
-        self._executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="netwalker-conn")
+        # Guards _active_connections and _connection_locks across discovery and reaper threads
+        self._registry_lock = threading.Lock()
+        # Sized to the discovery worker count so concurrent walks are not throttled here
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="netwalker-conn")
+
+        # Fast close hands session teardown to a background reaper thread
+        self.fast_close = fast_close
+        self._reaper_queue: queue.Queue = queue.Queue()
+        self._reaper_thread: Optional[threading.Thread] = None
+        self._reaper_lock = threading.Lock()
 
         # Log SSL configuration
         if not self.ssl_verify:
@@ -137,22 +148,24 @@ class ConnectionManager:
             )
 
         # Ensure thread-safe connection management
-        if host not in self._connection_locks:
-            self._connection_locks[host] = threading.Lock()
+        with self._registry_lock:
+            host_lock = self._connection_locks.setdefault(host, threading.Lock())
 
-        with self._connection_locks[host]:
+        with host_lock:
             # Try netmiko SSH first (async) with neighbor platform for PAN-OS detection
             if NETMIKO_AVAILABLE:
                 connection, result = self._try_netmiko_ssh_connection(host, credentials, start_time, db_manager, neighbor_platform)
                 if result.status == ConnectionStatus.SUCCESS:
-                    self._active_connections[host] = connection
+                    with self._registry_lock:
+                        self._active_connections[host] = connection
                     return connection, result
 
             # Fallback to scrapli Telnet
             self.logger.info(f"SSH failed for {host}, trying Telnet fallback")
             connection, result = self._try_scrapli_telnet_connection(host, credentials, start_time)
             if result.status == ConnectionStatus.SUCCESS:
-                self._active_connections[host] = connection
+                with self._registry_lock:
+                    self._active_connections[host] = connection
 
             return connection, result
 
@@ -216,7 +229,8 @@ class ConnectionManager:
 
             # Execute connection in thread pool for async operation
             future: Future = self._executor.submit(self._establish_netmiko_connection, device_params)
-            connection = future.result(timeout=self.timeout + 10)  # Allow extra time for connection setup
+            # Allow extra time for connection setup
+            connection, probe_output = future.result(timeout=self.timeout + 10)
 
             if connection:
                 connection_time = time.time() - start_time
@@ -226,7 +240,8 @@ class ConnectionManager:
                     host=host,
                     method=ConnectionMethod.SSH,
                     status=ConnectionStatus.SUCCESS,
-                    connection_time=connection_time
+                    connection_time=connection_time,
+                    probe_output=probe_output
                 )
             else:
                 raise Exception("Connection establishment failed")
@@ -258,7 +273,7 @@ class ConnectionManager:
                 connection_time=connection_time
             )
 
-    def _establish_netmiko_connection(self, device_params: Dict[str, Any]) -> Optional[Any]:
+    def _establish_netmiko_connection(self, device_params: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
         """
         Establish netmiko connection in a separate thread for async operation
 
@@ -266,7 +281,8 @@ class ConnectionManager:
             device_params: Device connection parameters
 
         Returns:
-            Connected netmiko device or None if failed
+            Tuple of (connected netmiko device, connect-time 'show version' output),
+            or (None, None) if failed
         """
         try:
             connection = ConnectHandler(**device_params)
@@ -275,17 +291,18 @@ class ConnectionManager:
             output = connection.send_command("show version", read_timeout=10)
             if output:
                 self.logger.debug(f"Connection test successful for {device_params['host']}")
-                return connection
+                # Return the output so device collection can reuse it instead of running it again
+                return connection, output if isinstance(output, str) else None
             else:
                 self.logger.warning(f"Connection test failed for {device_params['host']}")
                 connection.disconnect()
-                return None
+                return None, None
 
         except Exception as e:
             # Extract just the first line of the error message to avoid garbage text
             error_msg = str(e).split('\n')[0]
             self.logger.error(f"Failed to establish netmiko connection: {error_msg}")
-            return None
+            return None, None
 
     def _try_scrapli_telnet_connection(self, host: str, credentials: Credentials, start_time: float) -> Tuple[Optional[Scrapli], ConnectionResult]:
         """
@@ -435,8 +452,16 @@ class ConnectionManager:
             self.logger.debug(f"No active connection found for {host} (may already be closed)")
             return False
 
+        if self.fast_close:
+            return self._queue_fast_close(host)
+
+        close_start = time.time()
         try:
-            connection = self._active_connections[host]
+            with self._registry_lock:
+                connection = self._active_connections.get(host)
+            if connection is None:
+                self.logger.debug(f"No active connection found for {host} (may already be closed)")
+                return False
             self.logger.debug(f"Closing connection to {host}...")
 
             # Send exit commands to properly terminate session (causes host to disconnect)
@@ -506,25 +531,150 @@ class ConnectionManager:
                     self.logger.debug(f"Force close also failed for {host}: {force_error}")
 
             # Remove from active connections and locks
-            del self._active_connections[host]
-            if host in self._connection_locks:
-                del self._connection_locks[host]
+            self._release(host)
 
             self.logger.debug(f"Connection to {host} closed successfully")
+            self.logger.info(f"[CLOSE] Connection to {host} closed in {time.time() - close_start:.2f}s")
             return True
 
         except Exception as e:
             self.logger.error(f"Error closing connection to {host}: {str(e)}")
             # Ensure cleanup even if there was an error
-            if host in self._active_connections:
-                del self._active_connections[host]
-            if host in self._connection_locks:
-                del self._connection_locks[host]
+            self._release(host)
+            return False
+
+    def _release(self, host: str) -> Optional[Any]:
+        """
+        Stop tracking a host's connection and lock
+
+        Args:
+            host: Device hostname or IP address
+
+        Returns:
+            The connection that was tracked, or None
+        """
+        with self._registry_lock:
+            self._connection_locks.pop(host, None)
+            return self._active_connections.pop(host, None)
+
+    def _queue_fast_close(self, host: str) -> bool:
+        """
+        Release a connection immediately and tear the session down on the reaper thread
+
+        Args:
+            host: Device hostname or IP address
+
+        Returns:
+            True once the connection has been handed to the reaper
+        """
+        connection = self._release(host)
+        if connection is None:
+            return False
+
+        self._start_reaper()
+        self._reaper_queue.put((host, connection, time.time()))
+        self.logger.debug(f"Connection to {host} released for background teardown")
+        return True
+
+    def _start_reaper(self):
+        """Start the background teardown thread if it is not already running"""
+        with self._reaper_lock:
+            if self._reaper_thread is None or not self._reaper_thread.is_alive():
+                self._reaper_thread = threading.Thread(
+                    target=self._reaper_loop, name="netwalker-conn-reaper", daemon=True
+                )
+                self._reaper_thread.start()
+
+    def _reaper_loop(self):
+        """Tear down released connections until a stop sentinel is received"""
+        while True:
+            item = self._reaper_queue.get()
+            try:
+                if item is None:
+                    return
+                host, connection, released_at = item
+                teardown_start = time.time()
+                self._fast_teardown(host, connection)
+                teardown_time = time.time() - teardown_start
+                self.logger.info(f"[CLOSE] Connection to {host} closed in {teardown_time:.2f}s "
+                                 f"(fast close, {time.time() - released_at:.2f}s after release)")
+            except Exception as e:
+                self.logger.debug(f"Background teardown error: {e}")
+            finally:
+                self._reaper_queue.task_done()
+
+    def _fast_teardown(self, host: str, connection: Any):
+        """
+        Terminate a session with a single non-blocking exit and close the transport
+
+        Args:
+            host: Device hostname or IP address
+            connection: Netmiko or scrapli connection object
+        """
+        if hasattr(connection, 'write_channel') and hasattr(connection, 'device_type'):
+            # Netmiko connection - write exit without waiting for a prompt, then drop the socket
+            try:
+                connection.write_channel("exit" + getattr(connection, 'RETURN', '\n'))
+            except Exception as exit_error:
+                self.logger.debug(f"Exit write failed for {host}: {exit_error}")
+            try:
+                connection.disconnect()
+            except Exception as disconnect_error:
+                self.logger.debug(f"Netmiko disconnect failed for {host}: {disconnect_error}")
+        elif hasattr(connection, 'close'):
+            # Scrapli (and generic) connections - closing the transport ends the session
+            try:
+                connection.close()
+            except Exception as close_error:
+                self.logger.debug(f"Close failed for {host}: {close_error}")
+        elif hasattr(connection, 'disconnect'):
+            try:
+                connection.disconnect()
+            except Exception as disconnect_error:
+                self.logger.debug(f"Disconnect failed for {host}: {disconnect_error}")
+
+    def wait_for_pending_closes(self, timeout: float = 30.0) -> bool:
+        """
+        Wait for connections handed to the reaper thread to finish closing
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if no teardowns are still pending
+        """
+        drained = threading.Event()
+
+        def wait_for_queue():
+            self._reaper_queue.join()
+            drained.set()
+
+        threading.Thread(target=wait_for_queue, name="netwalker-conn-reaper-wait", daemon=True).start()
+        if not drained.wait(timeout):
+            self.logger.warning(f"{self._reaper_queue.unfinished_tasks} connection teardowns still pending")
             return False
+        return True
+
+    def _stop_reaper(self, timeout: float = 5.0):
+        """
+        Send the reaper thread its stop sentinel and wait for it to exit
+
+        Args:
+            timeout: Maximum seconds to wait for the thread
+        """
+        with self._reaper_lock:
+            reaper_thread, self._reaper_thread = self._reaper_thread, None
+        if reaper_thread is None or not reaper_thread.is_alive():
+            return
+        self._reaper_queue.put(None)
+        reaper_thread.join(timeout)
+        if reaper_thread.is_alive():
+            self.logger.warning("Connection reaper thread did not stop in time")
 
     def close_all_connections(self):
         """Close all active connections with proper thread cleanup and timeout handling"""
-        hosts = list(self._active_connections.keys())
+        with self._registry_lock:
+            hosts = list(self._active_connections.keys())
         closed_count = 0
         failed_count = 0
 
@@ -540,6 +690,11 @@ class ConnectionManager:
                 self.logger.error(f"Error closing connection to {host}: {e}")
                 failed_count += 1
 
+        # Let background teardowns finish before the thread pool goes away
+        if self.fast_close:
+            self.wait_for_pending_closes()
+            self._stop_reaper()
+
         # Shutdown the thread pool executor with proper timeout handling
         self.logger.info("Shutting down connection thread pool...")
         try:
@@ -590,8 +745,9 @@ class ConnectionManager:
         if remaining_connections > 0:
             self.logger.error(f"Connection cleanup incomplete - {remaining_connections} connections still tracked")
             # Force clear the tracking dictionaries
-            self._active_connections.clear()
-            self._connection_locks.clear()
+            with self._registry_lock:
+                self._active_connections.clear()
+                self._connection_locks.clear()
 
         self.logger.info(f"Connection cleanup complete - closed: {closed_count}, failed: {failed_count}")
 
@@ -652,8 +808,9 @@ class ConnectionManager:
                     self.logger.debug(f"Force close failed for {host}: {e}")
 
             # Clear tracking dictionaries
-            self._active_connections.clear()
-            self._connection_locks.clear()
+            with self._registry_lock:
+                self._active_connections.clear()
+                self._connection_locks.clear()
 
         # Force shutdown thread pool
         try:
@@ -32,6 +32,7 @@ class ConnectionResult:
     status: ConnectionStatus
     error_message: Optional[str] = None
     connection_time: Optional[float] = None
+    probe_output: Optional[str] = None  # Output of the connect-time test command (show version)
     
 
 @dataclass
@@ -60,6 +61,8 @@ class DeviceInfo:
     is_stack: bool = False
     is_physical_device: Optional[bool] = None  # True for physical, False for cloud/virtual, None if unknown
     ha_role: Optional[str] = None  # For PAN-OS: Active, Passive, or None if HA not enabled
+    command_timings: Dict[str, float] = None  # Seconds spent per command during collection
+    refresh_skipped: bool = False  # Incremental mode: unchanged since last walk, stack/VLANs not collected
     
     def __post_init__(self):
         if self.neighbors is None:
@@ -68,6 +71,8 @@ class DeviceInfo:
             self.vlans = []
         if self.stack_members is None:
             self.stack_members = []
+        if self.command_timings is None:
+            self.command_timings = {}
 
 
 @dataclass
@@ -0,0 +1,330 @@
+"""
+Raw Output Archive for NetWalker
+
+Stores every raw command output captured during collection as a gzip
+compressed, content-addressed blob, with an append-only index recording which
+device produced which output for which command and when. Identical outputs
+(unchanged devices across runs) are stored once. The archive can be replayed
+through a ReplayConnection so parsers run again without touching the network.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_FILENAME = 'index.jsonl'
+OBJECTS_DIRNAME = 'objects'
+
+
+@dataclass
+class ArchivedCapture:
+    """One device collection recorded in the archive"""
+    capture_id: str
+    host: str
+    timestamp: str
+    connection_method: str = "SSH"
+    device_type: Optional[str] = None
+    discovery_depth: int = 0
+    is_seed: bool = False
+    hostname: Optional[str] = None
+    primary_ip: Optional[str] = None
+    # command -> {'sha256': digest, 'timestamp': ISO time the output was captured}
+    commands: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+
+class CaptureWriter:
+    """
+    Records the command outputs of one device collection.
+
+    Blobs are written as outputs arrive; the index entry is written once by
+    finish(), so an interrupted collection never leaves a partial capture.
+    """
+
+    def __init__(self, archive: 'OutputArchive', capture: ArchivedCapture):
+        self.archive = archive
+        self.capture = capture
+        self._lock = threading.Lock()
+        self._finished = False
+
+    def store(self, command: str, output: Optional[str]):
+        """
+        Archive one command output
+
+        Args:
+            command: Command that produced the output
+            output: Raw command output, None is ignored
+        """
+        if output is None:
+            return
+        digest = self.archive.put(output)
+        with self._lock:
+            self.capture.commands[command] = {
+                'sha256': digest,
+                'timestamp': datetime.now().isoformat()
+            }
+
+    def finish(self, hostname: Optional[str] = None, primary_ip: Optional[str] = None):
+        """
+        Write the capture to the archive index
+
+        Args:
+            hostname: Hostname parsed from the device, if collection got that far
+            primary_ip: Primary IP the collector settled on, replayed so reparse
+                does not need DNS
+        """
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            self.capture.hostname = hostname
+            self.capture.primary_ip = primary_ip
+        if self.capture.commands:
+            self.archive.add_capture(self.capture)
+
+
+class OutputArchive:
+    """
+    Content-addressed store of raw command outputs.
+
+    Layout under the archive directory:
+        objects/<first two hex digits>/<sha256>.gz   compressed output
+        index.jsonl                                  one line per device capture
+    """
+
+    def __init__(self, directory: str, compression_level: int = 6):
+        """
+        Initialize output archive.
+
+        Args:
+            directory: Archive directory, created if missing
+            compression_level: gzip compression level (1-9)
+        """
+        self.directory = directory
+        self.compression_level = compression_level
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self.objects_path = os.path.join(directory, OBJECTS_DIRNAME)
+
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.blobs_written = 0
+        self.blobs_deduplicated = 0
+        self.bytes_raw = 0
+        self.bytes_stored = 0
+
+        os.makedirs(self.objects_path, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['OutputArchive']:
+        """
+        Create an archive from the flattened application configuration
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            OutputArchive in archive_directory, or None if archive_raw_output is off
+        """
+        if not config.get('archive_raw_output', False):
+            return None
+        return cls(config.get('archive_directory', './archive'))
+
+    def begin_capture(self, host: str, connection_method: str = "SSH",
+                      device_type: Optional[str] = None, discovery_depth: int = 0,
+                      is_seed: bool = False) -> CaptureWriter:
+        """
+        Start recording a device collection
+
+        Args:
+            host: Host the collector connected to
+            connection_method: SSH or Telnet
+            device_type: Netmiko device type of the connection, if any
+            discovery_depth: Discovery depth of the device
+            is_seed: Whether the device is a seed device
+
+        Returns:
+            CaptureWriter for the collection
+        """
+        capture = ArchivedCapture(
+            capture_id=uuid.uuid4().hex,
+            host=host,
+            timestamp=datetime.now().isoformat(),
+            connection_method=connection_method,
+            device_type=device_type,
+            discovery_depth=discovery_depth,
+            is_seed=is_seed
+        )
+        return CaptureWriter(self, capture)
+
+    def put(self, output: str) -> str:
+        """
+        Store an output blob if it is not already archived
+
+        Args:
+            output: Raw command output
+
+        Returns:
+            sha256 hex digest addressing the blob
+        """
+        data = output.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+
+        if os.path.exists(path):
+            with self._lock:
+                self.blobs_deduplicated += 1
+            return digest
+
+        compressed = gzip.compress(data, compresslevel=self.compression_level)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial blob
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(compressed)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self.blobs_written += 1
+            self.bytes_raw += len(data)
+            self.bytes_stored += len(compressed)
+        return digest
+
+    def get(self, digest: str) -> str:
+        """
+        Read an output blob
+
+        Args:
+            digest: sha256 hex digest returned by put()
+
+        Returns:
+            Raw command output
+
+        Raises:
+            FileNotFoundError: If the blob is not in the archive
+        """
+        with open(self._blob_path(digest), 'rb') as handle:
+            return gzip.decompress(handle.read()).decode('utf-8')
+
+    def add_capture(self, capture: ArchivedCapture):
+        """Append a finished capture to the index"""
+        line = json.dumps(capture.__dict__, sort_keys=True)
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as handle:
+                handle.write(line + '\n')
+        logger.debug(f"[ARCHIVE] {capture.host}: archived {len(capture.commands)} command outputs")
+
+    def captures(self) -> List[ArchivedCapture]:
+        """
+        Read every capture in the index, oldest first
+
+        Returns:
+            List of ArchivedCapture objects
+        """
+        if not os.path.exists(self.index_path):
+            return []
+
+        captures = []
+        with open(self.index_path, 'r', encoding='utf-8') as handle:
+            for line_number, line in enumerate(handle, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    captures.append(ArchivedCapture(**json.loads(line)))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"[ARCHIVE] Skipping unreadable index line {line_number}: {e}")
+        return captures
+
+    def latest_captures(self, since: Optional[str] = None) -> List[ArchivedCapture]:
+        """
+        Get the most recent capture of each device
+
+        Args:
+            since: Optional ISO timestamp, older captures are ignored
+
+        Returns:
+            Latest capture per host, in the order the hosts were first archived
+        """
+        latest: Dict[str, ArchivedCapture] = {}
+        for capture in self.captures():
+            if since and capture.timestamp < since:
+                continue
+            current = latest.get(capture.host)
+            if current is None or capture.timestamp >= current.timestamp:
+                latest[capture.host] = capture
+        return list(latest.values())
+
+    def load_outputs(self, capture: ArchivedCapture) -> Dict[str, str]:
+        """
+        Read every output of a capture
+
+        Args:
+            capture: Archived capture
+
+        Returns:
+            Dictionary of command -> raw output (missing blobs are skipped)
+        """
+        outputs = {}
+        for command, entry in capture.commands.items():
+            try:
+                outputs[command] = self.get(entry['sha256'])
+            except (OSError, KeyError) as e:
+                logger.warning(f"[ARCHIVE] {capture.host}: output of '{command}' unavailable: {e}")
+        return outputs
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get blob write, deduplication and size counters"""
+        with self._lock:
+            return {
+                'blobs_written': self.blobs_written,
+                'blobs_deduplicated': self.blobs_deduplicated,
+                'bytes_raw': self.bytes_raw,
+                'bytes_stored': self.bytes_stored
+            }
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_path, digest[:2], f"{digest}.gz")
+
+
+class ReplayConnection:
+    """
+    Netmiko-style connection that answers commands from archived outputs.
+
+    Commands without an archived output fail the way an unsupported command
+    does on a device, so collectors fall back exactly as they did live.
+    """
+
+    def __init__(self, outputs: Dict[str, str], device_type: Optional[str] = None, host: str = ""):
+        """
+        Initialize replay connection.
+
+        Args:
+            outputs: Dictionary of command -> raw output
+            device_type: Netmiko device type of the original connection
+            host: Device host, for error messages
+        """
+        self.outputs = outputs
+        self.device_type = device_type or 'cisco_ios'
+        self.host = host
+
+    def send_command(self, command: str, read_timeout: int = 30, **kwargs) -> str:
+        """Return the archived output of a command"""
+        if command not in self.outputs:
+            raise ValueError(f"% Invalid input: '{command}' not in archive for {self.host}")
+        return self.outputs[command]
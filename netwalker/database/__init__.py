@@ -5,10 +5,15 @@ Provides persistent storage for network device discovery data.
 """
 
 from .database_manager import DatabaseManager
+from .connection_pool import PooledConnection
+from .metadata_cache import DeviceMetadataCache, DeviceMetadata
 from .models import Device, DeviceVersion, DeviceInterface, VLAN, DeviceVLAN
 
 __all__ = [
     'DatabaseManager',
+    'PooledConnection',
+    'DeviceMetadataCache',
+    'DeviceMetadata',
     'Device',
     'DeviceVersion',
     'DeviceInterface',
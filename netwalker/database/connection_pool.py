@@ -0,0 +1,208 @@
+"""
+Pooled database connection for NetWalker
+
+Wraps a pyodbc connection so liveness is only probed after the connection
+has been idle or has reported a connection-level error, and re-opens the
+underlying connection in place when a probe fails.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import pyodbc
+
+
+def is_connection_error(error: Exception) -> bool:
+    """
+    Check if a pyodbc error means the connection itself is unusable
+
+    Args:
+        error: Exception raised by pyodbc
+
+    Returns:
+        True for communication link failures and closed connections
+    """
+    sqlstate = error.args[0] if getattr(error, 'args', None) else ''
+    if not isinstance(sqlstate, str):
+        return False
+    # 08xxx = connection exception class, 01002 = disconnect error
+    return sqlstate.startswith('08') or sqlstate == '01002'
+
+
+class _PooledCursor:
+    """Cursor proxy that flags the owning connection on connection-level errors"""
+
+    def __init__(self, cursor: Any, owner: 'PooledConnection'):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_owner', owner)
+
+    def execute(self, *args, **kwargs):
+        try:
+            return self._cursor.execute(*args, **kwargs)
+        except pyodbc.Error as e:
+            self._owner._note_error(e)
+            raise
+
+    def executemany(self, *args, **kwargs):
+        try:
+            return self._cursor.executemany(*args, **kwargs)
+        except pyodbc.Error as e:
+            self._owner._note_error(e)
+            raise
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class PooledConnection:
+    """
+    Long-lived database connection with idle-time health checks.
+
+    Every cursor, commit and rollback marks the connection as recently used.
+    ensure_healthy() only runs a SELECT 1 probe when the connection has been
+    idle for longer than health_check_interval or a connection-level error
+    was seen since the last check; a failed probe re-opens the connection.
+    """
+
+    def __init__(self, connect_factory: Callable[[], Any], health_check_interval: float = 60.0):
+        """
+        Initialize pooled connection.
+
+        Args:
+            connect_factory: Callable returning a new open pyodbc connection
+            health_check_interval: Idle seconds after which the connection is probed
+        """
+        self.logger = logging.getLogger(__name__)
+        self._connect_factory = connect_factory
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._connection = connect_factory()
+        self._last_used = time.monotonic()
+        self._suspect = False
+
+        # Statistics
+        self.probes = 0
+        self.probes_skipped = 0
+        self.reconnects = 0
+        self.connection_errors = 0
+
+    def _touch(self):
+        self._last_used = time.monotonic()
+
+    def _note_error(self, error: Exception):
+        """Mark the connection for a health check if the error was connection-level"""
+        if is_connection_error(error):
+            self.connection_errors += 1
+            self._suspect = True
+            self.logger.warning(f"Database connection error detected, will verify before next use: {error}")
+
+    def ensure_healthy(self) -> bool:
+        """
+        Verify the connection, probing and reconnecting only when needed
+
+        Returns:
+            True if the connection is usable
+        """
+        with self._lock:
+            if self._connection is None:
+                return False
+
+            idle = time.monotonic() - self._last_used
+            if not self._suspect and idle < self.health_check_interval:
+                self.probes_skipped += 1
+                return True
+
+            self.probes += 1
+            try:
+                cursor = self._connection.cursor()
+                cursor.execute("SELECT 1")
+                cursor.close()
+                self._suspect = False
+                self._touch()
+                return True
+            except Exception as e:
+                self.logger.warning(f"Database health check failed ({e}), reconnecting")
+                return self._reconnect()
+
+    def _reconnect(self) -> bool:
+        """Replace the underlying connection (caller holds the lock)"""
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+
+        try:
+            self._connection = self._connect_factory()
+            self.reconnects += 1
+            self._suspect = False
+            self._touch()
+            self.logger.info("Database connection re-established")
+            return True
+        except Exception as e:
+            self.logger.error(f"Database reconnect failed: {e}")
+            self._suspect = True
+            return False
+
+    def cursor(self) -> _PooledCursor:
+        try:
+            cursor = self._connection.cursor()
+        except pyodbc.Error as e:
+            self._note_error(e)
+            raise
+        self._touch()
+        return _PooledCursor(cursor, self)
+
+    def commit(self):
+        try:
+            self._connection.commit()
+        except pyodbc.Error as e:
+            self._note_error(e)
+            raise
+        self._touch()
+
+    def rollback(self):
+        try:
+            self._connection.rollback()
+        except pyodbc.Error as e:
+            # Nothing to roll back on a dead link; the next health check reconnects
+            if not is_connection_error(e):
+                raise
+            self._note_error(e)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.close()
+                finally:
+                    self._connection = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get probe and reconnect counters"""
+        return {
+            'probes': self.probes,
+            'probes_skipped': self.probes_skipped,
+            'reconnects': self.reconnects,
+            'connection_errors': self.connection_errors
+        }
+
+    def __getattr__(self, name: str):
+        # Pass through pyodbc connection attributes such as autocommit and timeout
+        connection = self.__dict__.get('_connection')
+        if connection is None:
+            raise AttributeError(name)
+        return getattr(connection, name)
+
+    def __setattr__(self, name: str, value: Any):
+        if name in ('autocommit', 'timeout'):
+            setattr(self._connection, name, value)
+        else:
+            object.__setattr__(self, name, value)
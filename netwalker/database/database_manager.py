@@ -8,14 +8,20 @@ schema creation, and CRUD operations.
 import ipaddress
 import logging
 import pyodbc
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Set, Tuple
 from datetime import datetime
 from .models import Device, DeviceVersion, DeviceInterface, VLAN, DeviceVLAN
+from .connection_pool import PooledConnection
+from .metadata_cache import DeviceMetadataCache
+from netwalker.interface_names import normalize_interface_name
 
 
 class DatabaseManager:
     """Manages database connections and operations for NetWalker inventory"""
 
+    # SQL Server accepts at most 2100 parameters per statement
+    MAX_QUERY_PARAMETERS = 2000
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize database manager
@@ -27,6 +33,12 @@ class DatabaseManager:
         self.config = config
         self.connection = None
         self.enabled = config.get('enabled', False)
+        # Write each discovered device in one transaction using staged sets and MERGE
+        self.batch_writes = config.get('batch_writes', False)
+        # Serve pre-connection platform and failure lookups from memory during discovery
+        self.preload_metadata = config.get('preload_metadata', True)
+        self.metadata_cache = DeviceMetadataCache()
+        self._protocol_parser = None
 
         if self.enabled:
             self.server = config.get('server', '')
@@ -37,6 +49,8 @@ class DatabaseManager:
             self.trust_cert = config.get('trust_server_certificate', True)
             self.conn_timeout = config.get('connection_timeout', 30)
             self.cmd_timeout = config.get('command_timeout', 60)
+            # Seconds a connection may sit idle before is_connected() probes it again
+            self.health_check_interval = config.get('health_check_interval', 60)
 
             self.logger.info(f"DatabaseManager initialized: server={self.server}, database={self.database}")
         else:
@@ -117,8 +131,12 @@ class DatabaseManager:
                         f"Connection Timeout={self.conn_timeout};"
                     )
 
-            self.connection = pyodbc.connect(conn_str, timeout=self.conn_timeout)
-            self.connection.timeout = self.cmd_timeout
+            def open_connection():
+                connection = pyodbc.connect(conn_str, timeout=self.conn_timeout)
+                connection.timeout = self.cmd_timeout
+                return connection
+
+            self.connection = PooledConnection(open_connection, self.health_check_interval)
 
             # Get the actual database we're connected to
             cursor = self.connection.cursor()
@@ -147,6 +165,10 @@ class DatabaseManager:
     def disconnect(self):
         """Close database connection"""
         if self.connection:
+            stats = self.get_connection_stats()
+            if stats:
+                self.logger.info(f"Database connection stats: {stats['probes']} probes, "
+                                 f"{stats['probes_skipped']} skipped, {stats['reconnects']} reconnects")
             try:
                 self.connection.close()
                 self.logger.info("Database connection closed")
@@ -156,10 +178,18 @@ class DatabaseManager:
                 self.connection = None
 
     def is_connected(self) -> bool:
-        """Check if database connection is active"""
+        """
+        Check if database connection is active
+
+        Pooled connections are only probed after sitting idle or after a
+        connection-level error, and are re-opened if the probe fails.
+        """
         if not self.connection:
             return False
 
+        if isinstance(self.connection, PooledConnection):
+            return self.connection.ensure_healthy()
+
         try:
             cursor = self.connection.cursor()
             cursor.execute("SELECT 1")
@@ -168,6 +198,18 @@ class DatabaseManager:
         except:
             return False
 
+    def get_connection_stats(self) -> Dict[str, int]:
+        """
+        Get connection health-check counters
+
+        Returns:
+            Dictionary with probes, probes_skipped, reconnects and connection_errors,
+            or an empty dictionary when no pooled connection is open
+        """
+        if isinstance(self.connection, PooledConnection):
+            return self.connection.get_stats()
+        return {}
+
     def initialize_database(self) -> bool:
         """
         Create database and tables if they don't exist
@@ -657,7 +699,8 @@ class DatabaseManager:
             'connected': False,
             'server': self.server if self.enabled else None,
             'database': self.database if self.enabled else None,
-            'record_counts': {}
+            'record_counts': {},
+            'connection_stats': self.get_connection_stats()
         }
 
         if not self.enabled:
@@ -685,6 +728,55 @@ class DatabaseManager:
 
         return status
 
+    def load_metadata_cache(self) -> bool:
+        """
+        Load platform, failure count and last-seen for every device in one query
+
+        Once loaded, get_device_platform() and get_connection_failures() are
+        answered from memory and writes made through this manager keep the
+        cache current.
+
+        Returns:
+            True if the cache was loaded, False otherwise
+        """
+        if not self.enabled or not self.preload_metadata or not self.is_connected():
+            return False
+
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+                SELECT d.device_id, d.device_name, d.platform, d.connection_failures,
+                       d.last_seen, di.ip_address
+                FROM devices d
+                LEFT JOIN device_interfaces di ON d.device_id = di.device_id
+                ORDER BY d.last_seen DESC
+            """)
+            rows = cursor.fetchall()
+            cursor.close()
+
+            self.metadata_cache.load(rows)
+            stats = self.metadata_cache.get_stats()
+            self.logger.info(f"Loaded device metadata cache: {stats['devices']} devices, "
+                             f"{stats['addresses']} addresses")
+            return True
+
+        except pyodbc.Error as e:
+            self.logger.error(f"Error loading device metadata cache: {e}")
+            self.metadata_cache.clear()
+            return False
+
+    def get_metadata_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get device metadata cache counters
+
+        Returns:
+            Dictionary with devices, addresses, lookups, hits, misses, updates
+            and hit_rate, or an empty dictionary when the cache is not loaded
+        """
+        if not self.metadata_cache.loaded:
+            return {}
+        return self.metadata_cache.get_stats()
+
     @staticmethod
     def parse_uptime_to_hours(uptime_str: str) -> Optional[float]:
         """
@@ -765,6 +857,48 @@ class DatabaseManager:
         if not self.enabled or not self.is_connected():
             return None
 
+        device_name = device_info.get('hostname', '')
+        serial_number = device_info.get('serial_number', 'unknown')
+        if not device_name or not serial_number:
+            self.logger.warning("Missing device_name or serial_number, skipping upsert")
+            return None
+
+        try:
+            cursor = self.connection.cursor()
+            result = self._upsert_device_row(cursor, device_info)
+
+            self.connection.commit()
+            cursor.close()
+            if result:
+                self._cache_device_write(device_info)
+            return result
+
+        except pyodbc.Error as e:
+            self.logger.error(f"Error upserting device {device_name}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return None
+
+    def _cache_device_write(self, device_info: Dict[str, Any]):
+        """Apply a committed device upsert to the metadata cache"""
+        if self.metadata_cache.loaded:
+            self.metadata_cache.record_device(
+                device_info.get('hostname', ''),
+                device_info.get('platform', ''),
+                device_info.get('primary_ip') or device_info.get('ip_address')
+            )
+
+    def _upsert_device_row(self, cursor, device_info: Dict[str, Any]) -> Optional[tuple]:
+        """
+        Insert or update device record on an existing cursor without committing
+
+        Args:
+            cursor: Open database cursor
+            device_info: Dictionary with device information
+
+        Returns:
+            Tuple of (device_id, is_new_device), or None if name or serial is missing
+        """
         device_name = device_info.get('hostname', '')
         serial_number = device_info.get('serial_number', 'unknown')
         platform = device_info.get('platform', '')
@@ -788,51 +922,78 @@ class DatabaseManager:
             self.logger.warning("Missing device_name or serial_number, skipping upsert")
             return None
 
-        try:
-            cursor = self.connection.cursor()
+        # First, check if device exists with same name and serial number
+        cursor.execute("""
+            SELECT device_id FROM devices
+            WHERE device_name = ? AND serial_number = ?
+        """, (device_name, serial_number))
 
-            # First, check if device exists with same name and serial number
-            cursor.execute("""
-                SELECT device_id FROM devices
-                WHERE device_name = ? AND serial_number = ?
-            """, (device_name, serial_number))
+        row = cursor.fetchone()
 
-            row = cursor.fetchone()
+        is_new_device = False
+        if row:
+            # Update existing device with same name and serial
+            # Use COALESCE to preserve existing data when new values are empty/null
+            device_id = row[0]
+            cursor.execute("""
+                UPDATE devices
+                SET last_seen = GETDATE(),
+                    platform = COALESCE(NULLIF(?, ''), platform),
+                    hardware_model = COALESCE(NULLIF(?, ''), hardware_model),
+                    capabilities = COALESCE(NULLIF(?, ''), capabilities),
+                    uptime_hours = COALESCE(?, uptime_hours),
+                    uptime_raw = COALESCE(NULLIF(?, ''), uptime_raw),
+                    connection_method = COALESCE(NULLIF(?, ''), connection_method),
+                    updated_at = GETDATE()
+                WHERE device_id = ?
+            """, (platform, hardware_model, capabilities_str, uptime_hours, uptime_raw, connection_method, device_id))
 
-            is_new_device = False
-            if row:
-                # Update existing device with same name and serial
-                # Use COALESCE to preserve existing data when new values are empty/null
-                device_id = row[0]
+            self.logger.debug(f"Updated device: {device_name} (ID: {device_id})")
+        else:
+            # Check if device exists with same name but serial='unknown' (unwalked neighbor)
+            # If we now have a real serial number, update the existing record instead of creating a duplicate
+            if serial_number != 'unknown':
                 cursor.execute("""
-                    UPDATE devices
-                    SET last_seen = GETDATE(),
-                        platform = COALESCE(NULLIF(?, ''), platform),
-                        hardware_model = COALESCE(NULLIF(?, ''), hardware_model),
-                        capabilities = COALESCE(NULLIF(?, ''), capabilities),
-                        uptime_hours = COALESCE(?, uptime_hours),
-                        uptime_raw = COALESCE(NULLIF(?, ''), uptime_raw),
-                        connection_method = COALESCE(NULLIF(?, ''), connection_method),
-                        updated_at = GETDATE()
-                    WHERE device_id = ?
-                """, (platform, hardware_model, capabilities_str, uptime_hours, uptime_raw, connection_method, device_id))
+                    SELECT device_id FROM devices
+                    WHERE device_name = ? AND serial_number = 'unknown'
+                """, (device_name,))
 
-                self.logger.debug(f"Updated device: {device_name} (ID: {device_id})")
-            else:
-                # Check if device exists with same name but serial='unknown' (unwalked neighbor)
-                # If we now have a real serial number, update the existing record instead of creating a duplicate
-                if serial_number != 'unknown':
+                unwalked_row = cursor.fetchone()
+
+                if unwalked_row:
+                    # Update the unwalked neighbor record with real data
+                    # Use COALESCE to preserve any existing data when new values are empty/null
+                    device_id = unwalked_row[0]
                     cursor.execute("""
-                        SELECT device_id FROM devices
-                        WHERE device_name = ? AND serial_number = 'unknown'
+                        UPDATE devices
+                        SET serial_number = ?,
+                            last_seen = GETDATE(),
+                            platform = COALESCE(NULLIF(?, ''), platform),
+                            hardware_model = COALESCE(NULLIF(?, ''), hardware_model),
+                            capabilities = COALESCE(NULLIF(?, ''), capabilities),
+                            uptime_hours = COALESCE(?, uptime_hours),
+                            uptime_raw = COALESCE(NULLIF(?, ''), uptime_raw),
+                            connection_method = COALESCE(NULLIF(?, ''), connection_method),
+                            updated_at = GETDATE()
+                        WHERE device_id = ?
+                    """, (serial_number, platform, hardware_model, capabilities_str, uptime_hours, uptime_raw, connection_method, device_id))
+
+                    self.logger.info(f"Updated unwalked neighbor to walked device: {device_name} (ID: {device_id})")
+                    is_new_device = True  # Count as new since it's now fully walked
+                else:
+                    # Check if device exists with same name but different serial
+                    # (e.g. stack failover changed which member reports as system serial)
+                    cursor.execute("""
+                        SELECT TOP 1 device_id FROM devices
+                        WHERE device_name = ? AND serial_number != 'unknown'
+                        ORDER BY last_seen DESC
                     """, (device_name,))
 
-                    unwalked_row = cursor.fetchone()
+                    existing_row = cursor.fetchone()
 
-                    if unwalked_row:
-                        # Update the unwalked neighbor record with real data
-                        # Use COALESCE to preserve any existing data when new values are empty/null
-                        device_id = unwalked_row[0]
+                    if existing_row:
+                        # Update existing record with new serial (stack failover)
+                        device_id = existing_row[0]
                         cursor.execute("""
                             UPDATE devices
                             SET serial_number = ?,
@@ -847,71 +1008,33 @@ class DatabaseManager:
                             WHERE device_id = ?
                         """, (serial_number, platform, hardware_model, capabilities_str, uptime_hours, uptime_raw, connection_method, device_id))
 
-                        self.logger.info(f"Updated unwalked neighbor to walked device: {device_name} (ID: {device_id})")
-                        is_new_device = True  # Count as new since it's now fully walked
+                        self.logger.info(f"Updated device serial (stack failover): {device_name} (ID: {device_id})")
                     else:
-                        # Check if device exists with same name but different serial
-                        # (e.g. stack failover changed which member reports as system serial)
+                        # Truly new device, insert
                         cursor.execute("""
-                            SELECT TOP 1 device_id FROM devices
-                            WHERE device_name = ? AND serial_number != 'unknown'
-                            ORDER BY last_seen DESC
-                        """, (device_name,))
-
-                        existing_row = cursor.fetchone()
-
-                        if existing_row:
-                            # Update existing record with new serial (stack failover)
-                            device_id = existing_row[0]
-                            cursor.execute("""
-                                UPDATE devices
-                                SET serial_number = ?,
-                                    last_seen = GETDATE(),
-                                    platform = COALESCE(NULLIF(?, ''), platform),
-                                    hardware_model = COALESCE(NULLIF(?, ''), hardware_model),
-                                    capabilities = COALESCE(NULLIF(?, ''), capabilities),
-                                    uptime_hours = COALESCE(?, uptime_hours),
-                                    uptime_raw = COALESCE(NULLIF(?, ''), uptime_raw),
-                                    connection_method = COALESCE(NULLIF(?, ''), connection_method),
-                                    updated_at = GETDATE()
-                                WHERE device_id = ?
-                            """, (serial_number, platform, hardware_model, capabilities_str, uptime_hours, uptime_raw, connection_method, device_id))
-
-                            self.logger.info(f"Updated device serial (stack failover): {device_name} (ID: {device_id})")
-                        else:
-                            # Truly new device, insert
-                            cursor.execute("""
-                                INSERT INTO devices (device_name, serial_number, platform, hardware_model, capabilities, uptime_hours, uptime_raw, connection_method)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (device_name, serial_number, platform, hardware_model, capabilities_str, uptime_hours, uptime_raw, connection_method or None))
-
-                            cursor.execute("SELECT @@IDENTITY")
-                            device_id = cursor.fetchone()[0]
-
-                            self.logger.info(f"Created new device: {device_name} (ID: {device_id})")
-                            is_new_device = True
-                else:
-                    # serial_number is 'unknown', just insert as unwalked neighbor
-                    cursor.execute("""
-                        INSERT INTO devices (device_name, serial_number, platform, hardware_model, capabilities)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (device_name, serial_number, platform, hardware_model, capabilities_str))
+                            INSERT INTO devices (device_name, serial_number, platform, hardware_model, capabilities, uptime_hours, uptime_raw, connection_method)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """, (device_name, serial_number, platform, hardware_model, capabilities_str, uptime_hours, uptime_raw, connection_method or None))
 
-                    cursor.execute("SELECT @@IDENTITY")
-                    device_id = cursor.fetchone()[0]
+                        cursor.execute("SELECT @@IDENTITY")
+                        device_id = cursor.fetchone()[0]
 
-                    self.logger.info(f"Created new unwalked neighbor: {device_name} (ID: {device_id})")
-                    is_new_device = False  # Don't count unwalked neighbors as new devices
+                        self.logger.info(f"Created new device: {device_name} (ID: {device_id})")
+                        is_new_device = True
+            else:
+                # serial_number is 'unknown', just insert as unwalked neighbor
+                cursor.execute("""
+                    INSERT INTO devices (device_name, serial_number, platform, hardware_model, capabilities)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (device_name, serial_number, platform, hardware_model, capabilities_str))
 
-            self.connection.commit()
-            cursor.close()
-            return (device_id, is_new_device)
+                cursor.execute("SELECT @@IDENTITY")
+                device_id = cursor.fetchone()[0]
 
-        except pyodbc.Error as e:
-            self.logger.error(f"Error upserting device {device_name}: {e}")
-            if self.connection:
-                self.connection.rollback()
-            return None
+                self.logger.info(f"Created new unwalked neighbor: {device_name} (ID: {device_id})")
+                is_new_device = False  # Don't count unwalked neighbors as new devices
+
+        return (device_id, is_new_device)
 
     def upsert_device_version(self, device_id: int, software_version: str) -> bool:
         """
@@ -1255,6 +1378,9 @@ class DatabaseManager:
         if not self.enabled or not self.is_connected():
             return (False, False)
 
+        if self.batch_writes:
+            return self._process_device_discovery_batched(device_info)
+
         try:
             # Upsert device
             result = self.upsert_device(device_info)
@@ -1349,6 +1475,781 @@ class DatabaseManager:
             self.logger.error(f"Error processing device discovery: {e}")
             return (False, False)
 
+    def _process_device_discovery_batched(self, device_info: Dict[str, Any]) -> tuple:
+        """
+        Persist a discovered device in a single transaction
+
+        Interfaces, VLANs, stack members and neighbor links are staged into
+        temp tables with fast_executemany and applied with one MERGE per set,
+        instead of a SELECT-then-UPDATE/INSERT and commit per row. Each child
+        section runs behind a savepoint, so a bad row (such as a VLAN name too
+        long for its column) drops only that section and the device row is
+        still committed.
+
+        Args:
+            device_info: Complete device information dictionary
+
+        Returns:
+            Tuple of (success, is_new_device)
+        """
+        device_name = device_info.get('hostname', '')
+
+        # Neighbor placeholders are created and committed by hostname resolution,
+        # so resolve them before the device transaction starts
+        neighbor_links = self._resolve_neighbor_links(device_info.get('neighbors', []))
+
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            cursor.fast_executemany = True
+
+            result = self._upsert_device_row(cursor, device_info)
+            if not result:
+                self.connection.rollback()
+                return (False, False)
+
+            device_id, is_new_device = result
+
+            software_version = device_info.get('software_version', '')
+            if software_version and software_version != 'unknown':
+                self._merge_section(cursor, 'nw_versions', device_name, self._merge_device_version,
+                                    device_id, software_version)
+
+            interface_rows = self._collect_interface_rows(device_info, device_id)
+            if interface_rows:
+                self._merge_section(cursor, 'nw_interfaces', device_name, self._merge_device_interfaces,
+                                    device_id, interface_rows)
+
+            vlan_rows = self._collect_vlan_rows(device_info.get('vlans', []))
+            if vlan_rows:
+                self._merge_section(cursor, 'nw_vlans', device_name, self._merge_device_vlans,
+                                    device_id, vlan_rows)
+
+            stack_rows = self._collect_stack_member_rows(device_info.get('stack_members', []))
+            if stack_rows and self._merge_section(cursor, 'nw_stack', device_name, self._merge_stack_members,
+                                                  device_id, stack_rows):
+                self.logger.info(f"Stored {len(stack_rows)} stack members for device {device_id}")
+
+            if neighbor_links:
+                link_count = self._merge_section(cursor, 'nw_neighbors', device_name, self._merge_device_neighbors,
+                                                 device_id, neighbor_links)
+                if link_count is not False:
+                    self.logger.info(f"Stored {link_count} neighbors for device {device_id}")
+
+            self.connection.commit()
+            self._cache_device_write(device_info)
+            self.logger.debug(f"Batched discovery write complete for {device_name} (ID: {device_id}): "
+                              f"{len(interface_rows)} interfaces, {len(vlan_rows)} VLANs, "
+                              f"{len(stack_rows)} stack members, {len(neighbor_links)} neighbors")
+            return (True, is_new_device)
+
+        except Exception as e:
+            self.logger.error(f"Error processing device discovery for {device_name}: {e}")
+            if self.connection:
+                try:
+                    self.connection.rollback()
+                except pyodbc.Error:
+                    pass
+            return (False, False)
+        finally:
+            if cursor:
+                cursor.close()
+
+    def _merge_section(self, cursor, savepoint: str, device_name: str, merge, *args):
+        """
+        Run one child MERGE of a device write behind a savepoint
+
+        Args:
+            cursor: Cursor of the open device transaction
+            savepoint: Savepoint name for this section
+            device_name: Device hostname (for logging)
+            merge: Merge method, called as merge(cursor, *args)
+
+        Returns:
+            The merge method's result (True if it returns None), or False if
+            the section failed and was rolled back to the savepoint
+        """
+        cursor.execute(f"SAVE TRANSACTION {savepoint}")
+        try:
+            result = merge(cursor, *args)
+            return True if result is None else result
+        except pyodbc.Error as e:
+            self.logger.warning(f"Could not store {savepoint[3:]} for {device_name}, keeping the device row: {e}")
+            cursor.execute(f"ROLLBACK TRANSACTION {savepoint}")
+            return False
+
+    def _merge_device_version(self, cursor, device_id: int, software_version: str):
+        """Record the device's software version"""
+        cursor.execute("""
+            MERGE device_versions AS t
+            USING (SELECT ? AS device_id, ? AS software_version) AS s
+            ON t.device_id = s.device_id AND t.software_version = s.software_version
+            WHEN MATCHED THEN
+                UPDATE SET last_seen = GETDATE(), updated_at = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT (device_id, software_version) VALUES (s.device_id, s.software_version);
+        """, (device_id, software_version))
+
+    def _collect_interface_rows(self, device_info: Dict[str, Any], device_id: int) -> List[tuple]:
+        """
+        Build (interface_name, ip_address, subnet_mask, interface_type) rows, primary IP first
+
+        Args:
+            device_info: Complete device information dictionary
+            device_id: Device ID (for logging)
+
+        Returns:
+            De-duplicated interface rows
+        """
+        rows: Dict[Tuple[str, str], tuple] = {}
+
+        primary_ip = device_info.get('primary_ip')
+        if primary_ip:
+            try:
+                ipaddress.ip_address(primary_ip)
+                rows[('Primary Management', primary_ip)] = ('Primary Management', primary_ip, '', 'management')
+            except (ValueError, AttributeError) as e:
+                self.logger.warning(
+                    "Invalid IP address format for primary_ip '%s' on device_id %s: %s",
+                    primary_ip, device_id, e
+                )
+
+        for interface in device_info.get('interfaces', []):
+            interface_name = interface.get('interface_name', '')
+            ip_address = interface.get('ip_address', '')
+            if not interface_name or not ip_address:
+                continue
+            rows[(interface_name, ip_address)] = (
+                interface_name, ip_address,
+                interface.get('subnet_mask', ''), interface.get('interface_type', '')
+            )
+
+        return list(rows.values())
+
+    def _collect_vlan_rows(self, vlans: List[Any]) -> List[tuple]:
+        """
+        Build (vlan_number, vlan_name, port_count) rows, one per VLAN number
+
+        Args:
+            vlans: List of VLANInfo objects or dicts
+
+        Returns:
+            Valid VLAN rows
+        """
+        rows: Dict[int, tuple] = {}
+        for vlan in vlans:
+            vlan_number = vlan.get('vlan_id') if hasattr(vlan, 'get') else getattr(vlan, 'vlan_id', 0)
+            vlan_name = vlan.get('vlan_name') if hasattr(vlan, 'get') else getattr(vlan, 'vlan_name', '')
+            port_count = vlan.get('port_count', 0) if hasattr(vlan, 'get') else getattr(vlan, 'port_count', 0)
+
+            if vlan_number and vlan_name and 1 <= vlan_number <= 4094:
+                rows[vlan_number] = (vlan_number, vlan_name, port_count or 0)
+
+        return list(rows.values())
+
+    def _collect_stack_member_rows(self, stack_members: List[Any]) -> List[tuple]:
+        """
+        Build stack member rows, one per switch number
+
+        Args:
+            stack_members: List of StackMemberInfo objects or dicts
+
+        Returns:
+            Rows of (switch_number, role, priority, hardware_model, serial_number,
+            mac_address, software_version, state)
+        """
+        fields = ('switch_number', 'role', 'priority', 'hardware_model', 'serial_number',
+                  'mac_address', 'software_version', 'state')
+        rows: Dict[Any, tuple] = {}
+        for member in stack_members:
+            if hasattr(member, 'get'):
+                row = tuple(member.get(field) for field in fields)
+            else:
+                row = tuple(getattr(member, field, None) for field in fields)
+            rows[row[0]] = row
+
+        return list(rows.values())
+
+    def _get_protocol_parser(self):
+        """Get the ProtocolParser shared by placeholder platform parsing"""
+        if self._protocol_parser is None:
+            from netwalker.discovery.protocol_parser import ProtocolParser
+            self._protocol_parser = ProtocolParser()
+        return self._protocol_parser
+
+    def _resolve_neighbor_links(self, neighbors: List[Any]) -> List[tuple]:
+        """
+        Resolve neighbors to (local_interface, dest_device_id, remote_interface, protocol) links
+
+        Args:
+            neighbors: List of NeighborInfo objects
+
+        Returns:
+            Links for neighbors whose hostname resolved to a device
+        """
+        if not neighbors:
+            return []
+
+        device_ids = self.resolve_neighbor_device_ids(neighbors)
+
+        links = []
+        for neighbor in neighbors:
+            neighbor_hostname = neighbor.device_id if hasattr(neighbor, 'device_id') else str(neighbor)
+            dest_device_id = device_ids.get(self._neighbor_name_key(neighbor_hostname))
+            if not dest_device_id:
+                self.logger.warning(f"Could not resolve neighbor hostname: {neighbor_hostname}")
+                continue
+
+            local_interface = neighbor.local_interface if hasattr(neighbor, 'local_interface') else 'Unknown'
+            remote_interface = neighbor.remote_interface if hasattr(neighbor, 'remote_interface') else 'Unknown'
+            protocol = neighbor.protocol if hasattr(neighbor, 'protocol') else 'CDP'
+
+            links.append((
+                normalize_interface_name(local_interface),
+                dest_device_id,
+                normalize_interface_name(remote_interface),
+                protocol
+            ))
+
+        return links
+
+    @staticmethod
+    def _neighbor_name_key(hostname: str) -> str:
+        """Key a neighbor hostname the way device_name matching sees it (short, case-insensitive)"""
+        short_hostname = hostname.split('.')[0] if '.' in hostname else hostname
+        return short_hostname.lower()
+
+    def resolve_neighbor_device_ids(self, neighbors: List[Any]) -> Dict[str, int]:
+        """
+        Resolve all neighbor hostnames to device_ids, creating placeholders for unwalked neighbors
+
+        Existing devices are looked up with one query per chunk of hostnames and
+        missing neighbors are inserted together, so the number of round trips
+        does not grow with the number of neighbors.
+
+        Args:
+            neighbors: List of NeighborInfo objects
+
+        Returns:
+            Dictionary mapping lower-case short hostname to device_id
+        """
+        if not self.enabled or not self.is_connected():
+            return {}
+
+        # First occurrence of each hostname supplies the placeholder platform/capabilities
+        pending: Dict[str, tuple] = {}
+        for neighbor in neighbors:
+            hostname = neighbor.device_id if hasattr(neighbor, 'device_id') else str(neighbor)
+            if not hostname:
+                continue
+            key = self._neighbor_name_key(hostname)
+            if key not in pending:
+                pending[key] = (
+                    hostname,
+                    neighbor.capabilities if hasattr(neighbor, 'capabilities') else [],
+                    neighbor.platform if hasattr(neighbor, 'platform') else None
+                )
+
+        if not pending:
+            return {}
+
+        device_ids: Dict[str, int] = {}
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+
+            short_names = [hostname.split('.')[0] for hostname, _, _ in pending.values()]
+            for i in range(0, len(short_names), self.MAX_QUERY_PARAMETERS):
+                chunk = short_names[i:i + self.MAX_QUERY_PARAMETERS]
+                placeholders = ', '.join('?' for _ in chunk)
+                # Newest device wins when a name is duplicated, as in resolve_hostname_to_device_id
+                cursor.execute(f"""
+                    SELECT device_name, device_id
+                    FROM devices
+                    WHERE device_name IN ({placeholders})
+                    ORDER BY last_seen DESC
+                """, tuple(chunk))
+                for device_name, device_id in cursor.fetchall():
+                    device_ids.setdefault(device_name.lower(), device_id)
+
+            for key, (hostname, _, platform) in pending.items():
+                if key in device_ids and self._is_refreshable_platform(platform):
+                    self._refresh_device_from_neighbor_platform(cursor, device_ids[key], hostname, platform)
+
+            missing = [key for key in pending if key not in device_ids]
+            if missing:
+                device_ids.update(self._insert_placeholder_devices(
+                    cursor, [pending[key] for key in missing]
+                ))
+                self.connection.commit()
+
+            cursor.close()
+            return device_ids
+
+        except pyodbc.Error as e:
+            self.logger.error(f"Error resolving {len(pending)} neighbor hostnames: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return device_ids
+
+    def _insert_placeholder_devices(self, cursor, neighbors: List[tuple]) -> Dict[str, int]:
+        """
+        Insert placeholder devices for unwalked neighbors without committing
+
+        Args:
+            cursor: Open database cursor
+            neighbors: (hostname, capabilities, platform) tuples not yet in devices
+
+        Returns:
+            Dictionary mapping lower-case short hostname to the new device_id
+        """
+        rows = []
+        versions = {}
+        for hostname, capabilities, platform in neighbors:
+            short_hostname = hostname.split('.')[0] if '.' in hostname else hostname
+            (parsed_platform, parsed_model, parsed_serial,
+             capabilities_str, axis_version) = self._placeholder_device_fields(platform, capabilities)
+            rows.append((short_hostname, parsed_serial, parsed_platform, parsed_model, capabilities_str, 'active'))
+            if axis_version:
+                versions[short_hostname.lower()] = axis_version
+
+        device_ids: Dict[str, int] = {}
+        chunk_size = self.MAX_QUERY_PARAMETERS // len(rows[0])
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            values = ', '.join('(?, ?, ?, ?, ?, ?)' for _ in chunk)
+            cursor.execute(f"""
+                INSERT INTO devices (device_name, serial_number, platform, hardware_model, capabilities, status)
+                OUTPUT inserted.device_name, inserted.device_id
+                VALUES {values}
+            """, tuple(value for row in chunk for value in row))
+            for device_name, device_id in cursor.fetchall():
+                device_ids[device_name.lower()] = device_id
+
+        # Insert versions parsed from Axis camera platform strings
+        version_rows = [(device_ids[key], version) for key, version in versions.items() if key in device_ids]
+        if version_rows:
+            cursor.executemany("""
+                INSERT INTO device_versions (device_id, software_version)
+                VALUES (?, ?)
+            """, version_rows)
+
+        if self.metadata_cache.loaded:
+            for short_hostname, _, parsed_platform, _, _, _ in rows:
+                self.metadata_cache.record_device(short_hostname, parsed_platform)
+
+        self.logger.info(f"Created {len(device_ids)} placeholder devices for unwalked neighbors")
+        return device_ids
+
+    def _stage_rows(self, cursor, table: str, columns: str, rows: List[tuple]):
+        """
+        (Re)create a session temp table and bulk load rows into it
+
+        Args:
+            cursor: Open database cursor with fast_executemany enabled
+            table: Temp table name (including the leading #)
+            columns: Column definitions for CREATE TABLE
+            rows: Rows to insert
+        """
+        cursor.execute(f"""
+            IF OBJECT_ID('tempdb..{table}') IS NOT NULL DROP TABLE {table};
+            CREATE TABLE {table} ({columns});
+        """)
+        placeholders = ', '.join('?' for _ in rows[0])
+        cursor.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+
+    def _merge_device_interfaces(self, cursor, device_id: int, rows: List[tuple]):
+        """Apply staged interface rows to device_interfaces"""
+        self._stage_rows(cursor, '#nw_stage_interfaces', """
+            interface_name NVARCHAR(100) NOT NULL,
+            ip_address NVARCHAR(50) NOT NULL,
+            subnet_mask NVARCHAR(50) NULL,
+            interface_type NVARCHAR(50) NULL
+        """, rows)
+        cursor.execute("""
+            MERGE device_interfaces AS t
+            USING #nw_stage_interfaces AS s
+            ON t.device_id = ? AND t.interface_name = s.interface_name AND t.ip_address = s.ip_address
+            WHEN MATCHED THEN
+                UPDATE SET last_seen = GETDATE(), subnet_mask = s.subnet_mask,
+                           interface_type = s.interface_type, updated_at = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT (device_id, interface_name, ip_address, subnet_mask, interface_type)
+                VALUES (?, s.interface_name, s.ip_address, s.subnet_mask, s.interface_type);
+        """, (device_id, device_id))
+
+    def _merge_device_vlans(self, cursor, device_id: int, rows: List[tuple]):
+        """Apply staged VLAN rows to vlans and device_vlans"""
+        self._stage_rows(cursor, '#nw_stage_vlans', """
+            vlan_number INT NOT NULL,
+            vlan_name NVARCHAR(255) NOT NULL,
+            port_count INT NULL
+        """, rows)
+        cursor.execute("""
+            MERGE vlans AS t
+            USING (SELECT DISTINCT vlan_number, vlan_name FROM #nw_stage_vlans) AS s
+            ON t.vlan_number = s.vlan_number AND t.vlan_name = s.vlan_name
+            WHEN MATCHED THEN
+                UPDATE SET last_seen = GETDATE(), updated_at = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT (vlan_number, vlan_name) VALUES (s.vlan_number, s.vlan_name);
+
+            -- VLAN renamed on this device: drop the old link so a new one is created
+            DELETE dv FROM device_vlans dv
+            JOIN #nw_stage_vlans s ON dv.vlan_number = s.vlan_number
+            WHERE dv.device_id = ? AND dv.vlan_name <> s.vlan_name;
+
+            MERGE device_vlans AS t
+            USING (
+                SELECT v.vlan_id, s.vlan_number, s.vlan_name, s.port_count
+                FROM #nw_stage_vlans s
+                JOIN vlans v ON v.vlan_number = s.vlan_number AND v.vlan_name = s.vlan_name
+            ) AS s
+            ON t.device_id = ? AND t.vlan_number = s.vlan_number
+            WHEN MATCHED THEN
+                UPDATE SET last_seen = GETDATE(), port_count = s.port_count, updated_at = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT (device_id, vlan_id, vlan_number, vlan_name, port_count)
+                VALUES (?, s.vlan_id, s.vlan_number, s.vlan_name, s.port_count);
+        """, (device_id, device_id, device_id))
+
+    def _merge_stack_members(self, cursor, device_id: int, rows: List[tuple]):
+        """Apply staged stack member rows to device_stack_members"""
+        self._stage_rows(cursor, '#nw_stage_stack', """
+            switch_number INT NOT NULL,
+            role NVARCHAR(20) NULL,
+            priority INT NULL,
+            hardware_model NVARCHAR(100) NULL,
+            serial_number NVARCHAR(100) NOT NULL,
+            mac_address NVARCHAR(20) NULL,
+            software_version NVARCHAR(100) NULL,
+            state NVARCHAR(20) NULL
+        """, rows)
+        cursor.execute("""
+            MERGE device_stack_members AS t
+            USING #nw_stage_stack AS s
+            ON t.device_id = ? AND t.switch_number = s.switch_number
+            WHEN MATCHED THEN
+                UPDATE SET role = s.role, priority = s.priority, hardware_model = s.hardware_model,
+                           serial_number = s.serial_number, mac_address = s.mac_address,
+                           software_version = s.software_version, state = s.state,
+                           last_seen = GETDATE(), updated_at = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT (device_id, switch_number, role, priority, hardware_model, serial_number,
+                        mac_address, software_version, state)
+                VALUES (?, s.switch_number, s.role, s.priority, s.hardware_model, s.serial_number,
+                        s.mac_address, s.software_version, s.state);
+        """, (device_id, device_id))
+
+    def _merge_device_neighbors(self, cursor, device_id: int, links: List[tuple]) -> int:
+        """
+        Apply neighbor links to device_neighbors
+
+        An existing reverse link (dest->source) is refreshed in place; otherwise
+        the link is upserted with the lower device_id as source, as chosen by
+        get_consistent_direction.
+
+        Args:
+            cursor: Open database cursor with fast_executemany enabled
+            device_id: Source device ID
+            links: (local_interface, dest_device_id, remote_interface, protocol) tuples
+
+        Returns:
+            Number of distinct links written
+        """
+        rows: Dict[tuple, tuple] = {}
+        for local_if, dest_id, remote_if, protocol in links:
+            src_id, src_if, dst_id, dst_if = self.get_consistent_direction(device_id, local_if, dest_id, remote_if)
+            rows[(src_id, src_if, dst_id, dst_if)] = (
+                local_if, dest_id, remote_if, protocol, src_id, src_if, dst_id, dst_if
+            )
+        staged = list(rows.values())
+
+        self._stage_rows(cursor, '#nw_stage_neighbors', """
+            local_interface NVARCHAR(100) NOT NULL,
+            dest_device_id INT NOT NULL,
+            remote_interface NVARCHAR(100) NOT NULL,
+            protocol NVARCHAR(10) NOT NULL,
+            src_id INT NOT NULL,
+            src_if NVARCHAR(100) NOT NULL,
+            dst_id INT NOT NULL,
+            dst_if NVARCHAR(100) NOT NULL
+        """, staged)
+        cursor.execute("""
+            -- Refresh links already stored in the reverse direction
+            UPDATE dn SET last_seen = GETDATE(), protocol = s.protocol, updated_at = GETDATE()
+            FROM device_neighbors dn
+            JOIN #nw_stage_neighbors s
+              ON dn.source_device_id = s.dest_device_id AND dn.source_interface = s.remote_interface
+             AND dn.destination_device_id = ? AND dn.destination_interface = s.local_interface;
+
+            MERGE device_neighbors AS t
+            USING (
+                SELECT s.* FROM #nw_stage_neighbors s
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM device_neighbors r
+                    WHERE r.source_device_id = s.dest_device_id AND r.source_interface = s.remote_interface
+                      AND r.destination_device_id = ? AND r.destination_interface = s.local_interface
+                )
+            ) AS s
+            ON t.source_device_id = s.src_id AND t.source_interface = s.src_if
+               AND t.destination_device_id = s.dst_id AND t.destination_interface = s.dst_if
+            WHEN MATCHED THEN
+                UPDATE SET last_seen = GETDATE(), protocol = s.protocol, updated_at = GETDATE()
+            WHEN NOT MATCHED THEN
+                INSERT (source_device_id, source_interface, destination_device_id,
+                        destination_interface, protocol)
+                VALUES (s.src_id, s.src_if, s.dst_id, s.dst_if, s.protocol);
+        """, (device_id, device_id))
+
+        return len(staged)
+
+    @staticmethod
+    def _is_refreshable_platform(platform: Optional[str]) -> bool:
+        """
+        Check if a neighbor platform string carries details worth writing back to an existing device
+
+        Args:
+            platform: Neighbor platform string from CDP/LLDP
+
+        Returns:
+            True for the platform families handled by _refresh_device_from_neighbor_platform
+        """
+        if not platform or platform == 'Unknown':
+            return False
+        return ('Aruba AP' in platform or 'AOS-' in platform
+                or 'SG300' in platform or 'SG200' in platform or 'SG500' in platform or '|' in platform
+                or platform.upper().startswith('AXIS')
+                or 'Nutanix' in platform
+                or 'Cisco ATA' in platform or ('ATA' in platform and any(char.isdigit() for char in platform)))
+
+    def _refresh_device_from_neighbor_platform(self, cursor, device_id: int, hostname: str,
+                                               platform: Optional[str]):
+        """
+        Update an existing device with model/serial/platform details parsed from a neighbor platform string
+
+        Args:
+            cursor: Open database cursor
+            device_id: Existing device ID
+            hostname: Neighbor hostname (for logging)
+            platform: Neighbor platform string from CDP/LLDP
+        """
+        # Update device information if new data is available from CDP/LLDP
+        if platform and platform != 'Unknown':
+            # Get current device data
+            cursor.execute("""
+                SELECT platform, hardware_model, serial_number 
+                FROM devices 
+                WHERE device_id = ?
+            """, (device_id,))
+            current_row = cursor.fetchone()
+            current_platform = current_row[0] if current_row else None
+            current_model = current_row[1] if current_row else None
+            current_serial = current_row[2] if current_row else None
+
+            # Check if this is an Aruba AP - always parse and update if data has changed
+            if 'Aruba AP' in platform or 'AOS-' in platform:
+                parser = self._get_protocol_parser()
+                aruba_data = parser.parse_aruba_platform_string(platform)
+
+                # Build update query for changed fields
+                update_fields = []
+                update_values = []
+
+                # Update platform if different
+                if aruba_data['platform'] != current_platform:
+                    update_fields.append("platform = ?")
+                    update_values.append(aruba_data['platform'])
+
+                # Update model if we have new data and it's different
+                if aruba_data['model'] and aruba_data['model'] != current_model:
+                    update_fields.append("hardware_model = ?")
+                    update_values.append(aruba_data['model'])
+
+                # Update serial if we have new data and it's different
+                if aruba_data['serial'] and aruba_data['serial'] != current_serial:
+                    update_fields.append("serial_number = ?")
+                    update_values.append(aruba_data['serial'])
+
+                # Execute update if any fields changed
+                if update_fields:
+                    update_fields.append("updated_at = GETDATE()")
+                    update_values.append(device_id)
+
+                    cursor.execute(f"""
+                        UPDATE devices
+                        SET {', '.join(update_fields)}
+                        WHERE device_id = ?
+                    """, tuple(update_values))
+                    self.connection.commit()
+                    self.logger.info(f"Updated Aruba device '{hostname}' (ID: {device_id}): platform={aruba_data['platform']}, model={aruba_data.get('model')}, serial={aruba_data.get('serial')}")
+
+            # Check if this is a Cisco SG300/SG200/SG500 device - parse and update
+            elif 'SG300' in platform or 'SG200' in platform or 'SG500' in platform or '|' in platform:
+                # Check if it's actually an SG device (not Axis or other delimited format)
+                if not platform.upper().startswith('AXIS') and not platform.upper().startswith('BACH'):
+                    parser = self._get_protocol_parser()
+                    sg_data = parser.parse_sg300_platform_string(platform)
+
+                    # Build update query for changed fields
+                    update_fields = []
+                    update_values = []
+
+                    # Update platform if different
+                    if sg_data['platform'] != current_platform:
+                        update_fields.append("platform = ?")
+                        update_values.append(sg_data['platform'])
+
+                    # Update model if we have new data and it's different
+                    if sg_data['model'] and sg_data['model'] != current_model:
+                        update_fields.append("hardware_model = ?")
+                        update_values.append(sg_data['model'])
+
+                    # Execute update if there are changes
+                    if update_fields:
+                        update_fields.append("updated_at = GETDATE()")
+                        update_values.append(device_id)
+
+                        cursor.execute(f"""
+                            UPDATE devices
+                            SET {', '.join(update_fields)}
+                            WHERE device_id = ?
+                        """, tuple(update_values))
+                        self.connection.commit()
+                        self.logger.info(f"Updated SG300 device '{hostname}' (ID: {device_id}): platform={sg_data['platform']}, model={sg_data.get('model')}")
+
+            # Check if this is an Axis camera - always parse and update if data has changed
+            elif platform.upper() == 'AXIS' or '|' in platform or (platform.upper().startswith('AXIS') and 'AXIS' in platform):
+                parser = self._get_protocol_parser()
+                axis_data = parser.parse_axis_platform_string(platform)
+
+                # Build update query for changed fields
+                update_fields = []
+                update_values = []
+
+                # Update platform if different
+                if axis_data['platform'] != current_platform:
+                    update_fields.append("platform = ?")
+                    update_values.append(axis_data['platform'])
+
+                # Update model if we have new data and it's different
+                if axis_data['model'] and axis_data['model'] != current_model:
+                    update_fields.append("hardware_model = ?")
+                    update_values.append(axis_data['model'])
+
+                # Add camera capability if not present
+                # Get current capabilities
+                cursor.execute("SELECT capabilities FROM devices WHERE device_id = ?", (device_id,))
+                cap_row = cursor.fetchone()
+                current_caps = cap_row[0] if cap_row and cap_row[0] else ''
+                if 'camera' not in current_caps.lower():
+                    new_caps = f"{current_caps},camera" if current_caps else "camera"
+                    update_fields.append("capabilities = ?")
+                    update_values.append(new_caps)
+
+                # Execute update if any fields changed
+                if update_fields:
+                    update_fields.append("updated_at = GETDATE()")
+                    update_values.append(device_id)
+
+                    cursor.execute(f"""
+                        UPDATE devices
+                        SET {', '.join(update_fields)}
+                        WHERE device_id = ?
+                    """, tuple(update_values))
+                    self.connection.commit()
+                    self.logger.info(f"Updated Axis camera '{hostname}' (ID: {device_id}): platform={axis_data['platform']}, model={axis_data.get('model')}")
+
+                # Update version if we have one
+                if axis_data.get('version'):
+                    self.upsert_device_version(device_id, axis_data['version'])
+                    self.logger.info(f"Updated Axis camera '{hostname}' (ID: {device_id}): platform={axis_data['platform']}, model={axis_data.get('model')}")
+
+            # Update Nutanix devices if current platform is generic
+            elif current_platform in ('Linux', 'Unknown', None) and 'Nutanix' in platform:
+                cursor.execute("""
+                    UPDATE devices
+                    SET platform = ?, updated_at = GETDATE()
+                    WHERE device_id = ?
+                """, (platform, device_id))
+                self.connection.commit()
+                self.logger.info(f"Updated platform for device '{hostname}' (ID: {device_id}) from '{current_platform}' to '{platform}'")
+
+            # Update Cisco ATA devices if current platform is generic
+            elif current_platform in ('Unknown', None) and ('Cisco ATA' in platform or ('ATA' in platform and any(char.isdigit() for char in platform))):
+                cursor.execute("""
+                    UPDATE devices
+                    SET platform = ?, updated_at = GETDATE()
+                    WHERE device_id = ?
+                """, (platform, device_id))
+                self.connection.commit()
+                self.logger.info(f"Updated platform for device '{hostname}' (ID: {device_id}) from '{current_platform}' to '{platform}'")
+
+    def _placeholder_device_fields(self, platform: Optional[str],
+                                   capabilities: Optional[List[str]]) -> tuple:
+        """
+        Derive device columns for an unwalked neighbor placeholder from CDP/LLDP data
+
+        Args:
+            platform: Neighbor platform string
+            capabilities: Neighbor capabilities
+
+        Returns:
+            Tuple of (platform, hardware_model, serial_number, capabilities_str, version)
+            where version is only set for Axis cameras
+        """
+        capabilities = list(capabilities) if capabilities else []
+        axis_version = None
+
+        # Parse Aruba platform strings to extract model and serial
+        parsed_platform = platform if platform else 'Unknown'
+        parsed_model = 'Unwalked Neighbor'
+        parsed_serial = 'unknown'
+
+        # Check if this is an Aruba AP with detailed platform string
+        if platform and ('Aruba AP' in platform or 'AOS-' in platform):
+            parser = self._get_protocol_parser()
+            aruba_data = parser.parse_aruba_platform_string(platform)
+            parsed_platform = aruba_data['platform']
+            if aruba_data['model']:
+                parsed_model = aruba_data['model']
+            if aruba_data['serial']:
+                parsed_serial = aruba_data['serial']
+            self.logger.info(f"Parsed Aruba device: platform={parsed_platform}, model={parsed_model}, serial={parsed_serial}")
+
+        # Check if this is a Cisco SG300/SG200/SG500 device
+        elif platform and ('SG300' in platform or 'SG200' in platform or 'SG500' in platform or '|' in platform):
+            # Check if it's actually an SG device (not Axis or other delimited format)
+            if not platform.upper().startswith('AXIS') and not platform.upper().startswith('BACH'):
+                parser = self._get_protocol_parser()
+                sg_data = parser.parse_sg300_platform_string(platform)
+                parsed_platform = sg_data['platform']
+                if sg_data['model']:
+                    parsed_model = sg_data['model']
+                self.logger.info(f"Parsed SG300 device: platform={parsed_platform}, model={parsed_model}")
+
+        # Check if this is an Axis camera
+        elif platform and (platform.upper() == 'AXIS' or '|' in platform):
+            parser = self._get_protocol_parser()
+            axis_data = parser.parse_axis_platform_string(platform)
+            parsed_platform = axis_data['platform']
+            if axis_data['model']:
+                parsed_model = axis_data['model']
+            # Store version for later insertion
+            axis_version = axis_data.get('version')
+            # Add camera capability
+            if capabilities:
+                if 'camera' not in [c.lower() for c in capabilities]:
+                    capabilities.append('camera')
+            else:
+                capabilities = ['camera']
+            self.logger.info(f"Parsed Axis camera: platform={parsed_platform}, model={parsed_model}, version={axis_version}")
+
+        # Convert capabilities list to comma-separated string
+        capabilities_str = ','.join(capabilities) if capabilities else None
+
+        return parsed_platform, parsed_model, parsed_serial, capabilities_str, axis_version
+
     def resolve_hostname_to_device_id(self, hostname: str, create_if_missing: bool = False,
                                       capabilities: List[str] = None, platform: str = None) -> Optional[int]:
         """
@@ -1389,159 +2290,7 @@ class DatabaseManager:
             if row:
                 device_id = row[0]
                 
-                # Update device information if new data is available from CDP/LLDP
-                if platform and platform != 'Unknown':
-                    # Get current device data
-                    cursor.execute("""
-                        SELECT platform, hardware_model, serial_number 
-                        FROM devices 
-                        WHERE device_id = ?
-                    """, (device_id,))
-                    current_row = cursor.fetchone()
-                    current_platform = current_row[0] if current_row else None
-                    current_model = current_row[1] if current_row else None
-                    current_serial = current_row[2] if current_row else None
-                    
-                    # Check if this is an Aruba AP - always parse and update if data has changed
-                    if 'Aruba AP' in platform or 'AOS-' in platform:
-                        from netwalker.discovery.protocol_parser import ProtocolParser
-                        parser = ProtocolParser()
-                        aruba_data = parser.parse_aruba_platform_string(platform)
-                        
-                        # Build update query for changed fields
-                        update_fields = []
-                        update_values = []
-                        
-                        # Update platform if different
-                        if aruba_data['platform'] != current_platform:
-                            update_fields.append("platform = ?")
-                            update_values.append(aruba_data['platform'])
-                        
-                        # Update model if we have new data and it's different
-                        if aruba_data['model'] and aruba_data['model'] != current_model:
-                            update_fields.append("hardware_model = ?")
-                            update_values.append(aruba_data['model'])
-                        
-                        # Update serial if we have new data and it's different
-                        if aruba_data['serial'] and aruba_data['serial'] != current_serial:
-                            update_fields.append("serial_number = ?")
-                            update_values.append(aruba_data['serial'])
-                        
-                        # Execute update if any fields changed
-                        if update_fields:
-                            update_fields.append("updated_at = GETDATE()")
-                            update_values.append(device_id)
-                            
-                            cursor.execute(f"""
-                                UPDATE devices
-                                SET {', '.join(update_fields)}
-                                WHERE device_id = ?
-                            """, tuple(update_values))
-                            self.connection.commit()
-                            self.logger.info(f"Updated Aruba device '{hostname}' (ID: {device_id}): platform={aruba_data['platform']}, model={aruba_data.get('model')}, serial={aruba_data.get('serial')}")
-                    
-                    # Check if this is a Cisco SG300/SG200/SG500 device - parse and update
-                    elif 'SG300' in platform or 'SG200' in platform or 'SG500' in platform or '|' in platform:
-                        # Check if it's actually an SG device (not Axis or other delimited format)
-                        if not platform.upper().startswith('AXIS') and not platform.upper().startswith('BACH'):
-                            from netwalker.discovery.protocol_parser import ProtocolParser
-                            parser = ProtocolParser()
-                            sg_data = parser.parse_sg300_platform_string(platform)
-                            
-                            # Build update query for changed fields
-                            update_fields = []
-                            update_values = []
-                            
-                            # Update platform if different
-                            if sg_data['platform'] != current_platform:
-                                update_fields.append("platform = ?")
-                                update_values.append(sg_data['platform'])
-                            
-                            # Update model if we have new data and it's different
-                            if sg_data['model'] and sg_data['model'] != current_model:
-                                update_fields.append("hardware_model = ?")
-                                update_values.append(sg_data['model'])
-                            
-                            # Execute update if there are changes
-                            if update_fields:
-                                update_fields.append("updated_at = GETDATE()")
-                                update_values.append(device_id)
-                                
-                                cursor.execute(f"""
-                                    UPDATE devices
-                                    SET {', '.join(update_fields)}
-                                    WHERE device_id = ?
-                                """, tuple(update_values))
-                                self.connection.commit()
-                                self.logger.info(f"Updated SG300 device '{hostname}' (ID: {device_id}): platform={sg_data['platform']}, model={sg_data.get('model')}")
-                    
-                    # Check if this is an Axis camera - always parse and update if data has changed
-                    elif platform.upper() == 'AXIS' or '|' in platform or (platform.upper().startswith('AXIS') and 'AXIS' in platform):
-                        from netwalker.discovery.protocol_parser import ProtocolParser
-                        parser = ProtocolParser()
-                        axis_data = parser.parse_axis_platform_string(platform)
-                        
-                        # Build update query for changed fields
-                        update_fields = []
-                        update_values = []
-                        
-                        # Update platform if different
-                        if axis_data['platform'] != current_platform:
-                            update_fields.append("platform = ?")
-                            update_values.append(axis_data['platform'])
-                        
-                        # Update model if we have new data and it's different
-                        if axis_data['model'] and axis_data['model'] != current_model:
-                            update_fields.append("hardware_model = ?")
-                            update_values.append(axis_data['model'])
-                        
-                        # Add camera capability if not present
-                        # Get current capabilities
-                        cursor.execute("SELECT capabilities FROM devices WHERE device_id = ?", (device_id,))
-                        cap_row = cursor.fetchone()
-                        current_caps = cap_row[0] if cap_row and cap_row[0] else ''
-                        if 'camera' not in current_caps.lower():
-                            new_caps = f"{current_caps},camera" if current_caps else "camera"
-                            update_fields.append("capabilities = ?")
-                            update_values.append(new_caps)
-                        
-                        # Execute update if any fields changed
-                        if update_fields:
-                            update_fields.append("updated_at = GETDATE()")
-                            update_values.append(device_id)
-                            
-                            cursor.execute(f"""
-                                UPDATE devices
-                                SET {', '.join(update_fields)}
-                                WHERE device_id = ?
-                            """, tuple(update_values))
-                            self.connection.commit()
-                            self.logger.info(f"Updated Axis camera '{hostname}' (ID: {device_id}): platform={axis_data['platform']}, model={axis_data.get('model')}")
-                        
-                        # Update version if we have one
-                        if axis_data.get('version'):
-                            self.upsert_device_version(device_id, axis_data['version'])
-                            self.logger.info(f"Updated Axis camera '{hostname}' (ID: {device_id}): platform={axis_data['platform']}, model={axis_data.get('model')}")
-                    
-                    # Update Nutanix devices if current platform is generic
-                    elif current_platform in ('Linux', 'Unknown', None) and 'Nutanix' in platform:
-                        cursor.execute("""
-                            UPDATE devices
-                            SET platform = ?, updated_at = GETDATE()
-                            WHERE device_id = ?
-                        """, (platform, device_id))
-                        self.connection.commit()
-                        self.logger.info(f"Updated platform for device '{hostname}' (ID: {device_id}) from '{current_platform}' to '{platform}'")
-                    
-                    # Update Cisco ATA devices if current platform is generic
-                    elif current_platform in ('Unknown', None) and ('Cisco ATA' in platform or ('ATA' in platform and any(char.isdigit() for char in platform))):
-                        cursor.execute("""
-                            UPDATE devices
-                            SET platform = ?, updated_at = GETDATE()
-                            WHERE device_id = ?
-                        """, (platform, device_id))
-                        self.connection.commit()
-                        self.logger.info(f"Updated platform for device '{hostname}' (ID: {device_id}) from '{current_platform}' to '{platform}'")
+                self._refresh_device_from_neighbor_platform(cursor, device_id, hostname, platform)
                 
                 cursor.close()
                 self.logger.debug(f"Resolved hostname '{hostname}' to device_id {device_id}")
@@ -1552,55 +2301,8 @@ class DatabaseManager:
                     # Create placeholder device record for unwalked neighbor
                     self.logger.info(f"Creating placeholder device for unwalked neighbor: {short_hostname}")
 
-                    # Parse Aruba platform strings to extract model and serial
-                    parsed_platform = platform if platform else 'Unknown'
-                    parsed_model = 'Unwalked Neighbor'
-                    parsed_serial = 'unknown'
-                    
-                    # Check if this is an Aruba AP with detailed platform string
-                    if platform and ('Aruba AP' in platform or 'AOS-' in platform):
-                        from netwalker.discovery.protocol_parser import ProtocolParser
-                        parser = ProtocolParser()
-                        aruba_data = parser.parse_aruba_platform_string(platform)
-                        parsed_platform = aruba_data['platform']
-                        if aruba_data['model']:
-                            parsed_model = aruba_data['model']
-                        if aruba_data['serial']:
-                            parsed_serial = aruba_data['serial']
-                        self.logger.info(f"Parsed Aruba device: platform={parsed_platform}, model={parsed_model}, serial={parsed_serial}")
-                    
-                    # Check if this is a Cisco SG300/SG200/SG500 device
-                    elif platform and ('SG300' in platform or 'SG200' in platform or 'SG500' in platform or '|' in platform):
-                        # Check if it's actually an SG device (not Axis or other delimited format)
-                        if not platform.upper().startswith('AXIS') and not platform.upper().startswith('BACH'):
-                            from netwalker.discovery.protocol_parser import ProtocolParser
-                            parser = ProtocolParser()
-                            sg_data = parser.parse_sg300_platform_string(platform)
-                            parsed_platform = sg_data['platform']
-                            if sg_data['model']:
-                                parsed_model = sg_data['model']
-                            self.logger.info(f"Parsed SG300 device: platform={parsed_platform}, model={parsed_model}")
-                    
-                    # Check if this is an Axis camera
-                    elif platform and (platform.upper() == 'AXIS' or '|' in platform):
-                        from netwalker.discovery.protocol_parser import ProtocolParser
-                        parser = ProtocolParser()
-                        axis_data = parser.parse_axis_platform_string(platform)
-                        parsed_platform = axis_data['platform']
-                        if axis_data['model']:
-                            parsed_model = axis_data['model']
-                        # Store version for later insertion
-                        axis_version = axis_data.get('version')
-                        # Add camera capability
-                        if capabilities:
-                            if 'camera' not in [c.lower() for c in capabilities]:
-                                capabilities.append('camera')
-                        else:
-                            capabilities = ['camera']
-                        self.logger.info(f"Parsed Axis camera: platform={parsed_platform}, model={parsed_model}, version={axis_version}")
-
-                    # Convert capabilities list to comma-separated string
-                    capabilities_str = ','.join(capabilities) if capabilities else None
+                    (parsed_platform, parsed_model, parsed_serial,
+                     capabilities_str, axis_version) = self._placeholder_device_fields(platform, capabilities)
 
                     cursor.execute("""
                         INSERT INTO devices (device_name, serial_number, platform, hardware_model, capabilities, status)
@@ -1611,7 +2313,7 @@ class DatabaseManager:
                     device_id = cursor.fetchone()[0]
                     
                     # Insert version if we have one (for Axis cameras)
-                    if 'axis_version' in locals() and axis_version:
+                    if axis_version:
                         cursor.execute("""
                             INSERT INTO device_versions (device_id, software_version)
                             VALUES (?, ?)
@@ -1620,6 +2322,8 @@ class DatabaseManager:
 
                     self.connection.commit()
                     cursor.close()
+                    if self.metadata_cache.loaded:
+                        self.metadata_cache.record_device(short_hostname, parsed_platform)
 
                     self.logger.info(f"Created placeholder device '{short_hostname}' with device_id {device_id}, capabilities: {capabilities_str}")
                     return device_id
@@ -1642,12 +2346,19 @@ class DatabaseManager:
         Returns:
             Platform string or None if not found
         """
-        if not self.enabled or not self.is_connected():
+        if not self.enabled:
             return None
 
         if not host:
             return None
 
+        if self.metadata_cache.loaded:
+            metadata = self.metadata_cache.lookup(host)
+            return metadata.platform if metadata else None
+
+        if not self.is_connected():
+            return None
+
         try:
             cursor = self.connection.cursor()
 
@@ -1694,6 +2405,141 @@ class DatabaseManager:
             self.logger.error(f"Error getting platform for host '{host}': {e}")
             return None
 
+    def neighbor_fingerprint(self, neighbors: List[Any]) -> Set[tuple]:
+        """
+        Key neighbors the way device_neighbors stores them
+
+        Args:
+            neighbors: List of NeighborInfo objects
+
+        Returns:
+            Set of (normalized local interface, lower-case short neighbor hostname)
+        """
+        fingerprint = set()
+        for neighbor in neighbors or []:
+            neighbor_hostname = neighbor.device_id if hasattr(neighbor, 'device_id') else str(neighbor)
+            local_interface = neighbor.local_interface if hasattr(neighbor, 'local_interface') else 'Unknown'
+            fingerprint.add((normalize_interface_name(local_interface),
+                             self._neighbor_name_key(neighbor_hostname)))
+        return fingerprint
+
+    def get_device_fingerprint(self, hostname: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the change-detection signals stored for a walked device
+
+        Neighbor links are those refreshed around the device's last walk, seen
+        from the device's side whichever direction they are stored in.
+
+        Args:
+            hostname: Device hostname
+
+        Returns:
+            Dictionary with device_id, serial_number, software_version,
+            uptime_hours, last_seen and neighbors (see neighbor_fingerprint),
+            or None if the device has never been walked
+        """
+        if not self.enabled or not hostname or not self.is_connected():
+            return None
+
+        try:
+            cursor = self.connection.cursor()
+            short_hostname = hostname.split('.')[0] if '.' in hostname else hostname
+
+            cursor.execute("""
+                SELECT TOP 1 d.device_id, d.serial_number, d.uptime_hours, d.last_seen,
+                       (SELECT TOP 1 v.software_version FROM device_versions v
+                        WHERE v.device_id = d.device_id ORDER BY v.last_seen DESC)
+                FROM devices d
+                WHERE d.device_name = ? AND d.serial_number != 'unknown'
+                ORDER BY d.last_seen DESC
+            """, (short_hostname,))
+            row = cursor.fetchone()
+            if not row:
+                cursor.close()
+                return None
+
+            device_id, serial_number, uptime_hours, last_seen, software_version = row
+
+            # Links written by this device's last walk share its last_seen; older
+            # links are neighbors that have since gone away
+            cursor.execute("""
+                SELECT n.source_interface, peer.device_name
+                FROM device_neighbors n
+                JOIN devices d ON d.device_id = n.source_device_id
+                JOIN devices peer ON peer.device_id = n.destination_device_id
+                WHERE n.source_device_id = ? AND n.last_seen >= DATEADD(MINUTE, -10, d.last_seen)
+                UNION
+                SELECT n.destination_interface, peer.device_name
+                FROM device_neighbors n
+                JOIN devices d ON d.device_id = n.destination_device_id
+                JOIN devices peer ON peer.device_id = n.source_device_id
+                WHERE n.destination_device_id = ? AND n.last_seen >= DATEADD(MINUTE, -10, d.last_seen)
+            """, (device_id, device_id))
+            neighbors = {(normalize_interface_name(interface), self._neighbor_name_key(name))
+                         for interface, name in cursor.fetchall()}
+            cursor.close()
+
+            return {
+                'device_id': device_id,
+                'serial_number': serial_number,
+                'software_version': software_version,
+                'uptime_hours': uptime_hours,
+                'last_seen': last_seen,
+                'neighbors': neighbors
+            }
+
+        except pyodbc.Error as e:
+            self.logger.error(f"Error getting fingerprint for device '{hostname}': {e}")
+            return None
+
+    def get_stored_device_details(self, device_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the stack members and VLANs stored by a device's last full walk
+
+        Rows written by that walk share its last_seen; older rows are stack
+        members or VLANs that have since gone away.
+
+        Args:
+            device_id: Device ID
+
+        Returns:
+            Dictionary with 'stack_members' and 'vlans' lists of row dictionaries,
+            or None if the rows could not be read
+        """
+        if not self.enabled or not self.is_connected():
+            return None
+
+        try:
+            cursor = self.connection.cursor()
+
+            cursor.execute("""
+                SELECT s.switch_number, s.role, s.priority, s.hardware_model, s.serial_number,
+                       s.mac_address, s.software_version, s.state
+                FROM device_stack_members s
+                WHERE s.device_id = ? AND s.last_seen >= (
+                    SELECT DATEADD(MINUTE, -10, MAX(last_seen)) FROM device_stack_members WHERE device_id = ?)
+                ORDER BY s.switch_number
+            """, (device_id, device_id))
+            stack_fields = ('switch_number', 'role', 'priority', 'hardware_model', 'serial_number',
+                            'mac_address', 'software_version', 'state')
+            stack_members = [dict(zip(stack_fields, row)) for row in cursor.fetchall()]
+
+            cursor.execute("""
+                SELECT v.vlan_number, v.vlan_name, v.port_count
+                FROM device_vlans v
+                WHERE v.device_id = ? AND v.last_seen >= (
+                    SELECT DATEADD(MINUTE, -10, MAX(last_seen)) FROM device_vlans WHERE device_id = ?)
+                ORDER BY v.vlan_number
+            """, (device_id, device_id))
+            vlans = [dict(zip(('vlan_number', 'vlan_name', 'port_count'), row)) for row in cursor.fetchall()]
+            cursor.close()
+
+            return {'stack_members': stack_members, 'vlans': vlans}
+
+        except pyodbc.Error as e:
+            self.logger.error(f"Error getting stored stack and VLAN data for device {device_id}: {e}")
+            return None
+
     def check_reverse_connection(self, source_id: int, source_if: str,
                                  dest_id: int, dest_if: str) -> Optional[int]:
         """
@@ -1828,12 +2674,16 @@ class DatabaseManager:
         """
         Store or update neighbor connections for a device
 
+        All neighbor hostnames are resolved together, then every link is written
+        with a single staged MERGE that also refreshes links already stored in
+        the reverse direction.
+
         Args:
             device_id: Source device ID
             neighbors: List of NeighborInfo objects
 
         Returns:
-            Count of neighbors successfully stored
+            Count of distinct neighbor connections stored
         """
         if not self.enabled or not self.is_connected():
             return 0
@@ -1841,81 +2691,26 @@ class DatabaseManager:
         if not neighbors:
             return 0
 
-        stored_count = 0
-
-        for neighbor in neighbors:
-            try:
-                # Extract neighbor information
-                neighbor_hostname = neighbor.device_id if hasattr(neighbor, 'device_id') else str(neighbor)
-                neighbor_capabilities = neighbor.capabilities if hasattr(neighbor, 'capabilities') else []
-                neighbor_platform = neighbor.platform if hasattr(neighbor, 'platform') else None
-
-                # Resolve hostname to destination_device_id
-                # Create placeholder device if neighbor doesn't exist (unwalked leaf node)
-                # Pass capabilities and platform for placeholder creation
-                dest_device_id = self.resolve_hostname_to_device_id(
-                    neighbor_hostname,
-                    create_if_missing=True,
-                    capabilities=neighbor_capabilities,
-                    platform=neighbor_platform
-                )
-
-                if not dest_device_id:
-                    # Skip if resolution fails
-                    self.logger.warning(f"Could not resolve neighbor hostname: {neighbor_hostname}")
-                    continue
-
-                # Get interface names
-                local_interface = neighbor.local_interface if hasattr(neighbor, 'local_interface') else 'Unknown'
-                remote_interface = neighbor.remote_interface if hasattr(neighbor, 'remote_interface') else 'Unknown'
-                protocol = neighbor.protocol if hasattr(neighbor, 'protocol') else 'CDP'
-
-                # Normalize interface names (import ProtocolParser if needed)
-                from netwalker.discovery.protocol_parser import ProtocolParser
-                parser = ProtocolParser()
-                local_interface = parser.normalize_interface_name(local_interface)
-                remote_interface = parser.normalize_interface_name(remote_interface)
-
-                # Check for reverse connection
-                reverse_id = self.check_reverse_connection(
-                    device_id, local_interface,
-                    dest_device_id, remote_interface
-                )
-
-                if reverse_id:
-                    # Reverse connection exists, update it
-                    cursor = self.connection.cursor()
-                    cursor.execute("""
-                        UPDATE device_neighbors
-                        SET last_seen = GETDATE(),
-                            protocol = ?,
-                            updated_at = GETDATE()
-                        WHERE neighbor_id = ?
-                    """, (protocol, reverse_id))
-                    self.connection.commit()
-                    cursor.close()
-
-                    self.logger.debug(f"Updated reverse connection: {reverse_id}")
-                    stored_count += 1
-                else:
-                    # No reverse connection, insert with consistent direction
-                    src_id, src_if, dst_id, dst_if = self.get_consistent_direction(
-                        device_id, local_interface,
-                        dest_device_id, remote_interface
-                    )
-
-                    if self.upsert_neighbor_connection(src_id, src_if, dst_id, dst_if, protocol):
-                        stored_count += 1
+        links = self._resolve_neighbor_links(neighbors)
+        if not links:
+            return 0
 
-            except Exception as e:
-                # Continue processing remaining neighbors on individual failures
-                self.logger.error(f"Error storing neighbor {neighbor}: {e}")
-                continue
+        cursor = None
+        try:
+            cursor = self.connection.cursor()
+            cursor.fast_executemany = True
+            stored_count = self._merge_device_neighbors(cursor, device_id, links)
+            self.connection.commit()
+            cursor.close()
 
-        if stored_count > 0:
             self.logger.info(f"Stored {stored_count} neighbor connections for device {device_id}")
+            return stored_count
 
-        return stored_count
+        except pyodbc.Error as e:
+            self.logger.error(f"Error storing neighbors for device {device_id}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return 0
 
     def get_device_neighbors(self, device_id: int) -> List[Dict[str, Any]]:
         """
@@ -2457,12 +3252,19 @@ class DatabaseManager:
         Returns:
             Connection failure count, or 0 if device not found or database disabled
         """
-        if not self.enabled or not self.is_connected():
+        if not self.enabled:
             return 0
 
         if not device_name:
             return 0
 
+        if self.metadata_cache.loaded:
+            metadata = self.metadata_cache.lookup(device_name)
+            return metadata.connection_failures if metadata else 0
+
+        if not self.is_connected():
+            return 0
+
         try:
             cursor = self.connection.cursor()
 
@@ -2584,6 +3386,8 @@ class DatabaseManager:
 
                 self.connection.commit()
                 cursor.close()
+                if self.metadata_cache.loaded:
+                    self.metadata_cache.set_connection_failures(device_name, new_count)
 
                 self.logger.info(f"Incremented connection failures for '{device_name}' to {new_count}")
                 return True
@@ -2634,6 +3438,8 @@ class DatabaseManager:
             cursor.close()
 
             if rows_affected > 0:
+                if self.metadata_cache.loaded:
+                    self.metadata_cache.set_connection_failures(device_name, 0)
                 self.logger.info(f"Reset connection failures for '{device_name}' to 0")
                 return True
             else:
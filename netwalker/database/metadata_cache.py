@@ -0,0 +1,165 @@
+"""
+Device Metadata Cache for NetWalker
+
+Holds the per-device fields that discovery consults before connecting
+(platform, connection failure count, last seen) so they can be loaded from
+the database in one query instead of one query per lookup.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+@dataclass
+class DeviceMetadata:
+    """Pre-connection metadata for a device stored in the inventory"""
+    device_name: str = ""
+    platform: Optional[str] = None
+    connection_failures: int = 0
+    last_seen: Optional[datetime] = None
+
+
+class DeviceMetadataCache:
+    """
+    In-memory map of hostname and IP address to device metadata.
+
+    Lookups follow the database queries they replace: a hostname is matched
+    case-insensitively against device_name after stripping any domain suffix,
+    an IP address is matched against interface addresses, and when several
+    devices match the most recently seen one wins. Once loaded, a miss is
+    authoritative, so callers do not fall back to the database.
+    """
+
+    def __init__(self):
+        """Initialize an empty, unloaded cache."""
+        self._lock = threading.Lock()
+        self._by_name: Dict[str, DeviceMetadata] = {}
+        self._by_ip: Dict[str, DeviceMetadata] = {}
+        self.loaded = False
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.updates = 0
+
+    @staticmethod
+    def _name_key(host: str) -> str:
+        short_hostname = host.split('.')[0] if '.' in host else host
+        return short_hostname.lower()
+
+    def load(self, rows: Iterable[tuple]):
+        """
+        Replace the cache contents from query rows
+
+        Args:
+            rows: Tuples of (device_id, device_name, platform, connection_failures,
+                  last_seen, ip_address) ordered by last_seen descending;
+                  ip_address is None for devices without interface addresses
+        """
+        by_name: Dict[str, DeviceMetadata] = {}
+        by_ip: Dict[str, DeviceMetadata] = {}
+        # Several rows per device (one per interface IP) share one record
+        records: Dict[int, DeviceMetadata] = {}
+
+        for device_id, device_name, platform, failures, last_seen, ip_address in rows:
+            if not device_name:
+                continue
+            record = records.get(device_id)
+            if record is None:
+                record = DeviceMetadata(device_name, platform, failures or 0, last_seen)
+                records[device_id] = record
+            # Rows arrive newest first, so keep the first match like TOP 1 would
+            by_name.setdefault(device_name.lower(), record)
+            if ip_address:
+                by_ip.setdefault(ip_address, record)
+
+        with self._lock:
+            self._by_name = by_name
+            self._by_ip = by_ip
+            self.loaded = True
+
+    def clear(self):
+        """Drop all entries and mark the cache unloaded."""
+        with self._lock:
+            self._by_name = {}
+            self._by_ip = {}
+            self.loaded = False
+
+    def _find(self, host: str) -> Optional[DeviceMetadata]:
+        record = self._by_name.get(self._name_key(host))
+        if record is None:
+            record = self._by_ip.get(host)
+        return record
+
+    def lookup(self, host: str) -> Optional[DeviceMetadata]:
+        """
+        Find metadata by hostname, falling back to IP address
+
+        Args:
+            host: Device hostname or IP address
+
+        Returns:
+            DeviceMetadata, or None if the device is not in the inventory
+        """
+        with self._lock:
+            record = self._find(host)
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return record
+
+    def record_device(self, device_name: str, platform: Optional[str] = None,
+                      ip_address: Optional[str] = None):
+        """
+        Apply a device insert or update written during the run
+
+        Args:
+            device_name: Device name as stored in the database
+            platform: Platform written, empty values keep the cached platform
+            ip_address: Management IP address of the device, if known
+        """
+        if not device_name:
+            return
+
+        with self._lock:
+            record = self._by_name.get(device_name.lower())
+            if record is None:
+                record = DeviceMetadata(device_name=device_name)
+                self._by_name[device_name.lower()] = record
+            if platform:
+                record.platform = platform
+            record.last_seen = datetime.now()
+            if ip_address:
+                self._by_ip[ip_address] = record
+            self.updates += 1
+
+    def set_connection_failures(self, host: str, failures: int):
+        """
+        Apply a connection failure count written during the run
+
+        Args:
+            host: Device hostname or IP address the count was written for
+            failures: New connection failure count
+        """
+        with self._lock:
+            record = self._find(host)
+            if record is not None:
+                record.connection_failures = failures
+                self.updates += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'devices': len(self._by_name),
+                'addresses': len(self._by_ip),
+                'lookups': lookups,
+                'hits': self.hits,
+                'misses': self.misses,
+                'updates': self.updates,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0
+            }
@@ -0,0 +1,176 @@
+"""
+Archive Re-parser for NetWalker
+
+Rebuilds the device inventory from the raw output archive with no network
+I/O. Every archived device capture is replayed through DeviceCollector on a
+process pool, so a parser fix takes effect without walking the network again.
+"""
+
+import logging
+import time
+import concurrent.futures
+from typing import Any, Dict, List, Optional, Tuple
+
+from netwalker.connection.data_models import DeviceInfo
+from netwalker.connection.output_archive import ArchivedCapture, OutputArchive, ReplayConnection
+from netwalker.validation.dns_resolver import DNSResolver
+from .device_collector import DeviceCollector
+from .discovery_engine import DeviceInventory, device_info_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+# Per-process state set up by _init_worker
+_worker_state: Optional[Tuple[OutputArchive, DeviceCollector]] = None
+
+
+def _init_worker(archive_directory: str, config: Dict[str, Any]):
+    """Create the archive reader and collector a worker process reuses for every capture"""
+    global _worker_state
+    # Replayed outputs must not be archived again
+    collector_config = dict(config, archive_raw_output=False)
+    _worker_state = (OutputArchive(archive_directory), DeviceCollector(collector_config, DNSResolver()))
+
+
+def _reparse_capture(capture: ArchivedCapture) -> Tuple[Optional[DeviceInfo], Optional[str]]:
+    """
+    Re-parse one archived capture in a worker process
+
+    Returns:
+        Tuple of (DeviceInfo or None, error message or None)
+    """
+    archive, collector = _worker_state
+    try:
+        outputs = archive.load_outputs(capture)
+        connection = ReplayConnection(outputs, capture.device_type, capture.host)
+        # Replay the address the live run settled on instead of asking DNS
+        collector.dns_resolver.prime(capture.host, capture.primary_ip or None)
+        device_info = collector.collect_device_information(
+            connection, capture.host, capture.connection_method,
+            capture.discovery_depth, capture.is_seed
+        )
+        return device_info, None
+    except Exception as e:
+        return None, f"Re-parse failed for {capture.host}: {e}"
+
+
+class ArchiveReparser:
+    """
+    Replays archived command outputs through the current parsers.
+
+    Captures are parsed on a process pool; results are added to the inventory
+    in archive order so a re-parse is deterministic.
+    """
+
+    def __init__(self, archive_directory: str, config: Optional[Dict[str, Any]] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize archive re-parser.
+
+        Args:
+            archive_directory: Directory of the raw output archive
+            config: Flattened application configuration passed to DeviceCollector
+            max_workers: Worker processes, None uses one per CPU and 1 parses in-process
+        """
+        self.archive_directory = archive_directory
+        self.config = config or {}
+        self.max_workers = max_workers
+
+        # Statistics
+        self.devices_reparsed = 0
+        self.devices_failed = 0
+        self.elapsed_seconds = 0.0
+
+    def reparse(self, since: Optional[str] = None) -> DeviceInventory:
+        """
+        Rebuild the inventory from the latest capture of each archived device
+
+        Args:
+            since: Optional ISO timestamp, captures older than this are ignored
+
+        Returns:
+            DeviceInventory built from the archive
+        """
+        start = time.perf_counter()
+        captures = OutputArchive(self.archive_directory).latest_captures(since)
+        logger.info(f"[REPARSE] Re-parsing {len(captures)} archived devices from {self.archive_directory}")
+
+        inventory = DeviceInventory()
+        for capture, (device_info, error) in zip(captures, self._parse_all(captures)):
+            self._add_to_inventory(inventory, capture, device_info, error)
+
+        self.elapsed_seconds = time.perf_counter() - start
+        logger.info(f"[REPARSE] {self.devices_reparsed} devices re-parsed, {self.devices_failed} failed "
+                    f"in {self.elapsed_seconds:.1f}s")
+        return inventory
+
+    def store_inventory(self, db_manager, inventory: DeviceInventory) -> int:
+        """
+        Write re-parsed devices to the database
+
+        Args:
+            db_manager: Connected DatabaseManager
+            inventory: Inventory returned by reparse()
+
+        Returns:
+            Number of devices stored
+        """
+        stored = 0
+        for device_key, device_info in inventory.get_devices_by_status("connected").items():
+            try:
+                success, _ = db_manager.process_device_discovery(device_info)
+                if success:
+                    stored += 1
+                else:
+                    logger.warning(f"[REPARSE] Failed to store {device_key} in database")
+            except Exception as e:
+                logger.error(f"[REPARSE] Error storing {device_key}: {e}")
+        return stored
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get re-parse counters"""
+        return {
+            'devices_reparsed': self.devices_reparsed,
+            'devices_failed': self.devices_failed,
+            'elapsed_seconds': self.elapsed_seconds
+        }
+
+    def _parse_all(self, captures: List[ArchivedCapture]) -> List[Tuple[Optional[DeviceInfo], Optional[str]]]:
+        """Parse captures on the process pool, or in-process for a single worker"""
+        if not captures:
+            return []
+
+        if self.max_workers == 1:
+            _init_worker(self.archive_directory, self.config)
+            return [_reparse_capture(capture) for capture in captures]
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(self.archive_directory, self.config)
+        ) as executor:
+            # Larger chunks cut inter-process overhead; map keeps archive order
+            chunksize = max(1, len(captures) // ((self.max_workers or 4) * 4))
+            return list(executor.map(_reparse_capture, captures, chunksize=chunksize))
+
+    def _add_to_inventory(self, inventory: DeviceInventory, capture: ArchivedCapture,
+                          device_info: Optional[DeviceInfo], error: Optional[str]):
+        """Record one re-parse result the way discovery records a collection result"""
+        if device_info is not None and device_info.connection_status == "success":
+            device_key = f"{device_info.hostname}:{device_info.primary_ip or capture.host}"
+            inventory.add_device(device_key, device_info_to_dict(device_info, "archive"), "connected")
+            self.devices_reparsed += 1
+            return
+
+        if device_info is not None:
+            error = device_info.error_details
+        hostname = capture.hostname or capture.host
+        inventory.add_device(f"{hostname}:{capture.primary_ip or capture.host}", {
+            'hostname': hostname,
+            'primary_ip': capture.primary_ip or capture.host,
+            'discovery_method': "archive",
+            'connection_status': "failed",
+            'error_details': error
+        }, "failed", error)
+        self.devices_failed += 1
+        logger.warning(f"[REPARSE] {hostname}: {error}")
@@ -0,0 +1,174 @@
+"""
+Device Change Detector for NetWalker
+
+Incremental rediscovery compares the cheap probe of a device ('show version'
+plus its CDP/LLDP neighbors) with what the database recorded on the last walk.
+Only devices whose serial number, software version, uptime or neighbor set
+changed get the expensive stack and VLAN collection; unchanged devices get
+the stack members and VLANs stored by their last full walk.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from netwalker.connection.data_models import DeviceInfo, StackMemberInfo, VLANInfo
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceChangeDetector:
+    """
+    Decides from a device probe whether the device needs a full refresh.
+
+    Devices missing from the database, or whose stored signals cannot be
+    read, are always refreshed. load_last_walk reads the database and runs on
+    the coordinating thread; needs_refresh only compares against what it
+    loaded and is safe to use from discovery worker threads.
+    """
+
+    def __init__(self, db_manager):
+        """
+        Initialize change detector.
+
+        Args:
+            db_manager: Connected DatabaseManager holding the previous walk
+        """
+        self.db_manager = db_manager
+
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.devices_skipped = 0
+        self.devices_refreshed = 0
+        self.refresh_reasons: Dict[str, int] = {}
+
+    def load_last_walk(self, hostname: str) -> Dict[str, Any]:
+        """
+        Read what the database stored for a device's last walk
+
+        Called by the discovery engine before the device is handed to a
+        worker, so database access stays on the coordinating thread.
+
+        Args:
+            hostname: Device hostname from the discovery queue
+
+        Returns:
+            Dictionary with 'fingerprint' (see DatabaseManager.get_device_fingerprint)
+            and 'details' (see DatabaseManager.get_stored_device_details), or
+            'error' if the database could not be read
+        """
+        try:
+            fingerprint = self.db_manager.get_device_fingerprint(hostname)
+            details = self.db_manager.get_stored_device_details(fingerprint['device_id']) if fingerprint else None
+        except Exception as e:
+            logger.warning(f"[INCREMENTAL] {hostname}: could not read last walk: {e}")
+            return {'error': str(e)}
+        return {'fingerprint': fingerprint, 'details': details}
+
+    def needs_refresh(self, device_info: DeviceInfo, last_walk: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check a probed device against its last walk and count the outcome
+
+        An unchanged device has the stack members and VLANs stored by its last
+        full walk restored onto device_info, so the inventory and reports keep
+        them. If they cannot be read the device is refreshed instead.
+
+        Args:
+            device_info: DeviceInfo holding the probe results (version fields and neighbors)
+            last_walk: Result of load_last_walk(), or None if it was not loaded
+
+        Returns:
+            True if stack and VLAN collection should run, False if the device is unchanged
+        """
+        if last_walk is None or 'error' in last_walk:
+            changed, reason = True, "fingerprint unavailable"
+        else:
+            changed, reason = self.compare(device_info, last_walk['fingerprint'])
+            if not changed:
+                if last_walk['details'] is None:
+                    changed, reason = True, "stored details unavailable"
+                else:
+                    self.restore(device_info, last_walk['details'])
+
+        with self._lock:
+            if changed:
+                self.devices_refreshed += 1
+                self.refresh_reasons[reason] = self.refresh_reasons.get(reason, 0) + 1
+            else:
+                self.devices_skipped += 1
+
+        if changed:
+            logger.info(f"[INCREMENTAL] {device_info.hostname}: full refresh ({reason})")
+        else:
+            logger.info(f"[INCREMENTAL] {device_info.hostname}: unchanged since last walk, skipping stack and VLAN collection")
+        return changed
+
+    def compare(self, device_info: DeviceInfo, fingerprint: Optional[Dict[str, Any]]) -> Tuple[bool, str]:
+        """
+        Compare probe results with the stored fingerprint
+
+        Args:
+            device_info: DeviceInfo holding the probe results
+            fingerprint: Result of DatabaseManager.get_device_fingerprint()
+
+        Returns:
+            Tuple of (changed, reason)
+        """
+        if not fingerprint:
+            return True, "not in database"
+
+        if (device_info.serial_number or '').lower() != (fingerprint.get('serial_number') or '').lower():
+            return True, "serial number changed"
+
+        if (device_info.software_version or '') != (fingerprint.get('software_version') or ''):
+            return True, "software version changed"
+
+        # Uptime only grows between walks; a smaller value means the device reloaded
+        uptime_hours = self.db_manager.parse_uptime_to_hours(device_info.uptime)
+        stored_uptime = fingerprint.get('uptime_hours')
+        if uptime_hours is not None and stored_uptime is not None and uptime_hours < float(stored_uptime):
+            return True, "device reloaded"
+
+        if self.db_manager.neighbor_fingerprint(device_info.neighbors) != fingerprint.get('neighbors', set()):
+            return True, "neighbors changed"
+
+        return False, "unchanged"
+
+    def restore(self, device_info: DeviceInfo, details: Dict[str, Any]):
+        """
+        Put the stack members and VLANs of the last full walk on a skipped device
+
+        VLAN portchannel and connected-port counts are not stored, so they are 0.
+
+        Args:
+            device_info: DeviceInfo of the unchanged device
+            details: Result of DatabaseManager.get_stored_device_details()
+        """
+        stack_members = [
+            StackMemberInfo(
+                switch_number=row['switch_number'], role=row['role'], priority=row['priority'],
+                hardware_model=row['hardware_model'], serial_number=row['serial_number'],
+                mac_address=row['mac_address'], software_version=row['software_version'], state=row['state']
+            )
+            for row in details.get('stack_members', [])
+        ]
+        device_info.stack_members = stack_members
+        device_info.is_stack = bool(stack_members)
+        device_info.vlans = [
+            VLANInfo(
+                vlan_id=row['vlan_number'], vlan_name=row['vlan_name'], port_count=row['port_count'] or 0,
+                portchannel_count=0, connected_port_count=0,
+                device_hostname=device_info.hostname, device_ip=device_info.primary_ip
+            )
+            for row in details.get('vlans', [])
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get skipped and refreshed device counts and refresh reasons"""
+        with self._lock:
+            return {
+                'devices_skipped': self.devices_skipped,
+                'devices_refreshed': self.devices_refreshed,
+                'refresh_reasons': dict(self.refresh_reasons)
+            }
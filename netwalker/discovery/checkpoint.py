@@ -0,0 +1,149 @@
+"""
+Discovery Checkpoints for NetWalker
+
+Periodically saves the state of a running discovery (queue, visited set,
+inventory and counters) to a local SQLite file so an interrupted, crashed
+or timed-out walk can be resumed with --resume instead of starting over.
+"""
+
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS queue (position INTEGER PRIMARY KEY, node TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS visited (device_key TEXT PRIMARY KEY, failed INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS devices (
+    device_key TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    error TEXT,
+    info BLOB NOT NULL
+);
+"""
+
+
+class DiscoveryCheckpoint:
+    """
+    SQLite checkpoint file for one discovery run.
+
+    The queue and visited set are rewritten on every save; device rows are
+    only written for devices added or updated since the previous save, so
+    saves stay cheap on large inventories.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize checkpoint file access
+
+        Args:
+            path: Checkpoint file path
+        """
+        self.path = path
+        self.saves = 0
+
+    def exists(self) -> bool:
+        """Check whether a checkpoint has been saved"""
+        return os.path.exists(self.path)
+
+    def save(self, queue_nodes: Iterable[Dict[str, Any]], discovered: Set[str], failed: Set[str],
+             devices: Iterable[Tuple[str, str, Optional[str], Dict[str, Any]]], counters: Dict[str, Any]):
+        """
+        Save discovery state in one transaction
+
+        Args:
+            queue_nodes: Queued discovery nodes as dictionaries, in queue order
+            discovered: Device keys already visited
+            failed: Device keys whose discovery failed
+            devices: (device key, status, error, device info) for inventory
+                entries changed since the last save
+            counters: Progress and timeout counters
+        """
+        start_time = time.time()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.execute("DELETE FROM queue")
+                connection.executemany(
+                    "INSERT INTO queue (position, node) VALUES (?, ?)",
+                    ((position, json.dumps(node)) for position, node in enumerate(queue_nodes))
+                )
+                connection.execute("DELETE FROM visited")
+                connection.executemany(
+                    "INSERT INTO visited (device_key, failed) VALUES (?, ?)",
+                    ((key, 1 if key in failed else 0) for key in discovered)
+                )
+                device_rows = [
+                    (key, status, error, pickle.dumps(info, protocol=pickle.HIGHEST_PROTOCOL))
+                    for key, status, error, info in devices
+                ]
+                # Upsert keeps each device's original row order for resume
+                connection.executemany(
+                    "INSERT INTO devices (device_key, status, error, info) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(device_key) DO UPDATE SET status = excluded.status, "
+                    "error = excluded.error, info = excluded.info",
+                    device_rows
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO state (name, value) VALUES ('counters', ?)",
+                    (json.dumps(dict(counters, saved_at=time.time())),)
+                )
+        finally:
+            connection.close()
+
+        self.saves += 1
+        logger.info(f"[CHECKPOINT] Saved {len(discovered)} visited devices, {len(device_rows)} updated inventory "
+                    f"entries to {self.path} in {time.time() - start_time:.2f}s")
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load the saved discovery state
+
+        Returns:
+            Dictionary with queue (node dictionaries), discovered and failed
+            (sets of device keys), devices (list of (key, status, error, info))
+            and counters
+        """
+        connection = sqlite3.connect(self.path)
+        try:
+            queue_nodes = [json.loads(node) for (node,) in
+                           connection.execute("SELECT node FROM queue ORDER BY position")]
+            discovered: Set[str] = set()
+            failed: Set[str] = set()
+            for device_key, was_failed in connection.execute("SELECT device_key, failed FROM visited"):
+                discovered.add(device_key)
+                if was_failed:
+                    failed.add(device_key)
+            devices: List[Tuple[str, str, Optional[str], Dict[str, Any]]] = [
+                (key, status, error, pickle.loads(info))
+                for key, status, error, info in
+                connection.execute("SELECT device_key, status, error, info FROM devices ORDER BY rowid")
+            ]
+            row = connection.execute("SELECT value FROM state WHERE name = 'counters'").fetchone()
+            counters = json.loads(row[0]) if row else {}
+        finally:
+            connection.close()
+
+        return {'queue': queue_nodes, 'discovered': discovered, 'failed': failed,
+                'devices': devices, 'counters': counters}
+
+    def clear(self):
+        """Delete the checkpoint file"""
+        try:
+            os.remove(self.path)
+            logger.info(f"[CHECKPOINT] Removed checkpoint {self.path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"[CHECKPOINT] Could not remove checkpoint {self.path}: {e}")
@@ -4,23 +4,35 @@ Device Collector for gathering comprehensive device information
 
 import re
 import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, List, Any
 from scrapli import Scrapli
 
 from netwalker.connection.data_models import DeviceInfo, NeighborInfo
+from netwalker.connection.command_plan import CommandPlan, CommandSession, execute_command
+from netwalker.connection.output_archive import OutputArchive
 from .protocol_parser import ProtocolParser
 from netwalker.vlan.vlan_collector import VLANCollector
 from .stack_collector import StackCollector
+from netwalker.validation.dns_resolver import DNSResolver
 
 
 class DeviceCollector:
     """Collects comprehensive device information during discovery"""
 
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, dns_resolver: Optional[DNSResolver] = None,
+                 output_archive: Optional[OutputArchive] = None, change_detector=None):
         self.logger = logging.getLogger(__name__)
         self.protocol_parser = ProtocolParser()
         self.config = config or {}
+        self.dns_resolver = dns_resolver or DNSResolver.from_config(self.config)
+
+        # Raw outputs are archived for offline re-parsing when archive_raw_output is on
+        self.output_archive = output_archive if output_archive is not None else OutputArchive.from_config(self.config)
+
+        # Incremental rediscovery: skip stack and VLAN collection on unchanged devices
+        self.change_detector = change_detector
 
         # Initialize VLAN collector if configuration is provided
         self.vlan_collector = VLANCollector(self.config) if config else None
@@ -28,6 +40,16 @@ class DeviceCollector:
         # Initialize stack collector
         self.stack_collector = StackCollector()
 
+        # Neighbor commands are only planned for enabled discovery protocols
+        self.discovery_protocols = self.config.get('discovery_protocols')
+
+        # Commands skipped by reusing output already captured for the device
+        self._commands_saved = 0
+        self._commands_run = 0
+        self._commands_skipped = 0
+        self._command_seconds: Dict[str, float] = {}
+        self._stats_lock = threading.Lock()
+
         # Regex patterns for parsing device information
         self.hostname_pattern = re.compile(r'^(\S+)\s+uptime is', re.MULTILINE | re.IGNORECASE)
         self.version_pattern = re.compile(r'Version\s+([^\s,]+)', re.IGNORECASE)
@@ -38,7 +60,9 @@ class DeviceCollector:
 
     def collect_device_information(self, connection: Any, host: str,
                                  connection_method: str, discovery_depth: int = 0,
-                                 is_seed: bool = False) -> Optional[DeviceInfo]:
+                                 is_seed: bool = False,
+                                 probe_output: Optional[str] = None,
+                                 last_walk: Optional[Dict[str, Any]] = None) -> Optional[DeviceInfo]:
         """
         Collect comprehensive device information
 
@@ -48,10 +72,18 @@ class DeviceCollector:
             connection_method: SSH or Telnet
             discovery_depth: Current discovery depth level
             is_seed: Whether this is a seed device
+            probe_output: 'show version' output captured when the connection was
+                tested, reused instead of running the command again
+            last_walk: The device's last walk loaded by the change detector on
+                the coordinating thread, compared with the probe for
+                incremental rediscovery
 
         Returns:
             DeviceInfo object or None if collection failed
         """
+        session = None
+        capture = None
+        device_info = None
         try:
             self.logger.info(f"Collecting device information from {host}")
 
@@ -62,25 +94,46 @@ class DeviceCollector:
                 if is_panos:
                     self.logger.info(f"PAN-OS device detected from connection device_type: {host}")
 
+            if self.output_archive is not None:
+                capture = self.output_archive.begin_capture(
+                    host, connection_method, getattr(connection, 'device_type', None),
+                    discovery_depth, is_seed
+                )
+
+            # Every collector below runs its commands through this session, so
+            # each command runs at most once per device
+            session = CommandSession(
+                connection,
+                CommandPlan.for_platform("PAN-OS" if is_panos else None, self.discovery_protocols),
+                host,
+                capture
+            )
+
             # Get version/system info output based on platform
             if is_panos:
                 self.logger.info(f"Using PAN-OS commands for {host}")
                 # PAN-OS "show system info" can have long output, use 60 second timeout
-                version_output = self._execute_command(connection, "show system info", timeout=60)
+                version_output = self._execute_command(session, "show system info", timeout=60)
                 # Add a marker to help platform detection
                 version_output = "PAN-OS\n" + version_output if version_output else "PAN-OS\n"
             else:
-                version_output = self._execute_command(connection, "show version")
+                if probe_output:
+                    self.logger.debug(f"Reusing connect-time 'show version' output for {host}")
+                    session.seed("show version", probe_output)
+                version_output = self._execute_command(session, "show version")
 
             if not version_output:
                 return self._create_failed_device_info(host, connection_method,
                                                      discovery_depth, is_seed,
                                                      "Failed to get version information")
 
+            # Narrow the plan to the detected platform before running anything else
+            platform = self._detect_platform(version_output)
+            session.set_plan(CommandPlan.for_platform(platform, self.discovery_protocols))
+
             # Extract basic device information
             hostname = self._extract_hostname(version_output, host)
-            primary_ip = self._extract_primary_ip(connection, host)
-            platform = self._detect_platform(version_output)
+            primary_ip = self._extract_primary_ip(session, host)
             software_version = self._extract_software_version(version_output)
             serial_number = self._extract_serial_number(version_output)
             hardware_model = self._extract_hardware_model(version_output)
@@ -92,11 +145,11 @@ class DeviceCollector:
             # Extract HA role for PAN-OS firewalls
             ha_role = None
             if platform == "PAN-OS":
-                ha_role = self._extract_panos_ha_role(connection)
+                ha_role = self._extract_panos_ha_role(session)
 
             # Get VTP information (skip for PAN-OS)
             if platform != "PAN-OS":
-                vtp_version = self._get_vtp_version(connection)
+                vtp_version = self._get_vtp_version(session)
             else:
                 vtp_version = None
 
@@ -104,7 +157,7 @@ class DeviceCollector:
             capabilities = self._determine_capabilities(version_output, platform)
 
             # Collect neighbor information
-            neighbors = self._collect_neighbors(connection, platform)
+            neighbors = self._collect_neighbors(session, platform)
 
             device_info = DeviceInfo(
                 hostname=hostname,
@@ -127,15 +180,23 @@ class DeviceCollector:
                 ha_role=ha_role
             )
 
+            # Version and neighbors are the probe; unchanged devices get the
+            # stack and VLAN data stored by their last walk from the detector
+            if self.change_detector is not None and not self.change_detector.needs_refresh(device_info, last_walk):
+                device_info.refresh_skipped = True
+                device_info.vlan_collection_status = "skipped"
+                device_info.command_timings = session.get_timings()
+                return device_info
+
             # Collect stack member information
             try:
                 self.logger.debug(f"Starting stack member collection for device {hostname}")
-                stack_members = self.stack_collector.collect_stack_members(connection, platform)
+                stack_members = self.stack_collector.collect_stack_members(session, platform)
 
                 if stack_members:
                     # Enrich with detailed information (serial numbers, models)
                     stack_members = self.stack_collector.enrich_stack_members_with_detail(
-                        connection, platform, stack_members
+                        session, platform, stack_members
                     )
 
                     # Set software version from parent device for all stack members
@@ -159,7 +220,7 @@ class DeviceCollector:
             if self.vlan_collector and self._should_collect_vlans():
                 try:
                     self.logger.debug(f"Starting VLAN collection for device {hostname}")
-                    vlans = self.vlan_collector.collect_vlan_information(connection, device_info)
+                    vlans = self.vlan_collector.collect_vlan_information(session, device_info)
                     device_info.vlans = vlans
                     device_info.vlan_collection_status = "success" if vlans else "no_vlans_found"
                     self.logger.info(f"VLAN collection completed for {hostname}: {len(vlans)} VLANs found")
@@ -175,6 +236,8 @@ class DeviceCollector:
                 elif not self._should_collect_vlans():
                     self.logger.debug(f"VLAN collection disabled for {hostname}")
 
+            device_info.command_timings = session.get_timings()
+
             self.logger.info(f"Successfully collected information for {hostname}")
             return device_info
 
@@ -184,34 +247,63 @@ class DeviceCollector:
             return self._create_failed_device_info(host, connection_method,
                                                  discovery_depth, is_seed, error_msg)
 
+        finally:
+            if session is not None:
+                self._record_command_session(session)
+            if capture is not None:
+                self._finish_capture(capture, device_info)
+
+
+    def get_commands_saved(self) -> int:
+        """Get number of device commands skipped by reusing output already captured for the device"""
+        with self._stats_lock:
+            return self._commands_saved
+
+    def get_command_stats(self) -> Dict[str, Any]:
+        """Get command run, reuse and skip counts and total seconds per command across all devices"""
+        with self._stats_lock:
+            return {
+                'commands_run': self._commands_run,
+                'commands_reused': self._commands_saved,
+                'commands_skipped': self._commands_skipped,
+                'command_seconds': dict(self._command_seconds)
+            }
+
+    def _record_command_session(self, session: CommandSession):
+        """Add a finished device session to the collector totals and log its timing breakdown"""
+        stats = session.get_stats()
+        timings = session.get_timings()
+
+        with self._stats_lock:
+            self._commands_saved += stats['commands_reused']
+            self._commands_run += stats['commands_run']
+            self._commands_skipped += stats['commands_skipped']
+            for command, seconds in timings.items():
+                self._command_seconds[command] = self._command_seconds.get(command, 0.0) + seconds
+
+        breakdown = ", ".join(f"{command}={seconds:.2f}s" for command, seconds in timings.items())
+        self.logger.info(f"[COMMAND PLAN] {session.host} ({stats['platform']}): {stats['commands_run']} run, "
+                         f"{stats['commands_reused']} reused, {stats['commands_skipped']} skipped, "
+                         f"{stats['command_seconds']:.2f}s total")
+        if breakdown:
+            self.logger.debug(f"[COMMAND PLAN] {session.host} command timings: {breakdown}")
+
+    def _finish_capture(self, capture, device_info: Optional[DeviceInfo]):
+        """Write a device capture to the output archive; archive errors never fail collection"""
+        try:
+            if device_info is not None and device_info.connection_status == "success":
+                capture.finish(device_info.hostname, device_info.primary_ip)
+            else:
+                capture.finish()
+        except Exception as e:
+            self.logger.warning(f"[ARCHIVE] Could not archive outputs for {capture.capture.host}: {e}")
 
     def _execute_command(self, connection: Any, command: str, timeout: int = 30) -> Optional[str]:
-        """Execute command and return output (supports both netmiko and scrapli)"""
+        """Execute command and return output (supports both netmiko and scrapli, or a command session)"""
         try:
-            # Determine connection type and execute accordingly
-            if hasattr(connection, 'send_command') and hasattr(connection, 'device_type'):
-                # Netmiko connection - returns string directly
-                response = connection.send_command(command, read_timeout=timeout)
-                return response
-            elif hasattr(connection, 'send_command') and hasattr(connection, 'transport'):
-                # Scrapli connection - returns response object with .result attribute
-                response = connection.send_command(command)
-                return response.result
-            elif hasattr(connection, 'send_command'):
-                # Generic connection (for testing) - try scrapli format first
-                try:
-                    response = connection.send_command(command)
-                    if hasattr(response, 'result'):
-                        return response.result
-                    else:
-                        return str(response)
-                except TypeError:
-                    # If scrapli format fails, try netmiko format
-                    response = connection.send_command(command, read_timeout=30)
-                    return response
-            else:
-                self.logger.error(f"Unknown connection type: {type(connection)}")
-                return None
+            if isinstance(connection, CommandSession):
+                return connection.run(command, timeout)
+            return execute_command(connection, command, timeout)
         except Exception as e:
             self.logger.error(f"Command execution failed for '{command}': {str(e)}")
             return None
@@ -315,7 +407,6 @@ class DeviceCollector:
         4. Fall back to connection host
         """
         import ipaddress
-        import socket
 
         def is_valid_ip(ip_str: str) -> bool:
             """Check if string is a valid IP address"""
@@ -339,13 +430,10 @@ class DeviceCollector:
             self.logger.debug(f"Failed to get IP from interfaces: {e}")
 
         # Method 3: Try forward DNS lookup
-        try:
-            resolved_ip = socket.gethostbyname(host)
-            if resolved_ip and is_valid_ip(resolved_ip):
-                self.logger.debug(f"Resolved {host} to {resolved_ip} via DNS")
-                return resolved_ip
-        except Exception as e:
-            self.logger.debug(f"DNS lookup failed for {host}: {e}")
+        resolved_ip = self.dns_resolver.resolve(host)
+        if resolved_ip and is_valid_ip(resolved_ip):
+            self.logger.debug(f"Resolved {host} to {resolved_ip} via DNS")
+            return resolved_ip
 
         # Method 4: Fall back to connection host (might be hostname)
         if is_valid_ip(host):
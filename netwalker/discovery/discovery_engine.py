@@ -5,20 +5,73 @@ Implements breadth-first network topology discovery with depth limits and error
 """
 
 import logging
-from typing import Dict, List, Set, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
 from collections import deque
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from types import MappingProxyType
 import time
+import threading
 
 from ..connection.connection_manager import ConnectionManager
 from ..connection.data_models import ConnectionStatus
 from ..filtering.filter_manager import FilterManager
 from .protocol_parser import ProtocolParser
 from .device_collector import DeviceCollector
+from .change_detector import DeviceChangeDetector
+from .thread_manager import ThreadManager, ThreadTask
+from .result_spill import SPILLED_FIELDS, ResultSpill, StreamingInventoryView, summarize_device_info
+from .checkpoint import DiscoveryCheckpoint
+from ..validation.dns_resolver import DNSResolver
 
 logger = logging.getLogger(__name__)
 
+# discovery_log_verbosity profiles, least to most detailed
+DISCOVERY_LOG_VERBOSITY = ('summary', 'device', 'neighbor')
+
+
+def device_info_to_dict(device_info: Any, discovery_method: str = "seed",
+                        parent_device: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert a collected DeviceInfo object to the inventory dictionary format
+
+    Args:
+        device_info: DeviceInfo returned by DeviceCollector
+        discovery_method: How the device was found (seed, cdp, lldp)
+        parent_device: Device whose neighbor table led to this device
+
+    Returns:
+        Device information dictionary as stored in DeviceInventory
+    """
+    return {
+        'hostname': device_info.hostname,
+        'primary_ip': device_info.primary_ip,
+        'platform': device_info.platform,
+        'capabilities': device_info.capabilities,
+        'software_version': device_info.software_version,
+        'vtp_version': device_info.vtp_version,
+        'serial_number': device_info.serial_number,
+        'hardware_model': device_info.hardware_model,
+        'uptime': device_info.uptime,
+        'discovery_depth': device_info.discovery_depth,
+        'discovery_method': discovery_method,
+        'parent_device': parent_device,
+        'discovery_timestamp': device_info.discovery_timestamp.isoformat(),
+        'connection_method': device_info.connection_method,
+        'connection_status': device_info.connection_status,
+        'error_details': device_info.error_details,
+        'neighbors': device_info.neighbors,  # Store the NeighborInfo objects directly
+        'vlans': device_info.vlans,  # Store the VLANInfo objects directly
+        'vlan_collection_status': device_info.vlan_collection_status,
+        'vlan_collection_error': device_info.vlan_collection_error,
+        'stack_members': device_info.stack_members,  # Store the StackMemberInfo objects
+        'is_stack': device_info.is_stack,  # Stack flag
+        'is_physical_device': device_info.is_physical_device,  # Physical device flag (from cloud-mode)
+        'ha_role': device_info.ha_role,  # HA role for PAN-OS (Active/Passive/None)
+        'command_timings': device_info.command_timings,  # Seconds per command
+        'refresh_skipped': device_info.refresh_skipped  # Unchanged since last walk (incremental mode)
+    }
+
 
 @dataclass
 class DiscoveryNode:
@@ -30,6 +83,7 @@ class DiscoveryNode:
     discovery_method: str = "seed"  # seed, cdp, lldp
     is_seed: bool = False
     platform: Optional[str] = None  # Platform from CDP/LLDP discovery (e.g., "Palo Alto Networks PA-5200")
+    last_walk: Optional[Dict[str, Any]] = None  # Stored walk loaded for incremental rediscovery
     
     def __post_init__(self):
         """Ensure hostname is limited to 36 characters"""
@@ -42,6 +96,100 @@ class DiscoveryNode:
         return f"{self.hostname}:{self.ip_address}"
 
 
+class DiscoveryQueue(deque):
+    """
+    Breadth-first discovery queue with constant-time membership checks.
+
+    Behaves like a deque of DiscoveryNode objects while keeping a count of
+    queued device keys in sync, so neighbor processing can ask whether a
+    device is already queued without scanning the whole queue.
+    """
+
+    def __init__(self, nodes=()):
+        super().__init__()
+        self._queued_keys: Dict[str, int] = {}
+        self.extend(nodes)
+
+    def _track(self, node: DiscoveryNode):
+        key = node.device_key
+        self._queued_keys[key] = self._queued_keys.get(key, 0) + 1
+
+    def _untrack(self, node: DiscoveryNode):
+        key = node.device_key
+        count = self._queued_keys.get(key, 0) - 1
+        if count > 0:
+            self._queued_keys[key] = count
+        else:
+            self._queued_keys.pop(key, None)
+
+    def contains_key(self, device_key: str) -> bool:
+        """Check if a device key is currently queued"""
+        return device_key in self._queued_keys
+
+    def queued_keys(self) -> List[str]:
+        """Get device keys in queue order"""
+        return [node.device_key for node in self]
+
+    def append(self, node: DiscoveryNode):
+        super().append(node)
+        self._track(node)
+
+    def appendleft(self, node: DiscoveryNode):
+        super().appendleft(node)
+        self._track(node)
+
+    def extend(self, nodes):
+        for node in nodes:
+            self.append(node)
+
+    def extendleft(self, nodes):
+        for node in nodes:
+            self.appendleft(node)
+
+    def insert(self, index: int, node: DiscoveryNode):
+        super().insert(index, node)
+        self._track(node)
+
+    def pop(self) -> DiscoveryNode:
+        node = super().pop()
+        self._untrack(node)
+        return node
+
+    def popleft(self) -> DiscoveryNode:
+        node = super().popleft()
+        self._untrack(node)
+        return node
+
+    def remove(self, node: DiscoveryNode):
+        super().remove(node)
+        self._untrack(node)
+
+    def clear(self):
+        super().clear()
+        self._queued_keys.clear()
+
+    def __setitem__(self, index, node: DiscoveryNode):
+        self._untrack(self[index])
+        super().__setitem__(index, node)
+        self._track(node)
+
+    def __delitem__(self, index):
+        self._untrack(self[index])
+        super().__delitem__(index)
+
+    def __iadd__(self, nodes):
+        self.extend(nodes)
+        return self
+
+    def copy(self) -> 'DiscoveryQueue':
+        return DiscoveryQueue(self)
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
 @dataclass
 class DiscoveryResult:
     """Results from device discovery operation"""
@@ -55,16 +203,64 @@ class DiscoveryResult:
     discovery_timestamp: datetime = field(default_factory=datetime.now)
 
 
+class InventoryRecord:
+    """
+    One inventory entry: the device information dictionary plus the status,
+    error and index attributes kept alongside it.
+    """
+    
+    __slots__ = ('info', 'status', 'error', 'hostname', 'ip_address', 'platform', 'site')
+    
+    def __init__(self, info: Dict[str, Any], status: str, error: Optional[str],
+                 site: Optional[str] = None):
+        self.info = info
+        self.status = status
+        self.error = error
+        self.hostname = (info.get('hostname') or '').upper() or None
+        self.ip_address = info.get('primary_ip') or info.get('ip_address') or None
+        platform = info.get('platform')
+        self.platform = platform.lower() if isinstance(platform, str) and platform else None
+        self.site = site
+
+
+# Secondary indexes kept by DeviceInventory, as InventoryRecord attribute names
+INVENTORY_INDEXES = ('status', 'hostname', 'ip_address', 'platform', 'site')
+
+
 class DeviceInventory:
     """
     Thread-safe storage for discovered device information and status.
+    
+    Devices are held as InventoryRecord entries with secondary indexes by
+    status, hostname, IP address, platform and site, so lookups stay constant
+    time as the inventory grows. Bulk reads return read-only snapshot views
+    that are reused until the next write instead of copying the inventory on
+    every call.
+    
+    With a ResultSpill (streaming mode) the neighbor, VLAN and stack member
+    lists of each device are written to the spill file when the device is
+    added and only a summary is kept in memory; load_device and
+    stream_devices read the full information back.
     """
     
-    def __init__(self):
-        """Initialize empty inventory"""
-        self._devices: Dict[str, Dict[str, Any]] = {}
-        self._device_status: Dict[str, str] = {}
-        self._device_errors: Dict[str, str] = {}
+    def __init__(self, site_resolver: Optional[Callable[[str], Optional[str]]] = None,
+                 spill: Optional[ResultSpill] = None):
+        """
+        Initialize empty inventory
+        
+        Args:
+            site_resolver: Maps a hostname to its site name, or None when the
+                device does not belong to a site
+            spill: Spill file for full device information (streaming mode)
+        """
+        self._records: Dict[str, InventoryRecord] = {}
+        self._spill = spill
+        # Keys added or updated since the last pop_changed_keys (for checkpoints)
+        self._changed: Dict[str, None] = {}
+        # index name -> index value -> device keys (dict used as an ordered set)
+        self._indexes: Dict[str, Dict[str, Dict[str, None]]] = {name: {} for name in INVENTORY_INDEXES}
+        self._site_resolver = site_resolver
+        self._snapshot: Optional[Mapping[str, Dict[str, Any]]] = None
         self._discovery_stats = {
             'total_discovered': 0,
             'successful_connections': 0,
@@ -73,8 +269,9 @@ class DeviceInventory:
             'boundary_devices': 0
         }
         
-        # Thread safety would be added here with threading.Lock() if needed
-        # For now, assuming single-threaded operation
+        # Guards all inventory state - concurrent discovery records results
+        # while worker threads are still collecting from other devices
+        self._lock = threading.RLock()
     
     def add_device(self, device_key: str, device_info: Dict[str, Any], 
                    status: str = "discovered", error: Optional[str] = None):
@@ -87,60 +284,210 @@ class DeviceInventory:
             status: Device status (discovered, connected, failed, filtered, boundary)
             error: Error message if status is failed
         """
-        logger.info(f"[INVENTORY ADD] Adding device {device_key} with status '{status}' to inventory")
-        logger.info(f"  Current inventory size: {len(self._devices)} devices")
-        
-        self._devices[device_key] = device_info
-        self._device_status[device_key] = status
-        
-        if error:
-            self._device_errors[device_key] = error
-        
-        # Update statistics
-        if status == "connected":
-            self._discovery_stats['successful_connections'] += 1
-        elif status == "failed":
-            self._discovery_stats['failed_connections'] += 1
-        elif status == "filtered":
-            self._discovery_stats['filtered_devices'] += 1
-        elif status == "boundary":
-            self._discovery_stats['boundary_devices'] += 1
-        
-        self._discovery_stats['total_discovered'] = len(self._devices)
+        if self._spill is not None:
+            if any(device_info.get(field_name) for field_name in SPILLED_FIELDS):
+                self._spill.write(device_key, device_info)
+                device_info = summarize_device_info(device_info)
+            else:
+                self._spill.discard(device_key)
+        
+        with self._lock:
+            existing = self._records.get(device_key)
+            if existing is not None:
+                self._unindex(device_key, existing)
+                if not error:
+                    error = existing.error
+            
+            record = InventoryRecord(device_info, status, error or None, self._resolve_site(device_info))
+            self._records[device_key] = record
+            self._index(device_key, record)
+            self._snapshot = None
+            self._changed[device_key] = None
+            
+            # Update statistics
+            if status == "connected":
+                self._discovery_stats['successful_connections'] += 1
+            elif status == "failed":
+                self._discovery_stats['failed_connections'] += 1
+            elif status == "filtered":
+                self._discovery_stats['filtered_devices'] += 1
+            elif status == "boundary":
+                self._discovery_stats['boundary_devices'] += 1
+            
+            self._discovery_stats['total_discovered'] = len(self._records)
+            inventory_size = len(self._records)
+        logger.debug("[INVENTORY ADD] Added device %s with status '%s' (inventory size %d)",
+                     device_key, status, inventory_size)
+    
+    def set_site_resolver(self, site_resolver: Optional[Callable[[str], Optional[str]]]):
+        """
+        Set the hostname to site mapping and re-index devices already stored
         
-        logger.info(f"[INVENTORY UPDATED] Device {device_key} added successfully. New inventory size: {len(self._devices)}")
-        logger.debug(f"Added device {device_key} with status {status}")
+        Args:
+            site_resolver: Maps a hostname to its site name, or None
+        """
+        with self._lock:
+            self._site_resolver = site_resolver
+            self._indexes['site'].clear()
+            for device_key, record in self._records.items():
+                record.site = self._resolve_site(record.info)
+                self._add_to_index('site', record.site, device_key)
     
     def get_device(self, device_key: str) -> Optional[Dict[str, Any]]:
-        """Get device information by key"""
-        return self._devices.get(device_key)
+        """Get device information by key (the summary for spilled devices)"""
+        record = self._records.get(device_key)
+        return record.info if record is not None else None
+    
+    def load_device(self, device_key: str) -> Optional[Dict[str, Any]]:
+        """Get full device information by key, reading spilled devices back"""
+        if self._spill is not None and device_key in self._spill:
+            return self._spill.read(device_key)
+        return self.get_device(device_key)
+    
+    def stream_devices(self) -> Mapping[str, Dict[str, Any]]:
+        """
+        Get all devices with full information for report generation
+        
+        Returns:
+            The get_all_devices snapshot, or in streaming mode a view that
+            reads one device at a time from the spill file
+        """
+        if self._spill is None:
+            return self.get_all_devices()
+        return StreamingInventoryView(self)
+    
+    def mark_changed(self, device_key: str):
+        """Report a device as changed again, e.g. after a failed checkpoint"""
+        with self._lock:
+            self._changed[device_key] = None
+    
+    def pop_changed_keys(self) -> List[str]:
+        """Get keys added or updated since the previous call, in order, and reset the list"""
+        with self._lock:
+            changed = list(self._changed)
+            self._changed.clear()
+            return changed
+    
+    def get_spill_stats(self) -> Optional[Dict[str, Any]]:
+        """Get spill file statistics, or None when not streaming"""
+        return self._spill.get_stats() if self._spill is not None else None
+    
+    def close(self):
+        """Release the spill file, if any"""
+        if self._spill is not None:
+            self._spill.close()
     
     def get_device_status(self, device_key: str) -> Optional[str]:
         """Get device status by key"""
-        return self._device_status.get(device_key)
+        record = self._records.get(device_key)
+        return record.status if record is not None else None
     
     def get_device_error(self, device_key: str) -> Optional[str]:
         """Get device error by key"""
-        return self._device_errors.get(device_key)
+        record = self._records.get(device_key)
+        return record.error if record is not None else None
     
     def has_device(self, device_key: str) -> bool:
         """Check if device exists in inventory"""
-        return device_key in self._devices
+        return device_key in self._records
     
-    def get_all_devices(self) -> Dict[str, Dict[str, Any]]:
-        """Get all devices in inventory"""
-        return self._devices.copy()
+    def get_device_count(self) -> int:
+        """Get number of devices in inventory"""
+        return len(self._records)
     
-    def get_devices_by_status(self, status: str) -> Dict[str, Dict[str, Any]]:
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def get_all_devices(self) -> Mapping[str, Dict[str, Any]]:
+        """
+        Get all devices in inventory
+        
+        Returns:
+            Read-only snapshot of device key to device information. The same
+            snapshot is returned until the inventory changes.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = MappingProxyType({key: record.info for key, record in self._records.items()})
+            return self._snapshot
+    
+    def get_devices_by_status(self, status: str) -> Mapping[str, Dict[str, Any]]:
         """Get all devices with specific status"""
-        return {
-            key: device for key, device in self._devices.items()
-            if self._device_status.get(key) == status
-        }
+        return self._lookup('status', status)
+    
+    def get_devices_by_site(self, site_name: str) -> Mapping[str, Dict[str, Any]]:
+        """Get all devices the site resolver assigned to site_name"""
+        return self._lookup('site', site_name)
+    
+    def get_devices_by_platform(self, platform: str) -> Mapping[str, Dict[str, Any]]:
+        """Get all devices with a platform (case-insensitive exact match)"""
+        return self._lookup('platform', platform.lower() if platform else platform)
+    
+    def get_devices_by_ip(self, ip_address: str) -> Mapping[str, Dict[str, Any]]:
+        """Get all devices whose primary or discovery IP address is ip_address"""
+        return self._lookup('ip_address', ip_address)
+    
+    def find_device_by_hostname(self, hostname: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Find the first device added with a hostname (case-insensitive)
+        
+        Args:
+            hostname: Device hostname
+            
+        Returns:
+            Tuple of (device key, device information), or None if not found
+        """
+        with self._lock:
+            keys = self._indexes['hostname'].get(hostname.upper() if hostname else None)
+            if not keys:
+                return None
+            device_key = next(iter(keys))
+            return device_key, self._records[device_key].info
+    
+    def get_sites(self) -> List[str]:
+        """Get site names with at least one device, in the order first seen"""
+        with self._lock:
+            return list(self._indexes['site'])
     
     def get_discovery_stats(self) -> Dict[str, int]:
         """Get discovery statistics"""
-        return self._discovery_stats.copy()
+        with self._lock:
+            return self._discovery_stats.copy()
+    
+    def _lookup(self, index_name: str, value: Any) -> Mapping[str, Dict[str, Any]]:
+        """Read-only view of the devices one index maps value to"""
+        with self._lock:
+            keys = self._indexes[index_name].get(value, ())
+            return MappingProxyType({key: self._records[key].info for key in keys})
+    
+    def _resolve_site(self, device_info: Dict[str, Any]) -> Optional[str]:
+        """Site name for a device, or None without a resolver or hostname"""
+        hostname = device_info.get('hostname')
+        if self._site_resolver is None or not hostname:
+            return None
+        return self._site_resolver(hostname)
+    
+    def _index(self, device_key: str, record: InventoryRecord):
+        """Add a record to every secondary index"""
+        for index_name in INVENTORY_INDEXES:
+            self._add_to_index(index_name, getattr(record, index_name), device_key)
+    
+    def _add_to_index(self, index_name: str, value: Any, device_key: str):
+        """Add a device key under value in one index"""
+        if value is not None:
+            self._indexes[index_name].setdefault(value, {})[device_key] = None
+    
+    def _unindex(self, device_key: str, record: InventoryRecord):
+        """Remove a record from every secondary index"""
+        for index_name in INVENTORY_INDEXES:
+            value = getattr(record, index_name)
+            if value is None:
+                continue
+            keys = self._indexes[index_name].get(value)
+            if keys is not None:
+                keys.pop(device_key, None)
+                if not keys:
+                    del self._indexes[index_name][value]
 
 
 class DiscoveryEngine:
@@ -153,11 +500,13 @@ class DiscoveryEngine:
     - Device filtering and boundary management
     - Comprehensive status tracking and reporting
     - Dynamic timeout reset for large network discovery
+    - Optional concurrent discovery, walking each depth level across a worker pool
     """
     
     def __init__(self, connection_manager: ConnectionManager, 
                  filter_manager: FilterManager, config: Dict[str, Any], credentials,
-                 db_manager=None):
+                 db_manager=None, thread_manager: Optional[ThreadManager] = None,
+                 dns_resolver: Optional[DNSResolver] = None):
         """
         Initialize DiscoveryEngine.
         
@@ -167,6 +516,8 @@ class DiscoveryEngine:
             config: Configuration dictionary
             credentials: Device authentication credentials
             db_manager: Optional database manager for inventory persistence
+            thread_manager: Optional worker pool used by concurrent discovery
+            dns_resolver: Optional shared resolver for neighbors reported without an IP
         """
         self.logger = logging.getLogger(__name__)
         self.connection_manager = connection_manager
@@ -180,10 +531,28 @@ class DiscoveryEngine:
         self.discovery_timeout = config.get('discovery_timeout_seconds', 300)
         self.initial_discovery_timeout = self.discovery_timeout  # Store original timeout
         
+        # Concurrent discovery walks each depth level across a worker pool
+        self.concurrent_discovery = config.get('concurrent_discovery', False)
+        self.thread_manager = thread_manager
+        
         # Initialize components
+        self.dns_resolver = dns_resolver or DNSResolver.from_config(config)
         self.protocol_parser = ProtocolParser()
-        self.device_collector = DeviceCollector(config)
-        self.inventory = DeviceInventory()
+        self.device_collector = DeviceCollector(config, self.dns_resolver)
+        # Streaming mode spills full device results to disk as devices complete
+        self.stream_results = config.get('stream_results', False)
+        spill = ResultSpill(config.get('spill_directory') or None) if self.stream_results else None
+        self.inventory = DeviceInventory(spill=spill)
+        
+        # Incremental rediscovery compares each device probe with its last walk in the database
+        self.change_detector = None
+        if config.get('incremental_discovery', False):
+            if db_manager and db_manager.enabled:
+                self.change_detector = DeviceChangeDetector(db_manager)
+                self.device_collector.change_detector = self.change_detector
+                logger.info("Incremental discovery enabled - unchanged devices skip stack and VLAN collection")
+            else:
+                logger.warning("Incremental discovery requires the database - every device will be fully refreshed")
         
         # Site collection integration
         # Get site boundary pattern - handle multiple config formats for compatibility
@@ -239,12 +608,16 @@ class DiscoveryEngine:
             else:
                 logger.info("Site collection disabled by configuration - using global collection mode")
         
+        # Index inventory devices by the site their hostname maps to
+        if pattern_allows_site_collection:
+            self.inventory.set_site_resolver(self._site_for_hostname)
+        
         # Site collection state
         self.site_boundaries: Dict[str, List[str]] = {}
         self.site_collection_results: Dict[str, Dict[str, Any]] = {}
         
         # Discovery state
-        self.discovery_queue: deque[DiscoveryNode] = deque()
+        self.discovery_queue: DiscoveryQueue = DiscoveryQueue()
         self.discovered_devices: Set[str] = set()
         self.failed_devices: Set[str] = set()
         
@@ -254,15 +627,33 @@ class DiscoveryEngine:
         self.new_devices_discovered = 0  # Track newly discovered devices
         self.progress_enabled = config.get('enable_progress_tracking', True)
         
+        # Per-device and per-neighbor decision lines are logged at INFO only when
+        # the verbosity profile asks for them, otherwise at DEBUG
+        verbosity = config.get('discovery_log_verbosity', 'summary')
+        if verbosity not in DISCOVERY_LOG_VERBOSITY:
+            logger.warning(f"Unknown discovery_log_verbosity '{verbosity}' - using 'summary'")
+            verbosity = 'summary'
+        self.device_log_level = logging.INFO if verbosity in ('device', 'neighbor') else logging.DEBUG
+        self.neighbor_log_level = logging.INFO if verbosity == 'neighbor' else logging.DEBUG
+        
         # Queue progress tracking
         self.total_queued = 0  # Total devices added to queue (after dedupe)
         self.total_completed = 0  # Total devices completed (removed from queue)
         
         # Timeout management for large networks
-        self.discovery_start_time: Optional[float] = None
+        self.discovery_start_time: Optional[float] = None  # Moved forward by timeout resets
+        self.run_start_time: Optional[float] = None  # Start of this run, never reset
         self.timeout_resets: int = 0
         self.devices_added_since_reset: int = 0
         
+        # Checkpoints of queue, visited set and inventory for --resume
+        checkpoint_file = config.get('checkpoint_file')
+        self.checkpoint_interval = config.get('checkpoint_interval_seconds', 300)
+        self.checkpoint = DiscoveryCheckpoint(checkpoint_file) if checkpoint_file and self.checkpoint_interval > 0 else None
+        self.resume_discovery = config.get('resume_discovery', False)
+        self.last_checkpoint_time: Optional[float] = None
+        self.resumed_elapsed_seconds = 0.0  # Discovery time spent before the run was resumed
+        
         logger.info(f"DiscoveryEngine initialized with max_depth={self.max_depth}, "
                    f"timeout={self.discovery_timeout}s")
     
@@ -295,71 +686,33 @@ class DiscoveryEngine:
         Returns:
             Discovery results summary
         """
-        self.discovery_start_time = time.time()
+        self.discovery_start_time = self.run_start_time = time.time()
         logger.info("Starting network topology discovery")
         
+        # Answer per-device platform and failure lookups from one preloaded query
+        if self.db_manager and self.db_manager.enabled:
+            self.db_manager.load_metadata_cache()
+        
+        self._start_checkpointing()
+        
         try:
             logger.info(f"[DISCOVERY LOOP] Starting discovery with {len(self.discovery_queue)} devices in queue")
             
-            while self.discovery_queue:
-                current_time = time.time()
-                elapsed_time = current_time - self.discovery_start_time
-                
-                # Check if we've exceeded the discovery timeout
-                if elapsed_time >= self.discovery_timeout:
-                    logger.warning(f"Discovery timeout reached after {elapsed_time:.2f}s (limit: {self.discovery_timeout}s)")
-                    logger.info(f"Timeout resets performed: {self.timeout_resets}")
-                    break
-                
-                current_node = self.discovery_queue.popleft()
-                
-                logger.info(f"[QUEUE] Processing device {current_node.device_key} from queue (depth {current_node.depth})")
-                logger.info(f"  Queue remaining: {len(self.discovery_queue)} devices")
-                logger.info(f"  Elapsed time: {elapsed_time:.2f}s / {self.discovery_timeout}s")
-                
-                # Skip if already discovered
-                if current_node.device_key in self.discovered_devices:
-                    logger.info(f"  [SKIPPED] {current_node.device_key} already discovered")
-                    continue
-                
-                # Check depth limit
-                if current_node.depth > self.max_depth:
-                    logger.info(f"  [DEPTH LIMIT] Skipping {current_node.device_key} - depth {current_node.depth} exceeds max_depth {self.max_depth}")
-                    continue
-                
-                # Discover device
-                self._discover_device(current_node)
-                
-                # Update completed count after device is processed
-                self.total_completed += 1
-                
-                # Monitor connection status periodically
-                if self.devices_processed % 10 == 0:  # Every 10 devices
-                    active_connections = self.connection_manager.get_active_connection_count()
-                    if active_connections > 0:
-                        logger.warning(f"[CONNECTION LEAK] {active_connections} connections still active after device processing")
-                        self.connection_manager.log_connection_status()
-                        
-                        # If we have too many leaked connections, try to clean them up
-                        if active_connections > 5:
-                            logger.error(f"[CONNECTION LEAK CRITICAL] {active_connections} leaked connections detected - attempting cleanup")
-                            try:
-                                self.connection_manager.close_all_connections()
-                                remaining = self.connection_manager.get_active_connection_count()
-                                if remaining > 0:
-                                    logger.error(f"[CONNECTION LEAK CLEANUP] {remaining} connections still remain after cleanup attempt")
-                                else:
-                                    logger.info("[CONNECTION LEAK CLEANUP] All leaked connections successfully cleaned up")
-                            except Exception as cleanup_error:
-                                logger.error(f"[CONNECTION LEAK CLEANUP] Cleanup failed: {cleanup_error}")
-                
-                # Update progress after processing device
-                self.devices_processed += 1
-                self._update_progress_display()
+            if self.concurrent_discovery:
+                self._run_concurrent_discovery()
+            else:
+                self._run_serial_discovery()
             
             # Handle completion
             if not self.discovery_queue:
                 logger.info(f"[DISCOVERY COMPLETE] Queue empty - all devices processed")
+                if self.checkpoint:
+                    self.checkpoint.clear()
+            elif self.checkpoint:
+                # Stopped by the discovery timeout - keep the remaining queue for --resume
+                self.save_checkpoint()
+                logger.warning(f"[CHECKPOINT] {len(self.discovery_queue)} devices left in queue - "
+                               f"run with --resume to continue")
             
             # After main discovery, perform site-specific collection if enabled
             if self.site_collection_enabled and self.site_collection_manager and self.site_boundary_pattern is not None:
@@ -377,7 +730,7 @@ class DiscoveryEngine:
             logger.error(f"Discovery engine error: {e}")
             raise
         
-        discovery_time = time.time() - self.discovery_start_time
+        discovery_time = time.time() - self.run_start_time + self.resumed_elapsed_seconds
         
         # Final connection status check and cleanup
         active_connections = self.connection_manager.get_active_connection_count()
@@ -403,6 +756,16 @@ class DiscoveryEngine:
         
         results = self._generate_discovery_summary(discovery_time)
         
+        dns_stats = results['dns_stats']
+        logger.info(f"[DNS] {dns_stats['lookups']} lookups ({dns_stats['failures']} failed), "
+                   f"{dns_stats['cache_hits'] + dns_stats['negative_hits']} answered from cache, "
+                   f"avg {dns_stats['avg_latency_ms']:.1f}ms, max {dns_stats['max_latency_ms']:.1f}ms")
+        
+        cache_stats = results.get('metadata_cache_stats')
+        if cache_stats:
+            logger.info(f"[METADATA CACHE] {cache_stats['lookups']} lookups served from memory, "
+                       f"hit rate {cache_stats['hit_rate']:.1%}, {cache_stats['updates']} updates")
+        
         logger.info(f"Discovery completed in {discovery_time:.2f}s - "
                    f"Found {results['total_devices']} devices "
                    f"({results['new_devices']} new), "
@@ -410,6 +773,319 @@ class DiscoveryEngine:
         
         return results
     
+    def _run_serial_discovery(self):
+        """Process the discovery queue one device at a time"""
+        while self.discovery_queue:
+            current_time = time.time()
+            elapsed_time = current_time - self.discovery_start_time
+            
+            # Check if we've exceeded the discovery timeout
+            if elapsed_time >= self.discovery_timeout:
+                logger.warning(f"Discovery timeout reached after {elapsed_time:.2f}s (limit: {self.discovery_timeout}s)")
+                logger.info(f"Timeout resets performed: {self.timeout_resets}")
+                break
+            
+            current_node = self.discovery_queue.popleft()
+            
+            logger.log(self.device_log_level,
+                       "[QUEUE] Processing device %s (depth %d), %d remaining, elapsed %.2fs / %ds",
+                       current_node.device_key, current_node.depth, len(self.discovery_queue),
+                       elapsed_time, self.discovery_timeout)
+            
+            # Skip if already discovered
+            if current_node.device_key in self.discovered_devices:
+                logger.log(self.device_log_level, "  [SKIPPED] %s already discovered", current_node.device_key)
+                continue
+            
+            # Check depth limit
+            if current_node.depth > self.max_depth:
+                logger.log(self.device_log_level, "  [DEPTH LIMIT] Skipping %s - depth %d exceeds max_depth %d",
+                           current_node.device_key, current_node.depth, self.max_depth)
+                continue
+            
+            # Discover device
+            self._discover_device(current_node)
+            
+            # Update completed count after device is processed
+            self.total_completed += 1
+            
+            # Monitor connection status periodically
+            if self.devices_processed % 10 == 0:  # Every 10 devices
+                self._check_connection_leaks()
+            
+            # Update progress after processing device
+            self.devices_processed += 1
+            self._update_progress_display()
+            
+            self._checkpoint_if_due()
+    
+    def _run_concurrent_discovery(self):
+        """
+        Process the discovery queue one depth level at a time across a worker pool.
+        
+        Only the connect-and-collect step runs on worker threads. Pre-connection
+        checks, inventory and database updates and neighbor queueing stay on this
+        thread and run in queue order, so each depth level queues its neighbors in
+        the same order serial discovery would.
+        """
+        thread_manager = self.thread_manager
+        owns_thread_manager = thread_manager is None
+        if owns_thread_manager:
+            thread_manager = ThreadManager(self.config)
+        thread_manager.start()
+        
+        logger.info(f"[CONCURRENT DISCOVERY] Walking each depth level with up to "
+                   f"{thread_manager.max_concurrent_connections} concurrent devices")
+        
+        try:
+            while self.discovery_queue:
+                elapsed_time = time.time() - self.discovery_start_time
+                
+                # Check if we've exceeded the discovery timeout
+                if elapsed_time >= self.discovery_timeout:
+                    logger.warning(f"Discovery timeout reached after {elapsed_time:.2f}s (limit: {self.discovery_timeout}s)")
+                    logger.info(f"Timeout resets performed: {self.timeout_resets}")
+                    break
+                
+                level_nodes = self._next_discovery_level()
+                ready_nodes = []
+                
+                for node in level_nodes:
+                    # Skip if already discovered
+                    if node.device_key in self.discovered_devices:
+                        logger.log(self.device_log_level, "  [SKIPPED] %s already discovered", node.device_key)
+                        continue
+                    
+                    # Check depth limit
+                    if node.depth > self.max_depth:
+                        logger.log(self.device_log_level, "  [DEPTH LIMIT] Skipping %s - depth %d exceeds max_depth %d",
+                                   node.device_key, node.depth, self.max_depth)
+                        continue
+                    
+                    try:
+                        if self._prepare_device_discovery(node):
+                            ready_nodes.append(node)
+                            continue
+                    except Exception as e:
+                        self._record_discovery_error(node, e)
+                    
+                    self._complete_device()
+                
+                if not ready_nodes:
+                    continue
+                
+                logger.info(f"[CONCURRENT DISCOVERY] Connecting to {len(ready_nodes)} devices at depth {ready_nodes[0].depth} "
+                           f"({len(self.discovery_queue)} remaining in queue)")
+                
+                tasks = [
+                    ThreadTask(
+                        task_id=node.device_key,
+                        hostname=node.hostname,
+                        ip_address=node.ip_address,
+                        task_function=self._connect_and_discover_before_timeout,
+                        task_args=(node,),
+                        task_kwargs={}
+                    )
+                    for node in ready_nodes
+                ]
+                thread_results = thread_manager.run_tasks(tasks)
+                
+                # Record results in queue order, not completion order
+                deferred_nodes = []
+                for node, thread_result in zip(ready_nodes, thread_results):
+                    if thread_result.success and thread_result.result is None:
+                        # Timeout reached before a worker picked this device up
+                        deferred_nodes.append(node)
+                        continue
+                    
+                    if thread_result.success:
+                        discovery_result = thread_result.result
+                    else:
+                        discovery_result = DiscoveryResult(
+                            hostname=node.hostname,
+                            ip_address=node.ip_address,
+                            device_info={},
+                            neighbors=[],
+                            success=False,
+                            error_message=thread_result.error
+                        )
+                    
+                    try:
+                        self._record_discovery_result(node, discovery_result)
+                    except Exception as e:
+                        self._record_discovery_error(node, e)
+                    
+                    self._complete_device()
+                
+                # Leave devices that never started in the queue for the summary
+                if deferred_nodes:
+                    for node in deferred_nodes:
+                        self.discovered_devices.discard(node.device_key)
+                        # Reloaded when the node is prepared again; not checkpointable
+                        node.last_walk = None
+                    self.discovery_queue.extendleft(reversed(deferred_nodes))
+                    logger.warning(f"[CONCURRENT DISCOVERY] {len(deferred_nodes)} devices not started before discovery timeout")
+                
+                self._check_connection_leaks()
+                self._checkpoint_if_due()
+        
+        finally:
+            if owns_thread_manager:
+                thread_manager.stop(wait=True)
+    
+    def _start_checkpointing(self):
+        """Restore the saved checkpoint for --resume, or discard a stale one"""
+        if not self.checkpoint:
+            return
+        
+        if self.resume_discovery:
+            if self.checkpoint.exists():
+                self._restore_checkpoint()
+            else:
+                logger.warning(f"[CHECKPOINT] --resume given but no checkpoint found at {self.checkpoint.path} - "
+                               f"starting a new discovery")
+        elif self.checkpoint.exists():
+            logger.info(f"[CHECKPOINT] Discarding checkpoint from a previous run (use --resume to continue it)")
+            self.checkpoint.clear()
+        
+        self.last_checkpoint_time = time.time()
+    
+    def _checkpoint_if_due(self):
+        """Save a checkpoint when checkpoint_interval_seconds have passed since the last one"""
+        if self.checkpoint and time.time() - self.last_checkpoint_time >= self.checkpoint_interval:
+            self.save_checkpoint()
+    
+    def save_checkpoint(self):
+        """
+        Save queue, visited set, changed inventory entries and counters.
+        
+        Called between devices (serial) or depth levels (concurrent), where
+        every visited device has its inventory entry.
+        """
+        if not self.checkpoint:
+            return
+        
+        changed_keys = self.inventory.pop_changed_keys()
+        devices = (
+            (key, self.inventory.get_device_status(key), self.inventory.get_device_error(key),
+             self.inventory.load_device(key))
+            for key in changed_keys
+        )
+        counters = {
+            'total_queued': self.total_queued,
+            'total_completed': self.total_completed,
+            'total_devices_discovered': self.total_devices_discovered,
+            'devices_processed': self.devices_processed,
+            'new_devices_discovered': self.new_devices_discovered,
+            'timeout_resets': self.timeout_resets,
+            'elapsed_seconds': time.time() - self.run_start_time + self.resumed_elapsed_seconds
+        }
+        try:
+            self.checkpoint.save([asdict(node) for node in self.discovery_queue], self.discovered_devices,
+                                 self.failed_devices, devices, counters)
+        except Exception as e:
+            logger.error(f"[CHECKPOINT] Failed to save checkpoint {self.checkpoint.path}: {e}")
+            # Write these entries again with the next checkpoint
+            for key in changed_keys:
+                self.inventory.mark_changed(key)
+        self.last_checkpoint_time = time.time()
+    
+    def _restore_checkpoint(self):
+        """Replace the seeded queue with the state saved in the checkpoint"""
+        state = self.checkpoint.load()
+        
+        self.discovery_queue = DiscoveryQueue(DiscoveryNode(**node) for node in state['queue'])
+        self.discovered_devices = state['discovered']
+        self.failed_devices = state['failed']
+        for device_key, status, error, device_info in state['devices']:
+            self.inventory.add_device(device_key, device_info, status, error)
+        # Restored entries are already in the checkpoint file
+        self.inventory.pop_changed_keys()
+        
+        counters = state['counters']
+        self.total_queued = counters.get('total_queued', len(self.discovery_queue))
+        self.total_completed = counters.get('total_completed', 0)
+        self.total_devices_discovered = counters.get('total_devices_discovered', 0)
+        self.devices_processed = counters.get('devices_processed', 0)
+        self.new_devices_discovered = counters.get('new_devices_discovered', 0)
+        self.timeout_resets = counters.get('timeout_resets', 0)
+        self.resumed_elapsed_seconds = counters.get('elapsed_seconds', 0.0)
+        
+        logger.info(f"[CHECKPOINT] Resumed from {self.checkpoint.path}: {len(self.discovered_devices)} devices "
+                    f"already visited, {len(self.discovery_queue)} queued, "
+                    f"{self.resumed_elapsed_seconds:.0f}s of discovery time carried over")
+    
+    def _next_discovery_level(self) -> List[DiscoveryNode]:
+        """
+        Pop the run of queued nodes that share the depth of the queue head.
+        
+        Nodes that would reuse a connection target already in the batch are left
+        at the front of the queue, since connections are tracked per target.
+        
+        Returns:
+            Nodes to walk concurrently, in queue order
+        """
+        depth = self.discovery_queue[0].depth
+        level_nodes = []
+        deferred_nodes = []
+        targets: Set[str] = set()
+        
+        while self.discovery_queue and self.discovery_queue[0].depth == depth:
+            node = self.discovery_queue.popleft()
+            target = node.ip_address if node.ip_address else node.hostname
+            if target in targets:
+                deferred_nodes.append(node)
+            else:
+                targets.add(target)
+                level_nodes.append(node)
+        
+        self.discovery_queue.extendleft(reversed(deferred_nodes))
+        return level_nodes
+    
+    def _connect_and_discover_before_timeout(self, node: DiscoveryNode) -> Optional[DiscoveryResult]:
+        """
+        Worker entry point for concurrent discovery.
+        
+        Args:
+            node: Discovery node
+            
+        Returns:
+            Discovery result, or None if the discovery timeout passed before the
+            worker started on this device
+        """
+        if time.time() - self.discovery_start_time >= self.discovery_timeout:
+            return None
+        
+        # Database access stays on the coordinating thread; the platform hint
+        # was already filled in from the database by _prepare_device_discovery
+        return self._connect_and_discover(node, db_lookup=False)
+    
+    def _complete_device(self):
+        """Update completion counters and progress after a device is processed"""
+        self.total_completed += 1
+        self.devices_processed += 1
+        self._update_progress_display()
+    
+    def _check_connection_leaks(self):
+        """Log and clean up connections left open after device processing"""
+        active_connections = self.connection_manager.get_active_connection_count()
+        if active_connections > 0:
+            logger.warning(f"[CONNECTION LEAK] {active_connections} connections still active after device processing")
+            self.connection_manager.log_connection_status()
+            
+            # If we have too many leaked connections, try to clean them up
+            if active_connections > 5:
+                logger.error(f"[CONNECTION LEAK CRITICAL] {active_connections} leaked connections detected - attempting cleanup")
+                try:
+                    self.connection_manager.close_all_connections()
+                    remaining = self.connection_manager.get_active_connection_count()
+                    if remaining > 0:
+                        logger.error(f"[CONNECTION LEAK CLEANUP] {remaining} connections still remain after cleanup attempt")
+                    else:
+                        logger.info("[CONNECTION LEAK CLEANUP] All leaked connections successfully cleaned up")
+                except Exception as cleanup_error:
+                    logger.error(f"[CONNECTION LEAK CLEANUP] Cleanup failed: {cleanup_error}")
+    
     def _discover_device(self, node: DiscoveryNode):
         """
         Discover a single device and add neighbors to queue.
@@ -417,191 +1093,232 @@ class DiscoveryEngine:
         Args:
             node: Discovery node to process
         """
+        try:
+            if not self._prepare_device_discovery(node):
+                return
+            
+            # Attempt connection and discovery
+            logger.log(self.device_log_level, "  [CONNECTING] Attempting connection to %s", node.device_key)
+            discovery_result = self._connect_and_discover(node)
+            
+            self._record_discovery_result(node, discovery_result)
+        
+        except Exception as e:
+            self._record_discovery_error(node, e)
+    
+    def _prepare_device_discovery(self, node: DiscoveryNode) -> bool:
+        """
+        Run pre-connection checks for a device and mark it as discovered.
+        
+        Devices that are filtered or skipped are recorded in the inventory here.
+        
+        Args:
+            node: Discovery node to process
+            
+        Returns:
+            True if the device should be connected to, False otherwise
+        """
         device_key = node.device_key
-        logger.info(f"[DISCOVERY DECISION] Processing device {device_key} at depth {node.depth}")
-        logger.info(f"  Device details: hostname='{node.hostname}', ip='{node.ip_address}', parent='{node.parent_device}'")
-        logger.info(f"  Discovery state: discovered_devices={len(self.discovered_devices)}, queue_size={len(self.discovery_queue)}")
+        level = self.device_log_level
+        if logger.isEnabledFor(level):
+            logger.log(level, "[DISCOVERY DECISION] Processing device %s at depth %d (parent '%s')",
+                       device_key, node.depth, node.parent_device)
+            logger.log(level, "  Discovery state: discovered_devices=%d, queue_size=%d",
+                       len(self.discovered_devices), len(self.discovery_queue))
         
         # Special debugging for LUMT-CORE-A and similar NEXUS devices
-        if 'LUMT' in node.hostname.upper() or 'CORE' in node.hostname.upper():
+        if logger.isEnabledFor(self.neighbor_log_level) and (
+                'LUMT' in node.hostname.upper() or 'CORE' in node.hostname.upper()):
             self._debug_nexus_device_processing(node)
         
-        try:
-            # Check if already in discovered set (this should not happen if queue logic is correct)
-            if device_key in self.discovered_devices:
-                logger.warning(f"  [ALREADY DISCOVERED] Device {device_key} is already in discovered_devices set - this should not happen!")
-                logger.warning(f"    Discovered devices: {list(self.discovered_devices)}")
-                return
+        # Check if already in discovered set (this should not happen if queue logic is correct)
+        if device_key in self.discovered_devices:
+            logger.warning(f"  [ALREADY DISCOVERED] Device {device_key} is already in discovered_devices set - this should not happen!")
+            return False
+        
+        # Mark as discovered to prevent loops
+        self.discovered_devices.add(device_key)
+        
+        # For initial device discovery, we only have hostname and IP
+        # Platform and capabilities will be checked during neighbor processing
+        if self.filter_manager.should_filter_device(node.hostname, node.ip_address):
+            logger.log(level, "  [FILTERED] Device %s will be marked as boundary (not discovered)", device_key)
+            self.filter_manager.mark_as_boundary(node.hostname, node.ip_address, "Filtered device")
+            
+            # Add to inventory as filtered with skip reason
+            device_info = self._create_basic_device_info(node, "filtered")
+            device_info['skip_reason'] = "Filtered by hostname or IP address pattern"
+            self.inventory.add_device(device_key, device_info, "filtered")
+            return False
+        
+        logger.log(level, "  [NOT FILTERED] Device %s passed initial filtering (hostname/IP only)", device_key)
+        
+        # Pre-connection filter: look up platform/capabilities from database
+        # This catches devices like PAN-OS firewalls that are excluded by platform
+        # but can't be filtered by hostname/IP alone
+        if self.db_manager and self.db_manager.enabled:
+            db_platform = self.db_manager.get_device_platform(node.hostname)
+            if not db_platform:
+                db_platform = self.db_manager.get_device_platform(node.ip_address)
             
-            # Mark as discovered to prevent loops
-            self.discovered_devices.add(device_key)
-            logger.info(f"  [MARKED DISCOVERED] Added {device_key} to discovered_devices set")
-            
-            # Check if device should be filtered
-            logger.info(f"  [CHECKING] if device {device_key} should be filtered...")
-            # For initial device discovery, we only have hostname and IP
-            # Platform and capabilities will be checked during neighbor processing
-            if self.filter_manager.should_filter_device(node.hostname, node.ip_address):
-                logger.info(f"  [FILTERED] Device {device_key} will be marked as boundary (not discovered)")
-                self.filter_manager.mark_as_boundary(node.hostname, node.ip_address, "Filtered device")
+            if db_platform:
+                logger.log(level, "  [DB LOOKUP] Found platform '%s' for %s in database", db_platform, device_key)
+                # Reuse the database platform as the connection hint so PAN-OS
+                # detection does not need another lookup
+                if not node.platform:
+                    node.platform = db_platform
+                if self.filter_manager.should_filter_device(
+                    node.hostname, node.ip_address, db_platform, None
+                ):
+                    logger.log(level, "  [FILTERED BY DB PLATFORM] Device %s filtered - platform '%s' is excluded",
+                               device_key, db_platform)
+                    self.filter_manager.mark_as_boundary(
+                        node.hostname, node.ip_address,
+                        f"Filtered by database platform: {db_platform}"
+                    )
+                    device_info = self._create_basic_device_info(node, "filtered")
+                    device_info['platform'] = db_platform
+                    device_info['skip_reason'] = f"Filtered by platform ({db_platform}) from database lookup"
+                    self.inventory.add_device(device_key, device_info, "filtered")
+                    return False
+            else:
+                logger.log(level, "  [DB LOOKUP] No platform found for %s in database", device_key)
+        
+        # Check connection failure threshold if database is enabled
+        connection_config = self.config.get('connection', {})
+        skip_after_failures = getattr(connection_config, 'skip_after_failures', 3) if hasattr(connection_config, 'skip_after_failures') else connection_config.get('skip_after_failures', 3)
+        
+        # CLI --ignore-failures overrides skip_after_failures
+        if self.config.get('ignore_failures', False):
+            skip_after_failures = 0
+        
+        if self.db_manager and self.db_manager.enabled and skip_after_failures > 0:
+            failure_count = self.db_manager.get_connection_failures(node.hostname)
+            if failure_count >= skip_after_failures:
+                logger.warning(f"  [SKIPPED] Device {device_key} has {failure_count} connection failures (threshold: {skip_after_failures})")
+                
+                # Add to inventory as skipped with failure reason
+                device_info = self._create_basic_device_info(node, "skipped")
+                device_info['skip_reason'] = f"Exceeded connection failure threshold ({failure_count} failures, limit: {skip_after_failures})"
+                self.inventory.add_device(device_key, device_info, "skipped")
+                return False
+        
+        # Load the last walk here so workers compare against it without touching the database
+        if self.change_detector is not None:
+            node.last_walk = self.change_detector.load_last_walk(node.hostname)
+        
+        return True
+    
+    def _record_discovery_result(self, node: DiscoveryNode, discovery_result: DiscoveryResult):
+        """
+        Record a connection result in inventory and database and queue neighbors.
+        
+        Args:
+            node: Discovery node that was processed
+            discovery_result: Result from _connect_and_discover
+        """
+        device_key = node.device_key
+        level = self.device_log_level
+        
+        if discovery_result.success:
+            # Now we have platform and capabilities, do a full filter check
+            device_platform = discovery_result.device_info.get('platform')
+            device_capabilities = discovery_result.device_info.get('capabilities', [])
+            
+            logger.log(level, "  [SUCCESS] Connected to %s - platform: %s, capabilities: %s",
+                       device_key, device_platform, device_capabilities)
+            
+            if self.filter_manager.should_filter_device(
+                node.hostname, node.ip_address, device_platform, device_capabilities
+            ):
+                logger.log(level, "  [FILTERED AFTER CONNECTION] Device %s filtered based on platform/capabilities",
+                           device_key)
+                self.filter_manager.mark_as_boundary(
+                    node.hostname, node.ip_address, 
+                    f"Filtered after connection - platform: {device_platform}, capabilities: {device_capabilities}"
+                )
                 
                 # Add to inventory as filtered with skip reason
                 device_info = self._create_basic_device_info(node, "filtered")
-                device_info['skip_reason'] = "Filtered by hostname or IP address pattern"
+                device_info.update({
+                    'platform': device_platform,
+                    'capabilities': device_capabilities,
+                    'filter_reason': 'Filtered after connection based on platform/capabilities',
+                    'skip_reason': f"Filtered by platform ({device_platform}) or capabilities ({', '.join(device_capabilities) if device_capabilities else 'none'})"
+                })
                 self.inventory.add_device(device_key, device_info, "filtered")
-                logger.info(f"  [INVENTORY] Added {device_key} to inventory as FILTERED")
                 return
             
-            logger.info(f"  [NOT FILTERED] Device {device_key} passed initial filtering (hostname/IP only)")
-            
-            # Pre-connection filter: look up platform/capabilities from database
-            # This catches devices like PAN-OS firewalls that are excluded by platform
-            # but can't be filtered by hostname/IP alone
+            # Reset connection failures on successful connection
             if self.db_manager and self.db_manager.enabled:
-                db_platform = self.db_manager.get_device_platform(node.hostname)
-                if not db_platform:
-                    db_platform = self.db_manager.get_device_platform(node.ip_address)
-                
-                if db_platform:
-                    logger.info(f"  [DB LOOKUP] Found platform '{db_platform}' for {device_key} in database")
-                    if self.filter_manager.should_filter_device(
-                        node.hostname, node.ip_address, db_platform, None
-                    ):
-                        logger.info(f"  [FILTERED BY DB PLATFORM] Device {device_key} filtered - platform '{db_platform}' is excluded")
-                        self.filter_manager.mark_as_boundary(
-                            node.hostname, node.ip_address,
-                            f"Filtered by database platform: {db_platform}"
-                        )
-                        device_info = self._create_basic_device_info(node, "filtered")
-                        device_info['platform'] = db_platform
-                        device_info['skip_reason'] = f"Filtered by platform ({db_platform}) from database lookup"
-                        self.inventory.add_device(device_key, device_info, "filtered")
-                        logger.info(f"  [INVENTORY] Added {device_key} to inventory as FILTERED (pre-connection DB lookup)")
-                        return
-                else:
-                    logger.info(f"  [DB LOOKUP] No platform found for {device_key} in database")
+                self.db_manager.reset_connection_failures(node.hostname)
+                logger.debug("  [CONNECTION SUCCESS] Reset failure count for %s", device_key)
             
-            # Check connection failure threshold if database is enabled
-            connection_config = self.config.get('connection', {})
-            skip_after_failures = getattr(connection_config, 'skip_after_failures', 3) if hasattr(connection_config, 'skip_after_failures') else connection_config.get('skip_after_failures', 3)
+            # Add device to inventory
+            self.inventory.add_device(
+                device_key, 
+                discovery_result.device_info, 
+                "connected"
+            )
             
-            # CLI --ignore-failures overrides skip_after_failures
-            if self.config.get('ignore_failures', False):
-                skip_after_failures = 0
+            # Process device discovery in database if enabled
+            if self.db_manager and self.db_manager.enabled:
+                try:
+                    success, is_new_device = self.db_manager.process_device_discovery(discovery_result.device_info)
+                    if success:
+                        logger.log(level, "  [DATABASE] Stored %s in database%s",
+                                   device_key, " (new device)" if is_new_device else "")
+                        if is_new_device:
+                            self.new_devices_discovered += 1
+                    else:
+                        logger.warning(f"  [DATABASE] Failed to store {device_key} in database")
+                except Exception as db_error:
+                    logger.error(f"  [DATABASE] Error storing {device_key}: {db_error}")
             
-            if self.db_manager and self.db_manager.enabled and skip_after_failures > 0:
-                failure_count = self.db_manager.get_connection_failures(node.hostname)
-                if failure_count >= skip_after_failures:
-                    logger.warning(f"  [SKIPPED] Device {device_key} has {failure_count} connection failures (threshold: {skip_after_failures})")
-                    
-                    # Add to inventory as skipped with failure reason
-                    device_info = self._create_basic_device_info(node, "skipped")
-                    device_info['skip_reason'] = f"Exceeded connection failure threshold ({failure_count} failures, limit: {skip_after_failures})"
-                    self.inventory.add_device(device_key, device_info, "skipped")
-                    logger.info(f"  [INVENTORY] Added {device_key} to inventory as SKIPPED (too many failures)")
-                    return
+            # Process neighbors for further discovery
+            logger.log(level, "  [PROCESSING NEIGHBORS] Evaluating %d neighbors of %s",
+                       len(discovery_result.neighbors), device_key)
             
-            # Attempt connection and discovery
-            logger.info(f"  [CONNECTING] Attempting connection to {device_key}")
-            discovery_result = self._connect_and_discover(node)
+            # Special debugging for NEXUS devices
+            if logger.isEnabledFor(self.neighbor_log_level) and (
+                    'LUMT' in node.hostname.upper() or 'CORE' in node.hostname.upper()):
+                self._debug_nexus_neighbor_processing(node, discovery_result.neighbors)
             
-            if discovery_result.success:
-                logger.info(f"  [SUCCESS] Connected to {device_key} - adding to inventory and processing neighbors")
-                
-                # Now we have platform and capabilities, do a full filter check
-                device_platform = discovery_result.device_info.get('platform')
-                device_capabilities = discovery_result.device_info.get('capabilities', [])
-                
-                logger.info(f"  [FULL FILTER CHECK] Re-evaluating {device_key} with complete device info")
-                logger.info(f"    Platform: {device_platform}, Capabilities: {device_capabilities}")
-                
-                if self.filter_manager.should_filter_device(
-                    node.hostname, node.ip_address, device_platform, device_capabilities
-                ):
-                    logger.info(f"  [FILTERED AFTER CONNECTION] Device {device_key} filtered based on platform/capabilities")
-                    self.filter_manager.mark_as_boundary(
-                        node.hostname, node.ip_address, 
-                        f"Filtered after connection - platform: {device_platform}, capabilities: {device_capabilities}"
-                    )
-                    
-                    # Add to inventory as filtered with skip reason
-                    device_info = self._create_basic_device_info(node, "filtered")
-                    device_info.update({
-                        'platform': device_platform,
-                        'capabilities': device_capabilities,
-                        'filter_reason': 'Filtered after connection based on platform/capabilities',
-                        'skip_reason': f"Filtered by platform ({device_platform}) or capabilities ({', '.join(device_capabilities) if device_capabilities else 'none'})"
-                    })
-                    self.inventory.add_device(device_key, device_info, "filtered")
-                    logger.info(f"  [INVENTORY] Added {device_key} to inventory as FILTERED (post-connection)")
-                    return
-                
-                logger.info(f"  [PASSED FULL FILTER] Device {device_key} passed complete filtering - adding to inventory")
-                
-                # Reset connection failures on successful connection
-                if self.db_manager and self.db_manager.enabled:
-                    self.db_manager.reset_connection_failures(node.hostname)
-                    logger.debug(f"  [CONNECTION SUCCESS] Reset failure count for {device_key}")
-                
-                # Add device to inventory
-                self.inventory.add_device(
-                    device_key, 
-                    discovery_result.device_info, 
-                    "connected"
-                )
-                logger.info(f"  [INVENTORY] Added {device_key} to inventory as CONNECTED")
-                
-                # Process device discovery in database if enabled
-                if self.db_manager and self.db_manager.enabled:
-                    logger.info(f"  [DATABASE] Processing device {device_key} for database storage")
-                    try:
-                        success, is_new_device = self.db_manager.process_device_discovery(discovery_result.device_info)
-                        if success:
-                            logger.info(f"  [DATABASE] Successfully stored {device_key} in database")
-                            if is_new_device:
-                                self.new_devices_discovered += 1
-                                logger.info(f"  [DATABASE] New device discovered: {device_key}")
-                        else:
-                            logger.warning(f"  [DATABASE] Failed to store {device_key} in database")
-                    except Exception as db_error:
-                        logger.error(f"  [DATABASE] Error storing {device_key}: {db_error}")
-                
-                # Process neighbors for further discovery
-                logger.info(f"  [PROCESSING NEIGHBORS] Evaluating neighbors of {device_key}")
-                
-                # Special debugging for NEXUS devices
-                if 'LUMT' in node.hostname.upper() or 'CORE' in node.hostname.upper():
-                    self._debug_nexus_neighbor_processing(node, discovery_result.neighbors)
-                
-                self._process_neighbors(discovery_result.neighbors, node)
-                
-            else:
-                # Record failed device
-                logger.info(f"  [CONNECTION FAILED] Could not connect to {device_key} - {discovery_result.error_message}")
-                self.failed_devices.add(device_key)
-                
-                # Increment connection failures in database
-                if self.db_manager and self.db_manager.enabled:
-                    self.db_manager.increment_connection_failures(node.hostname)
-                    new_count = self.db_manager.get_connection_failures(node.hostname)
-                    logger.warning(f"  [CONNECTION FAILURE] Incremented failure count for {device_key} to {new_count}")
-                
-                # Add to inventory as failed
-                device_info = self._create_basic_device_info(node, "failed")
-                device_info['error_message'] = discovery_result.error_message
-                self.inventory.add_device(device_key, device_info, "failed", discovery_result.error_message)
-                logger.info(f"  [INVENTORY] Added {device_key} to inventory as FAILED")
-                
-                logger.warning(f"Failed to discover {device_key}: {discovery_result.error_message}")
-        
-        except Exception as e:
-            logger.error(f"Error discovering device {device_key}: {e}")
+            self._process_neighbors(discovery_result.neighbors, node)
+            
+        else:
+            # Record failed device
             self.failed_devices.add(device_key)
             
-            # Add error device to inventory
-            device_info = self._create_basic_device_info(node, "error")
-            device_info['error_message'] = str(e)
-            self.inventory.add_device(device_key, device_info, "failed", str(e))
+            # Increment connection failures in database
+            if self.db_manager and self.db_manager.enabled:
+                self.db_manager.increment_connection_failures(node.hostname)
+                new_count = self.db_manager.get_connection_failures(node.hostname)
+                logger.warning(f"  [CONNECTION FAILURE] Incremented failure count for {device_key} to {new_count}")
+            
+            # Add to inventory as failed
+            device_info = self._create_basic_device_info(node, "failed")
+            device_info['error_message'] = discovery_result.error_message
+            self.inventory.add_device(device_key, device_info, "failed", discovery_result.error_message)
+            
+            logger.warning(f"Failed to discover {device_key}: {discovery_result.error_message}")
+    
+    def _record_discovery_error(self, node: DiscoveryNode, e: Exception):
+        """
+        Record an unexpected discovery error for a device.
+        
+        Args:
+            node: Discovery node that was processed
+            e: Exception raised during discovery
+        """
+        device_key = node.device_key
+        logger.error(f"Error discovering device {device_key}: {e}")
+        self.failed_devices.add(device_key)
+        
+        # Add error device to inventory
+        device_info = self._create_basic_device_info(node, "error")
+        device_info['error_message'] = str(e)
+        self.inventory.add_device(device_key, device_info, "failed", str(e))
     
     def _debug_nexus_device_processing(self, node: DiscoveryNode):
         """
@@ -666,12 +1383,14 @@ class DiscoveryEngine:
             else:
                 logger.info(f"    [NEXUS NEIGHBOR DEBUG] Neighbor {neighbor_id} will be queued for discovery")
     
-    def _connect_and_discover(self, node: DiscoveryNode) -> DiscoveryResult:
+    def _connect_and_discover(self, node: DiscoveryNode, db_lookup: bool = True) -> DiscoveryResult:
         """
         Connect to device and collect information.
         
         Args:
             node: Discovery node
+            db_lookup: Allow the connection manager to query the database for
+                PAN-OS detection
             
         Returns:
             Discovery result
@@ -683,7 +1402,8 @@ class DiscoveryEngine:
             # Use IP address if available, otherwise fall back to hostname
             connection_target = node.ip_address if node.ip_address else node.hostname
             connection, connection_result = self.connection_manager.connect_device(
-                connection_target, self.credentials, self.db_manager, node.platform
+                connection_target, self.credentials,
+                self.db_manager if db_lookup else None, node.platform
             )
             
             if connection_result.status != ConnectionStatus.SUCCESS:
@@ -699,7 +1419,7 @@ class DiscoveryEngine:
             # Collect device information
             device_info = self.device_collector.collect_device_information(
                 connection, node.ip_address, connection_result.method.value, 
-                node.depth, node.is_seed
+                node.depth, node.is_seed, connection_result.probe_output, node.last_walk
             )
             
             if not device_info:
@@ -714,32 +1434,7 @@ class DiscoveryEngine:
                 )
             
             # Convert DeviceInfo object to dictionary for compatibility
-            device_info_dict = {
-                'hostname': device_info.hostname,
-                'primary_ip': device_info.primary_ip,
-                'platform': device_info.platform,
-                'capabilities': device_info.capabilities,
-                'software_version': device_info.software_version,
-                'vtp_version': device_info.vtp_version,
-                'serial_number': device_info.serial_number,
-                'hardware_model': device_info.hardware_model,
-                'uptime': device_info.uptime,
-                'discovery_depth': device_info.discovery_depth,
-                'discovery_method': node.discovery_method,
-                'parent_device': node.parent_device,
-                'discovery_timestamp': device_info.discovery_timestamp.isoformat(),
-                'connection_method': device_info.connection_method,
-                'connection_status': device_info.connection_status,
-                'error_details': device_info.error_details,
-                'neighbors': device_info.neighbors,  # Store the NeighborInfo objects directly
-                'vlans': device_info.vlans,  # Store the VLANInfo objects directly
-                'vlan_collection_status': device_info.vlan_collection_status,
-                'vlan_collection_error': device_info.vlan_collection_error,
-                'stack_members': device_info.stack_members,  # Store the StackMemberInfo objects
-                'is_stack': device_info.is_stack,  # Stack flag
-                'is_physical_device': device_info.is_physical_device,  # Physical device flag (from cloud-mode)
-                'ha_role': device_info.ha_role  # HA role for PAN-OS (Active/Passive/None)
-            }
+            device_info_dict = device_info_to_dict(device_info, node.discovery_method, node.parent_device)
             
             # Get neighbors from DeviceInfo object
             neighbors = device_info.neighbors
@@ -785,6 +1480,10 @@ class DiscoveryEngine:
             parent_node: Parent device node
         """
         new_devices_added = 0
+        level = self.neighbor_log_level
+        
+        # Neighbors that passed filtering, as (hostname, ip, protocol, platform, capabilities)
+        candidates = []
         
         for neighbor in neighbors:
             # Handle both NeighborInfo objects and dictionaries
@@ -811,21 +1510,18 @@ class DiscoveryEngine:
                 neighbor_capabilities = neighbor.get('capabilities', [])
             
             if not neighbor_hostname:
-                logger.debug(f"Skipping neighbor with missing hostname: {neighbor}")
+                logger.debug("Skipping neighbor with missing hostname: %s", neighbor)
                 continue
             
             # Check exclusions BEFORE DNS resolution or connection attempts
             # This prevents unnecessary network activity for excluded devices
             # First check hostname-based exclusions (always available)
             # Then check platform/capability exclusions if that data is available
-            logger.info(f"    [NEIGHBOR DECISION] Evaluating neighbor {neighbor_hostname}:{neighbor_ip or 'no-ip'}")
-            logger.info(f"      Neighbor details: platform='{neighbor_platform}', capabilities={neighbor_capabilities}")
-            
             if self.filter_manager.should_filter_device(
                 neighbor_hostname, neighbor_ip or '', neighbor_platform, neighbor_capabilities
             ):
-                logger.info(f"    [NEIGHBOR FILTERED] {neighbor_hostname}:{neighbor_ip or 'no-ip'} will not be added to discovery queue")
-                logger.info(f"      Reason: platform='{neighbor_platform}', capabilities={neighbor_capabilities}")
+                logger.log(level, "    [NEIGHBOR FILTERED] %s:%s not queued - platform='%s', capabilities=%s",
+                           neighbor_hostname, neighbor_ip or 'no-ip', neighbor_platform, neighbor_capabilities)
                 self.filter_manager.mark_as_boundary(
                     neighbor_hostname, neighbor_ip or '', 
                     f"Filtered by platform ({neighbor_platform}) or capabilities ({neighbor_capabilities})"
@@ -841,20 +1537,23 @@ class DiscoveryEngine:
                 self.inventory.add_device(f"{neighbor_hostname}:{neighbor_ip or 'no-ip'}", device_info, "filtered")
                 continue
             
-            logger.info(f"    [NEIGHBOR PASSED] {neighbor_hostname}:{neighbor_ip or 'no-ip'} passed filtering checks")
-            
-            # DNS resolution AFTER filtering - only resolve IPs for non-excluded devices
+            candidates.append((neighbor_hostname, neighbor_ip, protocol, neighbor_platform, neighbor_capabilities))
+        
+        # DNS resolution AFTER filtering - only resolve IPs for non-excluded devices,
+        # all of this device's unaddressed neighbors at once
+        unresolved = [hostname for hostname, ip, _, _, _ in candidates if not ip]
+        resolved_ips = {}
+        if unresolved:
+            logger.log(level, "    [DNS RESOLUTION] Resolving %d neighbors with no IP address", len(unresolved))
+            resolved_ips = self.dns_resolver.resolve_many(unresolved)
+        
+        for neighbor_hostname, neighbor_ip, protocol, neighbor_platform, neighbor_capabilities in candidates:
             if not neighbor_ip:
-                logger.info(f"    [DNS RESOLUTION] Neighbor {neighbor_hostname} has no IP address, attempting DNS lookup")
-                try:
-                    import socket
-                    resolved_ip = socket.gethostbyname(neighbor_hostname)
-                    neighbor_ip = resolved_ip
-                    logger.info(f"    [DNS SUCCESS] Resolved {neighbor_hostname} to {resolved_ip}")
-                except (socket.gaierror, socket.herror, OSError) as e:
-                    logger.warning(f"    [DNS FAILED] Could not resolve {neighbor_hostname}: {e}")
-                    logger.debug(f"Skipping neighbor {neighbor_hostname} - no IP address available and DNS resolution failed")
+                neighbor_ip = resolved_ips.get(neighbor_hostname)
+                if not neighbor_ip:
+                    logger.warning(f"    [DNS FAILED] Could not resolve {neighbor_hostname}")
                     continue
+                logger.log(level, "    [DNS SUCCESS] Resolved %s to %s", neighbor_hostname, neighbor_ip)
             
             # Create neighbor node with platform from CDP/LLDP
             neighbor_node = DiscoveryNode(
@@ -866,22 +1565,19 @@ class DiscoveryEngine:
                 platform=neighbor_platform  # Pass platform from CDP/LLDP for PAN-OS detection
             )
             
-            logger.info(f"    [NEIGHBOR CHECK] Checking if {neighbor_node.device_key} should be queued")
-            logger.debug(f"      Current discovered_devices: {list(self.discovered_devices)}")
-            logger.debug(f"      Current queue devices: {[n.device_key for n in self.discovery_queue]}")
-            
             # Skip if already discovered or queued
             if neighbor_node.device_key in self.discovered_devices:
-                logger.info(f"    [NEIGHBOR SKIPPED] {neighbor_node.device_key} already in discovered_devices set")
+                logger.log(level, "    [NEIGHBOR SKIPPED] %s already discovered", neighbor_node.device_key)
                 continue
             
-            if any(n.device_key == neighbor_node.device_key for n in self.discovery_queue):
-                logger.info(f"    [NEIGHBOR SKIPPED] {neighbor_node.device_key} already in discovery queue")
+            if self.discovery_queue.contains_key(neighbor_node.device_key):
+                logger.log(level, "    [NEIGHBOR SKIPPED] %s already in discovery queue", neighbor_node.device_key)
                 continue
             
             # Check depth limit
             if neighbor_node.depth > self.max_depth:
-                logger.info(f"    [NEIGHBOR DEPTH LIMIT] {neighbor_node.device_key} at depth {neighbor_node.depth} exceeds max_depth {self.max_depth}")
+                logger.log(level, "    [NEIGHBOR DEPTH LIMIT] %s at depth %d exceeds max_depth %d",
+                           neighbor_node.device_key, neighbor_node.depth, self.max_depth)
                 # Add to inventory with skip reason
                 device_info = self._create_basic_device_info_for_neighbor(
                     neighbor_hostname, neighbor_ip, parent_node.depth + 1, 
@@ -897,10 +1593,8 @@ class DiscoveryEngine:
             new_devices_added += 1
             self.total_devices_discovered += 1
             self.total_queued += 1  # Increment total queued after dedupe
-            logger.info(f"    [NEIGHBOR QUEUED] Added {neighbor_node.device_key} to discovery queue (depth {neighbor_node.depth})")
-            logger.info(f"      Queue size after addition: {len(self.discovery_queue)}")
-            logger.debug(f"Added neighbor {neighbor_node.device_key} to discovery queue "
-                        f"(depth {neighbor_node.depth})")
+            logger.log(level, "    [NEIGHBOR QUEUED] Added %s to discovery queue (depth %d, queue size %d)",
+                       neighbor_node.device_key, neighbor_node.depth, len(self.discovery_queue))
         
         # Reset discovery timeout if new devices were added (for large networks)
         if new_devices_added > 0:
@@ -1049,7 +1743,13 @@ class DiscoveryEngine:
             'devices_in_queue': len(self.discovery_queue),
             'timeout_resets': self.timeout_resets,
             'initial_timeout_seconds': self.initial_discovery_timeout,
-            'filter_stats': self.filter_manager.get_filter_stats()
+            'commands_saved': self.device_collector.get_commands_saved(),
+            'command_stats': self.device_collector.get_command_stats(),
+            'incremental_stats': self.change_detector.get_stats() if self.change_detector else {},
+            'metadata_cache_stats': self.db_manager.get_metadata_cache_stats() if self.db_manager else {},
+            'dns_stats': self.dns_resolver.get_stats(),
+            'filter_stats': self.filter_manager.get_filter_stats(),
+            'spill_stats': self.inventory.get_spill_stats() or {}
         }
     
     def get_inventory(self) -> DeviceInventory:
@@ -1095,6 +1795,11 @@ class DiscoveryEngine:
         # Initialize site queues with discovered devices
         site_queues = self.site_collection_manager.initialize_site_queues(self.site_boundaries)
         
+        if self.site_collection_manager.site_collection_parallel:
+            self._perform_parallel_site_collection(list(self.site_boundaries.keys()))
+            logger.info("[SITE COLLECTION] Site-specific collection completed")
+            return
+        
         # Collect devices for each site
         for site_name in self.site_boundaries.keys():
             logger.info(f"[SITE COLLECTION] Starting collection for site '{site_name}'")
@@ -1122,6 +1827,52 @@ class DiscoveryEngine:
         
         logger.info("[SITE COLLECTION] Site-specific collection completed")
     
+    def _perform_parallel_site_collection(self, site_names: List[str]):
+        """
+        Collect several sites at once and merge them into the main inventory.
+        
+        Site queues are seeded from the main inventory before any site starts,
+        and results are merged in site boundary order once every site has
+        finished, so the merged inventory does not depend on which site
+        finished first.
+        
+        Args:
+            site_names: Sites to collect, in merge order
+        """
+        ready_sites = []
+        for site_name in site_names:
+            try:
+                # Update site queue with actual IP addresses from inventory
+                self._update_site_queue_with_inventory(site_name)
+                ready_sites.append(site_name)
+            except Exception as e:
+                logger.error(f"[SITE COLLECTION] Error preparing collection for site '{site_name}': {e}")
+                self.site_collection_results[site_name] = {
+                    'site_name': site_name,
+                    'success': False,
+                    'error_message': str(e)
+                }
+        
+        collection_results = self.site_collection_manager.collect_sites(ready_sites)
+        
+        for site_name in ready_sites:
+            collection_result = collection_results[site_name]
+            self.site_collection_results[site_name] = collection_result
+            
+            try:
+                # Merge site inventory into main inventory
+                self._merge_site_inventory_to_main(site_name, collection_result)
+                
+                logger.info(f"[SITE COLLECTION] Completed collection for site '{site_name}': {collection_result['statistics']}")
+                
+            except Exception as e:
+                logger.error(f"[SITE COLLECTION] Error merging collection for site '{site_name}': {e}")
+                self.site_collection_results[site_name] = {
+                    'site_name': site_name,
+                    'success': False,
+                    'error_message': str(e)
+                }
+    
     def _identify_site_boundaries_from_inventory(self) -> Dict[str, List[str]]:
         """
         Identify site boundaries from the current device inventory.
@@ -1177,6 +1928,20 @@ class DiscoveryEngine:
         
         return fnmatch.fnmatch(clean_hostname, pattern)
     
+    def _site_for_hostname(self, hostname: str) -> Optional[str]:
+        """
+        Site name for a hostname that matches the site boundary pattern.
+        
+        Args:
+            hostname: Device hostname
+            
+        Returns:
+            Site name, or None if the hostname is not a site boundary
+        """
+        if not self._matches_site_boundary_pattern(hostname):
+            return None
+        return self._extract_site_name_from_hostname(hostname)
+    
     def _extract_site_name_from_hostname(self, hostname: str) -> str:
         """
         Extract site name from hostname based on site boundary pattern.
@@ -1244,16 +2009,10 @@ class DiscoveryEngine:
         # Add devices with correct IP addresses from inventory
         for hostname in self.site_boundaries[site_name]:
             # Find device in inventory by hostname
-            device_info = None
-            device_key = None
-            
-            for key, info in self.inventory.get_all_devices().items():
-                if info.get('hostname', '').upper() == hostname.upper():
-                    device_info = info
-                    device_key = key
-                    break
+            found = self.inventory.find_device_by_hostname(hostname)
             
-            if device_info and device_key:
+            if found:
+                device_key, device_info = found
                 # Extract IP address
                 ip_address = device_info.get('ip_address') or device_info.get('primary_ip', '0.0.0.0')
                 
@@ -1288,7 +2047,7 @@ class DiscoveryEngine:
             # Check if device already exists in main inventory
             if self.inventory.has_device(device_key):
                 # Update existing device with additional information from site collection
-                existing_info = self.inventory.get_device(device_key)
+                existing_info = self.inventory.load_device(device_key)
                 
                 # Merge neighbor information if site collection found more neighbors
                 site_neighbors = device_info.get('neighbors', [])
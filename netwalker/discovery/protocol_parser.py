@@ -6,6 +6,7 @@ import re
 import logging
 from typing import List, Dict, Optional, Any
 from netwalker.connection.data_models import NeighborInfo
+from netwalker.interface_names import normalize_interface_name
 
 
 class ProtocolParser:
@@ -407,58 +408,9 @@ class ProtocolParser:
             platform: Device platform (IOS, NX-OS, etc.) - optional
             
         Returns:
-            Normalized interface name
-            
-        Examples:
-            "Gi1/0/1" → "GigabitEthernet1/0/1"
-            "Eth1/1" → "Ethernet1/1" (NX-OS preserved)
-            "Po1" → "Port-channel1"
-            "mgmt0" → "Management0"
+            Normalized interface name (see netwalker.interface_names)
         """
-        if not interface_name or interface_name == "Unknown":
-            return interface_name
-        
-        # Remove common prefixes and normalize
-        interface_name = interface_name.strip()
-        
-        # Detect platform from interface name if not provided
-        if not platform:
-            if re.match(r'^Ethernet\d+/\d+', interface_name):
-                platform = 'NX-OS'
-            else:
-                platform = 'IOS'
-        
-        # Handle NX-OS interface formats - preserve as-is
-        if platform and 'NX-OS' in platform.upper():
-            # NX-OS uses full names already: Ethernet1/1, port-channel1, mgmt0
-            # Standardize port-channel to Port-channel
-            interface_name = re.sub(r'^port-channel(\d+)', r'Port-channel\1', interface_name, flags=re.IGNORECASE)
-            # Standardize management to Management
-            interface_name = re.sub(r'^mgmt(\d+)', r'Management\1', interface_name, flags=re.IGNORECASE)
-            return interface_name
-        
-        # IOS abbreviation expansion
-        # GigabitEthernet
-        interface_name = re.sub(r'^Gi(?:gabitEthernet)?(\d+(?:/\d+)*)', r'GigabitEthernet\1', interface_name, flags=re.IGNORECASE)
-        # TenGigabitEthernet
-        interface_name = re.sub(r'^Te(?:nGigabitEthernet)?(\d+(?:/\d+)*)', r'TenGigabitEthernet\1', interface_name, flags=re.IGNORECASE)
-        # FastEthernet
-        interface_name = re.sub(r'^Fa(?:stEthernet)?(\d+(?:/\d+)*)', r'FastEthernet\1', interface_name, flags=re.IGNORECASE)
-        # FortyGigabitEthernet
-        interface_name = re.sub(r'^Fo(?:rtyGigabitEthernet)?(\d+(?:/\d+)*)', r'FortyGigabitEthernet\1', interface_name, flags=re.IGNORECASE)
-        
-        # Port-channel standardization
-        interface_name = re.sub(r'^Po(?:rt-channel)?(\d+)', r'Port-channel\1', interface_name, flags=re.IGNORECASE)
-        interface_name = re.sub(r'^PortChannel(\d+)', r'Port-channel\1', interface_name, flags=re.IGNORECASE)
-        
-        # Management interface standardization
-        interface_name = re.sub(r'^mgmt(\d+)', r'Management\1', interface_name, flags=re.IGNORECASE)
-        interface_name = re.sub(r'^Mgmt(\d+)', r'Management\1', interface_name)
-        
-        # Vlan interfaces - keep as is
-        # Loopback interfaces - keep as is
-        
-        return interface_name
+        return normalize_interface_name(interface_name, platform)
     
     def normalize_interface_name(self, interface_name: str, platform: str = None) -> str:
         """
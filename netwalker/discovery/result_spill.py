@@ -0,0 +1,159 @@
+"""
+Result Spill File for NetWalker
+
+Streaming mode keeps only a lightweight summary of each completed device in
+memory. The full device information (neighbor, VLAN and stack member
+objects) is appended to a local spill file as soon as the device finishes
+and read back one device at a time when reports are generated.
+"""
+
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Device information fields that hold per-device object lists and are moved
+# out of memory in streaming mode
+SPILLED_FIELDS = ('neighbors', 'vlans', 'stack_members', 'command_timings')
+
+
+def summarize_device_info(device_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Lightweight copy of device information without the spilled object lists
+
+    Args:
+        device_info: Full device information dictionary
+
+    Returns:
+        Device information with SPILLED_FIELDS replaced by <field>_count entries
+    """
+    summary = {key: value for key, value in device_info.items() if key not in SPILLED_FIELDS}
+    for field_name in SPILLED_FIELDS:
+        if field_name in device_info:
+            value = device_info[field_name]
+            summary[f"{field_name}_count"] = len(value) if value else 0
+    summary['spilled'] = True
+    return summary
+
+
+class ResultSpill:
+    """
+    Append-only pickle file of full device information keyed by device key.
+
+    Re-spilling a key appends a new entry and points the key at it, so reads
+    always return the latest version.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Create the spill file
+
+        Args:
+            directory: Directory for the spill file, defaults to the system temp directory
+        """
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix='netwalker_spill_', suffix='.pkl', dir=directory or None)
+        self._file = os.fdopen(fd, 'w+b')
+        self._offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+        logger.info(f"[SPILL] Streaming device results to {self.path}")
+
+    def write(self, device_key: str, device_info: Dict[str, Any]):
+        """
+        Append full device information for a device
+
+        Args:
+            device_key: Device key (hostname:ip)
+            device_info: Full device information dictionary
+        """
+        data = pickle.dumps(device_info, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(data)
+            self._offsets[device_key] = offset
+            self.bytes_written += len(data)
+
+    def read(self, device_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Read full device information back
+
+        Args:
+            device_key: Device key (hostname:ip)
+
+        Returns:
+            Device information dictionary, or None if the key was never spilled
+        """
+        with self._lock:
+            offset = self._offsets.get(device_key)
+            if offset is None:
+                return None
+            self._file.flush()
+            self._file.seek(offset)
+            return pickle.load(self._file)
+
+    def discard(self, device_key: str):
+        """Forget a spilled device so reads fall back to the in-memory entry"""
+        with self._lock:
+            self._offsets.pop(device_key, None)
+
+    def __contains__(self, device_key: str) -> bool:
+        return device_key in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get spilled device count and file size"""
+        with self._lock:
+            return {'devices_spilled': len(self._offsets), 'bytes_written': self.bytes_written, 'path': self.path}
+
+    def close(self):
+        """Close and delete the spill file"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"[SPILL] Could not remove spill file {self.path}: {e}")
+
+
+class StreamingInventoryView(Mapping):
+    """
+    Read-only device key to full device information mapping over a
+    DeviceInventory in streaming mode.
+
+    Iterating items() or values() loads one device at a time from the spill
+    file, so report generation never holds every device's objects at once.
+    """
+
+    def __init__(self, inventory):
+        """
+        Args:
+            inventory: DeviceInventory to read from
+        """
+        self._inventory = inventory
+        self._keys = list(inventory.get_all_devices())
+
+    def __getitem__(self, device_key: str) -> Dict[str, Any]:
+        device_info = self._inventory.load_device(device_key)
+        if device_info is None:
+            raise KeyError(device_key)
+        return device_info
+
+    def __contains__(self, device_key: object) -> bool:
+        return self._inventory.has_device(device_key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
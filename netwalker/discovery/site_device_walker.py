@@ -5,6 +5,8 @@ Handles site-specific device walking with connection management and neighbor pro
 """
 
 import logging
+import threading
+import concurrent.futures
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -12,7 +14,7 @@ from datetime import datetime
 from ..connection.connection_manager import ConnectionManager
 from ..connection.data_models import ConnectionStatus
 from .device_collector import DeviceCollector
-from .discovery_engine import DiscoveryNode
+from .discovery_engine import DiscoveryNode, device_info_to_dict
 from .site_association_validator import SiteAssociationValidator
 
 logger = logging.getLogger(__name__)
@@ -68,7 +70,8 @@ class SiteDeviceWalker:
         self.max_neighbors_per_device = self.config.get('max_neighbors_per_device', 50)
         self.enable_neighbor_filtering = self.config.get('enable_neighbor_filtering', True)
         
-        # Statistics tracking
+        # Statistics tracking - devices in a site may be walked concurrently
+        self._stats_lock = threading.Lock()
         self._walk_stats = {
             'total_walks': 0,
             'successful_walks': 0,
@@ -97,8 +100,9 @@ class SiteDeviceWalker:
         
         logger.info(f"Walking site device: {device_key} in site '{site_name}'")
         
-        self._walk_stats['total_walks'] += 1
+        self._count_walk(total_walks=1)
         
+        connection = None
         try:
             # Attempt to connect to the device
             connection, connection_result = self.connection_manager.connect_device(
@@ -109,7 +113,7 @@ class SiteDeviceWalker:
             if connection_result.status != ConnectionStatus.SUCCESS:
                 error_msg = f"Failed to connect to {device_key}: {connection_result.error_message}"
                 logger.warning(error_msg)
-                self._walk_stats['failed_walks'] += 1
+                self._count_walk(failed_walks=1)
                 
                 return SiteWalkResult(
                     device_key=device_key,
@@ -121,19 +125,19 @@ class SiteDeviceWalker:
                 )
             
             # Collect device information
-            device_info = self.device_collector.collect_device_info(
+            device_info = self.device_collector.collect_device_information(
                 connection,
-                device_node.hostname,
-                device_node.ip_address
+                device_node.ip_address,
+                connection_result.method.value,
+                device_node.depth,
+                device_node.is_seed,
+                connection_result.probe_output
             )
             
-            if not device_info:
+            if not device_info or device_info.connection_status != "success":
                 error_msg = f"Failed to collect device information from {device_key}"
                 logger.warning(error_msg)
-                self._walk_stats['failed_walks'] += 1
-                
-                # Close connection
-                self.connection_manager.close_connection(connection)
+                self._count_walk(failed_walks=1)
                 
                 return SiteWalkResult(
                     device_key=device_key,
@@ -146,19 +150,15 @@ class SiteDeviceWalker:
                 )
             
             # Extract neighbors from device
-            neighbors = device_info.get('neighbors', [])
+            neighbors = device_info.neighbors
             logger.info(f"Device {device_key} has {len(neighbors)} neighbors")
             
             # Process neighbors for site association
             processed_neighbors = self.process_site_neighbors(neighbors, site_name)
             
-            # Close connection
-            self.connection_manager.close_connection(connection)
-            
             # Update statistics
-            self._walk_stats['successful_walks'] += 1
-            self._walk_stats['neighbors_discovered'] += len(neighbors)
-            self._walk_stats['neighbors_queued'] += len(processed_neighbors)
+            self._count_walk(successful_walks=1, neighbors_discovered=len(neighbors),
+                             neighbors_queued=len(processed_neighbors))
             
             walk_duration = (datetime.now() - start_time).total_seconds()
             
@@ -168,7 +168,7 @@ class SiteDeviceWalker:
                 device_key=device_key,
                 site_name=site_name,
                 walk_success=True,
-                device_info=device_info,
+                device_info=device_info_to_dict(device_info, device_node.discovery_method, device_node.parent_device),
                 neighbors_found=neighbors,
                 neighbors_added_to_queue=len(processed_neighbors),
                 connection_method=connection_result.method.value,
@@ -179,7 +179,7 @@ class SiteDeviceWalker:
         except Exception as e:
             error_msg = f"Exception during device walk for {device_key}: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            self._walk_stats['failed_walks'] += 1
+            self._count_walk(failed_walks=1)
             
             return SiteWalkResult(
                 device_key=device_key,
@@ -189,6 +189,21 @@ class SiteDeviceWalker:
                 walk_timestamp=start_time,
                 walk_duration=(datetime.now() - start_time).total_seconds()
             )
+        
+        finally:
+            # Close by the host the connection was opened with, whatever happened,
+            # so a walk never outlives its slot of the connection budget
+            if connection is not None:
+                try:
+                    self.connection_manager.close_connection(device_node.ip_address)
+                except Exception as close_error:
+                    logger.error(f"Error closing connection to {device_key}: {close_error}")
+    
+    def _count_walk(self, **increments: int):
+        """Add increments to the walk statistics"""
+        with self._stats_lock:
+            for key, amount in increments.items():
+                self._walk_stats[key] = self._walk_stats.get(key, 0) + amount
     
     def process_site_neighbors(self, neighbors: List[Any], parent_site: str) -> List[DiscoveryNode]:
         """
@@ -215,6 +230,10 @@ class SiteDeviceWalker:
                 if hasattr(neighbor, 'hostname'):
                     neighbor_hostname = neighbor.hostname
                     neighbor_ip = getattr(neighbor, 'ip_address', '')
+                elif hasattr(neighbor, 'device_id'):
+                    # NeighborInfo from DeviceCollector
+                    neighbor_hostname = neighbor.device_id
+                    neighbor_ip = neighbor.ip_address or ''
                 elif isinstance(neighbor, dict):
                     neighbor_hostname = neighbor.get('hostname', '')
                     neighbor_ip = neighbor.get('ip_address', '')
@@ -309,28 +328,38 @@ class SiteDeviceWalker:
         logger.info("Site device walker statistics reset")
     
     def walk_multiple_devices(self, device_nodes: List[DiscoveryNode], 
-                            site_name: str) -> List[SiteWalkResult]:
+                            site_name: str, max_workers: int = 1) -> List[SiteWalkResult]:
         """
         Walk multiple devices in a site.
         
         Args:
             device_nodes: List of device nodes to walk
             site_name: Site name for all devices
+            max_workers: Maximum devices walked at once
             
         Returns:
-            List of SiteWalkResult objects
+            List of SiteWalkResult objects, in the order of device_nodes
         """
         results = []
         
         logger.info(f"Walking {len(device_nodes)} devices in site '{site_name}'")
         
-        for device_node in device_nodes:
-            result = self.walk_site_device(device_node, site_name)
-            results.append(result)
-            
-            # Log progress
-            if len(results) % 10 == 0:
-                logger.info(f"Walked {len(results)}/{len(device_nodes)} devices in site '{site_name}'")
+        workers = min(max_workers, len(device_nodes))
+        if workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                       thread_name_prefix='netwalker-site-walk') as executor:
+                futures = [executor.submit(self.walk_site_device, device_node, site_name)
+                           for device_node in device_nodes]
+                for future in futures:
+                    results.append(future.result())
+        else:
+            for device_node in device_nodes:
+                result = self.walk_site_device(device_node, site_name)
+                results.append(result)
+                
+                # Log progress
+                if len(results) % 10 == 0:
+                    logger.info(f"Walked {len(results)}/{len(device_nodes)} devices in site '{site_name}'")
         
         # Log final statistics
         successful = sum(1 for r in results if r.walk_success)
@@ -5,6 +5,7 @@ Manages separate device queues for each site boundary to ensure proper site-spec
 """
 
 import logging
+import threading
 from typing import Dict, Optional, Set, List
 from collections import deque
 
@@ -30,6 +31,9 @@ class SiteQueueManager:
         self._site_device_sets: Dict[str, Set[str]] = {}  # For deduplication
         self._queue_stats: Dict[str, Dict[str, int]] = {}
         
+        # Sites collected in parallel share this manager
+        self._lock = threading.RLock()
+        
         logger.info("SiteQueueManager initialized")
     
     def create_site_queue(self, site_name: str) -> deque[DiscoveryNode]:
@@ -42,20 +46,21 @@ class SiteQueueManager:
         Returns:
             The created queue for the site
         """
-        if site_name in self._site_queues:
-            logger.warning(f"Site queue for '{site_name}' already exists")
+        with self._lock:
+            if site_name in self._site_queues:
+                logger.warning(f"Site queue for '{site_name}' already exists")
+                return self._site_queues[site_name]
+            
+            self._site_queues[site_name] = deque()
+            self._site_device_sets[site_name] = set()
+            self._queue_stats[site_name] = {
+                'devices_added': 0,
+                'devices_processed': 0,
+                'duplicates_rejected': 0
+            }
+            
+            logger.info(f"Created site queue for '{site_name}'")
             return self._site_queues[site_name]
-        
-        self._site_queues[site_name] = deque()
-        self._site_device_sets[site_name] = set()
-        self._queue_stats[site_name] = {
-            'devices_added': 0,
-            'devices_processed': 0,
-            'duplicates_rejected': 0
-        }
-        
-        logger.info(f"Created site queue for '{site_name}'")
-        return self._site_queues[site_name]
     
     def add_device_to_site(self, site_name: str, device_node: DiscoveryNode) -> bool:
         """
@@ -68,25 +73,26 @@ class SiteQueueManager:
         Returns:
             True if device was added, False if it was a duplicate
         """
-        # Create site queue if it doesn't exist
-        if site_name not in self._site_queues:
-            self.create_site_queue(site_name)
-        
-        device_key = device_node.device_key
-        
-        # Check for duplicates
-        if device_key in self._site_device_sets[site_name]:
-            logger.debug(f"Duplicate device {device_key} rejected for site '{site_name}'")
-            self._queue_stats[site_name]['duplicates_rejected'] += 1
-            return False
-        
-        # Add device to queue and tracking set
-        self._site_queues[site_name].append(device_node)
-        self._site_device_sets[site_name].add(device_key)
-        self._queue_stats[site_name]['devices_added'] += 1
-        
-        logger.info(f"Added device {device_key} to site '{site_name}' queue (queue size: {len(self._site_queues[site_name])})")
-        return True
+        with self._lock:
+            # Create site queue if it doesn't exist
+            if site_name not in self._site_queues:
+                self.create_site_queue(site_name)
+            
+            device_key = device_node.device_key
+            
+            # Check for duplicates
+            if device_key in self._site_device_sets[site_name]:
+                logger.debug(f"Duplicate device {device_key} rejected for site '{site_name}'")
+                self._queue_stats[site_name]['duplicates_rejected'] += 1
+                return False
+            
+            # Add device to queue and tracking set
+            self._site_queues[site_name].append(device_node)
+            self._site_device_sets[site_name].add(device_key)
+            self._queue_stats[site_name]['devices_added'] += 1
+            
+            logger.info(f"Added device {device_key} to site '{site_name}' queue (queue size: {len(self._site_queues[site_name])})")
+            return True
     
     def get_next_device(self, site_name: str) -> Optional[DiscoveryNode]:
         """
@@ -98,14 +104,39 @@ class SiteQueueManager:
         Returns:
             Next device node or None if queue is empty
         """
-        if site_name not in self._site_queues or not self._site_queues[site_name]:
-            return None
+        with self._lock:
+            if site_name not in self._site_queues or not self._site_queues[site_name]:
+                return None
+            
+            device_node = self._site_queues[site_name].popleft()
+            self._queue_stats[site_name]['devices_processed'] += 1
+            
+            logger.debug(f"Retrieved device {device_node.device_key} from site '{site_name}' queue (remaining: {len(self._site_queues[site_name])})")
+            return device_node
+    
+    def get_next_level(self, site_name: str) -> List[DiscoveryNode]:
+        """
+        Get the run of queued devices that share the depth of the queue head.
         
-        device_node = self._site_queues[site_name].popleft()
-        self._queue_stats[site_name]['devices_processed'] += 1
+        Args:
+            site_name: Name of the site boundary
+            
+        Returns:
+            Device nodes in FIFO order, empty if the queue is empty
+        """
+        with self._lock:
+            site_queue = self._site_queues.get(site_name)
+            if not site_queue:
+                return []
+            
+            depth = site_queue[0].depth
+            level_nodes = []
+            while site_queue and site_queue[0].depth == depth:
+                level_nodes.append(site_queue.popleft())
+            self._queue_stats[site_name]['devices_processed'] += len(level_nodes)
         
-        logger.debug(f"Retrieved device {device_node.device_key} from site '{site_name}' queue (remaining: {len(self._site_queues[site_name])})")
-        return device_node
+        logger.debug(f"Retrieved {len(level_nodes)} devices at depth {depth} from site '{site_name}' queue (remaining: {len(site_queue)})")
+        return level_nodes
     
     def is_site_queue_empty(self, site_name: str) -> bool:
         """
@@ -6,7 +6,9 @@ topology discovery within site boundaries.
 """
 
 import logging
-from typing import Dict, List, Set, Optional, Any, Deque, Callable
+import threading
+import concurrent.futures
+from typing import Dict, List, Set, Optional, Any, Deque, Callable, Tuple
 from collections import deque, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -192,6 +194,14 @@ class SiteSpecificCollectionManager:
         self.site_collection_enabled = config.get('enable_site_collection', True)
         self.site_collection_parallel = config.get('site_collection_parallel', False)
         self.site_collection_max_workers = config.get('site_collection_max_workers', 4)
+        self.max_connections_per_site = config.get('max_connections_per_site', 4)
+        
+        # Global connection budget shared by every site walked at once
+        self.max_concurrent_connections = config.get('max_concurrent_connections', 10)
+        self._connection_budget = threading.BoundedSemaphore(max(1, self.max_concurrent_connections))
+        
+        # Serializes error handling, which updates state shared across sites
+        self._error_lock = threading.RLock()
         
         # Configure enhanced logging if log level override is specified
         if self.log_level_override:
@@ -204,6 +214,10 @@ class SiteSpecificCollectionManager:
         logger.info(f"Filtering enabled: {self.enable_filtering}, Site collection enabled: {self.site_collection_enabled}")
         logger.info(f"Enhanced logging: progress={self.progress_logging_enabled}, detailed_errors={self.detailed_error_logging}, statistics={self.statistics_logging_enabled}")
         logger.info(f"Progress update interval: {self.progress_update_interval} devices")
+        if self.site_collection_parallel:
+            logger.info(f"Parallel site collection: {self.site_collection_max_workers} sites, "
+                       f"{self.max_connections_per_site} connections per site, "
+                       f"{self.max_concurrent_connections} connections total")
     
     def apply_configuration_to_collection(self, device_node: DiscoveryNode) -> bool:
         """
@@ -577,30 +591,31 @@ class SiteSpecificCollectionManager:
         Returns:
             True if error was handled and collection can continue, False if critical
         """
-        self.logger.error(f"[ERROR HANDLER] Site collection error in '{error.site_name}': {error.error_message}")
-        
-        # Log detailed error information
-        self._log_site_collection_error_detailed(error)
-        
-        # Add error to site error list
-        self.site_errors[error.site_name].append(error)
-        
-        # Update statistics
-        if error.site_name in self.site_stats:
-            self.site_stats[error.site_name].errors_encountered += 1
-        
-        # Determine if error is critical
-        is_critical = self._is_critical_error(error)
-        
-        if is_critical:
-            self.logger.error(f"[ERROR HANDLER] Critical error detected for site '{error.site_name}': {error.error_type.value}")
-            return self._handle_critical_site_error(error)
-        
-        # Attempt recovery for non-critical errors
-        if self.error_recovery_enabled:
-            return self._attempt_error_recovery(error)
-        
-        return True  # Continue collection even without recovery
+        with self._error_lock:
+            self.logger.error(f"[ERROR HANDLER] Site collection error in '{error.site_name}': {error.error_message}")
+            
+            # Log detailed error information
+            self._log_site_collection_error_detailed(error)
+            
+            # Add error to site error list
+            self.site_errors[error.site_name].append(error)
+            
+            # Update statistics
+            if error.site_name in self.site_stats:
+                self.site_stats[error.site_name].errors_encountered += 1
+            
+            # Determine if error is critical
+            is_critical = self._is_critical_error(error)
+            
+            if is_critical:
+                self.logger.error(f"[ERROR HANDLER] Critical error detected for site '{error.site_name}': {error.error_type.value}")
+                return self._handle_critical_site_error(error)
+            
+            # Attempt recovery for non-critical errors
+            if self.error_recovery_enabled:
+                return self._attempt_error_recovery(error)
+            
+            return True  # Continue collection even without recovery
     
     def _is_critical_error(self, error: SiteCollectionError) -> bool:
         """
@@ -840,7 +855,9 @@ class SiteSpecificCollectionManager:
             'exclude_patterns': self.exclude_patterns,
             'site_collection_enabled': self.site_collection_enabled,
             'site_collection_parallel': self.site_collection_parallel,
-            'site_collection_max_workers': self.site_collection_max_workers
+            'site_collection_max_workers': self.site_collection_max_workers,
+            'max_connections_per_site': self.max_connections_per_site,
+            'max_concurrent_connections': self.max_concurrent_connections
         }
     
     def initialize_site_queues(self, site_boundaries: Dict[str, List[str]]) -> Dict[str, Deque[DiscoveryNode]]:
@@ -943,44 +960,58 @@ class SiteSpecificCollectionManager:
                     logger.warning(f"[SITE COLLECTION] Site '{site_name}' marked as failed during collection, stopping")
                     break
                 
-                device_node = self.site_queue_manager.get_next_device(site_name)
-                if device_node is None:
+                # Parallel collection walks the whole depth level at the queue head at once
+                if self.site_collection_parallel:
+                    level_nodes = self.site_queue_manager.get_next_level(site_name)
+                else:
+                    device_node = self.site_queue_manager.get_next_device(site_name)
+                    level_nodes = [device_node] if device_node is not None else []
+                if not level_nodes:
                     break
                 
-                logger.info(f"[SITE COLLECTION] Processing device {device_node.device_key} for site '{site_name}'")
-                
-                # Log progress update (Requirement 7.2, 7.5)
-                self._log_site_collection_progress(site_name, device_node.device_key)
+                ready_nodes = []
+                for device_node in level_nodes:
+                    logger.info(f"[SITE COLLECTION] Processing device {device_node.device_key} for site '{site_name}'")
+                    
+                    # Log progress update (Requirement 7.2, 7.5)
+                    self._log_site_collection_progress(site_name, device_node.device_key)
+                    
+                    # Skip if already processed
+                    if device_node.device_key in self.discovered_devices_by_site[site_name]:
+                        logger.info(f"[SITE COLLECTION] Device {device_node.device_key} already processed for site '{site_name}'")
+                        continue
+                    
+                    # Apply configuration filtering
+                    if not self.apply_configuration_to_collection(device_node):
+                        logger.info(f"[SITE COLLECTION] Device {device_node.device_key} filtered out by configuration")
+                        stats.devices_processed += 1
+                        # Log progress after processing
+                        self._log_site_collection_progress(site_name)
+                        continue
+                    
+                    # Mark as discovered
+                    self.discovered_devices_by_site[site_name].add(device_node.device_key)
+                    ready_nodes.append(device_node)
                 
-                # Skip if already processed
-                if device_node.device_key in self.discovered_devices_by_site[site_name]:
-                    logger.info(f"[SITE COLLECTION] Device {device_node.device_key} already processed for site '{site_name}'")
+                if not ready_nodes:
                     continue
                 
-                # Apply configuration filtering
-                if not self.apply_configuration_to_collection(device_node):
-                    logger.info(f"[SITE COLLECTION] Device {device_node.device_key} filtered out by configuration")
+                # Walk devices, then record results in queue order, not completion order
+                walk_outcomes = self._walk_site_level(ready_nodes, site_name)
+                
+                for device_node, walk_outcome in zip(ready_nodes, walk_outcomes):
+                    success = self._record_device_walk(device_node, site_name, *walk_outcome)
+                    
+                    # Update statistics
                     stats.devices_processed += 1
-                    # Log progress after processing
+                    
+                    if success:
+                        stats.devices_successful += 1
+                    else:
+                        stats.devices_failed += 1
+                    
+                    # Log progress after processing device
                     self._log_site_collection_progress(site_name)
-                    continue
-                
-                # Mark as discovered
-                self.discovered_devices_by_site[site_name].add(device_node.device_key)
-                
-                # Process device with error handling
-                success = self._process_device_with_error_handling(device_node, site_name)
-                
-                # Update statistics
-                stats.devices_processed += 1
-                
-                if success:
-                    stats.devices_successful += 1
-                else:
-                    stats.devices_failed += 1
-                
-                # Log progress after processing device
-                self._log_site_collection_progress(site_name)
                 
                 # Check if we should continue after errors
                 if not self._should_continue_site_collection(site_name):
@@ -1025,6 +1056,37 @@ class SiteSpecificCollectionManager:
             
             return self._create_failed_collection_result(site_name, str(e))
     
+    def collect_sites(self, site_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect several sites, up to site_collection_max_workers at once when
+        parallel site collection is enabled.
+        
+        Args:
+            site_names: Names of initialized sites to collect
+            
+        Returns:
+            Dictionary mapping site names to collection results, in the order of site_names
+        """
+        workers = min(self.site_collection_max_workers, len(site_names)) if self.site_collection_parallel else 1
+        
+        if workers <= 1:
+            return {site_name: self._collect_site_isolated(site_name) for site_name in site_names}
+        
+        logger.info(f"[SITE COLLECTION] Collecting {len(site_names)} sites with up to {workers} sites at once")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                   thread_name_prefix='netwalker-site') as executor:
+            futures = {site_name: executor.submit(self._collect_site_isolated, site_name)
+                       for site_name in site_names}
+            return {site_name: future.result() for site_name, future in futures.items()}
+    
+    def _collect_site_isolated(self, site_name: str) -> Dict[str, Any]:
+        """Collect a site, turning an exception into a failed collection result"""
+        try:
+            return self.collect_site_devices(site_name)
+        except Exception as e:
+            logger.error(f"[SITE COLLECTION] Error during collection for site '{site_name}': {e}")
+            return self._create_failed_collection_result(site_name, str(e))
+    
     def _process_device_with_error_handling(self, device_node: DiscoveryNode, site_name: str) -> bool:
         """
         Process a device with comprehensive error handling.
@@ -1036,60 +1098,80 @@ class SiteSpecificCollectionManager:
         Returns:
             True if processing was successful, False otherwise
         """
+        walk_result, walk_exception, attempts = self._walk_device_with_retries(device_node, site_name)
+        return self._record_device_walk(device_node, site_name, walk_result, walk_exception, attempts)
+    
+    def _walk_site_level(self, device_nodes: List[DiscoveryNode],
+                         site_name: str) -> List[Tuple[Optional[SiteWalkResult], Optional[Exception], int]]:
+        """
+        Walk a batch of site devices, up to max_connections_per_site at once.
+        
+        Args:
+            device_nodes: Devices to walk
+            site_name: Site name
+            
+        Returns:
+            Walk outcomes from _walk_device_with_retries, in the order of device_nodes
+        """
+        workers = min(self.max_connections_per_site, len(device_nodes))
+        if workers <= 1:
+            return [self._walk_device_with_retries(device_node, site_name) for device_node in device_nodes]
+        
+        logger.info(f"[SITE COLLECTION] Walking {len(device_nodes)} devices at depth {device_nodes[0].depth} "
+                   f"for site '{site_name}' with {workers} workers")
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                   thread_name_prefix='netwalker-site-walk') as executor:
+            futures = [executor.submit(self._walk_device_with_retries, device_node, site_name)
+                       for device_node in device_nodes]
+            return [future.result() for future in futures]
+    
+    def _walk_device_with_retries(self, device_node: DiscoveryNode,
+                                  site_name: str) -> Tuple[Optional[SiteWalkResult], Optional[Exception], int]:
+        """
+        Walk a device, retrying failures while error recovery allows it.
+        
+        Each attempt holds one slot of the global connection budget. Safe to
+        call from worker threads.
+        
+        Args:
+            device_node: Device to walk
+            site_name: Site name
+            
+        Returns:
+            Tuple of (last walk result, exception raised by the last attempt, attempts made);
+            the walk result is None when the last attempt raised
+        """
         retry_count = 0
         max_retries = self.max_device_retries
         
-        while retry_count <= max_retries:
+        while True:
             try:
                 # Walk the device
-                walk_result = self.site_device_walker.walk_site_device(device_node, site_name)
+                with self._connection_budget:
+                    walk_result = self.site_device_walker.walk_site_device(device_node, site_name)
                 
                 if walk_result.walk_success:
-                    # Update statistics
-                    self.site_stats[site_name].neighbors_discovered += len(walk_result.neighbors_found)
-                    
-                    # Add device to site inventory
-                    self.site_inventories[site_name].add_device(
-                        device_node.device_key,
-                        walk_result.device_info,
-                        "connected"
-                    )
-                    
-                    # Process neighbors and add to queue if they belong to this site
-                    self._process_site_neighbors(walk_result.neighbors_found, site_name, device_node)
-                    
-                    logger.info(f"[SITE COLLECTION] Successfully processed {device_node.device_key} - found {len(walk_result.neighbors_found)} neighbors")
-                    return True
-                    
-                else:
-                    # Handle walk failure
-                    walk_error = SiteCollectionError(
-                        error_type=SiteCollectionErrorType.DEVICE_WALK_FAILED,
-                        site_name=site_name,
-                        device_key=device_node.device_key,
-                        error_message=walk_result.error_message or "Device walk failed"
-                    )
-                    
-                    # Try recovery if this is not the last retry
-                    if retry_count < max_retries and self.error_recovery_enabled:
-                        if self._handle_site_collection_error(walk_error):
-                            retry_count += 1
-                            logger.info(f"[SITE COLLECTION] Retrying device {device_node.device_key} (attempt {retry_count + 1}/{max_retries + 1})")
-                            time.sleep(1)  # Brief delay before retry
-                            continue
-                    
-                    # Final failure - add failed device to inventory
-                    device_info = self._create_failed_device_info(device_node, walk_result.error_message)
-                    self.site_inventories[site_name].add_device(
-                        device_node.device_key,
-                        device_info,
-                        "failed",
-                        walk_result.error_message
-                    )
-                    
-                    logger.warning(f"[SITE COLLECTION] Failed to process {device_node.device_key} after {retry_count + 1} attempts: {walk_result.error_message}")
-                    return False
-                    
+                    return walk_result, None, retry_count + 1
+                
+                # Handle walk failure
+                walk_error = SiteCollectionError(
+                    error_type=SiteCollectionErrorType.DEVICE_WALK_FAILED,
+                    site_name=site_name,
+                    device_key=device_node.device_key,
+                    error_message=walk_result.error_message or "Device walk failed"
+                )
+                
+                # Try recovery if this is not the last retry
+                if retry_count < max_retries and self.error_recovery_enabled:
+                    if self._handle_site_collection_error(walk_error):
+                        retry_count += 1
+                        logger.info(f"[SITE COLLECTION] Retrying device {device_node.device_key} (attempt {retry_count + 1}/{max_retries + 1})")
+                        time.sleep(1)  # Brief delay before retry
+                        continue
+                
+                return walk_result, None, retry_count + 1
+                
             except Exception as e:
                 # Handle unexpected exceptions during device processing
                 connection_error = SiteCollectionError(
@@ -1108,18 +1190,68 @@ class SiteSpecificCollectionManager:
                         time.sleep(2)  # Longer delay after exception
                         continue
                 
-                # Final failure
-                device_info = self._create_failed_device_info(device_node, str(e))
+                return None, e, retry_count + 1
+    
+    def _record_device_walk(self, device_node: DiscoveryNode, site_name: str,
+                            walk_result: Optional[SiteWalkResult], walk_exception: Optional[Exception],
+                            attempts: int) -> bool:
+        """
+        Record a device walk outcome in the site inventory and queue its site neighbors.
+        
+        Args:
+            device_node: Device that was walked
+            site_name: Site name
+            walk_result: Last walk result, None if the last attempt raised
+            walk_exception: Exception raised by the last attempt
+            attempts: Number of walk attempts made
+            
+        Returns:
+            True if the walk was successful, False otherwise
+        """
+        if walk_result is not None and walk_result.walk_success:
+            try:
+                # Update statistics
+                self.site_stats[site_name].neighbors_discovered += len(walk_result.neighbors_found)
+                
+                # Add device to site inventory
                 self.site_inventories[site_name].add_device(
                     device_node.device_key,
-                    device_info,
-                    "failed",
-                    str(e)
+                    walk_result.device_info,
+                    "connected"
                 )
                 
-                logger.error(f"[SITE COLLECTION] Exception processing {device_node.device_key} after {retry_count + 1} attempts: {e}")
-                return False
+                # Process neighbors and add to queue if they belong to this site
+                self._process_site_neighbors(walk_result.neighbors_found, site_name, device_node)
+                
+                logger.info(f"[SITE COLLECTION] Successfully processed {device_node.device_key} - found {len(walk_result.neighbors_found)} neighbors")
+                return True
+            except Exception as e:
+                # Bad walk data fails this device only, not the rest of the site
+                walk_exception = e
+        
+        if walk_exception is None:
+            # Final failure - add failed device to inventory
+            device_info = self._create_failed_device_info(device_node, walk_result.error_message)
+            self.site_inventories[site_name].add_device(
+                device_node.device_key,
+                device_info,
+                "failed",
+                walk_result.error_message
+            )
+            
+            logger.warning(f"[SITE COLLECTION] Failed to process {device_node.device_key} after {attempts} attempts: {walk_result.error_message}")
+            return False
+        
+        # Final failure
+        device_info = self._create_failed_device_info(device_node, str(walk_exception))
+        self.site_inventories[site_name].add_device(
+            device_node.device_key,
+            device_info,
+            "failed",
+            str(walk_exception)
+        )
         
+        logger.error(f"[SITE COLLECTION] Exception processing {device_node.device_key} after {attempts} attempts: {walk_exception}")
         return False
     
     def _should_continue_site_collection(self, site_name: str) -> bool:
@@ -8,6 +8,7 @@ import re
 import logging
 from typing import List, Optional, Any
 from netwalker.connection.data_models import StackMemberInfo
+from netwalker.connection.command_plan import CommandSession, execute_command
 
 
 class StackCollector:
@@ -42,30 +43,11 @@ class StackCollector:
             return []
     
     def _execute_command(self, connection: Any, command: str) -> Optional[str]:
-        """Execute command and return output (supports both netmiko and scrapli)"""
+        """Execute command and return output (supports both netmiko and scrapli, or a command session)"""
         try:
-            if hasattr(connection, 'send_command') and hasattr(connection, 'device_type'):
-                # Netmiko connection
-                response = connection.send_command(command, read_timeout=30)
-                return response
-            elif hasattr(connection, 'send_command') and hasattr(connection, 'transport'):
-                # Scrapli connection
-                response = connection.send_command(command)
-                return response.result
-            elif hasattr(connection, 'send_command'):
-                # Generic connection
-                try:
-                    response = connection.send_command(command)
-                    if hasattr(response, 'result'):
-                        return response.result
-                    else:
-                        return str(response)
-                except TypeError:
-                    response = connection.send_command(command, read_timeout=30)
-                    return response
-            else:
-                self.logger.error(f"Unknown connection type: {type(connection)}")
-                return None
+            if isinstance(connection, CommandSession):
+                return connection.run(command, timeout=30)
+            return execute_command(connection, command, timeout=30)
         except Exception as e:
             self.logger.error(f"Command execution failed for '{command}': {str(e)}")
             return None
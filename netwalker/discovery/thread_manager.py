@@ -229,13 +229,61 @@ class ThreadManager:
             logger.error(f"Failed to submit task {task.task_id}: {e}")
             return False
     
-    def _execute_task_wrapper(self, task: ThreadTask) -> ThreadResult:
+    def run_tasks(self, tasks: List[ThreadTask]) -> List[ThreadResult]:
+        """
+        Execute a batch of tasks concurrently and wait for all of them.
+
+        Results are returned in submission order (not completion order) so
+        callers can process them deterministically. Batch results are handed
+        back directly and are not placed on result_queue.
+
+        Args:
+            tasks: Tasks to execute
+
+        Returns:
+            List of thread results, one per task, in the order submitted
+        """
+        if self.executor is None:
+            self.start()
+
+        submitted: List[Tuple[ThreadTask, Future]] = []
+        for task in tasks:
+            future = self.executor.submit(self._execute_task_wrapper, task, False)
+
+            with self._tasks_lock:
+                self.active_tasks[task.task_id] = future
+
+            with self._stats_lock:
+                self._stats['tasks_submitted'] += 1
+
+            submitted.append((task, future))
+
+        logger.debug(f"Submitted batch of {len(submitted)} tasks")
+
+        results = []
+        for task, future in submitted:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Task {task.task_id} raised outside wrapper: {e}")
+                results.append(ThreadResult(
+                    task_id=task.task_id,
+                    hostname=task.hostname,
+                    ip_address=task.ip_address,
+                    success=False,
+                    error=str(e)
+                ))
+
+        return results
+
+    def _execute_task_wrapper(self, task: ThreadTask, queue_result: bool = True) -> ThreadResult:
         """
         Wrapper for task execution with connection limiting and error handling.
-        
+
         Args:
             task: Task to execute
-            
+            queue_result: Whether to place the result on result_queue
+
         Returns:
             Thread result
         """
@@ -312,19 +360,21 @@ class ThreadManager:
             self.active_connections.decrement()
         
         # Store result and update tracking
-        self._store_result(thread_result)
+        self._store_result(thread_result, queue_result)
         
         return thread_result
     
-    def _store_result(self, result: ThreadResult):
+    def _store_result(self, result: ThreadResult, queue_result: bool = True):
         """
         Store task result and update tracking.
         
         Args:
             result: Thread result to store
+            queue_result: Whether to place the result on result_queue
         """
         # Add result to queue
-        self.result_queue.put(result)
+        if queue_result:
+            self.result_queue.put(result)
         
         # Update task tracking
         with self._tasks_lock:
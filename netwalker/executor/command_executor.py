@@ -11,13 +11,16 @@ Author: Mark Oldham
 import configparser
 import logging
 import os
+import queue
+import threading
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from netwalker.config.credentials import CredentialManager, Credentials
 from netwalker.connection.connection_manager import ConnectionManager
 from netwalker.database.database_manager import DatabaseManager
 from netwalker.executor.data_models import DeviceInfo, CommandResult, ExecutionSummary
 from netwalker.executor.device_filter import DeviceFilter
+from netwalker.executor.rate_limiter import LoginRateLimiter
 from netwalker.executor.exceptions import (
     CommandExecutorError,
     ConfigurationError,
@@ -34,17 +37,19 @@ class CommandExecutor:
     1. Load configuration from INI file
     2. Get credentials from CredentialManager
     3. Filter devices from database
-    4. Execute commands sequentially on each device
-    5. Collect and export results
+    4. Execute commands on each device, sequentially or on max_workers threads
+    5. Stream results to the Excel exporter as devices finish
     
     Attributes:
         config_file: Path to configuration file (default: netwalker.ini)
         device_filter: SQL wildcard pattern for device name matching
         command: Command string to execute on devices
         output_dir: Directory for Excel output file
+        max_workers: Devices processed at once (overrides configuration when set)
     """
     
-    def __init__(self, config_file: str, device_filter: str, command: str, output_dir: str):
+    def __init__(self, config_file: str, device_filter: str, command: str, output_dir: str,
+                 max_workers: Optional[int] = None):
         """
         Initialize the command executor.
         
@@ -53,12 +58,14 @@ class CommandExecutor:
             device_filter: SQL wildcard pattern for device filtering
             command: Command to execute on devices
             output_dir: Output directory for results
+            max_workers: Devices processed at once, overrides [command_executor] max_workers
         """
         self.logger = logging.getLogger(__name__)
         self.config_file = config_file
         self.device_filter_pattern = device_filter
         self.command = command
         self.output_dir = output_dir
+        self.max_workers = max_workers
         
         # Configuration and credentials (loaded during execute)
         self.config: Optional[Dict[str, Any]] = None
@@ -70,6 +77,10 @@ class CommandExecutor:
 
         # Connection manager (initialized during execute)
         self.connection_manager: Optional[ConnectionManager] = None
+        self._connection_manager_lock = threading.Lock()
+
+        # Login rate limiter shared by all workers (initialized during execute)
+        self.login_limiter: Optional[LoginRateLimiter] = None
 
         self.logger.info(f"CommandExecutor initialized: filter='{device_filter}', command='{command}'")
     
@@ -82,8 +93,8 @@ class CommandExecutor:
         2. Get credentials
         3. Connect to database
         4. Filter devices
-        5. Execute commands on each device
-        6. Export results to Excel
+        5. Execute commands on each device (in parallel when max_workers > 1)
+        6. Stream results to Excel as devices finish
         7. Display summary
 
         Returns:
@@ -156,38 +167,48 @@ class CommandExecutor:
 
         self.logger.info("Found %d devices matching filter", len(devices))
 
+        executor_config = self.config.get('command_executor', {})
+        workers = self.max_workers or executor_config.get('max_workers', 1)
+        workers = max(1, min(workers, len(devices)))
+        device_timeout = executor_config.get('device_timeout', 0)
+        self.login_limiter = LoginRateLimiter(executor_config.get('max_logins_per_second', 0))
+
         # Step 5: Initialize progress reporter and display header
         from netwalker.executor.progress_reporter import ProgressReporter
-        progress_reporter = ProgressReporter(len(devices), self.command)
+        progress_reporter = ProgressReporter(len(devices), self.command, concurrent=workers > 1)
         progress_reporter.display_header()
 
-        # Step 6: Execute commands on each device sequentially
-        results = []
+        # Step 6: Execute commands, streaming each result to the exporter as it completes
+        from netwalker.executor.excel_exporter import CommandResultExporter
+        exporter = CommandResultExporter(self.output_dir)
+        result_writer = exporter.open_stream(self.command)
         successful_count = 0
         failed_count = 0
 
-        for device in devices:
-            # Report start of execution for this device
-            progress_reporter.report_start(device.device_name, device.ip_address)
-
-            # Execute command on device
-            result = self._execute_on_device(device)
-            results.append(result)
+        if workers > 1 or device_timeout:
+            completed = self._execute_concurrently(devices, progress_reporter, workers, device_timeout)
+        else:
+            completed = self._execute_sequentially(devices, progress_reporter)
 
-            # Report success or failure
-            if result.status == "Success":
-                successful_count += 1
-                progress_reporter.report_success(device.device_name)
-            else:
-                failed_count += 1
-                progress_reporter.report_failure(device.device_name, result.status)
+        try:
+            for position, result in completed:
+                # Report success or failure
+                if result.status == "Success":
+                    successful_count += 1
+                    progress_reporter.report_success(result.device_name)
+                else:
+                    failed_count += 1
+                    progress_reporter.report_failure(result.device_name, result.status)
 
-        # Step 7: Export results to Excel with error handling
-        from netwalker.executor.excel_exporter import CommandResultExporter
-        exporter = CommandResultExporter(self.output_dir)
+                # Rows keep the device filter order whatever order results arrive in
+                result_writer.write(result, position)
+        except BaseException:
+            result_writer.discard()
+            raise
 
+        # Step 7: Write the Excel file with error handling
         try:
-            output_file = exporter.export(results, self.command)
+            output_file = result_writer.close()
             self.logger.info("Results exported to: %s", output_file)
         except PermissionError as e:
             error_msg = (
@@ -227,14 +248,150 @@ class CommandExecutor:
         progress_reporter.report_summary(summary)
 
         self.logger.info(
-            "Command execution completed: total=%d, successful=%d, failed=%d, time=%.1fs",
+            "Command execution completed: total=%d, successful=%d, failed=%d, time=%.1fs, "
+            "workers=%d, login rate limit wait=%.1fs",
             summary.total_devices,
             summary.successful,
             summary.failed,
-            summary.total_time
+            summary.total_time,
+            workers,
+            self.login_limiter.total_wait
         )
 
         return summary
+
+    def _execute_sequentially(self, devices: List[DeviceInfo],
+                              progress_reporter) -> Iterator[Tuple[int, CommandResult]]:
+        """
+        Execute the command on one device at a time.
+
+        Args:
+            devices: Devices to process
+            progress_reporter: ProgressReporter for start messages
+
+        Yields:
+            (device position, CommandResult) in device order
+        """
+        for position, device in enumerate(devices):
+            self.login_limiter.wait()
+
+            # Report start of execution for this device
+            progress_reporter.report_start(device.device_name, device.ip_address)
+            yield position, self._execute_on_device(device)
+
+    def _execute_concurrently(self, devices: List[DeviceInfo], progress_reporter, workers: int,
+                              device_timeout: float) -> Iterator[Tuple[int, CommandResult]]:
+        """
+        Execute the command on up to workers devices at once.
+
+        Each device runs on its own daemon thread once one of the workers
+        slots is free, and takes a login slot from the shared rate limiter
+        before connecting. A device still running device_timeout seconds after
+        it started is reported as a Timeout: its slot is handed to the next
+        device, its connection is closed on a background thread, and the hung
+        thread is abandoned rather than waited for.
+
+        Args:
+            devices: Devices to process
+            progress_reporter: ProgressReporter for start messages
+            workers: Number of devices run at once
+            device_timeout: Seconds allowed per device, 0 for no limit
+
+        Yields:
+            (device position, CommandResult) in completion order
+        """
+        started: Dict[int, float] = {}
+        slots = threading.Semaphore(workers)
+        released = set()
+        released_lock = threading.Lock()
+        results: queue.Queue = queue.Queue()
+
+        def release(position: int):
+            # The worker and a timeout may both give the slot back; only the first counts
+            with released_lock:
+                if position in released:
+                    return
+                released.add(position)
+            slots.release()
+
+        def run(position: int, device: DeviceInfo):
+            try:
+                # Space out logins so parallel workers do not flood TACACS
+                self.login_limiter.wait()
+                started[position] = time.time()
+                progress_reporter.report_start(device.device_name, device.ip_address)
+                outcome = self._execute_on_device(device)
+            except Exception as e:
+                outcome = e
+            release(position)
+            results.put((position, outcome))
+
+        self.logger.info("Executing on %d devices with %d workers (device timeout: %s)",
+                         len(devices), workers, f"{device_timeout}s" if device_timeout else "none")
+
+        next_position = 0
+        running = set()
+        while next_position < len(devices) or running:
+            while next_position < len(devices) and slots.acquire(blocking=False):
+                threading.Thread(target=run, args=(next_position, devices[next_position]),
+                                 name=f"netwalker-execute-{next_position}", daemon=True).start()
+                running.add(next_position)
+                next_position += 1
+
+            try:
+                position, outcome = results.get(timeout=min(device_timeout, 1.0) or None)
+            except queue.Empty:
+                pass
+            else:
+                # Results from devices already reported as timed out are dropped
+                if position in running:
+                    running.discard(position)
+                    if isinstance(outcome, Exception):
+                        raise outcome
+                    yield position, outcome
+
+            if device_timeout:
+                now = time.time()
+                for position in sorted(running):
+                    start_time = started.get(position)
+                    if start_time is not None and now - start_time >= device_timeout:
+                        running.discard(position)
+                        release(position)
+                        yield position, self._timeout_result(devices[position], now - start_time)
+
+    def _timeout_result(self, device: DeviceInfo, elapsed: float) -> CommandResult:
+        """
+        Build the result for a device that exceeded device_timeout.
+
+        Its connection is closed on a background thread, since the exit and
+        logout sequence can block as long as the device it is giving up on.
+
+        Args:
+            device: Device that timed out
+            elapsed: Seconds since the device started
+
+        Returns:
+            CommandResult with Timeout status
+        """
+        self.logger.warning(f"No result from {device.device_name} after {elapsed:.1f}s - giving up")
+        threading.Thread(target=self._close_timed_out_connection, args=(device,),
+                         name=f"netwalker-execute-close-{device.ip_address}", daemon=True).start()
+
+        return CommandResult(
+            device_name=device.device_name,
+            ip_address=device.ip_address,
+            status="Timeout",
+            output=f"No result within device timeout ({elapsed:.0f}s)",
+            execution_time=elapsed
+        )
+
+    def _close_timed_out_connection(self, device: DeviceInfo):
+        """Close the connection of a device that exceeded device_timeout"""
+        try:
+            if self.connection_manager:
+                self.connection_manager.close_connection(device.ip_address)
+        except Exception as close_error:
+            self.logger.warning(f"Error closing connection for {device.device_name}: {close_error}")
     
     def _load_configuration(self) -> Dict[str, Any]:
         """
@@ -357,13 +514,19 @@ class CommandExecutor:
             return {
                 'connection_timeout': 30,
                 'ssh_strict_key': False,
-                'output_directory': self.output_dir
+                'output_directory': self.output_dir,
+                'max_workers': 1,
+                'device_timeout': 0,
+                'max_logins_per_second': 0
             }
         
         executor_config = {
             'connection_timeout': config.getint('command_executor', 'connection_timeout', fallback=30),
             'ssh_strict_key': config.getboolean('command_executor', 'ssh_strict_key', fallback=False),
-            'output_directory': config.get('command_executor', 'output_directory', fallback=self.output_dir)
+            'output_directory': config.get('command_executor', 'output_directory', fallback=self.output_dir),
+            'max_workers': config.getint('command_executor', 'max_workers', fallback=1),
+            'device_timeout': config.getint('command_executor', 'device_timeout', fallback=0),
+            'max_logins_per_second': config.getfloat('command_executor', 'max_logins_per_second', fallback=0)
         }
         
         return executor_config
@@ -484,6 +647,22 @@ class CommandExecutor:
         self.logger.info(f"Found {len(devices)} devices matching filter")
         return devices
 
+    def _initialize_connection_manager(self):
+        """Create the shared connection manager if not already done"""
+        with self._connection_manager_lock:
+            if self.connection_manager:
+                return
+            timeout = self.config['command_executor']['connection_timeout']
+            self.connection_manager = ConnectionManager(
+                ssh_port=self.config['connection']['ssh_port'],
+                telnet_port=self.config['connection']['telnet_port'],
+                timeout=timeout,
+                ssl_verify=self.config['connection']['ssl_verify'],
+                ssl_cert_file=self.config['connection']['ssl_cert_file'],
+                ssl_key_file=self.config['connection']['ssl_key_file'],
+                ssl_ca_bundle=self.config['connection']['ssl_ca_bundle']
+            )
+
     def _execute_on_device(self, device: DeviceInfo) -> CommandResult:
         """
         Execute command on a single device.
@@ -505,18 +684,7 @@ class CommandExecutor:
 
         self.logger.info(f"Executing command on {device.device_name} ({device.ip_address})")
 
-        # Initialize connection manager if not already done
-        if not self.connection_manager:
-            timeout = self.config['command_executor']['connection_timeout']
-            self.connection_manager = ConnectionManager(
-                ssh_port=self.config['connection']['ssh_port'],
-                telnet_port=self.config['connection']['telnet_port'],
-                timeout=timeout,
-                ssl_verify=self.config['connection']['ssl_verify'],
-                ssl_cert_file=self.config['connection']['ssl_cert_file'],
-                ssl_key_file=self.config['connection']['ssl_key_file'],
-                ssl_ca_bundle=self.config['connection']['ssl_ca_bundle']
-            )
+        self._initialize_connection_manager()
 
         try:
             # Attempt to connect to the device
@@ -9,11 +9,15 @@ Author: Mark Oldham
 
 import logging
 import os
+import pickle
+import tempfile
+import threading
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 
@@ -21,6 +25,20 @@ from .data_models import CommandResult
 
 logger = logging.getLogger(__name__)
 
+HEADERS = ["Device Name", "Device IP", "Status", "Command Output", "Execution Time"]
+
+
+def _format_execution_time(result: CommandResult) -> str:
+    """Execution time formatted to 2 decimal places"""
+    return f"{result.execution_time:.2f}s"
+
+
+def _display_length(value) -> int:
+    """Display width of a cell value; multi-line content uses its longest line"""
+    if not value:
+        return 0
+    return max(len(line) for line in str(value).split('\n'))
+
 
 class CommandResultExporter:
     """
@@ -32,6 +50,7 @@ class CommandResultExporter:
     - Auto-adjusted column widths (max 100 characters)
     - Preserved line breaks in command output
     - Columns: Device Name, Device IP, Status, Command Output, Execution Time
+    - Streaming exports through open_stream() for results arriving one at a time
     """
     
     def __init__(self, output_dir: str = '.'):
@@ -50,6 +69,7 @@ class CommandResultExporter:
         self.header_font = Font(bold=True, color="FFFFFF")
         self.header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
         self.header_alignment = Alignment(horizontal="center", vertical="center")
+        self.output_alignment = Alignment(wrap_text=True, vertical="top")
         
         logger.info(f"CommandResultExporter initialized with output directory: {self.output_dir}")
     
@@ -67,45 +87,77 @@ class CommandResultExporter:
         Raises:
             Exception: If Excel file creation or writing fails
         """
+        writer = self.open_stream(command)
+        try:
+            for result in results:
+                writer.write(result)
+        except Exception:
+            writer.discard()
+            raise
+        return writer.close()
+    
+    def open_stream(self, command: str = "") -> 'CommandResultWriter':
+        """
+        Start an export that receives results one at a time as devices finish.
+        
+        Args:
+            command: The command that was executed (for reference)
+            
+        Returns:
+            CommandResultWriter; call write() per result and close() to save the file
+        """
+        return CommandResultWriter(self, command)
+    
+    def _save_workbook(self, rows: Iterator[CommandResult], column_widths: List[int], row_count: int) -> str:
+        """
+        Write results to a timestamped workbook, one row at a time.
+        
+        Args:
+            rows: Results in output order
+            column_widths: Longest value per column, including headers
+            row_count: Number of results, for logging
+            
+        Returns:
+            Path to the generated Excel file
+        """
         # Generate timestamped filename
         timestamp = datetime.now().strftime("%Y%m%d-%H-%M")
         filename = f"Command_Results_{timestamp}.xlsx"
         filepath = os.path.join(self.output_dir, filename)
         
-        logger.info(f"Exporting {len(results)} command results to: {filename}")
+        logger.info(f"Exporting {row_count} command results to: {filename}")
         
         try:
-            # Create workbook
-            workbook = Workbook()
-            ws = workbook.active
-            ws.title = "Command Results"
+            # Write-only workbook streams rows to disk; column widths must be set first
+            workbook = Workbook(write_only=True)
+            ws = workbook.create_sheet("Command Results")
             
-            # Define headers
-            headers = ["Device Name", "Device IP", "Status", "Command Output", "Execution Time"]
+            # Auto-adjust column widths (max 100 characters)
+            for col_num, max_length in enumerate(column_widths, start=1):
+                column_letter = get_column_letter(col_num)
+                adjusted_width = min(max_length + 2, 100)
+                ws.column_dimensions[column_letter].width = adjusted_width
+                logger.debug(f"Column {column_letter} width set to {adjusted_width}")
             
             # Write headers with formatting
-            for col_num, header in enumerate(headers, start=1):
-                cell = ws.cell(row=1, column=col_num)
-                cell.value = header
+            header_row = []
+            for header in HEADERS:
+                cell = WriteOnlyCell(ws, value=header)
                 cell.font = self.header_font
                 cell.fill = self.header_fill
                 cell.alignment = self.header_alignment
+                header_row.append(cell)
+            ws.append(header_row)
             
             # Write data rows
-            for row_num, result in enumerate(results, start=2):
-                ws.cell(row=row_num, column=1, value=result.device_name)
-                ws.cell(row=row_num, column=2, value=result.ip_address)
-                ws.cell(row=row_num, column=3, value=result.status)
-                
+            for result in rows:
                 # Command output with wrap text to preserve line breaks
-                output_cell = ws.cell(row=row_num, column=4, value=result.output)
-                output_cell.alignment = Alignment(wrap_text=True, vertical="top")
+                output_cell = WriteOnlyCell(ws, value=result.output)
+                output_cell.alignment = self.output_alignment
                 
                 # Execution time formatted to 2 decimal places
-                ws.cell(row=row_num, column=5, value=f"{result.execution_time:.2f}s")
-            
-            # Auto-adjust column widths (max 100 characters)
-            self._auto_adjust_columns(ws, max_width=100)
+                ws.append([result.device_name, result.ip_address, result.status, output_cell,
+                           _format_execution_time(result)])
             
             # Save workbook
             workbook.save(filepath)
@@ -117,38 +169,102 @@ class CommandResultExporter:
         except Exception as e:
             logger.error(f"Failed to export command results to Excel: {e}")
             raise
+
+
+class CommandResultWriter:
+    """
+    Streaming export of command results.
+    
+    Results are appended to a temporary spool file as they arrive (from any
+    thread, in any order) while column widths are tracked, so the executor
+    never holds every device's output in memory. close() writes the
+    workbook in a single pass, ordering rows by the position given to
+    write(), and removes the spool file.
     
-    def _auto_adjust_columns(self, worksheet, max_width: int = 100):
+    Attributes:
+        command: The command that was executed
+        count: Number of results written
+    """
+    
+    def __init__(self, exporter: CommandResultExporter, command: str = ""):
         """
-        Auto-adjust column widths based on content with a maximum width.
+        Initialize the writer and its spool file.
         
         Args:
-            worksheet: The worksheet to adjust
-            max_width: Maximum column width in characters (default: 100)
+            exporter: Exporter that owns the output directory and formatting
+            command: The command that was executed (for reference)
         """
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if cell.value:
-                        # Handle multi-line content by taking the longest line
-                        cell_value = str(cell.value)
-                        if '\n' in cell_value:
-                            # For multi-line content, use the longest line
-                            lines = cell_value.split('\n')
-                            max_line_length = max(len(line) for line in lines)
-                            if max_line_length > max_length:
-                                max_length = max_line_length
-                        else:
-                            if len(cell_value) > max_length:
-                                max_length = len(cell_value)
-                except:
-                    pass
-            
-            # Add padding and cap at max_width
-            adjusted_width = min(max_length + 2, max_width)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+        self.exporter = exporter
+        self.command = command
+        self.count = 0
+        self._column_widths = [len(header) for header in HEADERS]
+        self._offsets: Dict[int, int] = {}
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        fd, self._spool_path = tempfile.mkstemp(prefix='netwalker_results_', suffix='.pkl')
+        self._spool = os.fdopen(fd, 'w+b')
+    
+    def write(self, result: CommandResult, position: Optional[int] = None):
+        """
+        Add one result to the export.
+        
+        A spool write failure is logged and re-raised from close(), so one
+        bad write does not abort the remaining devices.
+        
+        Args:
+            result: Command result for one device
+            position: Row order key (e.g. the device's index); defaults to arrival order
+        """
+        values = (result.device_name, result.ip_address, result.status, result.output,
+                  _format_execution_time(result))
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._error:
+                return
+            try:
+                offset = self._spool.seek(0, os.SEEK_END)
+                self._spool.write(data)
+            except Exception as e:
+                logger.error(f"Failed to spool command result for {result.device_name}: {e}")
+                self._error = e
+                return
+            self._offsets[self.count if position is None else position] = offset
+            self.count += 1
+            for column, value in enumerate(values):
+                length = _display_length(value)
+                if length > self._column_widths[column]:
+                    self._column_widths[column] = length
+    
+    def close(self) -> str:
+        """
+        Write the Excel file and remove the spool file.
+        
+        Returns:
+            Path to the generated Excel file
             
-            logger.debug(f"Column {column_letter} width set to {adjusted_width}")
+        Raises:
+            Exception: If spooling, Excel file creation or writing failed
+        """
+        try:
+            if self._error:
+                raise self._error
+            self._spool.flush()
+            return self.exporter._save_workbook(self._read_rows(), self._column_widths, self.count)
+        finally:
+            self.discard()
+    
+    def discard(self):
+        """Remove the spool file without writing an Excel file"""
+        if self._spool.closed:
+            return
+        self._spool.close()
+        try:
+            os.remove(self._spool_path)
+        except OSError as e:
+            logger.warning(f"Could not remove result spool file {self._spool_path}: {e}")
+    
+    def _read_rows(self) -> Iterator[CommandResult]:
+        """Read spooled results back one at a time in position order"""
+        for position in sorted(self._offsets):
+            self._spool.seek(self._offsets[position])
+            yield pickle.load(self._spool)
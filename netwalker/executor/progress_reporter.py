@@ -10,6 +10,7 @@ Author: Mark Oldham
 """
 
 import logging
+import threading
 from netwalker.executor.data_models import ExecutionSummary
 
 
@@ -27,24 +28,34 @@ class ProgressReporter:
     Uses ASCII characters ([OK], [FAIL]) instead of Unicode for Windows
     console compatibility.
 
+    All report methods are thread-safe. In concurrent mode devices finish
+    out of order, so success and failure lines also show how many devices
+    have completed.
+
     Attributes:
         total_devices: Total number of devices to process
         current_device: Current device number being processed (1-indexed)
+        completed_devices: Number of devices with a reported result
         command: The command being executed (for display)
+        concurrent: Whether results can arrive out of order
     """
 
-    def __init__(self, total_devices: int, command: str):
+    def __init__(self, total_devices: int, command: str, concurrent: bool = False):
         """
         Initialize the progress reporter.
 
         Args:
             total_devices: Total number of devices to process
             command: The command being executed on devices
+            concurrent: Whether devices are processed in parallel
         """
         self.logger = logging.getLogger(__name__)
         self.total_devices = total_devices
         self.current_device = 0
+        self.completed_devices = 0
         self.command = command
+        self.concurrent = concurrent
+        self._lock = threading.Lock()
 
         self.logger.debug(
             "ProgressReporter initialized: total_devices=%d, command='%s'",
@@ -66,16 +77,18 @@ class ProgressReporter:
         Example output:
             [1/15] Connecting to BORO-SW-UW01 (10.1.1.1)...
         """
-        self.current_device += 1
+        with self._lock:
+            self.current_device += 1
+            current_device = self.current_device
 
-        print(
-            f"  [{self.current_device}/{self.total_devices}] "
-            f"Connecting to {device_name} ({ip_address})..."
-        )
+            print(
+                f"  [{current_device}/{self.total_devices}] "
+                f"Connecting to {device_name} ({ip_address})..."
+            )
 
         self.logger.debug(
             "Progress: [%d/%d] Connecting to %s (%s)",
-            self.current_device,
+            current_device,
             self.total_devices,
             device_name,
             ip_address
@@ -93,8 +106,10 @@ class ProgressReporter:
 
         Example output:
             [OK] BORO-SW-UW01: Command executed successfully
+            [OK] BORO-SW-UW01: Command executed successfully (12/15 done)  (concurrent)
         """
-        print(f"    [OK] {device_name}: Command executed successfully")
+        with self._lock:
+            print(f"    [OK] {device_name}: Command executed successfully{self._completed_suffix()}")
 
         self.logger.info(
             "Command executed successfully on %s",
@@ -115,8 +130,10 @@ class ProgressReporter:
 
         Example output:
             [FAIL] BORO-SW-UW02: Connection timeout
+            [FAIL] BORO-SW-UW02: Connection timeout (13/15 done)  (concurrent)
         """
-        print(f"    [FAIL] {device_name}: {error_type}")
+        with self._lock:
+            print(f"    [FAIL] {device_name}: {error_type}{self._completed_suffix()}")
 
         self.logger.warning(
             "Command execution failed on %s: %s",
@@ -124,6 +141,13 @@ class ProgressReporter:
             error_type
         )
 
+    def _completed_suffix(self) -> str:
+        """Count a finished device; in concurrent mode return the completed-count suffix"""
+        self.completed_devices += 1
+        if not self.concurrent:
+            return ""
+        return f" ({self.completed_devices}/{self.total_devices} done)"
+
     def report_summary(self, summary: ExecutionSummary) -> None:
         """
         Report the final execution summary.
@@ -0,0 +1,62 @@
+"""
+Login Rate Limiter for Command Executor
+
+Spaces out device logins across all executor workers so a parallel run does
+not send a burst of authentication requests to the TACACS/RADIUS servers.
+
+Author: Mark Oldham
+"""
+
+import logging
+import threading
+import time
+
+
+class LoginRateLimiter:
+    """
+    Allows at most logins_per_second device logins across all threads.
+
+    Each caller reserves the next free login slot under a lock and then
+    sleeps until that slot outside the lock, so waiting workers do not
+    block each other.
+
+    Attributes:
+        logins_per_second: Maximum login rate (0 or less disables limiting)
+        total_wait: Total seconds callers spent waiting for a login slot
+    """
+
+    def __init__(self, logins_per_second: float):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            logins_per_second: Maximum login rate (0 or less disables limiting)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.logins_per_second = logins_per_second
+        self.interval = 1.0 / logins_per_second if logins_per_second > 0 else 0.0
+        self.total_wait = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """
+        Block until the caller may start its next login.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.interval:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            delay = slot - now
+            self.total_wait += delay
+
+        if delay > 0:
+            self.logger.debug("Login rate limit: waiting %.2fs", delay)
+            time.sleep(delay)
+        return delay
@@ -5,14 +5,25 @@ Provides filtering and boundary management for network discovery operations.
 Supports wildcard name matching, CIDR range filtering, and various exclusion criteria.
 """
 
+import bisect
 import fnmatch
 import ipaddress
 import logging
-from typing import List, Set, Dict, Any, Optional
+import re
+from functools import lru_cache
+from typing import List, Set, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Verdicts remembered per (hostname, ip, platform, capabilities); a walk
+# re-evaluates the same neighbors from every device that reports them
+VERDICT_CACHE_SIZE = 65536
+
+# Infrastructure capabilities that indicate the device is a switch/router,
+# not a true endpoint even if it also reports phone/camera/etc.
+INFRASTRUCTURE_CAPABILITIES = frozenset({'router', 'switch'})
+
 
 @dataclass
 class FilterCriteria:
@@ -29,6 +40,134 @@ class FilterCriteria:
         self.capability_excludes = [cap.lower() for cap in self.capability_excludes]
 
 
+class CompiledFilterCriteria:
+    """
+    FilterCriteria compiled once for fast repeated evaluation.
+
+    Hostname patterns become a single regex, CIDR ranges a sorted table of
+    merged integer intervals searched with bisect, and platform and
+    capability exclusions frozen sets with one combined regex each.
+    """
+
+    def __init__(self, criteria: FilterCriteria):
+        """
+        Compile filter criteria.
+
+        Args:
+            criteria: Normalized filter criteria
+        """
+        self.hostname_regex = self._compile_any(fnmatch.translate(pattern) for pattern in criteria.hostname_excludes)
+
+        self.ip_intervals: Dict[int, Tuple[List[int], List[int]]] = {}
+        networks: Dict[int, List[Tuple[int, int]]] = {}
+        for cidr_range in criteria.ip_excludes:
+            try:
+                network = ipaddress.ip_network(cidr_range, strict=False)
+            except (ipaddress.AddressValueError, ValueError) as e:
+                logger.warning(f"Invalid CIDR range {cidr_range}: {e}")
+                continue
+            networks.setdefault(network.version, []).append(
+                (int(network.network_address), int(network.broadcast_address)))
+        for version, intervals in networks.items():
+            self.ip_intervals[version] = self._merge_intervals(intervals)
+
+        # Platform exclusions match as substrings of the reported platform
+        self.platform_excludes = frozenset(criteria.platform_excludes)
+        self.platform_regex = self._compile_any(re.escape(platform) for platform in sorted(self.platform_excludes))
+
+        # Capability exclusions match whole words, so "phone" does not match "phone port"
+        self.capability_excludes = frozenset(criteria.capability_excludes)
+        self.capability_regex = self._compile_any(
+            r'\b' + re.escape(capability) + r'\b' for capability in sorted(self.capability_excludes))
+
+    @staticmethod
+    def _compile_any(patterns) -> Optional['re.Pattern']:
+        """Compile alternatives into one regex, or None if there are none"""
+        patterns = list(patterns)
+        if not patterns:
+            return None
+        return re.compile('|'.join(f"(?:{pattern})" for pattern in patterns))
+
+    @staticmethod
+    def _merge_intervals(intervals: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+        """Merge overlapping intervals into parallel sorted start and end lists"""
+        starts: List[int] = []
+        ends: List[int] = []
+        for start, end in sorted(intervals):
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    def matches_hostname(self, hostname: str) -> bool:
+        """Check if hostname matches any exclusion pattern"""
+        return self.hostname_regex is not None and self.hostname_regex.match(hostname.lower()) is not None
+
+    def matches_ip(self, ip_address: str) -> bool:
+        """Check if IP address falls within any excluded CIDR range"""
+        if not self.ip_intervals:
+            return False
+        try:
+            ip = ipaddress.ip_address(ip_address)
+        except (ipaddress.AddressValueError, ValueError):
+            # Not an IP address (likely a hostname); IP range filtering does not apply
+            return False
+        table = self.ip_intervals.get(ip.version)
+        if table is None:
+            return False
+        starts, ends = table
+        value = int(ip)
+        index = bisect.bisect_right(starts, value) - 1
+        return index >= 0 and value <= ends[index]
+
+    def matches_platform(self, platform: str) -> bool:
+        """Check if platform contains any excluded platform"""
+        if self.platform_regex is None:
+            return False
+        platform_lower = platform.lower()
+        return platform_lower in self.platform_excludes or self.platform_regex.search(platform_lower) is not None
+
+    def matches_capabilities(self, capabilities: Tuple[str, ...]) -> bool:
+        """Check if any capability matches exclusions.
+
+        Uses smart filtering: if a device has infrastructure capabilities
+        (Router, Switch) alongside an excluded capability (e.g. Phone),
+        it's not a true endpoint device — don't filter it.
+        """
+        if self.capability_regex is None:
+            return False
+        capabilities_lower = [cap.lower().strip() for cap in capabilities]
+        if not any(self.capability_regex.search(cap) for cap in capabilities_lower):
+            return False
+        return INFRASTRUCTURE_CAPABILITIES.isdisjoint(capabilities_lower)
+
+    def evaluate(self, hostname: str, ip_address: str, platform: Optional[str],
+                 capabilities: Optional[Tuple[str, ...]]) -> Optional[str]:
+        """
+        Evaluate all criteria for one device
+
+        Args:
+            hostname: Device hostname
+            ip_address: Device IP address
+            platform: Device platform type, or None
+            capabilities: Device capabilities, or None
+
+        Returns:
+            Name of the criterion that filters the device, or None if it passes
+        """
+        if self.matches_hostname(hostname):
+            return "hostname pattern"
+        if self.matches_ip(ip_address):
+            return "IP range"
+        if platform and self.matches_platform(platform):
+            return "platform"
+        if capabilities and self.matches_capabilities(capabilities):
+            return "capabilities"
+        return None
+
+
 class FilterManager:
     """
     Manages filtering and boundary enforcement for network discovery.
@@ -47,6 +186,8 @@ class FilterManager:
         """
         self.config = config
         self.criteria = self._load_filter_criteria()
+        self.compiled = CompiledFilterCriteria(self.criteria)
+        self._cached_verdict = lru_cache(maxsize=VERDICT_CACHE_SIZE)(self.compiled.evaluate)
         self.filtered_devices: Set[str] = set()
         self.boundary_devices: Set[str] = set()
         
@@ -90,6 +231,9 @@ class FilterManager:
         """
         Determine if a device should be filtered (excluded from discovery).
         
+        Verdicts come from the compiled criteria and are cached per
+        (hostname, ip, platform, capabilities).
+        
         Args:
             hostname: Device hostname
             ip_address: Device IP address
@@ -102,146 +246,23 @@ class FilterManager:
         device_key = f"{hostname}:{ip_address}"
         
         try:
-            logger.info(f"FILTER DECISION: Evaluating device {device_key}")
-            logger.info(f"  Device details: hostname='{hostname}', ip='{ip_address}', platform='{platform}', capabilities={capabilities}")
-            
-            # Check hostname patterns
-            if self._matches_hostname_pattern(hostname):
-                logger.info(f"  [FILTERED] by hostname pattern - matches one of: {self.criteria.hostname_excludes}")
-                self.filtered_devices.add(device_key)
-                return True
-            else:
-                logger.info(f"  [PASSED] hostname check - no match in patterns: {self.criteria.hostname_excludes}")
-            
-            # Check IP address ranges
-            if self._matches_ip_range(ip_address):
-                logger.info(f"  [FILTERED] by IP range - matches one of: {self.criteria.ip_excludes}")
-                self.filtered_devices.add(device_key)
-                return True
-            else:
-                logger.info(f"  [PASSED] IP range check - no match in ranges: {self.criteria.ip_excludes}")
-            
-            # Check platform exclusions
-            if platform and self._matches_platform_exclusion(platform):
-                logger.info(f"  [FILTERED] by platform - '{platform}' matches one of: {self.criteria.platform_excludes}")
-                self.filtered_devices.add(device_key)
-                return True
-            else:
-                if platform:
-                    logger.info(f"  [PASSED] platform check - '{platform}' not in exclusions")
-                else:
-                    logger.info(f"  [PASSED] platform check - no platform specified")
-            
-            # Check capability exclusions
-            if capabilities and self._matches_capability_exclusion(capabilities):
-                logger.info(f"  [FILTERED] by capabilities - {capabilities} matches one of: {self.criteria.capability_excludes}")
-                self.filtered_devices.add(device_key)
-                return True
-            else:
-                if capabilities:
-                    logger.info(f"  [PASSED] capability check - {capabilities} not in exclusions")
-                else:
-                    logger.info(f"  [PASSED] capability check - no capabilities specified")
-            
-            logger.info(f"  [FINAL DECISION] Device {device_key} will NOT be filtered - proceeding to discovery")
-            return False
-            
+            reason = self._cached_verdict(hostname, ip_address, platform,
+                                          tuple(capabilities) if capabilities else None)
         except Exception as e:
-            logger.error(f"  [ERROR] in filtering evaluation for {device_key}: {e}")
+            logger.error(f"[ERROR] in filtering evaluation for {device_key}: {e}")
             logger.exception("Full exception details:")
             # Default to not filtering on error to avoid blocking discovery
             return False
-    
-    def _matches_hostname_pattern(self, hostname: str) -> bool:
-        """Check if hostname matches any exclusion pattern"""
-        hostname_lower = hostname.lower()
-        logger.debug(f"    Checking hostname '{hostname_lower}' against patterns: {self.criteria.hostname_excludes}")
-        
-        for pattern in self.criteria.hostname_excludes:
-            if fnmatch.fnmatch(hostname_lower, pattern):
-                logger.debug(f"    [MATCH] Hostname '{hostname_lower}' matches pattern '{pattern}'")
-                return True
-            else:
-                logger.debug(f"    [NO MATCH] Hostname '{hostname_lower}' does not match pattern '{pattern}'")
-        
-        return False
-    
-    def _matches_ip_range(self, ip_address: str) -> bool:
-        """Check if IP address falls within any excluded CIDR range"""
-        logger.debug(f"    Checking IP '{ip_address}' against ranges: {self.criteria.ip_excludes}")
-        
-        try:
-            ip = ipaddress.ip_address(ip_address)
-            for cidr_range in self.criteria.ip_excludes:
-                try:
-                    network = ipaddress.ip_network(cidr_range, strict=False)
-                    if ip in network:
-                        logger.debug(f"    [MATCH] IP '{ip_address}' is within range '{cidr_range}'")
-                        return True
-                    else:
-                        logger.debug(f"    [NO MATCH] IP '{ip_address}' is not within range '{cidr_range}'")
-                except (ipaddress.AddressValueError, ValueError) as e:
-                    logger.warning(f"Invalid CIDR range {cidr_range}: {e}")
-                    continue
-        except (ipaddress.AddressValueError, ValueError):
-            # If it's not a valid IP address, it might be a hostname
-            # Skip IP range filtering for hostnames
-            logger.debug(f"    [INFO] Skipping IP range filtering for hostname: {ip_address}")
         
-        return False
-    
-    def _matches_platform_exclusion(self, platform: str) -> bool:
-        """Check if platform matches any exclusion"""
-        try:
-            platform_lower = platform.lower()
-            logger.debug(f"    Checking platform '{platform_lower}' against exclusions: {self.criteria.platform_excludes}")
-            
-            for excluded_platform in self.criteria.platform_excludes:
-                if excluded_platform in platform_lower:
-                    logger.debug(f"    [MATCH] Platform '{platform_lower}' contains excluded substring '{excluded_platform}'")
-                    return True
-                else:
-                    logger.debug(f"    [NO MATCH] Platform '{platform_lower}' does not contain '{excluded_platform}'")
-            
-            return False
-        except Exception as e:
-            logger.error(f"    [ERROR] in platform matching for '{platform}': {e}")
+        if reason is None:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"FILTER DECISION: {device_key} passed all filters - proceeding to discovery")
             return False
-    
-    def _matches_capability_exclusion(self, capabilities: List[str]) -> bool:
-        """Check if any capability matches exclusions.
-        
-        Uses smart filtering: if a device has infrastructure capabilities
-        (Router, Switch) alongside an excluded capability (e.g. Phone),
-        it's not a true endpoint device — don't filter it.
-        """
-        import re
-        capabilities_lower = [cap.lower().strip() for cap in capabilities]
-        logger.debug(f"    Checking capabilities {capabilities_lower} against exclusions: {self.criteria.capability_excludes}")
-        
-        # Infrastructure capabilities that indicate the device is a switch/router,
-        # not a true endpoint even if it also reports phone/camera/etc.
-        infrastructure_caps = {'router', 'switch'}
-        has_infrastructure = bool(infrastructure_caps.intersection(set(capabilities_lower)))
-        
-        for excluded_cap in self.criteria.capability_excludes:
-            for cap in capabilities_lower:
-                # Use word boundary matching to avoid false positives
-                # This ensures "phone" matches "phone" or "ip phone" but not "phone port"
-                pattern = r'\b' + re.escape(excluded_cap) + r'\b'
-                if re.search(pattern, cap):
-                    # If device also has infrastructure capabilities (Router/Switch),
-                    # don't filter it — it's a switch/router that happens to support phones
-                    if has_infrastructure:
-                        logger.debug(f"    [OVERRIDE] Capability '{cap}' matches '{excluded_cap}' but device also has "
-                                   f"infrastructure capabilities {infrastructure_caps.intersection(set(capabilities_lower))} - NOT filtering")
-                        return False
-                    logger.debug(f"    [MATCH] Capability '{cap}' matches excluded pattern '{excluded_cap}' (regex: {pattern})")
-                    return True
-                else:
-                    logger.debug(f"    [NO MATCH] Capability '{cap}' does not match excluded pattern '{excluded_cap}'")
         
-        return False
+        logger.info(f"FILTER DECISION: {device_key} [FILTERED] by {reason} "
+                    f"(platform='{platform}', capabilities={capabilities})")
+        self.filtered_devices.add(device_key)
+        return True
     
     def mark_as_boundary(self, hostname: str, ip_address: str, reason: str):
         """
@@ -269,7 +290,9 @@ class FilterManager:
             'hostname_patterns': len(self.criteria.hostname_excludes),
             'ip_ranges': len(self.criteria.ip_excludes),
             'platform_excludes': len(self.criteria.platform_excludes),
-            'capability_excludes': len(self.criteria.capability_excludes)
+            'capability_excludes': len(self.criteria.capability_excludes),
+            'verdict_cache_hits': self._cached_verdict.cache_info().hits,
+            'verdict_cache_misses': self._cached_verdict.cache_info().misses
         }
     
     def get_filtered_devices(self) -> Set[str]:
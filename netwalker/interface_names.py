@@ -0,0 +1,166 @@
+"""
+Interface name normalization shared by the protocol parser, VLAN parser and database
+
+Interface names arrive abbreviated ("Gi1/0/1", "Po1") or in full
+("GigabitEthernet1/0/1") depending on the command and platform. Every call
+site normalizes through this module so they agree on the result. The
+interface type prefix is looked up in a trie compiled once at import, and
+results are interned and cached because the same few hundred names of a
+device repeat across neighbors, VLANs and database rows.
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Canonical interface type names and the abbreviations devices print for them
+INTERFACE_TYPES = {
+    'GigabitEthernet': ('gi',),
+    'TenGigabitEthernet': ('te',),
+    'FastEthernet': ('fa',),
+    'FortyGigabitEthernet': ('fo',),
+    'TwentyFiveGigE': ('twe',),
+    'HundredGigE': ('hu',),
+    'Ethernet': ('eth',),
+    'Serial': ('se',),
+    'Port-channel': ('po', 'portchannel'),
+    'Management': ('mgmt',),
+}
+
+# Prefixes expanded for display and storage (device_neighbors rows), by platform.
+# Only these are rewritten so stored interface names stay as they have always been.
+IOS_DISPLAY_PREFIXES = {
+    'gi': 'GigabitEthernet',
+    'gigabitethernet': 'GigabitEthernet',
+    'te': 'TenGigabitEthernet',
+    'tengigabitethernet': 'TenGigabitEthernet',
+    'fa': 'FastEthernet',
+    'fastethernet': 'FastEthernet',
+    'fo': 'FortyGigabitEthernet',
+    'fortygigabitethernet': 'FortyGigabitEthernet',
+    'po': 'Port-channel',
+    'port-channel': 'Port-channel',
+    'portchannel': 'Port-channel',
+    'mgmt': 'Management',
+}
+
+NXOS_DISPLAY_PREFIXES = {
+    'port-channel': 'Port-channel',
+    'mgmt': 'Management',
+}
+
+# Physical port interfaces as listed in 'show vlan' port columns
+PHYSICAL_PORT_PATTERN = re.compile(
+    r'\b(?:' + '|'.join(sorted(
+        (re.escape(name) for canonical, aliases in INTERFACE_TYPES.items()
+         if canonical not in ('Port-channel', 'Management')
+         for name in (canonical.lower(),) + aliases),
+        key=len, reverse=True)) +
+    r')\d+/\d+(?:/\d+)?(?:\.\d+)?\b',
+    re.IGNORECASE
+)
+
+_NXOS_INTERFACE_PATTERN = re.compile(r'^Ethernet\d+/\d+')
+_TERMINAL = ''
+
+
+def _compile_prefix_trie(prefixes: Dict[str, str]) -> dict:
+    """Build a character trie mapping lower-case type prefixes to replacements"""
+    trie = {}
+    for prefix, replacement in prefixes.items():
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = replacement
+    return trie
+
+
+def _match_prefix(trie: dict, name: str) -> Optional[Tuple[str, int]]:
+    """
+    Match the interface type prefix of a lower-case name against a trie
+
+    A prefix only matches when the interface number starts right after it,
+    so "gi1/0/1" matches "gi" but "gig1/0/1" and "vlan10" match nothing.
+
+    Returns:
+        (replacement, prefix length), or None if there is no match
+    """
+    node = trie
+    for index, char in enumerate(name):
+        if char.isdigit():
+            replacement = node.get(_TERMINAL)
+            return (replacement, index) if replacement is not None else None
+        node = node.get(char)
+        if node is None:
+            return None
+    return None
+
+
+_IOS_DISPLAY_TRIE = _compile_prefix_trie(IOS_DISPLAY_PREFIXES)
+_NXOS_DISPLAY_TRIE = _compile_prefix_trie(NXOS_DISPLAY_PREFIXES)
+_MATCH_KEY_TRIE = _compile_prefix_trie({
+    name.replace('-', ''): canonical.lower().replace('-', '')
+    for canonical, aliases in INTERFACE_TYPES.items()
+    for name in (canonical.lower(),) + aliases
+})
+
+
+@lru_cache(maxsize=8192)
+def normalize_interface_name(interface_name: str, platform: Optional[str] = None) -> str:
+    """
+    Normalize an interface name for display and storage
+
+    Args:
+        interface_name: Raw interface name from device output
+        platform: Device platform (IOS, NX-OS, etc.) - optional
+
+    Returns:
+        Normalized interface name
+
+    Examples:
+        "Gi1/0/1" -> "GigabitEthernet1/0/1"
+        "Eth1/1" -> "Eth1/1" (NX-OS names preserved)
+        "Po1" -> "Port-channel1"
+        "mgmt0" -> "Management0"
+    """
+    if not interface_name or interface_name == "Unknown":
+        return interface_name
+
+    interface_name = interface_name.strip()
+
+    # Detect platform from interface name if not provided
+    if not platform:
+        platform = 'NX-OS' if _NXOS_INTERFACE_PATTERN.match(interface_name) else 'IOS'
+
+    trie = _NXOS_DISPLAY_TRIE if 'NX-OS' in platform.upper() else _IOS_DISPLAY_TRIE
+    match = _match_prefix(trie, interface_name.lower())
+    if match:
+        replacement, length = match
+        interface_name = replacement + interface_name[length:]
+
+    return sys.intern(interface_name)
+
+
+@lru_cache(maxsize=8192)
+def interface_match_key(interface_name: str) -> str:
+    """
+    Reduce an interface name to a key for comparing names across commands
+
+    Abbreviated and full names of the same interface get the same key,
+    whatever their case or separators.
+
+    Args:
+        interface_name: Interface name (e.g., "Gi1/0/1", "GigabitEthernet1/0/1", "Twe4/1/1")
+
+    Returns:
+        Lower-case key (e.g., "gigabitethernet1/0/1")
+    """
+    key = interface_name.lower().strip().replace(' ', '').replace('_', '').replace('-', '')
+
+    match = _match_prefix(_MATCH_KEY_TRIE, key)
+    if match:
+        replacement, length = match
+        key = replacement + key[length:]
+
+    return sys.intern(key)
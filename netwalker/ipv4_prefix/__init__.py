@@ -183,17 +183,26 @@ class IPv4PrefixInventory:
         
         # Step 6: Parse and normalize
         self.logger.info("Parsing and normalizing prefixes...")
-        all_prefixes, exceptions = self._parse_and_normalize(successful_results)
+        from netwalker.ipv4_prefix.prefix_table import NUMPY_AVAILABLE, PrefixTable
+        columnar = self.config.columnar_prefix_table
+        if columnar and not NUMPY_AVAILABLE:
+            self.logger.warning("numpy not available - columnar_prefix_table disabled")
+            columnar = False
+        all_prefixes, exceptions = self._parse_and_normalize(successful_results, columnar)
         
         self.logger.info(f"Parsed {len(all_prefixes)} prefixes with {len(exceptions)} exceptions")
         
         # Step 7: Deduplicate
         self.logger.info("Deduplicating prefixes...")
-        from netwalker.ipv4_prefix.normalizer import PrefixDeduplicator
-        deduplicator = PrefixDeduplicator()
-        
-        deduplicated_by_device = deduplicator.deduplicate_by_device(all_prefixes)
-        deduplicated_by_vrf = deduplicator.deduplicate_by_vrf(all_prefixes)
+        if isinstance(all_prefixes, PrefixTable):
+            deduplicated_by_device = all_prefixes.deduplicate_by_device()
+            deduplicated_by_vrf = all_prefixes.deduplicate_by_vrf()
+        else:
+            from netwalker.ipv4_prefix.normalizer import PrefixDeduplicator
+            deduplicator = PrefixDeduplicator()
+            
+            deduplicated_by_device = deduplicator.deduplicate_by_device(all_prefixes)
+            deduplicated_by_vrf = deduplicator.deduplicate_by_vrf(all_prefixes)
         
         self.logger.info(f"Deduplicated: {len(deduplicated_by_device)} unique by device, "
                         f"{len(deduplicated_by_vrf)} unique by VRF")
@@ -204,7 +213,14 @@ class IPv4PrefixInventory:
             self.logger.info("Analyzing route summarization...")
             from netwalker.ipv4_prefix.summarization import SummarizationAnalyzer
             analyzer = SummarizationAnalyzer()
-            summarization_relationships = analyzer.analyze_summarization(all_prefixes)
+            if isinstance(all_prefixes, PrefixTable):
+                # Materialize one device/VRF group at a time
+                for _, _, indices in all_prefixes.device_vrf_groups():
+                    summarization_relationships.extend(
+                        analyzer.analyze_summarization(all_prefixes.to_prefixes(indices))
+                    )
+            else:
+                summarization_relationships = analyzer.analyze_summarization(all_prefixes)
             self.logger.info(f"Found {len(summarization_relationships)} summarization relationships")
         
         # Step 9: Export results
@@ -386,15 +402,25 @@ class IPv4PrefixInventory:
         
         return devices
     
-    def _parse_and_normalize(self, collection_results: List['DeviceCollectionResult']) -> tuple:
-        """Parse and normalize all collected prefixes."""
+    def _parse_and_normalize(self, collection_results: List['DeviceCollectionResult'],
+                             columnar: bool = False) -> tuple:
+        """
+        Parse and normalize all collected prefixes.
+        
+        With columnar, prefixes go into a PrefixTable instead of a list of
+        NormalizedPrefix objects.
+        """
         from netwalker.ipv4_prefix.parser import CommandOutputParser
         from netwalker.ipv4_prefix.normalizer import PrefixNormalizer
         
         parser = CommandOutputParser()
         normalizer = PrefixNormalizer()
         
-        all_prefixes = []
+        if columnar:
+            from netwalker.ipv4_prefix.prefix_table import PrefixTable
+            all_prefixes = PrefixTable()
+        else:
+            all_prefixes = []
         exceptions = []
         
         for result in collection_results:
@@ -418,6 +444,22 @@ class IPv4PrefixInventory:
                     continue
                 
                 # Normalize prefix
+                if columnar:
+                    network = normalizer.normalize_parsed_network(parsed, exceptions)
+                    if network:
+                        all_prefixes.append(
+                            network,
+                            device=parsed.device,
+                            platform=parsed.platform,
+                            vrf=parsed.vrf,
+                            source=parsed.source,
+                            protocol=parsed.protocol,
+                            timestamp=parsed.timestamp,
+                            vlan=parsed.vlan,
+                            interface=parsed.interface
+                        )
+                    continue
+                
                 normalized = normalizer.normalize_parsed_prefix(parsed, exceptions)
                 if normalized:
                     all_prefixes.append(normalized)
@@ -428,7 +470,7 @@ class IPv4PrefixInventory:
                        deduplicated: List['DeduplicatedPrefix'],
                        exceptions: List['CollectionException'],
                        summarization: List['SummarizationRelationship']) -> List[str]:
-        """Export results to CSV, Excel, and database."""
+        """Export results to CSV, Excel, and database; prefixes may be a PrefixTable."""
         from netwalker.ipv4_prefix.exporter import CSVExporter, ExcelExporter, DatabaseExporter
         
         output_files = []
@@ -8,7 +8,164 @@ Author: Mark Oldham
 """
 
 import logging
-from typing import List, Optional
+import re
+import uuid
+from typing import Dict, List, Optional
+
+
+# Commands sent to the device in one channel write
+BATCH_SIZE = 30
+
+# NX-OS full-table commands and the header opening each VRF's section
+NXOS_ROUTE_VRF_ALL = 'show ip route vrf all'
+NXOS_BGP_VRF_ALL = 'show ip bgp vrf all'
+NXOS_ROUTE_SECTION = re.compile(r'^IP Route Table for VRF "([^"]+)"', re.MULTILINE)
+NXOS_BGP_SECTION = re.compile(r'^BGP routing table information for VRF (\S+?),', re.MULTILINE)
+
+
+def split_vrf_sections(output: str, header: re.Pattern) -> Dict[str, str]:
+    """
+    Split a 'vrf all' command output into per-VRF sections.
+    
+    Args:
+        output: Full-table command output
+        header: Pattern matching the line opening a VRF section, VRF name in group 1
+        
+    Returns:
+        VRF name -> section text (including its header line)
+    """
+    matches = list(header.finditer(output or ''))
+    return {
+        match.group(1): output[match.start():matches[index + 1].start() if index + 1 < len(matches) else len(output)]
+        for index, match in enumerate(matches)
+    }
+
+
+class CommandPipeline:
+    """
+    Runs a list of show commands with as few round trips as possible.
+    
+    On connections with raw channel access (netmiko), commands are written
+    in batches of BATCH_SIZE with a comment marker line after each, and the
+    output read back in one go is split on the echoed markers. Any other
+    connection, or a batch whose output cannot be split, runs the commands
+    one at a time with send_command. A batch whose read fails is only rerun
+    once a fresh marker has been echoed back, so no late output from it is
+    mistaken for a later command's.
+    """
+    
+    def __init__(self, timeout: int = 30, batch_size: int = BATCH_SIZE):
+        """
+        Initialize command pipeline.
+        
+        Args:
+            timeout: Read timeout in seconds per command
+            batch_size: Commands per channel write
+        """
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+    
+    def run(self, connection, commands: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Run commands and return their outputs.
+        
+        Args:
+            connection: Active device connection
+            commands: Commands to run, in order
+            
+        Returns:
+            Command -> output, or None for a command that failed
+        """
+        outputs = {}
+        batched = hasattr(connection, 'write_channel') and hasattr(connection, 'read_until_pattern')
+        
+        for start in range(0, len(commands), self.batch_size):
+            chunk = commands[start:start + self.batch_size]
+            chunk_outputs = None
+            if batched and len(chunk) > 1:
+                try:
+                    chunk_outputs = self._run_batch(connection, chunk)
+                except Exception as e:
+                    self.logger.warning(f"Batched execution failed, running commands one at a time: {str(e)}")
+                    if not self._resync(connection, self.timeout * len(chunk)):
+                        self.logger.error("Channel did not resync after failed batch, dropping remaining commands")
+                        outputs.update({command: None for command in commands[start:]})
+                        break
+            if chunk_outputs is None:
+                chunk_outputs = {command: self._run_single(connection, command) for command in chunk}
+            outputs.update(chunk_outputs)
+        
+        return outputs
+    
+    def _run_single(self, connection, command: str) -> Optional[str]:
+        """Run one command with send_command, isolating failures."""
+        try:
+            self.logger.debug(f"Executing '{command}'")
+            return connection.send_command(command)
+        except Exception as e:
+            self.logger.error(f"Failed to execute '{command}': {str(e)}")
+            return None
+    
+    def _run_batch(self, connection, commands: List[str]) -> Optional[Dict[str, str]]:
+        """
+        Write a batch of commands at once and split the output.
+        
+        Returns:
+            Command -> output, or None if the batch must be rerun one command at a time
+            
+        Raises:
+            Exception: Channel write or read failed; the channel must be resynced
+        """
+        token = uuid.uuid4().hex[:12]
+        markers = [f"! netwalker-batch-{token}-{index}" for index in range(len(commands))]
+        payload = ''.join(f"{command}\n{marker}\n" for command, marker in zip(commands, markers))
+        
+        self.logger.debug(f"Executing {len(commands)} commands in one batch")
+        connection.write_channel(payload)
+        # Read through the last marker's echo and the prompt printed after it
+        raw = connection.read_until_pattern(
+            pattern=re.escape(markers[-1]) + r'[^\n]*\n[^\n]*[#>]',
+            read_timeout=self.timeout * len(commands)
+        )
+        
+        outputs = {}
+        position = 0
+        for command, marker in zip(commands, markers):
+            end = raw.find(marker, position)
+            # Output follows the command's echo and ends before the prompt the marker was typed at
+            echo = raw.find(command, position, end)
+            if end < 0 or echo < 0:
+                self.logger.warning(f"Could not split batched output at '{command}', running commands one at a time")
+                return None
+            body_start = raw.find('\n', echo, end)
+            body = raw[body_start + 1:end] if body_start >= 0 else ''
+            outputs[command] = body[:body.rfind('\n')] if '\n' in body else ''
+            position = end + len(marker)
+        
+        return outputs
+    
+    def _resync(self, connection, read_timeout: int) -> bool:
+        """
+        Wait for a fresh marker to echo back after a failed batch.
+        
+        Everything up to the marker, including output the failed batch is
+        still producing, is read and discarded.
+        
+        Returns:
+            True if the channel is back at a prompt
+        """
+        marker = f"! netwalker-resync-{uuid.uuid4().hex[:12]}"
+        try:
+            connection.write_channel(f"{marker}\n")
+            connection.read_until_pattern(
+                pattern=re.escape(marker) + r'[^\n]*\n[^\n]*[#>]',
+                read_timeout=read_timeout
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not resync channel after failed batch: {str(e)}")
+            return False
 
 
 class VRFDiscovery:
@@ -373,15 +530,7 @@ class BGPCollector:
                 self.logger.error(f"Invalid VRF name for BGP collection: {vrf}")
                 return None
             
-            # Build platform-specific command
-            if platform.lower() in ['ios', 'iosxe', 'ios-xe']:
-                command = f"show ip bgp vpnv4 vrf {sanitized_vrf}"
-            elif platform.lower() in ['nxos', 'nx-os']:
-                command = f"show ip bgp vrf {sanitized_vrf}"
-            else:
-                self.logger.warning(f"Unknown platform '{platform}' for BGP VRF collection, trying IOS command")
-                command = f"show ip bgp vpnv4 vrf {sanitized_vrf}"
-            
+            command = self.vrf_bgp_command(sanitized_vrf, platform)
             self.logger.debug(f"Executing '{command}' (sanitized VRF: {sanitized_vrf})")
             output = connection.send_command(command)
             
@@ -398,6 +547,25 @@ class BGPCollector:
             self.logger.debug("Continuing with collection without BGP data for this VRF")
             return None
     
+    def vrf_bgp_command(self, sanitized_vrf: str, platform: str) -> str:
+        """
+        Build the platform-specific BGP VRF command.
+        
+        Args:
+            sanitized_vrf: VRF name as returned by _sanitize_vrf_name
+            platform: Device platform (ios, iosxe, nxos)
+            
+        Returns:
+            'show ip bgp vpnv4 vrf <VRF>' (IOS/IOS-XE and unknown platforms)
+            or 'show ip bgp vrf <VRF>' (NX-OS)
+        """
+        if platform.lower() in ['ios', 'iosxe', 'ios-xe']:
+            return f"show ip bgp vpnv4 vrf {sanitized_vrf}"
+        if platform.lower() in ['nxos', 'nx-os']:
+            return f"show ip bgp vrf {sanitized_vrf}"
+        self.logger.warning(f"Unknown platform '{platform}' for BGP VRF collection, trying IOS command")
+        return f"show ip bgp vpnv4 vrf {sanitized_vrf}"
+    
     def _is_bgp_not_configured(self, output: str) -> bool:
         """
         Check if command output indicates BGP is not configured.
@@ -604,7 +772,11 @@ class PrefixCollector:
                         result.raw_outputs['show ip bgp'] = output
             
             # Collect per-VRF tables (if enabled)
-            if self.config.collect_per_vrf and vrfs:
+            if self.config.collect_per_vrf and vrfs and self.config.batch_vrf_commands:
+                self.logger.debug(f"Collecting per-VRF routing tables from {device_name} ({len(vrfs)} VRFs, batched)...")
+                self._collect_vrf_tables(connection, vrfs, platform, result)
+            
+            elif self.config.collect_per_vrf and vrfs:
                 self.logger.debug(f"Collecting per-VRF routing tables from {device_name} ({len(vrfs)} VRFs)...")
                 
                 for vrf in vrfs:
@@ -646,3 +818,71 @@ class PrefixCollector:
                     self.logger.warning(f"Error disconnecting from {device_name}: {str(e)}")
         
         return result
+    
+    def _collect_vrf_tables(self, connection, vrfs: List[str], platform: str, result):
+        """
+        Collect the per-VRF route, connected and BGP tables with few round trips.
+        
+        NX-OS returns the route and BGP tables of every VRF from one
+        'vrf all' command, split here into per-VRF sections. Everything
+        else (all IOS/IOS-XE commands, connected routes, and route tables
+        missing from a 'vrf all' output) goes through a CommandPipeline. Outputs are
+        stored under the same raw_outputs keys, in the same order, as the
+        one-command-per-VRF collection.
+        
+        Args:
+            connection: Active device connection
+            vrfs: VRF names discovered on the device
+            platform: Device platform (ios, iosxe, nxos)
+            result: DeviceCollectionResult to fill
+        """
+        is_ios = platform.lower() in ['ios', 'iosxe', 'ios-xe']
+        is_nxos = platform.lower() in ['nxos', 'nx-os']
+        pipeline = CommandPipeline(timeout=self.config.command_timeout)
+        
+        route_sections = {}
+        bgp_sections = {}
+        if is_nxos:
+            full_tables = pipeline.run(connection, [NXOS_ROUTE_VRF_ALL] +
+                                       ([NXOS_BGP_VRF_ALL] if self.config.collect_bgp else []))
+            route_sections = split_vrf_sections(full_tables.get(NXOS_ROUTE_VRF_ALL), NXOS_ROUTE_SECTION)
+            bgp_output = full_tables.get(NXOS_BGP_VRF_ALL)
+            if bgp_output is not None and self.bgp_collector._is_bgp_not_configured(bgp_output):
+                self.logger.info("BGP is not configured on device (all VRFs)")
+                bgp_sections = None
+            else:
+                bgp_sections = split_vrf_sections(bgp_output, NXOS_BGP_SECTION)
+        
+        # (raw_outputs key, command) per table, in collection order
+        planned = []
+        for vrf in vrfs:
+            sanitized_vrf = self.routing_collector._sanitize_vrf_name(vrf)
+            if not sanitized_vrf:
+                self.logger.error(f"Invalid VRF name: {vrf}")
+            else:
+                planned.append((f'show ip route vrf {vrf}', f"show ip route vrf {sanitized_vrf}",
+                                route_sections.get(vrf.strip())))
+                planned.append((f'show ip route vrf {vrf} connected', f"show ip route vrf {sanitized_vrf} connected",
+                                None))
+            
+            if self.config.collect_bgp and bgp_sections is not None:
+                sanitized_vrf = self.bgp_collector._sanitize_vrf_name(vrf)
+                if not sanitized_vrf:
+                    self.logger.error(f"Invalid VRF name for BGP collection: {vrf}")
+                    continue
+                key = f'show ip bgp vpnv4 vrf {vrf}' if is_ios else f'show ip bgp vrf {vrf}'
+                # A VRF missing from a split 'vrf all' output has no BGP table
+                planned.append((key, self.bgp_collector.vrf_bgp_command(sanitized_vrf, platform),
+                                bgp_sections.get(vrf.strip(), '' if bgp_sections else None)))
+        
+        outputs = pipeline.run(connection, list(dict.fromkeys(
+            command for _, command, section in planned if section is None
+        )))
+        
+        for key, command, section in planned:
+            output = section if section is not None else outputs.get(command)
+            if key.startswith('show ip bgp') and self.bgp_collector._is_bgp_not_configured(output):
+                self.logger.info(f"BGP is not configured for '{key}'")
+                continue
+            if output:
+                result.raw_outputs[key] = output
@@ -28,6 +28,10 @@ class IPv4PrefixConfig:
         track_summarization: Enable tracking of route summarization relationships
         concurrent_devices: Number of devices to process concurrently
         command_timeout: Timeout in seconds for command execution
+        columnar_prefix_table: Hold prefixes in a NumPy PrefixTable instead of
+            one NormalizedPrefix per route (needs numpy)
+        batch_vrf_commands: Send per-VRF commands in batched channel writes
+            (and 'vrf all' commands on NX-OS) instead of one round trip each
     """
     collect_global_table: bool
     collect_per_vrf: bool
@@ -38,6 +42,8 @@ class IPv4PrefixConfig:
     track_summarization: bool
     concurrent_devices: int
     command_timeout: int
+    columnar_prefix_table: bool = False
+    batch_vrf_commands: bool = False
 
 
 @dataclass
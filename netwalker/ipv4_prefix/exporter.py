@@ -9,12 +9,41 @@ Author: Mark Oldham
 import logging
 import csv
 import os
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional, Union
 from datetime import datetime
 
 from netwalker.ipv4_prefix.data_models import (
     NormalizedPrefix, DeduplicatedPrefix, CollectionException, SummarizationRelationship
 )
+from netwalker.ipv4_prefix.prefix_table import PrefixTable
+
+
+def _prefix_rows(prefixes: Union[List[NormalizedPrefix], PrefixTable]) -> Iterator[List[Any]]:
+    """
+    Rows of the prefixes export, sorted by vrf, prefix, device.
+    
+    Args:
+        prefixes: List of NormalizedPrefix objects, or a PrefixTable
+        
+    Yields:
+        [device, platform, vrf, prefix, source, protocol, vlan, interface, timestamp]
+    """
+    if isinstance(prefixes, PrefixTable):
+        yield from prefixes.export_rows()
+        return
+    
+    for prefix in sorted(prefixes, key=lambda p: (p.vrf, p.prefix, p.device)):
+        yield [
+            prefix.device,
+            prefix.platform,
+            prefix.vrf,
+            prefix.prefix,
+            prefix.source,
+            prefix.protocol,
+            prefix.vlan if prefix.vlan is not None else '',
+            prefix.interface if prefix.interface else '',
+            prefix.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        ]
 
 
 class CSVExporter:
@@ -24,7 +53,7 @@ class CSVExporter:
         """Initialize CSV exporter."""
         self.logger = logging.getLogger(__name__)
     
-    def export_prefixes(self, prefixes: List[NormalizedPrefix], output_dir: str) -> str:
+    def export_prefixes(self, prefixes: Union[List[NormalizedPrefix], PrefixTable], output_dir: str) -> str:
         """
         Export to prefixes.csv.
         
@@ -32,7 +61,7 @@ class CSVExporter:
         Sort order: vrf, prefix, device
         
         Args:
-            prefixes: List of NormalizedPrefix objects
+            prefixes: List of NormalizedPrefix objects, or a PrefixTable
             output_dir: Output directory path
             
         Returns:
@@ -51,10 +80,7 @@ class CSVExporter:
         # Build output file path
         output_file = os.path.join(output_dir, 'prefixes.csv')
         
-        # Sort prefixes by vrf, prefix, device
-        sorted_prefixes = sorted(prefixes, key=lambda p: (p.vrf, p.prefix, p.device))
-        
-        # Write CSV file
+        # Write CSV file, rows sorted by vrf, prefix, device
         with open(output_file, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             
@@ -62,20 +88,9 @@ class CSVExporter:
             writer.writerow(['device', 'platform', 'vrf', 'prefix', 'source', 'protocol', 'vlan', 'interface', 'timestamp'])
             
             # Write data rows
-            for prefix in sorted_prefixes:
-                writer.writerow([
-                    prefix.device,
-                    prefix.platform,
-                    prefix.vrf,
-                    prefix.prefix,
-                    prefix.source,
-                    prefix.protocol,
-                    prefix.vlan if prefix.vlan is not None else '',
-                    prefix.interface if prefix.interface else '',
-                    prefix.timestamp.strftime('%Y-%m-%d %H:%M:%S')
-                ])
+            writer.writerows(_prefix_rows(prefixes))
         
-        self.logger.info(f"Exported {len(sorted_prefixes)} prefixes to: {output_file}")
+        self.logger.info(f"Exported {len(prefixes)} prefixes to: {output_file}")
         return output_file
     
     def export_deduplicated(self, prefixes: List[DeduplicatedPrefix], output_dir: str) -> str:
@@ -188,7 +203,7 @@ class ExcelExporter:
         """Initialize Excel exporter."""
         self.logger = logging.getLogger(__name__)
     
-    def export(self, prefixes: List[NormalizedPrefix],
+    def export(self, prefixes: Union[List[NormalizedPrefix], PrefixTable],
                deduplicated: List[DeduplicatedPrefix],
                exceptions: List[CollectionException],
                output_dir: str) -> str:
@@ -204,7 +219,7 @@ class ExcelExporter:
         - Data filters
         
         Args:
-            prefixes: List of NormalizedPrefix objects
+            prefixes: List of NormalizedPrefix objects, or a PrefixTable
             deduplicated: List of DeduplicatedPrefix objects
             exceptions: List of CollectionException objects
             output_dir: Output directory path
@@ -256,7 +271,7 @@ class ExcelExporter:
         self.logger.info(f"Exported Excel workbook to: {output_file}")
         return output_file
     
-    def _create_prefixes_sheet(self, wb, prefixes: List[NormalizedPrefix]):
+    def _create_prefixes_sheet(self, wb, prefixes: Union[List[NormalizedPrefix], PrefixTable]):
         """Create Prefixes sheet with all collected prefixes."""
         from openpyxl.styles import Font, PatternFill
         from openpyxl.utils import get_column_letter
@@ -272,20 +287,10 @@ class ExcelExporter:
             cell.font = Font(bold=True, color='FFFFFF')
             cell.fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
         
-        # Sort prefixes
-        sorted_prefixes = sorted(prefixes, key=lambda p: (p.vrf, p.prefix, p.device))
-        
-        # Write data rows
-        for row_num, prefix in enumerate(sorted_prefixes, 2):
-            ws.cell(row=row_num, column=1, value=prefix.device)
-            ws.cell(row=row_num, column=2, value=prefix.platform)
-            ws.cell(row=row_num, column=3, value=prefix.vrf)
-            ws.cell(row=row_num, column=4, value=prefix.prefix)
-            ws.cell(row=row_num, column=5, value=prefix.source)
-            ws.cell(row=row_num, column=6, value=prefix.protocol)
-            ws.cell(row=row_num, column=7, value=prefix.vlan if prefix.vlan is not None else '')
-            ws.cell(row=row_num, column=8, value=prefix.interface if prefix.interface else '')
-            ws.cell(row=row_num, column=9, value=prefix.timestamp.strftime('%Y-%m-%d %H:%M:%S'))
+        # Write data rows, sorted by vrf, prefix, device
+        for row_num, row in enumerate(_prefix_rows(prefixes), 2):
+            for col_num, value in enumerate(row, 1):
+                ws.cell(row=row_num, column=col_num, value=value)
         
         # Auto-size columns
         for col_num in range(1, len(headers) + 1):
@@ -9,7 +9,7 @@ Author: Mark Oldham
 
 import logging
 import ipaddress
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Set
 from collections import defaultdict
 
 from netwalker.ipv4_prefix.data_models import (
@@ -51,6 +51,19 @@ class PrefixNormalizer:
             - 6.4: Return valid IPv4 network in CIDR notation
             - 6.5: Preserve /32 host routes
         """
+        network = self.normalize_network(raw_prefix)
+        return str(network) if network else None
+    
+    def normalize_network(self, raw_prefix: str) -> Optional[ipaddress.IPv4Network]:
+        """
+        Convert prefix to an IPv4Network, as normalize() does for strings.
+        
+        Args:
+            raw_prefix: Prefix string in any supported format
+            
+        Returns:
+            IPv4Network or None if invalid
+        """
         if not raw_prefix or not raw_prefix.strip():
             return None
         
@@ -58,18 +71,26 @@ class PrefixNormalizer:
         
         # Check if already in CIDR format
         if '/' in raw_prefix:
-            return self.validate_cidr(raw_prefix)
+            return self._to_network(raw_prefix, f"Invalid CIDR format: {raw_prefix}")
         
         # Check if in mask format (IP + subnet mask)
         if ' ' in raw_prefix:
             parts = raw_prefix.split()
             if len(parts) == 2:
-                return self.mask_to_cidr(parts[0], parts[1])
+                return self._to_network(f"{parts[0]}/{parts[1]}", f"Invalid IP/mask format: {parts[0]} {parts[1]}")
         
         # Single IP address without mask (ambiguous - should be resolved first)
         self.logger.warning(f"Cannot normalize ambiguous prefix without mask: {raw_prefix}")
         return None
     
+    def _to_network(self, prefix: str, error_message: str) -> Optional[ipaddress.IPv4Network]:
+        """Parse "ip/length" or "ip/mask" with the ipaddress library, logging failures."""
+        try:
+            return ipaddress.IPv4Network(prefix, strict=False)
+        except (ValueError, ipaddress.AddressValueError, ipaddress.NetmaskValueError) as e:
+            self.logger.warning(f"{error_message} - {str(e)}")
+            return None
+    
     def mask_to_cidr(self, ip: str, mask: str) -> Optional[str]:
         """
         Convert IP + mask to CIDR notation.
@@ -86,14 +107,8 @@ class PrefixNormalizer:
         Requirements:
             - 6.1: Convert mask format to CIDR using ipaddress library
         """
-        try:
-            # Create IPv4Network from IP and netmask
-            network = ipaddress.IPv4Network(f"{ip}/{mask}", strict=False)
-            return str(network)
-            
-        except (ValueError, ipaddress.AddressValueError, ipaddress.NetmaskValueError) as e:
-            self.logger.warning(f"Invalid IP/mask format: {ip} {mask} - {str(e)}")
-            return None
+        network = self._to_network(f"{ip}/{mask}", f"Invalid IP/mask format: {ip} {mask}")
+        return str(network) if network else None
     
     def validate_cidr(self, cidr: str) -> Optional[str]:
         """
@@ -109,14 +124,8 @@ class PrefixNormalizer:
             - 6.2: Validate CIDR format and preserve if valid
             - 6.4: Ensure output is valid IPv4 network
         """
-        try:
-            # Parse and validate using ipaddress library
-            network = ipaddress.IPv4Network(cidr, strict=False)
-            return str(network)
-            
-        except (ValueError, ipaddress.AddressValueError, ipaddress.NetmaskValueError) as e:
-            self.logger.warning(f"Invalid CIDR format: {cidr} - {str(e)}")
-            return None
+        network = self._to_network(cidr, f"Invalid CIDR format: {cidr}")
+        return str(network) if network else None
     
     def normalize_parsed_prefix(self, parsed: ParsedPrefix, 
                                 exceptions: List[CollectionException]) -> Optional[NormalizedPrefix]:
@@ -138,20 +147,9 @@ class PrefixNormalizer:
             - 6.4: Return valid IPv4 network in CIDR notation
         """
         # Normalize the prefix string
-        normalized_str = self.normalize(parsed.prefix_str)
+        network = self.normalize_parsed_network(parsed, exceptions)
         
-        if not normalized_str:
-            # Normalization failed - add to exceptions
-            exception = CollectionException(
-                device=parsed.device,
-                command='',  # Not command-specific
-                error_type='normalization_failed',
-                raw_token=parsed.prefix_str,
-                error_message=f"Failed to normalize prefix: {parsed.prefix_str}",
-                timestamp=parsed.timestamp
-            )
-            exceptions.append(exception)
-            self.logger.error(f"Failed to normalize prefix on {parsed.device}: {parsed.prefix_str}")
+        if not network:
             return None
         
         # Create NormalizedPrefix object
@@ -159,7 +157,7 @@ class PrefixNormalizer:
             device=parsed.device,
             platform=parsed.platform,
             vrf=parsed.vrf,
-            prefix=normalized_str,
+            prefix=str(network),
             source=parsed.source,
             protocol=parsed.protocol,
             raw_line=parsed.raw_line,
@@ -169,6 +167,39 @@ class PrefixNormalizer:
         )
         
         return normalized
+    
+    def normalize_parsed_network(self, parsed: ParsedPrefix,
+                                 exceptions: List[CollectionException]) -> Optional[ipaddress.IPv4Network]:
+        """
+        Normalize a ParsedPrefix to an IPv4Network without building a NormalizedPrefix.
+        
+        Used when rows go straight into a PrefixTable. If normalization fails,
+        adds an exception and returns None.
+        
+        Args:
+            parsed: ParsedPrefix object to normalize
+            exceptions: List to append exceptions to
+            
+        Returns:
+            IPv4Network or None if normalization failed
+        """
+        network = self.normalize_network(parsed.prefix_str)
+        
+        if not network:
+            # Normalization failed - add to exceptions
+            exception = CollectionException(
+                device=parsed.device,
+                command='',  # Not command-specific
+                error_type='normalization_failed',
+                raw_token=parsed.prefix_str,
+                error_message=f"Failed to normalize prefix: {parsed.prefix_str}",
+                timestamp=parsed.timestamp
+            )
+            exceptions.append(exception)
+            self.logger.error(f"Failed to normalize prefix on {parsed.device}: {parsed.prefix_str}")
+            return None
+        
+        return network
 
 
 class AmbiguityResolver:
@@ -381,12 +412,10 @@ class PrefixDeduplicator:
             - 9.5: Include count of devices for each prefix
         """
         # Group prefixes by (vrf, prefix)
-        grouped: Dict[tuple, List[str]] = defaultdict(list)
+        grouped: Dict[tuple, Set[str]] = defaultdict(set)
         
         for prefix in prefixes:
-            key = (prefix.vrf, prefix.prefix)
-            if prefix.device not in grouped[key]:
-                grouped[key].append(prefix.device)
+            grouped[(prefix.vrf, prefix.prefix)].add(prefix.device)
         
         # Create DeduplicatedPrefix objects
         deduplicated = []
@@ -0,0 +1,448 @@
+"""
+Columnar Prefix Table for IPv4 Prefix Inventory Module
+
+This module holds normalized prefixes as NumPy columns instead of one
+NormalizedPrefix object per route: uint32 network and mask arrays plus
+integer codes into per-column category lists for device, VRF, source and
+the other repeated string fields. Deduplication, grouping by VRF and
+containment checks run as array operations, so inventories of a million
+routes or more fit in tens of megabytes.
+
+NumPy is optional; without it the prefix pipeline keeps using lists of
+NormalizedPrefix objects.
+
+Author: Mark Oldham
+"""
+
+import ipaddress
+import logging
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from netwalker.ipv4_prefix.data_models import DeduplicatedPrefix, NormalizedPrefix
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Columns holding codes into a category list, and the raw integer columns
+CATEGORICAL_COLUMNS = ('device', 'platform', 'vrf', 'source', 'protocol', 'interface', 'timestamp')
+INTEGER_COLUMNS = ('network', 'mask', 'vlan')
+
+# Placeholder in the vlan column for prefixes without a VLAN
+NO_VLAN = -1
+
+# Rows decoded at a time when exporting
+EXPORT_CHUNK_ROWS = 65536
+
+
+class _Categories:
+    """Distinct values of a categorical column, coded in first-seen order."""
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value: Any) -> int:
+        """Get the code of a value, adding it if it is new."""
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def sort_ranks(self) -> 'np.ndarray':
+        """Rank of each code when the values are sorted."""
+        ranks = np.empty(len(self.values), dtype=np.int64)
+        ranks[sorted(range(len(self.values)), key=lambda code: self.values[code])] = np.arange(len(self.values))
+        return ranks
+
+
+def _length_to_mask(length: int) -> int:
+    """Netmask of a prefix length as an integer."""
+    return (0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF
+
+
+_MASK_LENGTHS = {_length_to_mask(length): length for length in range(33)}
+
+
+def _format_prefixes(networks: 'np.ndarray', masks: 'np.ndarray') -> List[str]:
+    """CIDR notation of integer networks and netmasks."""
+    octets = [((networks >> shift) & 0xFF).tolist() for shift in (24, 16, 8, 0)]
+    lengths = [_MASK_LENGTHS[mask] for mask in masks.tolist()]
+    return ['%d.%d.%d.%d/%d' % row for row in zip(*octets, lengths)]
+
+
+class PrefixTable:
+    """
+    Normalized prefixes stored column-wise.
+
+    Rows are appended into compact array buffers and moved into NumPy
+    columns the first time a column is read. raw_line is not kept; rows
+    turned back into NormalizedPrefix objects have an empty raw_line.
+    """
+
+    def __init__(self):
+        """Initialize an empty prefix table."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the columnar prefix table")
+
+        self.logger = logging.getLogger(__name__)
+        self.categories = {name: _Categories() for name in CATEGORICAL_COLUMNS}
+        self._columns = {name: np.empty(0, dtype=self._dtype(name)) for name in CATEGORICAL_COLUMNS + INTEGER_COLUMNS}
+        self._pending = self._new_buffers()
+        self._pending_rows = 0
+
+    @staticmethod
+    def _dtype(name: str):
+        return np.uint32 if name in ('network', 'mask') else np.int32
+
+    @staticmethod
+    def _new_buffers() -> Dict[str, array]:
+        return {name: array('I' if name in ('network', 'mask') else 'i')
+                for name in CATEGORICAL_COLUMNS + INTEGER_COLUMNS}
+
+    @classmethod
+    def from_prefixes(cls, prefixes: List[NormalizedPrefix]) -> 'PrefixTable':
+        """
+        Build a table from NormalizedPrefix objects.
+
+        Args:
+            prefixes: List of NormalizedPrefix objects
+
+        Returns:
+            PrefixTable holding the same rows
+        """
+        table = cls()
+        for prefix in prefixes:
+            table.append(
+                ipaddress.IPv4Network(prefix.prefix, strict=False),
+                device=prefix.device,
+                platform=prefix.platform,
+                vrf=prefix.vrf,
+                source=prefix.source,
+                protocol=prefix.protocol,
+                timestamp=prefix.timestamp,
+                vlan=prefix.vlan,
+                interface=prefix.interface
+            )
+        return table
+
+    def append(self, network: ipaddress.IPv4Network, device: str, platform: str, vrf: str,
+               source: str, protocol: str, timestamp: datetime,
+               vlan: Optional[int] = None, interface: Optional[str] = None):
+        """
+        Append one normalized prefix.
+
+        Args:
+            network: Normalized prefix
+            device, platform, vrf, source, protocol, timestamp, vlan, interface:
+                Same meaning as the NormalizedPrefix fields
+        """
+        pending = self._pending
+        categories = self.categories
+        pending['network'].append(int(network.network_address))
+        pending['mask'].append(int(network.netmask))
+        pending['vlan'].append(NO_VLAN if vlan is None else vlan)
+        pending['device'].append(categories['device'].code(device))
+        pending['platform'].append(categories['platform'].code(platform))
+        pending['vrf'].append(categories['vrf'].code(vrf))
+        pending['source'].append(categories['source'].code(source))
+        pending['protocol'].append(categories['protocol'].code(protocol))
+        pending['interface'].append(categories['interface'].code(interface))
+        pending['timestamp'].append(categories['timestamp'].code(timestamp))
+        self._pending_rows += 1
+
+    def column(self, name: str) -> 'np.ndarray':
+        """
+        Get a column as a NumPy array.
+
+        Args:
+            name: Column name (network, mask, vlan, or a categorical column)
+
+        Returns:
+            Array of raw values or category codes, one entry per row
+        """
+        if self._pending_rows:
+            for column_name, buffer in self._pending.items():
+                self._columns[column_name] = np.concatenate(
+                    (self._columns[column_name], np.frombuffer(buffer, dtype=self._dtype(column_name)))
+                )
+            self._pending = self._new_buffers()
+            self._pending_rows = 0
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self._columns['network']) + self._pending_rows
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays."""
+        return sum(self.column(name).nbytes for name in self._columns)
+
+    def prefix_lengths(self) -> 'np.ndarray':
+        """Prefix length of every row."""
+        masks = np.array([_length_to_mask(length) for length in range(33)], dtype=np.uint32)
+        return np.searchsorted(masks, self.column('mask')).astype(np.int8)
+
+    def take(self, indices: 'np.ndarray') -> 'PrefixTable':
+        """
+        Get a table of selected rows, sharing this table's categories.
+
+        Args:
+            indices: Row indexes, in the order wanted
+
+        Returns:
+            New PrefixTable
+        """
+        table = PrefixTable.__new__(PrefixTable)
+        table.logger = self.logger
+        table.categories = self.categories
+        table._columns = {name: self.column(name)[indices] for name in self._columns}
+        table._pending = self._new_buffers()
+        table._pending_rows = 0
+        return table
+
+    def _prefix_keys(self) -> 'np.ndarray':
+        """Network and mask of every row packed into one uint64 sort key."""
+        return (self.column('network').astype(np.uint64) << np.uint64(32)) | self.column('mask').astype(np.uint64)
+
+    def _prefix_strings(self) -> Tuple['np.ndarray', List[str]]:
+        """
+        Format each distinct network/mask pair once.
+
+        Returns:
+            (index into the string list for every row, CIDR strings)
+        """
+        unique_keys, inverse = np.unique(self._prefix_keys(), return_inverse=True)
+        strings = _format_prefixes(unique_keys >> np.uint64(32), unique_keys & np.uint64(0xFFFFFFFF))
+        return inverse.reshape(-1), strings
+
+    def _decoded(self, indices: 'np.ndarray', prefix_strings: Optional[Tuple['np.ndarray', List[str]]] = None
+                 ) -> Dict[str, List[Any]]:
+        """
+        Decode selected rows into Python values, one list per NormalizedPrefix field.
+
+        Args:
+            indices: Row indexes, in the order wanted
+            prefix_strings: Result of _prefix_strings(), if already computed
+        """
+        decoded = {}
+        for name in CATEGORICAL_COLUMNS:
+            values = self.categories[name].values
+            decoded[name] = [values[code] for code in self.column(name)[indices].tolist()]
+
+        if prefix_strings is None:
+            decoded['prefix'] = _format_prefixes(self.column('network')[indices], self.column('mask')[indices])
+        else:
+            prefix_index, strings = prefix_strings
+            decoded['prefix'] = [strings[index] for index in prefix_index[indices].tolist()]
+
+        decoded['vlan'] = [None if vlan == NO_VLAN else vlan for vlan in self.column('vlan')[indices].tolist()]
+        return decoded
+
+    def to_prefixes(self, indices: Optional['np.ndarray'] = None) -> List[NormalizedPrefix]:
+        """
+        Materialize rows as NormalizedPrefix objects.
+
+        Args:
+            indices: Row indexes to materialize (default: all rows)
+
+        Returns:
+            List of NormalizedPrefix objects, with an empty raw_line
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+        decoded = self._decoded(indices)
+        return [
+            NormalizedPrefix(device=device, platform=platform, vrf=vrf, prefix=prefix, source=source,
+                             protocol=protocol, raw_line='', timestamp=timestamp, vlan=vlan, interface=interface)
+            for device, platform, vrf, prefix, source, protocol, timestamp, vlan, interface in zip(
+                decoded['device'], decoded['platform'], decoded['vrf'], decoded['prefix'], decoded['source'],
+                decoded['protocol'], decoded['timestamp'], decoded['vlan'], decoded['interface'])
+        ]
+
+    @staticmethod
+    def _sorted_runs(*keys: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Stable sort of rows by keys (first key most significant).
+
+        Returns:
+            (row order, positions in the order where a run of equal keys starts)
+        """
+        order = np.lexsort(keys[::-1])
+        run_start = np.zeros(len(order), dtype=bool)
+        run_start[:1] = True
+        for key in keys:
+            sorted_key = key[order]
+            run_start[1:] |= sorted_key[1:] != sorted_key[:-1]
+        return order, np.flatnonzero(run_start)
+
+    def deduplicate_by_device(self) -> 'PrefixTable':
+        """
+        Remove duplicates within device scope, as PrefixDeduplicator does.
+
+        Key: (device, vrf, prefix, source)
+        Keeps first occurrence of duplicates.
+
+        Returns:
+            Deduplicated PrefixTable
+        """
+        if not len(self):
+            return self.take(np.empty(0, dtype=np.intp))
+
+        vrf_count = len(self.categories['vrf'].values)
+        source_count = len(self.categories['source'].values)
+        owner = (self.column('device').astype(np.int64) * vrf_count + self.column('vrf')) * source_count \
+            + self.column('source')
+
+        # The stable sort puts each key's first occurrence at the start of its run
+        order, starts = self._sorted_runs(owner, self._prefix_keys())
+        first_index = np.sort(order[starts])
+
+        duplicates_removed = len(self) - len(first_index)
+        if duplicates_removed > 0:
+            self.logger.info(f"Removed {duplicates_removed} duplicate prefixes (by device)")
+
+        return self.take(first_index)
+
+    def deduplicate_by_vrf(self) -> List[DeduplicatedPrefix]:
+        """
+        Create deduplicated view across devices, as PrefixDeduplicator does.
+
+        Key: (vrf, prefix)
+        Aggregates: device_list (sorted), device_count
+
+        Returns:
+            List of DeduplicatedPrefix objects, in first-seen order
+        """
+        if not len(self):
+            return []
+
+        vrf_codes = self.column('vrf')
+        prefix_keys = self._prefix_keys()
+        device_rank = self.categories['device'].sort_ranks()[self.column('device')]
+
+        # Runs of (vrf, prefix) groups, and of distinct devices inside them ordered by name.
+        # Groups sit at the same positions in both orders.
+        _, group_starts = self._sorted_runs(vrf_codes, prefix_keys)
+        order, device_starts = self._sorted_runs(vrf_codes, prefix_keys, device_rank)
+        first_rows = np.minimum.reduceat(order, group_starts)
+        device_group = np.searchsorted(group_starts, device_starts, side='right') - 1
+        device_bounds = np.searchsorted(device_group, np.arange(len(group_starts) + 1)).tolist()
+
+        sorted_devices = sorted(self.categories['device'].values)
+        devices = [sorted_devices[rank] for rank in device_rank[order[device_starts]].tolist()]
+        decoded = self._decoded(first_rows)
+
+        deduplicated = []
+        for group_id in np.argsort(first_rows, kind='stable').tolist():
+            device_list = devices[device_bounds[group_id]:device_bounds[group_id + 1]]
+            deduplicated.append(DeduplicatedPrefix(
+                vrf=decoded['vrf'][group_id],
+                prefix=decoded['prefix'][group_id],
+                device_count=len(device_list),
+                device_list=device_list
+            ))
+
+        self.logger.info(f"Created deduplicated view with {len(deduplicated)} unique (vrf, prefix) pairs")
+        return deduplicated
+
+    def vrf_groups(self) -> Dict[str, 'np.ndarray']:
+        """
+        Group rows by VRF.
+
+        Returns:
+            VRF name -> row indexes, in row order
+        """
+        return self._group_rows(self.column('vrf'), self.categories['vrf'].values)
+
+    def device_vrf_groups(self) -> Iterator[Tuple[str, str, 'np.ndarray']]:
+        """
+        Group rows by (device, VRF), e.g. to analyze summarization one group at a time.
+
+        Yields:
+            (device, VRF, row indexes in row order)
+        """
+        vrf_count = max(len(self.categories['vrf'].values), 1)
+        combined = self.column('device').astype(np.int64) * vrf_count + self.column('vrf')
+        for code, indices in self._group_rows(combined, None).items():
+            device_code, vrf_code = divmod(code, vrf_count)
+            yield (self.categories['device'].values[device_code], self.categories['vrf'].values[vrf_code], indices)
+
+    @staticmethod
+    def _group_rows(codes: 'np.ndarray', labels: Optional[List[Any]]) -> Dict[Any, 'np.ndarray']:
+        """Split row indexes by code, groups in first-seen order."""
+        order = np.argsort(codes, kind='stable')
+        unique_codes, starts = np.unique(codes[order], return_index=True)
+        groups = np.split(order, starts[1:])
+        by_first_row = sorted(zip(unique_codes.tolist(), groups), key=lambda item: item[1][0])
+        return {(labels[code] if labels is not None else code): rows for code, rows in by_first_row}
+
+    def contained_in(self, summary: str) -> 'np.ndarray':
+        """
+        Find rows strictly more specific than a summary and inside its range.
+
+        Args:
+            summary: Summary prefix in CIDR notation
+
+        Returns:
+            Row indexes of the component prefixes
+        """
+        try:
+            summary_net = ipaddress.IPv4Network(summary, strict=False)
+        except ValueError:
+            self.logger.warning(f"Invalid summary prefix format: {summary}")
+            return np.empty(0, dtype=np.intp)
+
+        summary_mask = np.uint32(int(summary_net.netmask))
+        inside = (self.column('network') & summary_mask) == np.uint32(int(summary_net.network_address))
+        more_specific = self.column('mask') > summary_mask
+        return np.nonzero(inside & more_specific)[0]
+
+    def export_rows(self) -> Iterator[List[Any]]:
+        """
+        Rows for the prefixes CSV and Excel sheet, sorted by vrf, prefix, device.
+
+        Yields:
+            [device, platform, vrf, prefix, source, protocol, vlan, interface, timestamp]
+        """
+        if not len(self):
+            return
+
+        prefix_index, prefix_strings = self._prefix_strings()
+        prefix_rank = np.empty(len(prefix_strings), dtype=np.int64)
+        prefix_rank[sorted(range(len(prefix_strings)), key=prefix_strings.__getitem__)] = np.arange(len(prefix_strings))
+
+        order = np.lexsort((
+            self.categories['device'].sort_ranks()[self.column('device')],
+            prefix_rank[prefix_index],
+            self.categories['vrf'].sort_ranks()[self.column('vrf')],
+        ))
+
+        timestamp_strings = {timestamp: timestamp.strftime('%Y-%m-%d %H:%M:%S')
+                             for timestamp in self.categories['timestamp'].values}
+
+        # Decode in chunks so a million-route export never holds every row as Python objects
+        for chunk_start in range(0, len(order), EXPORT_CHUNK_ROWS):
+            decoded = self._decoded(order[chunk_start:chunk_start + EXPORT_CHUNK_ROWS], (prefix_index, prefix_strings))
+            for device, platform, vrf, prefix, source, protocol, vlan, interface, timestamp in zip(
+                    decoded['device'], decoded['platform'], decoded['vrf'], decoded['prefix'], decoded['source'],
+                    decoded['protocol'], decoded['vlan'], decoded['interface'], decoded['timestamp']):
+                yield [
+                    device,
+                    platform,
+                    vrf,
+                    prefix,
+                    source,
+                    protocol,
+                    vlan if vlan is not None else '',
+                    interface if interface else '',
+                    timestamp_strings[timestamp]
+                ]
@@ -4,16 +4,203 @@ Summarization Analyzer Component for IPv4 Prefix Inventory Module
 This module analyzes route summarization relationships, identifying summary routes
 and their component routes to track hierarchical prefix aggregation.
 
+Prefixes are indexed in a binary radix (Patricia) trie over integer
+network/length pairs: building it is O(n*32), every summary/component pair
+is emitted in one traversal, and the components of a summary are the
+entries of its subtree.
+
 Author: Mark Oldham
 """
 
 import logging
 import ipaddress
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
 
 from netwalker.ipv4_prefix.data_models import NormalizedPrefix, SummarizationRelationship
 
 
+@lru_cache(maxsize=65536)
+def _parse_prefix(prefix: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse a CIDR prefix into (network address as integer, prefix length).
+    
+    Args:
+        prefix: Prefix in CIDR notation (e.g., "192.168.1.0/24")
+        
+    Returns:
+        (network, prefix length), or None if the prefix is invalid
+    """
+    try:
+        network = ipaddress.IPv4Network(prefix, strict=False)
+    except (ValueError, TypeError):
+        return None
+    return int(network.network_address), network.prefixlen
+
+
+def _mask(length: int) -> int:
+    """Netmask of a prefix length as an integer."""
+    return (0xFFFFFFFF << (32 - length)) & 0xFFFFFFFF
+
+
+class _TrieNode:
+    """Patricia trie node; branch-only nodes have no entries."""
+    
+    __slots__ = ('network', 'length', 'entries', 'children')
+    
+    def __init__(self, network: int, length: int):
+        self.network = network
+        self.length = length
+        self.entries = []
+        self.children = [None, None]
+
+
+class PrefixTrie:
+    """
+    Binary radix (Patricia) trie of prefixes.
+    
+    Each node holds one network/length and the indexes of the items
+    inserted with it, so duplicate prefixes share a node. A node's
+    ancestors are exactly its covering (less specific) prefixes and its
+    subtree is exactly its more specific prefixes.
+    """
+    
+    def __init__(self, prefixes: Optional[List[NormalizedPrefix]] = None):
+        """
+        Initialize the trie.
+        
+        Args:
+            prefixes: NormalizedPrefix objects to insert, in order
+        """
+        self.logger = logging.getLogger(__name__)
+        self.items = []
+        self._root = _TrieNode(0, 0)
+        for prefix in prefixes or []:
+            self.insert(prefix)
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def insert(self, item: NormalizedPrefix) -> bool:
+        """
+        Insert a prefix in O(32).
+        
+        Args:
+            item: NormalizedPrefix to index
+            
+        Returns:
+            False if the prefix is not valid CIDR notation and was skipped
+        """
+        parsed = _parse_prefix(item.prefix)
+        if parsed is None:
+            self.logger.warning(f"Invalid prefix format skipped in summarization index: {item.prefix}")
+            return False
+        
+        index = len(self.items)
+        self.items.append(item)
+        self._node_for(*parsed, create=True).entries.append(index)
+        return True
+    
+    def _node_for(self, network: int, length: int, create: bool = False) -> Optional[_TrieNode]:
+        """
+        Find the node of a prefix, or with create the node it belongs in.
+        
+        Without create, returns the node of the prefix if it exists, else the
+        topmost node inside the prefix range (whose subtree is then exactly
+        the prefix's more specific prefixes), or None.
+        """
+        node = self._root
+        while True:
+            if node.length == length and node.network == network:
+                return node
+            
+            bit = (network >> (31 - node.length)) & 1
+            child = node.children[bit]
+            if child is None:
+                if not create:
+                    return None
+                node.children[bit] = _TrieNode(network, length)
+                return node.children[bit]
+            
+            diff = child.network ^ network
+            common = min(child.length, length, 32 - diff.bit_length())
+            if common == child.length:
+                # Child covers the prefix, descend
+                node = child
+                continue
+            
+            if not create:
+                # The prefix covers the child (its subtree) or diverges from it
+                return child if common == length else None
+            
+            if common == length:
+                # New prefix covers the child: insert it between node and child
+                new_node = _TrieNode(network, length)
+            else:
+                # Paths diverge: branch at the common prefix
+                new_node = _TrieNode(network & _mask(common), common)
+                new_node.children[(network >> (31 - common)) & 1] = _TrieNode(network, length)
+            new_node.children[(child.network >> (31 - common)) & 1] = child
+            node.children[bit] = new_node
+            return new_node if common == length else new_node.children[(network >> (31 - common)) & 1]
+    
+    def pairs(self) -> List[Tuple[int, int]]:
+        """
+        Emit every (summary index, component index) pair in one traversal.
+        
+        A pair is emitted for each item whose prefix is strictly more
+        specific than, and inside, another item's prefix.
+        
+        Returns:
+            Pairs of item indexes, in traversal order
+        """
+        pairs = []
+        # Stack of (node, entry indexes of all covering prefixes above it)
+        stack = [(self._root, [])]
+        while stack:
+            node, covering = stack.pop()
+            if node.entries:
+                for component in node.entries:
+                    pairs.extend((summary, component) for summary in covering)
+                covering = covering + node.entries
+            for child in node.children:
+                if child is not None:
+                    stack.append((child, covering))
+        return pairs
+    
+    def components(self, summary: str) -> List[NormalizedPrefix]:
+        """
+        Find the items strictly more specific than a summary, in O(32 + k).
+        
+        Args:
+            summary: Summary prefix in CIDR notation
+            
+        Returns:
+            Component NormalizedPrefix objects, in insertion order
+        """
+        parsed = _parse_prefix(summary)
+        if parsed is None:
+            self.logger.warning(f"Invalid summary prefix format: {summary}")
+            return []
+        
+        network, length = parsed
+        node = self._node_for(network, length)
+        if node is None:
+            return []
+        
+        indexes = []
+        # Entries of the summary's own node are not more specific than it
+        stack = list(node.children) if node.length == length else [node]
+        while stack:
+            current = stack.pop()
+            if current is not None:
+                indexes.extend(current.entries)
+                stack.extend(current.children)
+        
+        indexes.sort()
+        return [self.items[index] for index in indexes]
+
+
 class SummarizationAnalyzer:
     """Analyzes route summarization relationships."""
     
@@ -26,9 +213,9 @@ class SummarizationAnalyzer:
         Identify summary routes and their component routes.
         
         Algorithm:
-        1. Sort prefixes by prefix length (shortest first)
-        2. For each prefix, find all more-specific prefixes that fall within its range
-        3. Record relationships where a device advertises both summary and components
+        1. Index each device/VRF group's prefixes in a PrefixTrie
+        2. Walk the trie once, pairing every prefix with all prefixes covering it
+        3. Order the pairs as a shortest-prefix-first scan would list them
         
         Args:
             prefixes: List of NormalizedPrefix objects
@@ -57,23 +244,25 @@ class SummarizationAnalyzer:
         
         # Analyze each device/VRF combination independently
         for (device, vrf), prefix_list in device_vrf_prefixes.items():
-            # Sort by prefix length (shortest first = most general)
-            sorted_prefixes = sorted(prefix_list, key=lambda p: self._get_prefix_length(p.prefix))
-            
-            # For each prefix, find components
-            for i, summary_prefix in enumerate(sorted_prefixes):
-                # Check all more-specific prefixes (those that come after in sorted list)
-                for component_prefix in sorted_prefixes[i+1:]:
-                    # Check if component falls within summary range
-                    if self.is_component_of(component_prefix.prefix, summary_prefix.prefix):
-                        # Create relationship
-                        relationship = SummarizationRelationship(
-                            summary_prefix=summary_prefix.prefix,
-                            component_prefix=component_prefix.prefix,
-                            device=device,
-                            vrf=vrf
-                        )
-                        relationships.append(relationship)
+            trie = PrefixTrie(prefix_list)
+            items = trie.items
+            
+            # Position of each item when sorted by prefix length (shortest first)
+            order = sorted(range(len(items)), key=lambda index: self._get_prefix_length(items[index].prefix))
+            position = [0] * len(items)
+            for rank, index in enumerate(order):
+                position[index] = rank
+            
+            pairs = trie.pairs()
+            pairs.sort(key=lambda pair: (position[pair[0]], position[pair[1]]))
+            
+            for summary_index, component_index in pairs:
+                relationships.append(SummarizationRelationship(
+                    summary_prefix=items[summary_index].prefix,
+                    component_prefix=items[component_index].prefix,
+                    device=device,
+                    vrf=vrf
+                ))
         
         self.logger.info(f"Identified {len(relationships)} summarization relationships")
         return relationships
@@ -96,33 +285,33 @@ class SummarizationAnalyzer:
         Requirements:
             - 15.3: Identify if component prefix falls within summary range
         """
-        try:
-            # Parse both prefixes as IPv4Network objects
-            component_net = ipaddress.IPv4Network(component, strict=False)
-            summary_net = ipaddress.IPv4Network(summary, strict=False)
-            
-            # Check if component is a subnet of summary
-            # A prefix is a component if:
-            # 1. It's more specific (longer prefix length)
-            # 2. It falls within the summary's address range
-            if component_net.prefixlen <= summary_net.prefixlen:
-                # Component must be more specific than summary
-                return False
-            
-            # Check if component's network address falls within summary's range
-            return component_net.subnet_of(summary_net)
-            
-        except (ValueError, ipaddress.AddressValueError, ipaddress.NetmaskValueError) as e:
-            self.logger.warning(f"Invalid prefix format in summarization check: {component}, {summary} - {str(e)}")
+        component_net = _parse_prefix(component)
+        summary_net = _parse_prefix(summary)
+        if component_net is None or summary_net is None:
+            self.logger.warning(f"Invalid prefix format in summarization check: {component}, {summary}")
+            return False
+        
+        component_network, component_length = component_net
+        summary_network, summary_length = summary_net
+        
+        # A prefix is a component if:
+        # 1. It's more specific (longer prefix length)
+        # 2. It falls within the summary's address range
+        if component_length <= summary_length:
+            # Component must be more specific than summary
             return False
+        
+        return component_network & _mask(summary_length) == summary_network
     
-    def find_components(self, summary: str, all_prefixes: List[NormalizedPrefix]) -> List[NormalizedPrefix]:
+    def find_components(self, summary: str,
+                        all_prefixes: Union[List[NormalizedPrefix], PrefixTrie]) -> List[NormalizedPrefix]:
         """
         Find all component prefixes for a given summary.
         
         Args:
             summary: Summary prefix in CIDR notation
-            all_prefixes: List of all NormalizedPrefix objects to search
+            all_prefixes: List of all NormalizedPrefix objects to search, or a
+                PrefixTrie of them to answer repeated lookups in O(k)
             
         Returns:
             List of NormalizedPrefix objects that are components of the summary
@@ -130,13 +319,10 @@ class SummarizationAnalyzer:
         Requirements:
             - 15.6: Support finding all components for a summary
         """
-        components = []
-        
-        for prefix in all_prefixes:
-            if self.is_component_of(prefix.prefix, summary):
-                components.append(prefix)
+        if not isinstance(all_prefixes, PrefixTrie):
+            all_prefixes = PrefixTrie(all_prefixes)
         
-        return components
+        return all_prefixes.components(summary)
     
     def _get_prefix_length(self, prefix: str) -> int:
         """
@@ -148,9 +334,6 @@ class SummarizationAnalyzer:
         Returns:
             Prefix length as integer (e.g., 24)
         """
-        try:
-            network = ipaddress.IPv4Network(prefix, strict=False)
-            return network.prefixlen
-        except (ValueError, ipaddress.AddressValueError, ipaddress.NetmaskValueError):
-            # If parsing fails, return a large number to sort it last
-            return 999
+        parsed = _parse_prefix(prefix)
+        # If parsing fails, return a large number to sort it last
+        return parsed[1] if parsed else 999
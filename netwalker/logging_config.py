@@ -2,20 +2,33 @@
 Logging configuration for NetWalker
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
 
+# Listener writing queued records to the file and console handlers, and the
+# root logger handler feeding it
+_queue_listener = None
+_queue_handler = None
 
-def setup_logging(logs_directory="./logs", log_level=logging.INFO):
+
+def setup_logging(logs_directory="./logs", log_level=logging.INFO, use_queue=True):
     """
     Set up logging infrastructure with configurable output directory
 
+    With use_queue the root logger only gets a QueueHandler and a single
+    QueueListener thread does the file and console I/O, so discovery worker
+    threads never block on disk writes.
+
     Args:
         logs_directory (str): Directory for log files
         log_level: Logging level (default: INFO)
+        use_queue (bool): Write log records from a background listener thread
     """
     # Create logs directory if it doesn't exist
     Path(logs_directory).mkdir(parents=True, exist_ok=True)
@@ -28,15 +41,21 @@ def setup_logging(logs_directory="./logs", log_level=logging.INFO):
     # Configure logging format
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+    handlers = [
+        logging.FileHandler(log_path),
+        logging.StreamHandler()  # Also log to console
+    ]
+
     # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_path),
-            logging.StreamHandler()  # Also log to console
-        ]
-    )
+    if use_queue and not logging.getLogger().handlers:
+        formatter = logging.Formatter(log_format)
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        logging.basicConfig(level=log_level, handlers=[queue_handler])
+        _start_listener(queue_handler, handlers)
+    else:
+        logging.basicConfig(level=log_level, format=log_format, handlers=handlers)
 
     # Suppress verbose third-party library loggers
     # Paramiko logs authentication success at INFO level which clutters logs
@@ -49,6 +68,39 @@ def setup_logging(logs_directory="./logs", log_level=logging.INFO):
     return logger
 
 
+def _start_listener(queue_handler, handlers):
+    """Start the listener thread draining queue_handler's queue into handlers"""
+    global _queue_listener, _queue_handler
+    _queue_handler = queue_handler
+    _queue_listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+
+
+def stop_logging():
+    """
+    Flush queued log records and stop the listener thread
+
+    The file and console handlers are attached to the root logger directly
+    afterwards, so records logged during shutdown are still written. Safe to
+    call more than once and when logging was set up without a queue.
+    """
+    global _queue_listener, _queue_handler
+    if _queue_listener is None:
+        return
+    listener, _queue_listener = _queue_listener, None
+    listener.stop()
+
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_queue_handler)
+    _queue_handler = None
+    for handler in listener.handlers:
+        handler.flush()
+        root_logger.addHandler(handler)
+
+
+atexit.register(stop_logging)
+
+
 def log_startup_banner(logger, config=None):
     """
     Log startup information banner at the beginning of the log file
@@ -143,5 +195,6 @@ def log_startup_banner(logger, config=None):
         logger.info("  [Logging]")
         logger.info(f"    log_level: {config.get('log_level', 'NOT SET')}")
         logger.info(f"    console_logging: {config.get('console_logging', 'NOT SET')}")
+        logger.info(f"    discovery_log_verbosity: {config.get('discovery_log_verbosity', 'NOT SET')}")
 
     logger.info("=" * 80)
@@ -8,7 +8,6 @@ Provides the primary interface for network topology discovery and reporting.
 import logging
 import sys
 import os
-import socket
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
@@ -22,14 +21,37 @@ from .discovery.thread_manager import ThreadManager
 from .reports.excel_generator import ExcelReportGenerator
 from .reports.visio_generator import VisioGenerator
 from .output.output_manager import OutputManager
-from .logging_config import setup_logging
+from .logging_config import setup_logging, stop_logging
 from .validation.dns_validator import DNSValidator
+from .validation.dns_resolver import DNSResolver
 from .database.database_manager import DatabaseManager
 from .version import __version__, __author__, __compile_date__
 
 logger = logging.getLogger(__name__)
 
 
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process in MB
+    
+    Returns:
+        Peak RSS, or None if neither the resource module nor psutil is available
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and KiB elsewhere
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        memory_info = psutil.Process().memory_info()
+        return getattr(memory_info, 'peak_wset', memory_info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
 class NetWalkerApp:
     """
     Main NetWalker application class.
@@ -65,6 +87,8 @@ class NetWalkerApp:
         self.excel_generator: Optional[ExcelReportGenerator] = None
         self.dns_validator: Optional[DNSValidator] = None
         self.db_manager: Optional[DatabaseManager] = None
+        # Shared by seed loading, discovery and DNS validation; reconfigured once config is loaded
+        self.dns_resolver: DNSResolver = DNSResolver()
         
         # Application state
         self.initialized = False
@@ -112,14 +136,14 @@ class NetWalkerApp:
             logger.info("Step 7: Initializing database...")
             self._initialize_database()
             
+            # Initialize threading (BEFORE discovery engine so it can be passed)
+            logger.info("Step 8: Initializing threading...")
+            self._initialize_threading()
+            
             # Initialize discovery engine
-            logger.info("Step 8: Initializing discovery engine...")
+            logger.info("Step 9: Initializing discovery engine...")
             self._initialize_discovery_engine()
             
-            # Initialize threading
-            logger.info("Step 9: Initializing threading...")
-            self._initialize_threading()
-            
             # Initialize reporting
             logger.info("Step 10: Initializing reporting...")
             self._initialize_reporting()
@@ -154,11 +178,24 @@ class NetWalkerApp:
         self.config = {
             'reports_directory': parsed_config['output'].reports_directory,
             'logs_directory': parsed_config['output'].logs_directory,
+            'archive_raw_output': parsed_config['output'].archive_raw_output,
+            'archive_directory': parsed_config['output'].archive_directory,
             'max_discovery_depth': parsed_config['discovery'].max_depth,
             'discovery_timeout_seconds': parsed_config['discovery'].discovery_timeout,
             'max_concurrent_connections': parsed_config['discovery'].concurrent_connections,
             'connection_timeout_seconds': parsed_config['discovery'].connection_timeout,
             'enable_progress_tracking': parsed_config['discovery'].enable_progress_tracking,
+            'concurrent_discovery': parsed_config['discovery'].concurrent_discovery,
+            'incremental_discovery': parsed_config['discovery'].incremental_discovery,
+            'discovery_log_verbosity': parsed_config['discovery'].discovery_log_verbosity,
+            'stream_results': parsed_config['discovery'].stream_results,
+            'spill_directory': parsed_config['discovery'].spill_directory,
+            'checkpoint_interval_seconds': parsed_config['discovery'].checkpoint_interval,
+            'checkpoint_file': parsed_config['discovery'].checkpoint_file,
+            'discovery_protocols': parsed_config['discovery'].protocols,
+            'site_collection_parallel': parsed_config['discovery'].site_collection_parallel,
+            'site_collection_max_workers': parsed_config['discovery'].site_collection_max_workers,
+            'max_connections_per_site': parsed_config['discovery'].max_connections_per_site,
             'task_timeout_seconds': 60,  # Keep this default for now
             'hostname_excludes': parsed_config['exclusions'].exclude_hostnames,
             'ip_excludes': parsed_config['exclusions'].exclude_ip_ranges,
@@ -181,6 +218,8 @@ class NetWalkerApp:
             self.config.update({k: v for k, v in self.cli_args.items() if v is not None})
             print(f"DEBUG: After CLI overrides, max_discovery_depth: {self.config.get('max_discovery_depth', 'NOT SET')}")
         
+        self.dns_resolver = DNSResolver.from_config(self.config)
+        
         logger.info(f"Configuration initialized with defaults and CLI overrides")
         logger.info(f"Final max_discovery_depth: {self.config.get('max_discovery_depth', 'NOT SET')}")
     
@@ -239,10 +278,12 @@ class NetWalkerApp:
             ssh_port=ssh_port, 
             telnet_port=telnet_port, 
             timeout=timeout,
+            max_workers=self.config.get('max_concurrent_connections', 10),
             ssl_verify=ssl_verify,
             ssl_cert_file=ssl_cert_file if ssl_cert_file else None,
             ssl_key_file=ssl_key_file if ssl_key_file else None,
-            ssl_ca_bundle=ssl_ca_bundle if ssl_ca_bundle else None
+            ssl_ca_bundle=ssl_ca_bundle if ssl_ca_bundle else None,
+            fast_close=parsed_config['connection'].fast_close
         )
         logger.info("Connection management initialized")
     
@@ -261,7 +302,9 @@ class NetWalkerApp:
             self.filter_manager,
             self.config,
             self.credentials,
-            self.db_manager
+            self.db_manager,
+            self.thread_manager,
+            self.dns_resolver
         )
         logger.info("Discovery engine initialized")
     
@@ -295,7 +338,7 @@ class NetWalkerApp:
             'enable_ping_resolution': self.config.get('enable_ping_resolution', True)
         })
         
-        self.dns_validator = DNSValidator(dns_config)
+        self.dns_validator = DNSValidator(dns_config, self.dns_resolver)
         logger.info("DNS validation initialized")
     
     def _initialize_database(self):
@@ -497,20 +540,14 @@ class NetWalkerApp:
                 logger.info(f"Resolved {hostname} to {ip} from database")
                 return ip
         
-        # Try DNS fallback
-        try:
-            ip = socket.gethostbyname(hostname)
+        # Try DNS fallback (cached, failures included, by the shared resolver)
+        ip = self.dns_resolver.resolve(hostname)
+        if ip:
             logger.info(f"Resolved {hostname} to {ip} from DNS")
             return ip
-        except socket.gaierror as e:
-            logger.warning(f"Failed to resolve {hostname} via database or DNS: {e}")
-            return None
-        except socket.timeout as e:
-            logger.warning(f"DNS timeout for {hostname}: {e}")
-            return None
-        except Exception as e:
-            logger.warning(f"Unexpected error resolving {hostname}: {e}")
-            return None
+        
+        logger.warning(f"Failed to resolve {hostname} via database or DNS")
+        return None
     
     def discover_network(self) -> Dict[str, Any]:
         """
@@ -564,8 +601,8 @@ class NetWalkerApp:
         try:
             report_files = []
             
-            # Get device inventory
-            inventory = self.discovery_engine.get_inventory().get_all_devices()
+            # Get device inventory - in streaming mode devices are read back one at a time
+            inventory = self.discovery_engine.get_inventory().stream_devices()
             logger.info(f"Retrieved inventory with {len(inventory)} devices")
             
             # Generate main discovery report and per-seed reports
@@ -703,6 +740,26 @@ class NetWalkerApp:
         print(f"Failed Connections: {results.get('failed_connections', 0)}")
         print(f"Filtered Devices: {results.get('filtered_devices', 0)}")
         print(f"Maximum Depth: {results.get('max_depth_reached', 0)}")
+        print(f"Commands Saved (output reused): {results.get('commands_saved', 0)}")
+        command_stats = results.get('command_stats')
+        if command_stats:
+            print(f"Commands Run: {command_stats['commands_run']} "
+                  f"({command_stats['commands_skipped']} skipped as not applicable)")
+        incremental_stats = results.get('incremental_stats')
+        if incremental_stats:
+            print(f"Incremental: {incremental_stats['devices_skipped']} devices unchanged (skipped), "
+                  f"{incremental_stats['devices_refreshed']} fully refreshed")
+        cache_stats = results.get('metadata_cache_stats')
+        if cache_stats:
+            print(f"Metadata Cache: {cache_stats['lookups']} lookups, {cache_stats['hit_rate']:.1%} hit rate")
+        spill_stats = results.get('spill_stats')
+        if spill_stats:
+            print(f"Streamed Results: {spill_stats['devices_spilled']} devices spilled to disk "
+                  f"({spill_stats['bytes_written'] / (1024 * 1024):.1f} MB)")
+        peak_rss = peak_rss_mb()
+        if peak_rss is not None:
+            print(f"Peak Memory (RSS): {peak_rss:.1f} MB")
+            logger.info(f"Peak memory (RSS): {peak_rss:.1f} MB")
         print("\nGenerated Reports:")
         for report_file in report_files:
             print(f"  - {report_file}")
@@ -746,6 +803,14 @@ class NetWalkerApp:
                     except Exception as force_error:
                         logger.error(f"Force cleanup also failed: {force_error}")
             
+            # Remove the streaming-mode spill file
+            if self.discovery_engine:
+                self.discovery_engine.get_inventory().close()
+            
+            # Stop DNS lookups still running in the background
+            if self.dns_resolver:
+                self.dns_resolver.shutdown()
+            
             # Stop thread manager
             if self.thread_manager:
                 logger.info("Stopping thread manager...")
@@ -799,6 +864,10 @@ class NetWalkerApp:
             except Exception as emergency_error:
                 logger.error(f"Emergency cleanup also failed: {emergency_error}")
                 # At this point, we've done everything we can
+        
+        finally:
+            # Drain queued log records before the process exits
+            stop_logging()
     
     def get_version_info(self) -> Dict[str, str]:
         """Get version information"""
@@ -0,0 +1,10 @@
+"""
+Device simulator for NetWalker discovery tests and benchmarks
+"""
+
+from .network import DeviceBehavior, SimulatedDevice, SimulatedLink, SimulatedNetwork
+from .outputs import render_output
+from .connection import SimulatedConnection, SimulatorConnectionManager
+from .servers import SimulatorSSHServer, SimulatorTelnetServer
+
+__all__ = ['DeviceBehavior', 'SimulatedDevice', 'SimulatedLink', 'SimulatedNetwork', 'render_output', 'SimulatedConnection', 'SimulatorConnectionManager', 'SimulatorSSHServer', 'SimulatorTelnetServer']
@@ -0,0 +1,174 @@
+"""
+In-Process Simulator Connections for NetWalker
+
+A drop-in replacement for ConnectionManager that connects discovery to a
+SimulatedNetwork without sockets, so benchmarks measure NetWalker itself and
+the injected device latency rather than SSH handshakes.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from netwalker.config import Credentials
+from netwalker.connection.data_models import ConnectionMethod, ConnectionResult, ConnectionStatus
+from netwalker.simulator.network import DeviceBehavior, SimulatedDevice, SimulatedNetwork
+from netwalker.simulator.outputs import render_output
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedConnection:
+    """Netmiko-style connection to one simulated device"""
+
+    def __init__(self, device: SimulatedDevice, behavior: DeviceBehavior):
+        self.device = device
+        self.behavior = behavior
+        self.device_type = device.device_type
+        self.host = device.ip_address
+        self.commands_sent = 0
+        self._connected = True
+
+    def send_command(self, command: str, read_timeout: float = 30, **kwargs) -> str:
+        """
+        Run a command on the simulated device
+
+        Args:
+            command: Command to run
+            read_timeout: Accepted for netmiko compatibility
+
+        Returns:
+            Rendered or recorded command output
+        """
+        if not self._connected:
+            raise OSError(f"Socket is closed for {self.host}")
+        delay = self.behavior.command_delay()
+        if delay:
+            time.sleep(delay)
+        self.commands_sent += 1
+        return render_output(self.device, command)
+
+    def is_alive(self) -> bool:
+        """Check whether the session is still open"""
+        return self._connected
+
+    def disconnect(self):
+        """Close the session"""
+        self._connected = False
+
+
+class SimulatorConnectionManager:
+    """
+    Serves ConnectionManager's discovery-facing interface from a SimulatedNetwork.
+
+    Unknown hosts fail like an unreachable device and hosts picked by the
+    behavior profile fail authentication.
+    """
+
+    def __init__(self, network: SimulatedNetwork, behavior: Optional[DeviceBehavior] = None):
+        """
+        Initialize simulator connection manager.
+
+        Args:
+            network: Devices to serve
+            behavior: Latency and failure profile, defaults to no latency and no failures
+        """
+        self.network = network
+        self.behavior = behavior or DeviceBehavior()
+        self._active_connections: Dict[str, SimulatedConnection] = {}
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.connections_opened = 0
+        self.auth_failures = 0
+        self.unreachable = 0
+        self.commands_sent = 0
+
+    def connect_device(self, host: str, credentials: Credentials, db_manager=None,
+                       neighbor_platform: str = None) -> Tuple[Optional[Any], ConnectionResult]:
+        """
+        Connect to a simulated device
+
+        Args:
+            host: Device hostname or IP address
+            credentials: Authentication credentials
+            db_manager: Unused, accepted for ConnectionManager compatibility
+            neighbor_platform: Unused, accepted for ConnectionManager compatibility
+
+        Returns:
+            Tuple of (connection object, connection result)
+        """
+        start_time = time.time()
+        device = self.network.lookup(host)
+
+        if device is None:
+            with self._lock:
+                self.unreachable += 1
+            return None, ConnectionResult(host=host, method=ConnectionMethod.SSH, status=ConnectionStatus.FAILED,
+                                          error_message="Connection timed out", connection_time=0.0)
+
+        login_delay = self.behavior.login_delay()
+        if login_delay:
+            time.sleep(login_delay)
+
+        if not credentials or self.behavior.auth_fails(device.ip_address):
+            with self._lock:
+                self.auth_failures += 1
+            return None, ConnectionResult(host=host, method=ConnectionMethod.SSH, status=ConnectionStatus.FAILED,
+                                          error_message="Netmiko SSH connection failed: Authentication to device failed.",
+                                          connection_time=time.time() - start_time)
+
+        connection = SimulatedConnection(device, self.behavior)
+        probe_output = connection.send_command("show version") if device.platform != 'PAN-OS' else None
+        with self._lock:
+            self._active_connections[host] = connection
+            self.connections_opened += 1
+
+        return connection, ConnectionResult(host=host, method=ConnectionMethod.SSH, status=ConnectionStatus.SUCCESS,
+                                            connection_time=time.time() - start_time, probe_output=probe_output)
+
+    def close_connection(self, host: str) -> bool:
+        """
+        Close the connection to a device
+
+        Args:
+            host: Host passed to connect_device
+
+        Returns:
+            True if a connection was closed
+        """
+        with self._lock:
+            connection = self._active_connections.pop(host, None)
+            if connection is None:
+                return False
+            self.commands_sent += connection.commands_sent
+        connection.disconnect()
+        return True
+
+    def close_all_connections(self):
+        """Close every open connection"""
+        for host in list(self._active_connections):
+            self.close_connection(host)
+
+    def force_cleanup_connections(self):
+        """Close every open connection"""
+        self.close_all_connections()
+
+    def get_active_connection_count(self) -> int:
+        """Get count of active connections"""
+        return len(self._active_connections)
+
+    def log_connection_status(self):
+        """Log current connection status for debugging"""
+        logger.debug(f"Active simulated connections: {len(self._active_connections)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection counts and commands sent"""
+        with self._lock:
+            return {
+                'connections_opened': self.connections_opened,
+                'auth_failures': self.auth_failures,
+                'unreachable': self.unreachable,
+                'commands_sent': self.commands_sent
+            }
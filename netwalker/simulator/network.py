@@ -0,0 +1,251 @@
+"""
+Simulated Network for NetWalker
+
+Synthetic device topologies for exercising discovery without production gear.
+A network is a set of devices joined by CDP links; each device answers show
+commands with rendered or recorded outputs, and a shared behavior profile
+injects command latency, jitter and authentication failures.
+"""
+
+import hashlib
+import ipaddress
+import random
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+
+# Role -> platform used when building synthetic meshes
+ROLE_PLATFORMS = {
+    'CR': 'NX-OS',
+    'DS': 'IOS-XE',
+    'AS': 'IOS',
+    'FW': 'PAN-OS',
+}
+
+
+@dataclass
+class SimulatedLink:
+    """One CDP adjacency as seen from the local device"""
+    local_interface: str
+    remote_hostname: str
+    remote_ip: str
+    remote_interface: str
+    remote_platform: str
+
+
+@dataclass
+class SimulatedDevice:
+    """A device the simulator answers for"""
+    hostname: str
+    ip_address: str
+    platform: str  # IOS, IOS-XE, NX-OS or PAN-OS
+    serial_number: str
+    links: List[SimulatedLink] = field(default_factory=list)
+    vlan_count: int = 10
+    # Recorded command -> output; a device with recordings replays only those
+    recorded_outputs: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def device_type(self) -> str:
+        """Netmiko device type the simulator presents"""
+        return 'paloalto_panos' if self.platform == 'PAN-OS' else 'cisco_ios'
+
+
+@dataclass
+class DeviceBehavior:
+    """
+    Latency and failure profile applied to every simulated device.
+
+    Random draws are seeded so a benchmark run is repeatable. Authentication
+    failures are decided per host, so retries against the same device fail
+    the same way a device with a wrong password would.
+    """
+    command_latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    login_latency_ms: float = 0.0
+    auth_failure_rate: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def command_delay(self) -> float:
+        """Seconds one command takes, latency plus uniform jitter"""
+        jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.command_latency_ms + jitter) / 1000.0
+
+    def login_delay(self) -> float:
+        """Seconds a login takes"""
+        return max(0.0, self.login_latency_ms) / 1000.0
+
+    def auth_fails(self, host: str) -> bool:
+        """Check whether logins to host are rejected"""
+        if self.auth_failure_rate <= 0:
+            return False
+        digest = hashlib.sha256(f"{self.seed}:{host}".encode('utf-8')).digest()
+        return int.from_bytes(digest[:4], 'big') / 2 ** 32 < self.auth_failure_rate
+
+
+class SimulatedNetwork:
+    """
+    Devices indexed by IP address and hostname.
+
+    Lookups by hostname are case-insensitive and ignore any domain suffix,
+    matching how discovery keys devices.
+    """
+
+    def __init__(self, devices: Iterable[SimulatedDevice] = ()):
+        self._by_ip: Dict[str, SimulatedDevice] = {}
+        self._by_name: Dict[str, SimulatedDevice] = {}
+        for device in devices:
+            self.add_device(device)
+
+    def add_device(self, device: SimulatedDevice):
+        """Add or replace a device"""
+        self._by_ip[device.ip_address] = device
+        self._by_name[device.hostname.split('.')[0].lower()] = device
+
+    def lookup(self, host: str) -> Optional[SimulatedDevice]:
+        """
+        Find a device by IP address or hostname
+
+        Args:
+            host: IP address or hostname
+
+        Returns:
+            SimulatedDevice, or None if the simulator does not know the host
+        """
+        if not host:
+            return None
+        device = self._by_ip.get(host)
+        if device is None:
+            device = self._by_name.get(host.split('.')[0].lower())
+        return device
+
+    @property
+    def devices(self) -> List[SimulatedDevice]:
+        """All devices in insertion order"""
+        return list(self._by_ip.values())
+
+    def __len__(self) -> int:
+        return len(self._by_ip)
+
+    @classmethod
+    def build_mesh(cls, node_count: int, fanout: int = 8, redundant_links: bool = True,
+                   firewall_every: int = 50, address_base: str = '10.0.0.0',
+                   vlan_count: int = 10) -> 'SimulatedNetwork':
+        """
+        Build a synthetic core/distribution/access CDP mesh
+
+        Node 0 is an NX-OS core; its children are IOS-XE distribution switches
+        and everything deeper is an IOS access switch. Every firewall_every-th
+        leaf is a PAN-OS firewall. With redundant_links each switch also links
+        to its parent's next sibling, so discovery sees every device from more
+        than one neighbor.
+
+        Args:
+            node_count: Number of devices (100 to 10k are typical)
+            fanout: Children per switch
+            redundant_links: Add a second uplink per switch
+            firewall_every: Turn every n-th leaf into a PAN-OS firewall, 0 for none
+            address_base: First address; device i gets address_base + i + 1
+            vlan_count: VLANs each switch reports
+
+        Returns:
+            SimulatedNetwork with node_count devices
+        """
+        fanout = max(1, fanout)
+        base = ipaddress.ip_address(address_base)
+        first_leaf = (node_count - 2) // fanout + 1 if node_count > 1 else 1
+
+        def parent_of(index: int) -> int:
+            return (index - 1) // fanout
+
+        def role_of(index: int) -> str:
+            if index == 0:
+                return 'CR'
+            if firewall_every and index >= first_leaf and index % firewall_every == 0:
+                return 'FW'
+            return 'DS' if parent_of(index) == 0 else 'AS'
+
+        devices = []
+        for index in range(node_count):
+            role = role_of(index)
+            devices.append(SimulatedDevice(
+                hostname=f"SIM{index:05d}-{role}",
+                ip_address=str(base + index + 1),
+                platform=ROLE_PLATFORMS[role],
+                serial_number=f"SIM{index:08d}",
+                vlan_count=0 if role == 'FW' else vlan_count
+            ))
+
+        def link(a: int, b: int, a_port: str, b_port: str):
+            device_a, device_b = devices[a], devices[b]
+            device_a.links.append(SimulatedLink(a_port, device_b.hostname, device_b.ip_address,
+                                                b_port, device_b.platform))
+            device_b.links.append(SimulatedLink(b_port, device_a.hostname, device_a.ip_address,
+                                                a_port, device_a.platform))
+
+        for index in range(1, node_count):
+            parent = parent_of(index)
+            slot = (index - 1) % fanout
+            link(parent, index, _port(devices[parent], slot + 1), _port(devices[index], 49))
+
+            # Second uplink to the parent's next sibling (switches only)
+            if redundant_links and parent > 0 and devices[index].platform != 'PAN-OS':
+                peer = parent + 1
+                if peer < node_count and parent_of(peer) == parent_of(parent) and devices[peer].platform != 'PAN-OS':
+                    link(peer, index, _port(devices[peer], fanout + slot + 1), _port(devices[index], 50))
+
+        return cls(devices)
+
+    @classmethod
+    def from_archive(cls, directory: str, since: Optional[str] = None) -> 'SimulatedNetwork':
+        """
+        Build a network that replays recorded outputs from a raw output archive
+
+        Each device answers with the outputs of its latest capture; the
+        recorded CDP/LLDP neighbor outputs define the topology.
+
+        Args:
+            directory: Archive directory written with archive_raw_output enabled
+            since: Only use captures taken at or after this ISO timestamp
+
+        Returns:
+            SimulatedNetwork with one device per archived host
+        """
+        from netwalker.connection.output_archive import OutputArchive
+
+        archive = OutputArchive(directory)
+        network = cls()
+        for capture in archive.latest_captures(since):
+            outputs = archive.load_outputs(capture)
+            network.add_device(SimulatedDevice(
+                hostname=capture.hostname or capture.host,
+                ip_address=capture.primary_ip or capture.host,
+                platform=_recorded_platform(capture.device_type, outputs.get('show version', '')),
+                serial_number='',
+                recorded_outputs=outputs
+            ))
+        return network
+
+
+def _recorded_platform(device_type: Optional[str], version_output: str) -> str:
+    """Platform of an archived device, from its device type and 'show version'"""
+    if device_type == 'paloalto_panos':
+        return 'PAN-OS'
+    version_lower = version_output.lower()
+    if 'nx-os' in version_lower or 'nexus' in version_lower:
+        return 'NX-OS'
+    if 'ios-xe' in version_lower:
+        return 'IOS-XE'
+    return 'IOS'
+
+
+def _port(device: SimulatedDevice, number: int) -> str:
+    """Interface name for a port number on the device's platform"""
+    if device.platform == 'NX-OS':
+        return f"Ethernet1/{number}"
+    if device.platform == 'PAN-OS':
+        return f"ethernet1/{number}"
+    return f"GigabitEthernet1/0/{number}"
@@ -0,0 +1,187 @@
+"""
+Simulated Command Outputs for NetWalker
+
+Renders the show command outputs discovery reads from IOS, IOS-XE, NX-OS and
+PAN-OS devices, in the formats DeviceCollector, ProtocolParser, StackCollector
+and the VLAN parser expect. Devices with recorded outputs (for example loaded
+from a raw output archive) replay those instead.
+"""
+
+from typing import Callable, Dict
+
+from netwalker.simulator.network import SimulatedDevice
+
+
+INVALID_INPUT = "% Invalid input detected at '^' marker.\n"
+
+MODELS = {
+    'IOS': 'WS-C3850-48P',
+    'IOS-XE': 'C9300-48P',
+    'NX-OS': 'N9K-C93180YC-EX',
+    'PAN-OS': 'PA-3220',
+}
+
+CDP_PLATFORMS = {
+    'IOS': ('cisco WS-C3850-48P', 'Switch IGMP'),
+    'IOS-XE': ('cisco C9300-48P', 'Router Switch IGMP'),
+    'NX-OS': ('N9K-C93180YC-EX', 'Router Switch IGMP Filtering Supports-STP-Dispute'),
+    'PAN-OS': ('Palo Alto Networks PA-3220', 'Router'),
+}
+
+
+def _show_version(device: SimulatedDevice) -> str:
+    model = MODELS[device.platform]
+    if device.platform == 'NX-OS':
+        return (
+            "Cisco Nexus Operating System (NX-OS) Software\n"
+            "Software\n"
+            "  NXOS: version 9.3(8)\n"
+            "Hardware\n"
+            f"  cisco Nexus9000 {model} Chassis\n"
+            f"  Processor Board ID {device.serial_number}\n"
+            f"  Device name: {device.hostname}\n"
+            "Kernel uptime is 120 day(s), 4 hour(s), 12 minute(s), 5 second(s)\n"
+        )
+    banner = ("Cisco IOS XE Software, Version 17.06.05\n"
+              "Cisco IOS-XE software, Copyright (c) 1986-2023 by Cisco Systems, Inc.\n"
+              if device.platform == 'IOS-XE' else
+              "Cisco IOS Software, C3850 Software (CAT3K_CAA-UNIVERSALK9-M), Version 15.2(7)E8, RELEASE SOFTWARE\n")
+    return (
+        banner +
+        f"{device.hostname} uptime is 45 weeks, 2 days, 3 hours, 10 minutes\n"
+        "System returned to ROM by power-on\n"
+        f"cisco {model} (MIPS) processor with 524288K bytes of memory.\n"
+        f"Processor board ID {device.serial_number}\n"
+        f"Model Number                       : {model}\n"
+        f"System Serial Number               : {device.serial_number}\n"
+    )
+
+
+def _show_system_info(device: SimulatedDevice) -> str:
+    return (
+        f"hostname: {device.hostname}\n"
+        f"ip-address: {device.ip_address}\n"
+        "uptime: 30 days, 2:14:55\n"
+        "family: 3200\n"
+        f"model: {MODELS['PAN-OS']}\n"
+        f"serial: {device.serial_number}\n"
+        "cloud-mode: non-cloud\n"
+        "sw-version: 10.2.4\n"
+        "operational-mode: normal\n"
+    )
+
+
+def _show_cdp_neighbors_detail(device: SimulatedDevice) -> str:
+    entries = []
+    for link in device.links:
+        platform, capabilities = CDP_PLATFORMS.get(link.remote_platform, CDP_PLATFORMS['IOS'])
+        entries.append(
+            "-------------------------\n"
+            f"Device ID: {link.remote_hostname}\n"
+            "Entry address(es):\n"
+            f"  IP address: {link.remote_ip}\n"
+            f"Platform: {platform},  Capabilities: {capabilities}\n"
+            f"Interface: {link.local_interface},  Port ID (outgoing port): {link.remote_interface}\n"
+            "Holdtime : 150 sec\n"
+        )
+    return "".join(entries)
+
+
+def _show_ip_interface_brief(device: SimulatedDevice) -> str:
+    management = 'mgmt0' if device.platform == 'NX-OS' else 'Vlan1'
+    return (
+        "Interface              IP-Address      OK? Method Status                Protocol\n"
+        f"{management:<22} {device.ip_address:<15} YES NVRAM  up                    up\n"
+    )
+
+
+def _vlan_table(device: SimulatedDevice) -> str:
+    lines = [
+        "VLAN Name                             Status    Ports",
+        "---- -------------------------------- --------- -------------------------------",
+    ]
+    ports = [link.local_interface for link in device.links]
+    for vlan_id in range(1, device.vlan_count + 1):
+        vlan_ports = ", ".join(ports) if vlan_id == 1 else ""
+        lines.append(f"{vlan_id:<4} {'default' if vlan_id == 1 else f'VLAN{vlan_id:04d}':<32} active    {vlan_ports}")
+    return "\n".join(lines) + "\n"
+
+
+def _show_interfaces_status(device: SimulatedDevice) -> str:
+    lines = ["Port      Name               Status       Vlan       Duplex  Speed Type"]
+    for link in device.links:
+        lines.append(f"{link.local_interface:<9} {link.remote_hostname[:18]:<18} connected    trunk      a-full  a-1000 10/100/1000BaseTX")
+    return "\n".join(lines) + "\n"
+
+
+def _show_inventory(device: SimulatedDevice) -> str:
+    model = MODELS[device.platform]
+    return (
+        f'NAME: "Chassis", DESCR: "Cisco {model} Chassis"\n'
+        f"PID: {model}     , VID: V01  , SN: {device.serial_number}\n"
+    )
+
+
+def _show_switch(device: SimulatedDevice) -> str:
+    # Single-member stack so StackCollector reports nothing to enrich
+    return ""
+
+
+def _show_vtp_status(device: SimulatedDevice) -> str:
+    return (
+        "VTP Version capable             : 1 to 3\n"
+        "VTP version running             : 2\n"
+        "VTP Domain Name                 : SIM\n"
+        "VTP Operating Mode              : Transparent\n"
+    )
+
+
+def _show_high_availability_state(device: SimulatedDevice) -> str:
+    return "HA not enabled\n"
+
+
+RENDERERS: Dict[str, Callable[[SimulatedDevice], str]] = {
+    'show version': _show_version,
+    'show system info': _show_system_info,
+    'show cdp neighbors detail': _show_cdp_neighbors_detail,
+    'show lldp neighbors detail': lambda device: "",
+    'show ip interface brief': _show_ip_interface_brief,
+    'show ip route connected': lambda device: "",
+    'show vlan brief': _vlan_table,
+    'show vlan': _vlan_table,
+    'show interfaces status': _show_interfaces_status,
+    'show interface status': _show_interfaces_status,
+    'show inventory': _show_inventory,
+    'show switch': _show_switch,
+    'show mod': lambda device: "",
+    'show vtp status': _show_vtp_status,
+    'show high-availability state': _show_high_availability_state,
+}
+
+# Commands each platform answers; anything else is rejected like a real device would
+PLATFORM_COMMANDS = {
+    'PAN-OS': {'show system info', 'show high-availability state'},
+}
+
+
+def render_output(device: SimulatedDevice, command: str) -> str:
+    """
+    Render the output of a show command on a simulated device
+
+    Args:
+        device: Device the command runs on
+        command: Command line as sent by discovery
+
+    Returns:
+        Command output, or an IOS-style invalid input error for unknown commands
+    """
+    command = ' '.join(command.split())
+    if device.recorded_outputs:
+        # Replayed devices only answer what was recorded
+        return device.recorded_outputs.get(command, INVALID_INPUT)
+
+    allowed = PLATFORM_COMMANDS.get(device.platform)
+    renderer = RENDERERS.get(command)
+    if renderer is None or (allowed is not None and command not in allowed):
+        return INVALID_INPUT
+    return renderer(device)
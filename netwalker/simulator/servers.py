@@ -0,0 +1,285 @@
+"""
+SSH and Telnet Device Simulator Servers for NetWalker
+
+Serve a SimulatedNetwork over real sockets so the whole connection stack
+(netmiko over SSH, scrapli over Telnet) can be exercised locally. One server
+answers for every device: it listens on all addresses and picks the device by
+the address the client connected to, so a mesh built on 127.x.y.z addresses
+(all routed to loopback on Linux) looks like thousands of separate hosts.
+"""
+
+import logging
+import socket
+import threading
+import time
+from typing import Optional
+
+from netwalker.simulator.network import DeviceBehavior, SimulatedDevice, SimulatedNetwork
+from netwalker.simulator.outputs import render_output
+
+try:
+    import paramiko
+    PARAMIKO_AVAILABLE = True
+except ImportError:
+    PARAMIKO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Session setup commands clients send before discovery commands; they print nothing
+SESSION_COMMAND_PREFIXES = ('terminal ', 'set cli ', 'screen-length ')
+
+
+def _prompt(device: SimulatedDevice, privileged: bool = True) -> str:
+    if device.platform == 'PAN-OS':
+        return f"admin@{device.hostname}> "
+    return f"{device.hostname}{'#' if privileged else '>'}"
+
+
+class _CommandShell:
+    """Cisco-style interactive shell over a byte channel"""
+
+    def __init__(self, device: SimulatedDevice, behavior: DeviceBehavior, send, recv):
+        self.device = device
+        self.behavior = behavior
+        self._send = send
+        self._recv = recv
+        self.privileged = True
+
+    def run(self):
+        """Serve commands until the client exits or disconnects"""
+        self._send(f"\r\n{_prompt(self.device)}")
+        buffer = b""
+        echoed = 0
+        while True:
+            data = self._recv()
+            if not data:
+                return
+            buffer += data
+            while b"\n" in buffer or b"\r" in buffer:
+                cut = min(i for i in (buffer.find(b"\r"), buffer.find(b"\n")) if i >= 0)
+                line, buffer = buffer[:cut].decode('utf-8', 'replace'), buffer[cut + 1:].lstrip(b"\n\x00")
+                self._send(line[echoed:])
+                echoed = 0
+                command = ' '.join(line.split())
+                if command in ('exit', 'quit', 'logout'):
+                    return
+                output = self._execute(command)
+                self._send(f"\r\n{output}{_prompt(self.device, self.privileged)}")
+            # Echo typed characters as they arrive; clients wait for the echo before sending return
+            if buffer[echoed:]:
+                self._send(buffer[echoed:].decode('utf-8', 'replace'))
+                echoed = len(buffer)
+
+    def _execute(self, command: str) -> str:
+        if command in ('enable', 'disable'):
+            # Scrapli settles on the exec (>) or privileged (#) prompt before running commands
+            self.privileged = command == 'enable'
+            return ""
+        if not command or command.startswith(SESSION_COMMAND_PREFIXES):
+            return ""
+        delay = self.behavior.command_delay()
+        if delay:
+            time.sleep(delay)
+        output = render_output(self.device, command)
+        return output.replace("\r\n", "\n").replace("\n", "\r\n")
+
+
+class _SimulatorServer:
+    """Accept loop shared by the SSH and Telnet servers"""
+
+    def __init__(self, network: SimulatedNetwork, behavior: Optional[DeviceBehavior] = None,
+                 port: int = 0, bind_address: str = '0.0.0.0'):
+        """
+        Initialize simulator server.
+
+        Args:
+            network: Devices to serve
+            behavior: Latency and failure profile
+            port: TCP port to listen on, 0 picks a free port
+            bind_address: Address to listen on
+        """
+        self.network = network
+        self.behavior = behavior or DeviceBehavior()
+        self.bind_address = bind_address
+        self.port = port
+        self._socket: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> int:
+        """
+        Start listening in a background thread
+
+        Returns:
+            Port the server listens on
+        """
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.bind_address, self.port))
+        self._socket.listen(256)
+        self.port = self._socket.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, name=f"{type(self).__name__}-{self.port}", daemon=True)
+        self._thread.start()
+        logger.info(f"{type(self).__name__} listening on {self.bind_address}:{self.port} for {len(self.network)} devices")
+        return self.port
+
+    def stop(self):
+        """Stop accepting connections"""
+        self._running = False
+        if self._socket is not None:
+            # Shutdown wakes the accept loop; close alone leaves it blocked
+            for close in (lambda: self._socket.shutdown(socket.SHUT_RDWR), self._socket.close):
+                try:
+                    close()
+                except OSError:
+                    pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve_client, args=(client,), daemon=True).start()
+
+    def _serve_client(self, client: socket.socket):
+        device = self.network.lookup(client.getsockname()[0])
+        if device is None and len(self.network) == 1:
+            device = self.network.devices[0]
+        try:
+            if device is None:
+                logger.debug(f"No simulated device at {client.getsockname()[0]}")
+                return
+            self._handle(client, device)
+        except Exception as e:
+            logger.debug(f"Simulator session for {device.hostname if device else '?'} ended: {e}")
+        finally:
+            try:
+                client.close()
+            except OSError:
+                pass
+
+    def _handle(self, client: socket.socket, device: SimulatedDevice):
+        raise NotImplementedError
+
+
+if PARAMIKO_AVAILABLE:
+    class _DeviceSSHInterface(paramiko.ServerInterface):
+        """Password authentication and a single interactive shell"""
+
+        def __init__(self, device: SimulatedDevice, behavior: DeviceBehavior):
+            self.device = device
+            self.behavior = behavior
+            self.shell_requested = threading.Event()
+
+        def get_allowed_auths(self, username):
+            return 'password,keyboard-interactive'
+
+        def check_auth_password(self, username, password):
+            time.sleep(self.behavior.login_delay())
+            if self.behavior.auth_fails(self.device.ip_address):
+                return paramiko.AUTH_FAILED
+            return paramiko.AUTH_SUCCESSFUL
+
+        # Netmiko logs in to PAN-OS with keyboard-interactive authentication
+        def check_auth_interactive(self, username, submethods):
+            return paramiko.InteractiveQuery('', '', ('Password: ', False))
+
+        def check_auth_interactive_response(self, responses):
+            return self.check_auth_password('', responses[0] if responses else '')
+
+        def check_channel_request(self, kind, chanid):
+            if kind == 'session':
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+        def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+            return True
+
+        def check_channel_shell_request(self, channel):
+            self.shell_requested.set()
+            return True
+
+
+class SimulatorSSHServer(_SimulatorServer):
+    """SSH server answering for every device in a SimulatedNetwork"""
+
+    def __init__(self, network: SimulatedNetwork, behavior: Optional[DeviceBehavior] = None,
+                 port: int = 0, bind_address: str = '0.0.0.0'):
+        if not PARAMIKO_AVAILABLE:
+            raise ImportError("paramiko is required for the SSH device simulator")
+        super().__init__(network, behavior, port, bind_address)
+        self._host_key = paramiko.RSAKey.generate(2048)
+
+    def _handle(self, client: socket.socket, device: SimulatedDevice):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self._host_key)
+        interface = _DeviceSSHInterface(device, self.behavior)
+        try:
+            transport.start_server(server=interface)
+            channel = transport.accept(timeout=30)
+            if channel is None or not interface.shell_requested.wait(timeout=30):
+                return
+            _CommandShell(device, self.behavior,
+                          send=lambda text: channel.sendall(text.encode('utf-8')),
+                          recv=lambda: channel.recv(4096)).run()
+            channel.close()
+        finally:
+            transport.close()
+
+
+class SimulatorTelnetServer(_SimulatorServer):
+    """Telnet server with an IOS-style login for every device in a SimulatedNetwork"""
+
+    def _handle(self, client: socket.socket, device: SimulatedDevice):
+        send = lambda text: client.sendall(text.encode('utf-8'))  # noqa: E731
+
+        def recv() -> bytes:
+            return _strip_telnet_commands(client.recv(4096))
+
+        def read_line() -> Optional[str]:
+            buffer = b""
+            while b"\r" not in buffer and b"\n" not in buffer:
+                data = recv()
+                if not data:
+                    return None
+                buffer += data
+            return buffer.splitlines()[0].decode('utf-8', 'replace')
+
+        send("\r\nUser Access Verification\r\n\r\nUsername: ")
+        if read_line() is None:
+            return
+        send("Password: ")
+        if read_line() is None:
+            return
+        time.sleep(self.behavior.login_delay())
+        if self.behavior.auth_fails(device.ip_address):
+            send("\r\n% Authentication failed\r\n")
+            return
+
+        _CommandShell(device, self.behavior, send=send, recv=recv).run()
+
+
+def _strip_telnet_commands(data: bytes) -> bytes:
+    """Drop IAC option negotiation sequences from client data"""
+    if b"\xff" not in data:
+        return data
+    result = bytearray()
+    index = 0
+    while index < len(data):
+        if data[index] == 0xFF and index + 1 < len(data):
+            index += 3 if data[index + 1] in (0xFB, 0xFC, 0xFD, 0xFE) else 2
+            continue
+        result.append(data[index])
+        index += 1
+    return bytes(result)
@@ -0,0 +1,237 @@
+"""
+Shared DNS Resolver for NetWalker
+
+Resolves hostnames and addresses on a bounded worker pool with a TTL cache,
+so discovery, seed loading and DNS validation share lookups instead of
+repeating them, and a slow DNS server only stalls a lookup for the timeout.
+"""
+
+import logging
+import socket
+import threading
+import time
+import concurrent.futures
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DNSResolver:
+    """
+    Caching forward/reverse DNS resolver backed by a bounded thread pool.
+
+    Successful lookups are cached for ttl_seconds and failed lookups for
+    negative_ttl_seconds. Concurrent requests for the same name share one
+    in-flight lookup. Every lookup that reaches DNS records its latency.
+    """
+
+    def __init__(self, max_workers: int = 10, timeout: float = 5.0,
+                 ttl_seconds: float = 300.0, negative_ttl_seconds: float = 60.0):
+        """
+        Initialize DNS resolver.
+
+        Args:
+            max_workers: Maximum concurrent DNS lookups
+            timeout: Seconds to wait for a single lookup before treating it as failed
+            ttl_seconds: Seconds a successful result is cached
+            negative_ttl_seconds: Seconds a failed result is cached
+        """
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+        self._lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # (kind, name) -> (result or None, expires_at)
+        self._cache: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+        self._inflight: Dict[Tuple[str, str], concurrent.futures.Future] = {}
+
+        # Statistics
+        self.lookups = 0
+        self.cache_hits = 0
+        self.negative_hits = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'DNSResolver':
+        """
+        Create a resolver from the flattened application configuration
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            DNSResolver using max_concurrent_dns, dns_timeout_seconds,
+            dns_cache_ttl_seconds and dns_negative_ttl_seconds
+        """
+        return cls(
+            max_workers=config.get('max_concurrent_dns', 10),
+            timeout=config.get('dns_timeout_seconds', 5),
+            ttl_seconds=config.get('dns_cache_ttl_seconds', 300),
+            negative_ttl_seconds=config.get('dns_negative_ttl_seconds', 60)
+        )
+
+    def resolve(self, hostname: str) -> Optional[str]:
+        """
+        Resolve a hostname to an IPv4 address
+
+        Args:
+            hostname: Hostname to resolve
+
+        Returns:
+            IP address, or None if the name does not resolve
+        """
+        if not hostname:
+            return None
+        return self._wait(('forward', hostname), self._submit(('forward', hostname)))
+
+    def reverse(self, ip_address: str) -> Optional[str]:
+        """
+        Resolve an IP address to its hostname
+
+        Args:
+            ip_address: IP address to look up
+
+        Returns:
+            Hostname, or None if there is no PTR record
+        """
+        if not ip_address:
+            return None
+        return self._wait(('reverse', ip_address), self._submit(('reverse', ip_address)))
+
+    def resolve_many(self, hostnames: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve several hostnames concurrently
+
+        Args:
+            hostnames: Hostnames to resolve
+
+        Returns:
+            Dictionary of hostname -> IP address (None for names that did not resolve)
+        """
+        pending = {}
+        for hostname in hostnames:
+            if hostname and hostname not in pending:
+                pending[hostname] = self._submit(('forward', hostname))
+
+        # Lookups beyond max_workers queue behind earlier ones, so allow one timeout per wave
+        waves = -(-len(pending) // self.max_workers)
+        deadline = time.monotonic() + self.timeout * waves
+        return {hostname: self._wait(('forward', hostname), future,
+                                     max(0.0, deadline - time.monotonic()))
+                for hostname, future in pending.items()}
+
+    def _submit(self, key: Tuple[str, str]) -> concurrent.futures.Future:
+        """Return a future for key, served from cache or an in-flight lookup where possible"""
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                result, expires_at = cached
+                if time.monotonic() < expires_at:
+                    if result is None:
+                        self.negative_hits += 1
+                    else:
+                        self.cache_hits += 1
+                    future = concurrent.futures.Future()
+                    future.set_result(result)
+                    return future
+                del self._cache[key]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.cache_hits += 1
+                return future
+
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='netwalker-dns'
+                )
+            future = self._executor.submit(self._lookup, key)
+            self._inflight[key] = future
+            return future
+
+    def _wait(self, key: Tuple[str, str], future: concurrent.futures.Future,
+              timeout: Optional[float] = None) -> Optional[str]:
+        """Wait for a lookup (default: the resolver timeout), caching a timeout as a failure"""
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+                    self._cache[key] = (None, time.monotonic() + self.negative_ttl_seconds)
+            logger.warning(f"[DNS] {key[0]} lookup for {key[1]} timed out after {self.timeout}s")
+            return None
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[str]:
+        """Run one DNS query on a worker thread and cache the outcome"""
+        kind, name = key
+        start = time.perf_counter()
+        try:
+            if kind == 'forward':
+                result = socket.gethostbyname(name)
+            else:
+                result = socket.gethostbyaddr(name)[0]
+        except Exception as e:
+            # gaierror/herror/timeout are the usual failures; anything else is treated the same
+            logger.debug(f"[DNS] {kind} lookup failed for {name}: {e}")
+            result = None
+        latency = time.perf_counter() - start
+
+        with self._lock:
+            self.lookups += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            ttl = self.ttl_seconds
+            if result is None:
+                self.failures += 1
+                ttl = self.negative_ttl_seconds
+            self._cache[key] = (result, time.monotonic() + ttl)
+            self._inflight.pop(key, None)
+
+        logger.debug(f"[DNS] {kind} {name} -> {result} in {latency * 1000:.1f}ms")
+        return result
+
+    def prime(self, hostname: str, ip_address: Optional[str]):
+        """
+        Cache a known forward result so resolving hostname needs no DNS query
+
+        Args:
+            hostname: Hostname to cache
+            ip_address: Its IP address, or None to cache it as unresolvable
+        """
+        if not hostname:
+            return
+        ttl = self.ttl_seconds if ip_address else self.negative_ttl_seconds
+        with self._lock:
+            self._cache[('forward', hostname)] = (ip_address, time.monotonic() + ttl)
+
+    def clear_cache(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get lookup, cache and latency counters"""
+        with self._lock:
+            return {
+                'lookups': self.lookups,
+                'cache_hits': self.cache_hits,
+                'negative_hits': self.negative_hits,
+                'failures': self.failures,
+                'timeouts': self.timeouts,
+                'avg_latency_ms': (self.total_latency / self.lookups * 1000) if self.lookups else 0.0,
+                'max_latency_ms': self.max_latency * 1000
+            }
+
+    def shutdown(self):
+        """Stop the worker pool without waiting for lookups still in progress."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -6,7 +6,6 @@ Implements public IP detection, forward/reverse DNS testing, and Excel reporting
 """
 
 import logging
-import socket
 import subprocess
 import ipaddress
 from typing import Dict, List, Any, Optional, Tuple
@@ -15,6 +14,8 @@ from datetime import datetime
 import concurrent.futures
 import threading
 
+from .dns_resolver import DNSResolver
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,17 +50,20 @@ class DNSValidator:
     - Concurrent DNS validation processing
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], dns_resolver: Optional[DNSResolver] = None):
         """
         Initialize DNS Validator.
         
         Args:
             config: Configuration dictionary
+            dns_resolver: Optional shared resolver, so lookups already made during
+                discovery are answered from its cache
         """
         self.config = config
         self.timeout = config.get('dns_timeout_seconds', 5)
         self.max_concurrent_dns = config.get('max_concurrent_dns', 10)
         self.enable_ping_resolution = config.get('enable_ping_resolution', True)
+        self.dns_resolver = dns_resolver or DNSResolver.from_config(config)
         
         # RFC1918 private address ranges
         self.rfc1918_networks = [
@@ -258,12 +262,11 @@ class DNSValidator:
         Returns:
             Tuple of (success, resolved_ip)
         """
-        try:
-            resolved_ip = socket.gethostbyname(hostname)
+        resolved_ip = self.dns_resolver.resolve(hostname)
+        if resolved_ip:
             return True, resolved_ip
-        except (socket.gaierror, socket.herror, OSError) as e:
-            logger.debug(f"Forward DNS lookup failed for {hostname}: {e}")
-            return False, None
+        logger.debug(f"Forward DNS lookup failed for {hostname}")
+        return False, None
     
     def _reverse_dns_lookup(self, ip_address: str) -> Tuple[bool, Optional[str]]:
         """
@@ -275,12 +278,11 @@ class DNSValidator:
         Returns:
             Tuple of (success, resolved_hostname)
         """
-        try:
-            resolved_hostname = socket.gethostbyaddr(ip_address)[0]
+        resolved_hostname = self.dns_resolver.reverse(ip_address)
+        if resolved_hostname:
             return True, resolved_hostname
-        except (socket.gaierror, socket.herror, OSError) as e:
-            logger.debug(f"Reverse DNS lookup failed for {ip_address}: {e}")
-            return False, None
+        logger.debug(f"Reverse DNS lookup failed for {ip_address}")
+        return False, None
     
     def _validate_hostname_match(self, expected_hostname: str, dns_hostname: str) -> bool:
         """
@@ -14,6 +14,7 @@ from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
 from netwalker.connection.data_models import VLANInfo, VLANCollectionResult, VLANCollectionConfig, DeviceInfo
+from netwalker.connection.command_plan import CommandSession, execute_command
 from .platform_handler import PlatformHandler
 from .vlan_parser import VLANParser
 
@@ -298,30 +299,10 @@ class VLANCollector:
             Command output or None if failed
         """
         try:
-            # Determine connection type and execute accordingly
-            if hasattr(connection, 'send_command') and hasattr(connection, 'device_type'):
-                # Netmiko connection
-                response = connection.send_command(command, read_timeout=self.vlan_config.command_timeout)
-                return response
-            elif hasattr(connection, 'send_command') and hasattr(connection, 'transport'):
-                # Scrapli connection
-                response = connection.send_command(command)
-                return response.result if hasattr(response, 'result') else str(response)
-            elif hasattr(connection, 'send_command'):
-                # Generic connection (for testing)
-                try:
-                    response = connection.send_command(command)
-                    if hasattr(response, 'result'):
-                        return response.result
-                    else:
-                        return str(response)
-                except TypeError:
-                    # Fallback for netmiko-style
-                    response = connection.send_command(command, read_timeout=self.vlan_config.command_timeout)
-                    return response
-            else:
-                self.logger.error(f"Unknown connection type: {type(connection)}")
-                return None
+            if isinstance(connection, CommandSession):
+                # Shared with the other collectors, so output already captured is reused
+                return connection.run(command, self.vlan_config.command_timeout)
+            return execute_command(connection, command, self.vlan_config.command_timeout)
                 
         except Exception as e:
             self.logger.error(f"Raw command execution failed: {e}")
@@ -859,11 +840,14 @@ class VLANCollector:
                     except (ValueError, IndexError):
                         continue
             
+            # Normalize the status map once instead of once per VLAN port
+            connected_interfaces = self.vlan_parser.build_connected_interface_set(interface_status)
+            
             # Update connected port counts for each VLAN
             for vlan in vlans:
                 if vlan.vlan_id in vlan_ports_map:
                     ports_str = vlan_ports_map[vlan.vlan_id]
-                    connected_count = self.vlan_parser.count_connected_ports_in_vlan(ports_str, interface_status)
+                    connected_count = self.vlan_parser.count_connected_ports_in_vlan(ports_str, connected_interfaces)
                     vlan.connected_port_count = connected_count
                     self.logger.debug(f"VLAN {vlan.vlan_id}: {connected_count} connected ports out of {vlan.port_count} total")
             
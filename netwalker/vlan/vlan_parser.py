@@ -7,10 +7,11 @@ including port and PortChannel counts.
 
 import re
 import logging
-from typing import List, Tuple, Optional, Dict
+from typing import AbstractSet, FrozenSet, List, Tuple, Optional, Dict, Union
 from datetime import datetime
 
 from netwalker.connection.data_models import VLANInfo
+from netwalker.interface_names import PHYSICAL_PORT_PATTERN, interface_match_key
 
 
 class VLANParser:
@@ -30,11 +31,8 @@ class VLANParser:
             re.MULTILINE
         )
         
-        # Pattern for port interfaces (Fa, Gi, Te, Eth, etc.)
-        self.port_pattern = re.compile(
-            r'\b(?:Fa|Gi|Te|Eth|Se|Hu)\d+/\d+(?:/\d+)?(?:\.\d+)?\b', 
-            re.IGNORECASE
-        )
+        # Pattern for port interfaces (Fa, Gi, Te, Twe, Eth, etc.)
+        self.port_pattern = PHYSICAL_PORT_PATTERN
         
         # Pattern for PortChannel interfaces
         self.portchannel_pattern = re.compile(
@@ -490,13 +488,31 @@ class VLANParser:
             self.logger.error(f"Error parsing interface status: {e}")
             return {}
     
-    def count_connected_ports_in_vlan(self, vlan_ports_str: str, interface_status: Dict[str, str]) -> int:
+    def build_connected_interface_set(self, interface_status: Dict[str, str]) -> FrozenSet[str]:
+        """
+        Normalize an interface status map once into the set of connected interfaces
+        
+        Args:
+            interface_status: Dictionary of interface statuses
+            
+        Returns:
+            Normalized names of interfaces in connected status
+        """
+        return frozenset(
+            interface_match_key(interface_name)
+            for interface_name, status in interface_status.items()
+            if status == 'connected'
+        )
+    
+    def count_connected_ports_in_vlan(self, vlan_ports_str: str,
+                                      interface_status: Union[Dict[str, str], AbstractSet[str]]) -> int:
         """
         Count how many ports in a VLAN are in connected status
         
         Args:
             vlan_ports_str: String of ports in VLAN (e.g., "Gi1/0/1, Gi1/0/2, Po1")
-            interface_status: Dictionary of interface statuses
+            interface_status: Dictionary of interface statuses, or the set from
+                build_connected_interface_set() when counting many VLANs of one device
             
         Returns:
             Count of connected ports
@@ -505,21 +521,14 @@ class VLANParser:
             return 0
         
         try:
+            if isinstance(interface_status, dict):
+                interface_status = self.build_connected_interface_set(interface_status)
+            
             # Find all physical port interfaces in the VLAN
             ports = self.port_pattern.findall(vlan_ports_str)
             
             # Count how many are connected
-            connected_count = 0
-            for port in ports:
-                # Normalize port name for matching (handle different formats)
-                normalized_port = self._normalize_interface_name(port)
-                
-                # Check if this port is in connected status
-                for interface_name, status in interface_status.items():
-                    normalized_interface = self._normalize_interface_name(interface_name)
-                    if normalized_interface == normalized_port and status == 'connected':
-                        connected_count += 1
-                        break
+            connected_count = sum(1 for port in ports if interface_match_key(port) in interface_status)
             
             self.logger.debug(f"Found {connected_count} connected ports out of {len(ports)} total ports in VLAN")
             return connected_count
@@ -538,30 +547,4 @@ class VLANParser:
         Returns:
             Normalized interface name
         """
-        # Convert to lowercase for case-insensitive matching
-        normalized = interface_name.lower().strip()
-        
-        # Expand common abbreviations to full names for matching
-        abbreviations = {
-            'gi': 'gigabitethernet',
-            'fa': 'fastethernet',
-            'te': 'tengigabitethernet',
-            'twe': 'twentyfivegige',
-            'fo': 'fortygigabitethernet',
-            'hu': 'hundredgige',
-            'eth': 'ethernet',
-            'se': 'serial',
-            'po': 'port-channel'
-        }
-        
-        # Try to match abbreviation at start of string
-        for abbr, full in abbreviations.items():
-            if normalized.startswith(abbr):
-                # Replace abbreviation with full name
-                normalized = full + normalized[len(abbr):]
-                break
-        
-        # Remove spaces and special characters for consistent matching
-        normalized = normalized.replace(' ', '').replace('_', '').replace('-', '')
-        
-        return normalized
+        return interface_match_key(interface_name)
@@ -0,0 +1,31 @@
+"""
+Shared pytest fixtures
+"""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+
+@pytest.fixture
+def db_manager():
+    """Enabled DatabaseManager on a mocked pyodbc connection"""
+    # Imported here so tests that never touch the database run without pyodbc
+    from netwalker.database.database_manager import DatabaseManager
+
+    db_manager = DatabaseManager({'enabled': True})
+    db_manager.connection = MagicMock()
+    db_manager.is_connected = Mock(return_value=True)
+    return db_manager
+
+
+@pytest.fixture
+def canned_connection():
+    """Factory for scrapli-style connections returning canned output per command"""
+    def make(outputs=None):
+        outputs = outputs or {}
+        connection = Mock(spec=['send_command', 'transport'])
+        connection.transport = Mock()
+        connection.send_command.side_effect = lambda command: Mock(result=outputs.get(command, ""))
+        return connection
+    return make
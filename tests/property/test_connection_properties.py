@@ -3,6 +3,9 @@ Property-based tests for connection management
 Feature: network-topology-discovery, Property 5: SSH Priority and Telnet Fallback
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from hypothesis import given, strategies as st
@@ -147,7 +150,7 @@ def test_netmiko_connection_termination():
         # Mock the thread executor
         with patch.object(connection_manager, '_executor') as mock_executor:
             future_mock = Mock()
-            future_mock.result.return_value = connection_instance
+            future_mock.result.return_value = (connection_instance, None)
             mock_executor.submit.return_value = future_mock
             
             # Establish connection
@@ -174,6 +177,119 @@ def test_netmiko_connection_termination():
             assert success is True, "Netmiko connection termination should return success"
 
 
+def test_netmiko_probe_output_returned():
+    """
+    Test that the connect-time 'show version' output is returned with the connection result
+    """
+    credentials = Credentials(username="testuser", password="testpass")
+    connection_manager = ConnectionManager()
+    
+    with patch('netwalker.connection.connection_manager.ConnectHandler') as mock_netmiko:
+        connection_instance = Mock()
+        connection_instance.send_command.return_value = "CORE-SWITCH-A uptime is 2 weeks"
+        connection_instance.device_type = "cisco_ios"
+        mock_netmiko.return_value = connection_instance
+        
+        connection, result = connection_manager.connect_device("10.0.0.1", credentials)
+        
+        assert result.status == ConnectionStatus.SUCCESS
+        assert result.probe_output == "CORE-SWITCH-A uptime is 2 weeks"
+        assert connection_instance.send_command.call_count == 1, "show version should run once at connect time"
+
+
+def test_late_probe_output_not_handed_to_next_connect():
+    """
+    Test that a connection finishing after its connect timed out does not leak its probe output
+    """
+    credentials = Credentials(username="testuser", password="testpass")
+    # Connect waits timeout + 10 seconds for the worker thread
+    connection_manager = ConnectionManager(timeout=-9.8)
+    late_done = threading.Event()
+    
+    def slow_then_fast(**params):
+        connection_instance = Mock()
+        connection_instance.device_type = "cisco_ios"
+        if not late_done.is_set():
+            time.sleep(0.5)
+            connection_instance.send_command.return_value = "LATE uptime is 1 day"
+            late_done.set()
+        else:
+            # Structured output is not kept as probe output
+            connection_instance.send_command.return_value = [{"hostname": "FRESH"}]
+        return connection_instance
+    
+    with patch('netwalker.connection.connection_manager.ConnectHandler', side_effect=slow_then_fast):
+        connection, result = connection_manager.connect_device("10.0.0.1", credentials)
+        assert connection is None
+        assert late_done.wait(timeout=5)
+        
+        connection, result = connection_manager.connect_device("10.0.0.1", credentials)
+        
+        assert result.status == ConnectionStatus.SUCCESS
+        assert result.probe_output is None
+
+
+def test_fast_close_hands_teardown_to_reaper():
+    """
+    Test that fast close releases the connection at once and tears it down in the background
+    """
+    connection_manager = ConnectionManager(fast_close=True)
+    
+    connection_instance = Mock()
+    connection_instance.device_type = "cisco_ios"
+    connection_instance.RETURN = "\n"
+    connection_manager._active_connections["test-host"] = connection_instance
+    
+    assert connection_manager.close_connection("test-host") is True
+    assert connection_manager.get_active_connection_count() == 0, "Connection should be released immediately"
+    assert connection_manager.wait_for_pending_closes(timeout=5) is True
+    
+    # Single non-blocking exit, no prompt-waiting exit/logout sequence
+    connection_instance.write_channel.assert_called_once_with("exit\n")
+    connection_instance.send_command.assert_not_called()
+    connection_instance.disconnect.assert_called_once()
+
+
+def test_fast_close_all_connections_waits_for_teardown():
+    """
+    Test that close_all_connections drains pending background teardowns
+    """
+    connection_manager = ConnectionManager(fast_close=True)
+    connections = []
+    for i in range(3):
+        connection_instance = Mock(spec=['send_command', 'transport', 'close'])
+        connection_manager._active_connections[f"host-{i}"] = connection_instance
+        connections.append(connection_instance)
+    
+    connection_manager.close_all_connections()
+    
+    for connection_instance in connections:
+        connection_instance.close.assert_called_once()
+        connection_instance.send_command.assert_not_called()
+    assert connection_manager._reaper_queue.unfinished_tasks == 0
+    assert connection_manager._reaper_thread is None, "Reaper should be stopped with its sentinel"
+
+
+def test_wait_for_pending_closes_times_out_on_slow_teardown():
+    """
+    Test that waiting for background teardowns honours its timeout
+    """
+    connection_manager = ConnectionManager(fast_close=True)
+    release = threading.Event()
+    connection_instance = Mock(spec=['close'])
+    connection_instance.close.side_effect = lambda: release.wait(5)
+    connection_manager._active_connections["slow-host"] = connection_instance
+    
+    assert connection_manager.close_connection("slow-host") is True
+    assert connection_manager.wait_for_pending_closes(timeout=0.2) is False
+    
+    release.set()
+    assert connection_manager.wait_for_pending_closes(timeout=5) is True
+    reaper_thread = connection_manager._reaper_thread
+    connection_manager._stop_reaper()
+    assert not reaper_thread.is_alive()
+
+
 def test_force_cleanup_connections():
     """
     Test force cleanup functionality when normal cleanup fails
@@ -311,4 +311,49 @@ def test_neighbor_collection_integration():
     
     # Should collect neighbors from both protocols
     assert isinstance(neighbors, list), "Should return list of neighbors"
-    # Note: Actual parsing depends on protocol parser implementation
\ No newline at end of file
+    # Note: Actual parsing depends on protocol parser implementation
+
+def test_probe_output_reused_for_version_information():
+    """
+    Connect-time 'show version' output is used instead of running the command again
+    """
+    collector = DeviceCollector()
+    
+    mock_connection = Mock(spec=['send_command', 'transport'])
+    mock_connection.transport = Mock()
+    mock_connection.send_command.return_value = Mock(result="")
+    
+    device_info = collector.collect_device_information(
+        connection=mock_connection,
+        host="192.168.1.1",
+        connection_method="SSH",
+        probe_output=SAMPLE_VERSION_OUTPUT
+    )
+    
+    sent_commands = [call.args[0] for call in mock_connection.send_command.call_args_list]
+    assert "show version" not in sent_commands, "show version should not be re-run"
+    assert device_info.hostname == "CORE-SWITCH-A", "Hostname should come from probe output"
+    assert device_info.serial_number == "FTX1628A1B2", "Serial should come from probe output"
+    assert collector.get_commands_saved() == 1, "Saved command should be counted"
+
+
+def test_panos_ignores_probe_output():
+    """
+    PAN-OS devices still run 'show system info' since the probe is an IOS command
+    """
+    collector = DeviceCollector()
+    
+    mock_connection = Mock()
+    mock_connection.device_type = 'paloalto_panos'
+    mock_connection.send_command.return_value = "hostname: FW-01\nmodel: PA-3220\nserial: 0123456789"
+    
+    collector.collect_device_information(
+        connection=mock_connection,
+        host="192.168.1.254",
+        connection_method="SSH",
+        probe_output="Invalid syntax."
+    )
+    
+    sent_commands = [call.args[0] for call in mock_connection.send_command.call_args_list]
+    assert "show system info" in sent_commands, "PAN-OS should query system info"
+    assert collector.get_commands_saved() == 0, "No command should be counted as saved"
@@ -12,7 +12,7 @@ from datetime import datetime
 from netwalker.discovery.site_device_walker import SiteDeviceWalker, SiteWalkResult
 from netwalker.discovery.discovery_engine import DiscoveryNode
 from netwalker.discovery.site_association_validator import SiteAssociationValidator
-from netwalker.connection.data_models import ConnectionResult, ConnectionMethod, ConnectionStatus
+from netwalker.connection.data_models import ConnectionResult, ConnectionMethod, ConnectionStatus, DeviceInfo
 
 
 class TestSiteDeviceWalkerProperties:
@@ -52,28 +52,33 @@ class TestSiteDeviceWalkerProperties:
         
         return mock_manager
     
+    def create_device_info(self, host: str, neighbors) -> DeviceInfo:
+        """Create the DeviceInfo a successful collection returns"""
+        return DeviceInfo(
+            hostname=host, primary_ip=host, platform='IOS', capabilities=['Switch'],
+            software_version='16.12.4', vtp_version=None, serial_number='FOC1234X0AB',
+            hardware_model='C3850', uptime='2 weeks', discovery_timestamp=datetime.now(),
+            discovery_depth=0, is_seed=False, connection_method='SSH',
+            connection_status='success', error_details=None, neighbors=neighbors
+        )
+    
     def create_mock_device_collector(self, neighbors_per_device: int = 3):
         """Create a mock device collector that returns device info with neighbors"""
         mock_collector = Mock()
         
-        def mock_collect_info(connection, hostname, ip_address):
+        def mock_collect_info(connection, host, connection_method, discovery_depth=0,
+                              is_seed=False, probe_output=None):
             # Create mock neighbors
             neighbors = []
             for i in range(neighbors_per_device):
                 neighbor = Mock()
-                neighbor.hostname = f"{hostname}-NEIGHBOR-{i+1:02d}"
+                neighbor.hostname = f"{host}-NEIGHBOR-{i+1:02d}"
                 neighbor.ip_address = f"192.168.{i+1}.{i+1}"
                 neighbors.append(neighbor)
             
-            return {
-                'hostname': hostname,
-                'ip_address': ip_address,
-                'device_type': 'switch',
-                'neighbors': neighbors,
-                'interfaces': ['GigabitEthernet0/1', 'GigabitEthernet0/2']
-            }
-        
-        mock_collector.collect_device_info.side_effect = mock_collect_info
+            return self.create_device_info(host, neighbors)
+        
+        mock_collector.collect_device_information.side_effect = mock_collect_info
         return mock_collector
     
     def create_discovery_node(self, hostname: str, ip_address: str, depth: int = 0) -> DiscoveryNode:
@@ -146,8 +151,8 @@ class TestSiteDeviceWalkerProperties:
             f"Connection manager should be called {device_count} times, was called {connection_manager.connect_device.call_count} times"
         
         # Property: Device collector should be called for each successful connection
-        assert device_collector.collect_device_info.call_count == device_count, \
-            f"Device collector should be called {device_count} times, was called {device_collector.collect_device_info.call_count} times"
+        assert device_collector.collect_device_information.call_count == device_count, \
+            f"Device collector should be called {device_count} times, was called {device_collector.collect_device_information.call_count} times"
     
     @given(
         site_name=st.text(min_size=3, max_size=10, alphabet=st.characters(min_codepoint=65, max_codepoint=90)),
@@ -176,7 +181,8 @@ class TestSiteDeviceWalkerProperties:
         # Create a custom device collector that generates neighbors with site-specific names
         mock_collector = Mock()
         
-        def mock_collect_info(connection, hostname, ip_address):
+        def mock_collect_info(connection, host, connection_method, discovery_depth=0,
+                              is_seed=False, probe_output=None):
             # The mock should return neighbors based on the current device being walked
             # For this test, we'll use a fixed number of neighbors per device
             neighbors_per_device = 2  # Fixed for simplicity
@@ -196,14 +202,9 @@ class TestSiteDeviceWalkerProperties:
                 neighbor.ip_address = f"192.168.1.{i + 10}"
                 neighbors.append(neighbor)
             
-            return {
-                'hostname': hostname,
-                'ip_address': ip_address,
-                'device_type': 'switch',
-                'neighbors': neighbors
-            }
-        
-        mock_collector.collect_device_info.side_effect = mock_collect_info
+            return self.create_device_info(host, neighbors)
+        
+        mock_collector.collect_device_information.side_effect = mock_collect_info
         
         walker = SiteDeviceWalker(connection_manager, mock_collector, site_validator)
         
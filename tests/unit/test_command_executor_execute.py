@@ -66,7 +66,8 @@ class TestExecuteMethod:
 
         # Mock Excel exporter
         mock_exporter = Mock()
-        mock_exporter.export.return_value = 'Command_Results_20260209-19-15.xlsx'
+        mock_writer = mock_exporter.open_stream.return_value
+        mock_writer.close.return_value = 'Command_Results_20260209-19-15.xlsx'
         mock_exporter_class.return_value = mock_exporter
 
         # Create executor
@@ -109,10 +110,12 @@ class TestExecuteMethod:
         assert mock_progress_reporter.report_failure.call_count == 1
         assert mock_progress_reporter.report_summary.called
 
-        # Verify Excel export was called
-        assert mock_exporter.export.called
-        export_args = mock_exporter.export.call_args
-        assert len(export_args[0][0]) == 3  # 3 results
+        # Verify results were streamed to the Excel export in device order
+        assert mock_exporter.open_stream.called
+        assert [call[0] for call in mock_writer.write.call_args_list] == [
+            (test_results[0], 0), (test_results[1], 1), (test_results[2], 2)
+        ]
+        assert mock_writer.close.called
 
     @patch('netwalker.executor.command_executor.CredentialManager')
     @patch('os.path.exists')
@@ -0,0 +1,199 @@
+"""
+Unit tests for parallel command execution
+
+Tests worker threads, per-device timeouts, login rate limiting and streaming
+results to Excel in device order.
+
+Author: Mark Oldham
+"""
+
+import random
+import threading
+import time
+from unittest.mock import Mock
+
+from openpyxl import load_workbook
+
+from netwalker.config.credentials import Credentials
+from netwalker.executor.command_executor import CommandExecutor
+from netwalker.executor.data_models import CommandResult, DeviceInfo
+from netwalker.executor.excel_exporter import CommandResultExporter
+from netwalker.executor.rate_limiter import LoginRateLimiter
+
+
+def make_executor(tmp_path, devices, executor_config, max_workers=None):
+    """CommandExecutor with configuration, credentials and database mocked out"""
+    executor = CommandExecutor(
+        config_file='netwalker.ini',
+        device_filter='%',
+        command='show version',
+        output_dir=str(tmp_path),
+        max_workers=max_workers
+    )
+    executor._load_configuration = Mock(return_value={
+        'database': {},
+        'connection': {},
+        'command_executor': dict({'connection_timeout': 30}, **executor_config)
+    })
+    executor._get_credentials = Mock(return_value=Credentials('testuser', 'testpass'))
+    executor._initialize_database = Mock(return_value=True)
+    executor._filter_devices = Mock(return_value=devices)
+    return executor
+
+
+def device_rows(output_file):
+    """Device name column of the exported worksheet"""
+    worksheet = load_workbook(output_file)['Command Results']
+    return [row[0] for row in worksheet.iter_rows(min_row=2, values_only=True)]
+
+
+class TestParallelExecution:
+    """Test CommandExecutor with several workers"""
+
+    def test_parallel_results_exported_in_device_order(self, tmp_path, capsys):
+        devices = [DeviceInfo(f"SW{i:02d}", f"10.1.1.{i}") for i in range(20)]
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def execute_on_device(device):
+            with lock:
+                running.append(device)
+                peak.append(len(running))
+            time.sleep(random.uniform(0.001, 0.02))
+            with lock:
+                running.remove(device)
+            status = 'Failed' if device.device_name.endswith('7') else 'Success'
+            return CommandResult(device.device_name, device.ip_address, status, 'output', 0.01)
+
+        executor = make_executor(tmp_path, devices, {'max_workers': 1}, max_workers=5)
+        executor._execute_on_device = Mock(side_effect=execute_on_device)
+
+        summary = executor.execute()
+
+        assert (summary.total_devices, summary.successful, summary.failed) == (20, 18, 2)
+        assert 1 < max(peak) <= 5
+        assert device_rows(summary.output_file) == [device.device_name for device in devices]
+        assert '(20/20 done)' in capsys.readouterr().out
+
+    def test_device_timeout_reported_without_waiting(self, tmp_path):
+        devices = [DeviceInfo('SW01', '10.1.1.1'), DeviceInfo('HUNG', '10.1.1.2'), DeviceInfo('SW03', '10.1.1.3')]
+        release = threading.Event()
+
+        def execute_on_device(device):
+            if device.device_name == 'HUNG':
+                release.wait(10)
+            return CommandResult(device.device_name, device.ip_address, 'Success', 'output', 0.01)
+
+        executor = make_executor(tmp_path, devices, {'max_workers': 3, 'device_timeout': 1})
+        executor._execute_on_device = Mock(side_effect=execute_on_device)
+
+        start_time = time.time()
+        summary = executor.execute()
+        release.set()
+
+        assert time.time() - start_time < 5
+        assert (summary.successful, summary.failed) == (2, 1)
+        worksheet = load_workbook(summary.output_file)['Command Results']
+        statuses = {row[0]: row[2] for row in worksheet.iter_rows(min_row=2, values_only=True)}
+        assert statuses == {'SW01': 'Success', 'HUNG': 'Timeout', 'SW03': 'Success'}
+
+    def test_hung_devices_do_not_hold_worker_slots(self, tmp_path):
+        devices = [DeviceInfo('HUNG1', '10.1.1.1'), DeviceInfo('HUNG2', '10.1.1.2'),
+                   DeviceInfo('SW03', '10.1.1.3'), DeviceInfo('SW04', '10.1.1.4')]
+        release = threading.Event()
+        finished = {}
+
+        def execute_on_device(device):
+            if device.device_name.startswith('HUNG'):
+                release.wait(10)
+            finished[device.device_name] = time.time()
+            return CommandResult(device.device_name, device.ip_address, 'Success', 'output', 0.01)
+
+        executor = make_executor(tmp_path, devices, {'max_workers': 1, 'device_timeout': 1})
+        executor._execute_on_device = Mock(side_effect=execute_on_device)
+
+        start_time = time.time()
+        summary = executor.execute()
+        elapsed = time.time() - start_time
+        release.set()
+
+        # Each hung device gives its slot up after device_timeout, not when it returns
+        assert elapsed < 5
+        assert finished['SW04'] - start_time < 4
+        worksheet = load_workbook(summary.output_file)['Command Results']
+        statuses = {row[0]: row[2] for row in worksheet.iter_rows(min_row=2, values_only=True)}
+        assert statuses == {'HUNG1': 'Timeout', 'HUNG2': 'Timeout', 'SW03': 'Success', 'SW04': 'Success'}
+
+    def test_timed_out_connection_closed_off_consumer_thread(self, tmp_path):
+        devices = [DeviceInfo('HUNG', '10.1.1.1'), DeviceInfo('SW02', '10.1.1.2')]
+        release = threading.Event()
+        close_threads = []
+
+        def execute_on_device(device):
+            if device.device_name == 'HUNG':
+                release.wait(10)
+            return CommandResult(device.device_name, device.ip_address, 'Success', 'output', 0.01)
+
+        def close_connection(host):
+            close_threads.append(threading.current_thread())
+            time.sleep(3)
+
+        executor = make_executor(tmp_path, devices, {'max_workers': 1, 'device_timeout': 1})
+        executor._execute_on_device = Mock(side_effect=execute_on_device)
+        executor.connection_manager = Mock()
+        executor.connection_manager.close_connection.side_effect = close_connection
+
+        start_time = time.time()
+        executor.execute()
+        elapsed = time.time() - start_time
+        release.set()
+
+        assert elapsed < 3.5
+        assert close_threads and close_threads[0] is not threading.current_thread()
+
+
+class TestLoginRateLimiter:
+    """Test login spacing across threads"""
+
+    def test_logins_spaced_across_threads(self):
+        limiter = LoginRateLimiter(50)
+        login_times = []
+        lock = threading.Lock()
+
+        def login():
+            limiter.wait()
+            with lock:
+                login_times.append(time.monotonic())
+
+        threads = [threading.Thread(target=login) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        login_times.sort()
+        assert login_times[-1] - login_times[0] >= 9 * 0.02 * 0.9
+        assert limiter.total_wait > 0
+
+    def test_zero_rate_disables_limiting(self):
+        limiter = LoginRateLimiter(0)
+
+        assert limiter.wait() == 0.0
+        assert limiter.total_wait == 0.0
+
+
+class TestStreamingExport:
+    """Test CommandResultWriter"""
+
+    def test_out_of_order_writes_saved_in_position_order(self, tmp_path):
+        writer = CommandResultExporter(str(tmp_path)).open_stream('show version')
+        for position in (2, 0, 1):
+            writer.write(CommandResult(f"SW0{position}", f"10.1.1.{position}", 'Success',
+                                       'line one\n' + 'x' * (40 + position), 1.0), position)
+
+        output_file = writer.close()
+
+        assert device_rows(output_file) == ['SW00', 'SW01', 'SW02']
+        worksheet = load_workbook(output_file)['Command Results']
+        assert worksheet.column_dimensions['D'].width == 44
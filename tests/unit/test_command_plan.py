@@ -0,0 +1,158 @@
+"""
+Unit tests for per-platform command plans and the shared command session
+"""
+
+from unittest.mock import Mock
+
+from netwalker.connection.command_plan import (
+    CommandPlan, CommandSession, KNOWN_COMMANDS, PLATFORM_COMMANDS
+)
+from netwalker.discovery.device_collector import DeviceCollector
+from netwalker.vlan.platform_handler import PlatformHandler
+from netwalker.vlan.vlan_collector import VLANCollector
+
+
+NXOS_VERSION = """Cisco Nexus Operating System (NX-OS) Software
+  NXOS: version 9.3(8)
+CORE-NX01 uptime is 120 day(s), 3 hour(s)
+"""
+
+IOS_VERSION = """Cisco IOS Software, C3850 Software, Version 16.12.4
+ACCESS-SW01 uptime is 2 weeks, 1 day
+Processor board ID FOC1234X0AB
+"""
+
+VLAN_BRIEF = """VLAN Name                             Status    Ports
+---- -------------------------------- --------- -------------------------------
+1    default                          active    Gi1/0/1
+"""
+
+
+def sent_commands(connection):
+    return [call.args[0] for call in connection.send_command.call_args_list]
+
+
+class TestCommandPlan:
+    """Test plan construction and skip rules"""
+
+    def test_vtp_skipped_on_nxos(self):
+        plan = CommandPlan.for_platform('NX-OS')
+
+        assert not plan.applies('show vtp status')
+        assert plan.applies('show vlan')
+        assert plan.applies('show module 1'), "Commands built at run time always run"
+
+    def test_disabled_protocol_dropped(self):
+        plan = CommandPlan.for_platform('IOS', protocols=['CDP'])
+
+        assert plan.applies('show cdp neighbors detail')
+        assert not plan.applies('show lldp neighbors detail')
+
+    def test_unknown_platform_runs_everything(self):
+        plan = CommandPlan.for_platform('Unknown')
+
+        assert plan.commands == KNOWN_COMMANDS
+        assert not plan.skipped
+
+    def test_duplicates_dropped(self):
+        plan = CommandPlan('IOS', ['show version', 'show switch', 'show version'])
+
+        assert plan.commands == ('show version', 'show switch')
+
+    def test_vlan_commands_planned(self):
+        handler = PlatformHandler()
+
+        for platform in handler.supported_platforms:
+            for command in handler.get_vlan_commands(platform) + handler.get_interface_status_commands(platform):
+                assert command in PLATFORM_COMMANDS[platform], f"{command} missing from {platform} plan"
+
+
+class TestCommandSession:
+    """Test memoization, skipping and timing"""
+
+    def test_command_runs_once(self, canned_connection):
+        connection = canned_connection({'show inventory': 'NAME: "Switch 1"'})
+        session = CommandSession(connection, CommandPlan.for_platform('IOS'), 'access-sw01')
+
+        assert session.run('show inventory') == 'NAME: "Switch 1"'
+        assert session.run('show inventory') == 'NAME: "Switch 1"'
+
+        assert sent_commands(connection) == ['show inventory']
+        assert session.get_stats()['commands_reused'] == 1
+        assert list(session.get_timings()) == ['show inventory']
+
+    def test_failed_command_not_stored(self, canned_connection):
+        connection = canned_connection()
+        connection.send_command.side_effect = [TimeoutError("read timeout"), Mock(result="ok")]
+        session = CommandSession(connection, CommandPlan.for_platform('IOS'))
+
+        try:
+            session.run('show vlan brief')
+        except TimeoutError:
+            pass
+        assert session.run('show vlan brief') == "ok"
+
+    def test_empty_output_not_stored(self, canned_connection):
+        connection = canned_connection()
+        connection.send_command.side_effect = [Mock(result=""), Mock(result="  \n"), Mock(result="VLAN Name")]
+        session = CommandSession(connection, CommandPlan.for_platform('IOS'))
+
+        assert session.run('show vlan brief') == ""
+        assert session.run('show vlan brief') == "  \n"
+        assert session.run('show vlan brief') == "VLAN Name"
+        assert session.run('show vlan brief') == "VLAN Name"
+        assert sent_commands(connection) == ['show vlan brief'] * 3
+
+    def test_vlan_retry_after_empty_output_reaches_device(self, canned_connection):
+        connection = canned_connection()
+        connection.send_command.side_effect = [Mock(result=""), Mock(result="1    default    active")]
+        session = CommandSession(connection, CommandPlan.for_platform('IOS'))
+        collector = VLANCollector({'vlan_collection': {'max_retries': 1}})
+        collector.active_collections['c1'] = {}
+
+        output = collector._execute_vlan_commands_with_timeout(session, ['show vlan brief'], Mock(hostname='SW01'), 'c1')
+
+        assert output == "1    default    active"
+        assert sent_commands(connection) == ['show vlan brief', 'show vlan brief']
+
+    def test_skipped_command_not_sent(self, canned_connection):
+        connection = canned_connection()
+        session = CommandSession(connection, CommandPlan.for_platform('NX-OS'))
+
+        assert session.run('show vtp status') is None
+        assert sent_commands(connection) == []
+        assert session.get_stats()['commands_skipped'] == 1
+
+
+class TestDeviceCollectorCommandPlan:
+    """Test that device collection goes through one session per device"""
+
+    def test_nxos_collection_skips_vtp(self, canned_connection):
+        connection = canned_connection({'show version': NXOS_VERSION})
+        collector = DeviceCollector()
+
+        device_info = collector.collect_device_information(connection, 'CORE-NX01', 'SSH')
+
+        assert device_info.platform == 'NX-OS'
+        assert 'show vtp status' not in sent_commands(connection)
+        assert 'show version' in device_info.command_timings
+        assert collector.get_command_stats()['commands_skipped'] >= 1
+
+    def test_no_command_sent_twice(self, canned_connection):
+        # Empty outputs are retried, so give every command that is looked up twice some output
+        connection = canned_connection({'show version': IOS_VERSION, 'show vlan brief': VLAN_BRIEF})
+        collector = DeviceCollector({'vlan_collection': {'enabled': True}})
+
+        collector.collect_device_information(connection, 'ACCESS-SW01', 'SSH')
+
+        commands = sent_commands(connection)
+        assert len(commands) == len(set(commands)), f"Duplicate commands sent: {commands}"
+
+    def test_lldp_not_run_when_disabled(self, canned_connection):
+        connection = canned_connection({'show version': IOS_VERSION})
+        collector = DeviceCollector({'discovery_protocols': ['CDP']})
+
+        collector.collect_device_information(connection, 'ACCESS-SW01', 'SSH')
+
+        assert 'show cdp neighbors detail' in sent_commands(connection)
+        assert 'show lldp neighbors detail' not in sent_commands(connection)
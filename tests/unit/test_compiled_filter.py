@@ -0,0 +1,111 @@
+"""
+Unit tests for the compiled FilterManager criteria and verdict cache
+"""
+
+import fnmatch
+import ipaddress
+
+import pytest
+
+from netwalker.filtering.filter_manager import CompiledFilterCriteria, FilterCriteria, FilterManager
+
+
+CONFIG = {
+    'hostname_excludes': ['LUMT*', 'lumv*', '*-AP-??', 'SEP[0-9]*'],
+    'ip_excludes': ['10.70.0.0/16', '10.70.4.0/24', '10.71.0.0/16', '192.168.1.7/32', '2001:db8::/32', 'bogus'],
+    'platform_excludes': ['linux', 'Windows', 'cisco ip phone'],
+    'capability_excludes': ['phone', 'Host'],
+}
+
+
+def reference_verdict(hostname, ip_address, platform=None, capabilities=None):
+    """Straightforward per-call evaluation the compiled criteria must agree with"""
+    if any(fnmatch.fnmatch(hostname.lower(), p.lower()) for p in CONFIG['hostname_excludes']):
+        return True
+    try:
+        ip = ipaddress.ip_address(ip_address)
+        for cidr in CONFIG['ip_excludes']:
+            try:
+                if ip in ipaddress.ip_network(cidr, strict=False):
+                    return True
+            except ValueError:
+                continue
+    except ValueError:
+        pass
+    if platform and any(p.lower() in platform.lower() for p in CONFIG['platform_excludes']):
+        return True
+    if capabilities:
+        caps = [c.lower().strip() for c in capabilities]
+        matched = any(e.lower() == word for c in caps for e in CONFIG['capability_excludes'] for word in c.split())
+        if matched and not {'router', 'switch'} & set(caps):
+            return True
+    return False
+
+
+CASES = [
+    ('LUMT-SW01', '10.1.1.1', None, None),
+    ('lumv99', '10.1.1.1', None, None),
+    ('BLD1-AP-07', '10.1.1.1', None, None),
+    ('BLD1-AP-107', '10.1.1.1', None, None),
+    ('SEP0011223344', '10.1.1.1', None, None),
+    ('SEPARATE-SW', '10.1.1.1', None, None),
+    ('CORE-SW01', '10.70.4.10', None, None),
+    ('CORE-SW01', '10.70.255.255', None, None),
+    ('CORE-SW01', '10.72.0.1', None, None),
+    ('CORE-SW01', '10.69.255.255', None, None),
+    ('CORE-SW01', '192.168.1.7', None, None),
+    ('CORE-SW01', '192.168.1.8', None, None),
+    ('CORE-SW01', '2001:db8::1', None, None),
+    ('CORE-SW01', 'core-sw01.example.com', None, None),
+    ('SRV01', '10.1.1.1', 'Linux x86_64', None),
+    ('PHONE1', '10.1.1.1', 'Cisco IP Phone 8845', None),
+    ('PHONE1', '10.1.1.1', 'cisco WS-C3850', ['Phone']),
+    ('ACCESS-SW', '10.1.1.1', 'cisco WS-C3850', ['Switch', 'IGMP', 'Phone']),
+    ('PORTDEV', '10.1.1.1', 'cisco WS-C3850', ['Phone Port']),
+    ('HOST1', '10.1.1.1', 'cisco', [' host ']),
+]
+
+
+class TestCompiledFilterCriteria:
+    """Test that the compiled criteria reproduce the per-pattern checks"""
+
+    @pytest.mark.parametrize('hostname, ip_address, platform, capabilities', CASES)
+    def test_matches_reference(self, hostname, ip_address, platform, capabilities):
+        filter_manager = FilterManager(CONFIG)
+
+        assert filter_manager.should_filter_device(hostname, ip_address, platform, capabilities) == \
+            reference_verdict(hostname, ip_address, platform, capabilities)
+
+    def test_overlapping_ranges_merged(self):
+        compiled = CompiledFilterCriteria(FilterCriteria([], CONFIG['ip_excludes'], [], []))
+
+        starts, ends = compiled.ip_intervals[4]
+        assert len(starts) == 2  # 10.70.0.0/15 after merging, plus the /32
+        assert compiled.matches_ip('10.71.200.1') and not compiled.matches_ip('10.72.0.0')
+
+    def test_empty_criteria_filter_nothing(self):
+        filter_manager = FilterManager({})
+
+        assert not filter_manager.should_filter_device('LUMT-SW01', '10.70.0.1', 'linux', ['Host'])
+
+
+class TestVerdictCache:
+    """Test caching of filter verdicts"""
+
+    def test_repeated_decisions_served_from_cache(self):
+        filter_manager = FilterManager(CONFIG)
+
+        for _ in range(3):
+            assert filter_manager.should_filter_device('LUMT-SW01', '10.1.1.1', None, ['Switch'])
+            assert not filter_manager.should_filter_device('CORE-SW01', '10.1.1.1', None, ['Switch'])
+
+        stats = filter_manager.get_filter_stats()
+        assert (stats['verdict_cache_misses'], stats['verdict_cache_hits']) == (2, 4)
+        # Filtered devices are still recorded on cached verdicts
+        assert filter_manager.get_filtered_devices() == {'LUMT-SW01:10.1.1.1'}
+
+    def test_capabilities_part_of_key(self):
+        filter_manager = FilterManager(CONFIG)
+
+        assert filter_manager.should_filter_device('DEV1', '10.1.1.1', None, ['Phone'])
+        assert not filter_manager.should_filter_device('DEV1', '10.1.1.1', None, ['Phone', 'Switch'])
@@ -0,0 +1,172 @@
+"""Unit tests for concurrent DiscoveryEngine discovery"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from netwalker.connection.connection_manager import ConnectionManager
+from netwalker.connection.data_models import NeighborInfo
+from netwalker.discovery.discovery_engine import DiscoveryEngine, DiscoveryResult
+from netwalker.discovery.thread_manager import ThreadManager, ThreadTask
+from netwalker.filtering.filter_manager import FilterManager
+
+
+# Small tree: root -> a, b, c; a -> a1, a2; b -> b1; c -> (root, a) back-links
+TOPOLOGY = {
+    'root': ['a', 'b', 'c'],
+    'a': ['a1', 'a2', 'root'],
+    'b': ['b1', 'root'],
+    'c': ['root', 'a'],
+    'a1': [], 'a2': [], 'b1': [],
+}
+IPS = {name: f"10.0.0.{i + 1}" for i, name in enumerate(TOPOLOGY)}
+
+
+def make_engine(concurrent: bool, max_depth: int = 5, workers: int = 4, delay: float = 0.0):
+    """Create an engine whose _connect_and_discover walks TOPOLOGY"""
+    connection_manager = Mock(spec=ConnectionManager)
+    connection_manager.get_active_connection_count.return_value = 0
+    filter_manager = Mock(spec=FilterManager)
+    filter_manager.should_filter_device.return_value = False
+    filter_manager.get_filter_stats.return_value = {}
+
+    config = {
+        'max_discovery_depth': max_depth,
+        'discovery_timeout_seconds': 60,
+        'concurrent_discovery': concurrent,
+        'max_concurrent_connections': workers,
+        'enable_progress_tracking': False,
+    }
+    engine = DiscoveryEngine(connection_manager, filter_manager, config, Mock())
+
+    state = {'active': 0, 'peak': 0, 'threads': set()}
+    lock = threading.Lock()
+
+    def fake_connect(node, db_lookup=True):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['threads'].add(threading.current_thread().name)
+        time.sleep(delay)
+        with lock:
+            state['active'] -= 1
+        neighbors = [
+            NeighborInfo(device_id=name, local_interface='Gi1/0/1', remote_interface='Gi1/0/2',
+                         platform='cisco WS-C3850', capabilities=['Switch'], ip_address=IPS[name])
+            for name in TOPOLOGY[node.hostname]
+        ]
+        return DiscoveryResult(
+            hostname=node.hostname, ip_address=node.ip_address,
+            device_info={'hostname': node.hostname, 'platform': 'IOS', 'capabilities': ['Switch'],
+                         'discovery_depth': node.depth},
+            neighbors=neighbors, success=True
+        )
+
+    engine._connect_and_discover = fake_connect
+    engine.add_seed_device('root', IPS['root'])
+    return engine, state
+
+
+class TestConcurrentDiscovery:
+    """Test concurrent breadth-first discovery"""
+
+    def test_matches_serial_inventory(self):
+        """Concurrent and serial discovery find the same devices and statuses"""
+        serial_engine, _ = make_engine(concurrent=False)
+        serial_engine.discover_topology()
+        concurrent_engine, _ = make_engine(concurrent=True)
+        concurrent_engine.discover_topology()
+
+        serial_devices = serial_engine.get_inventory().get_all_devices()
+        concurrent_devices = concurrent_engine.get_inventory().get_all_devices()
+        assert list(concurrent_devices) == list(serial_devices)
+        assert concurrent_engine.get_discovered_devices() == serial_engine.get_discovered_devices()
+        assert len(concurrent_devices) == len(TOPOLOGY)
+
+    def test_walks_devices_in_parallel(self):
+        """Devices at the same depth are connected to at the same time"""
+        engine, state = make_engine(concurrent=True, workers=4, delay=0.05)
+        engine.discover_topology()
+
+        assert state['peak'] > 1
+        assert all(name.startswith('NetWalker-Worker') for name in state['threads'])
+
+    def test_depth_limit_enforced(self):
+        """Neighbors beyond max depth are recorded as skipped, not walked"""
+        engine, _ = make_engine(concurrent=True, max_depth=1)
+        results = engine.discover_topology()
+
+        inventory = engine.get_inventory()
+        assert engine.get_discovered_devices() == {
+            f"{name}:{IPS[name]}" for name in ('root', 'a', 'b', 'c')
+        }
+        assert inventory.get_device_status(f"a1:{IPS['a1']}") == 'skipped'
+        assert results['devices_in_queue'] == 0
+
+    def test_shared_connection_target_not_walked_twice_at_once(self):
+        """Nodes sharing an IP are split across batches"""
+        engine, _ = make_engine(concurrent=True)
+        engine.discovery_queue.clear()
+        engine.add_seed_device('a1', '10.9.9.9')
+        engine.add_seed_device('b1', '10.9.9.9')
+        engine.add_seed_device('a2', '10.9.9.10')
+
+        first_level = engine._next_discovery_level()
+
+        assert [node.hostname for node in first_level] == ['a1', 'a2']
+        assert [node.hostname for node in engine.discovery_queue] == ['b1']
+
+    def test_timeout_leaves_unstarted_devices_queued(self):
+        """Devices not started before the timeout stay in the queue"""
+        engine, _ = make_engine(concurrent=True)
+        engine.discovery_start_time = time.time() - 120
+        node = engine.discovery_queue[0]
+
+        assert engine._connect_and_discover_before_timeout(node) is None
+
+
+class TestThreadManagerRunTasks:
+    """Test ThreadManager batch execution"""
+
+    def test_results_in_submission_order(self):
+        """Results come back in submission order regardless of completion order"""
+        manager = ThreadManager({'max_concurrent_connections': 4})
+
+        def work(value, delay):
+            time.sleep(delay)
+            return value
+
+        tasks = [
+            ThreadTask(task_id=f"t{i}", hostname=f"h{i}", ip_address='', task_function=work,
+                       task_args=(i, 0.04 - i * 0.01), task_kwargs={})
+            for i in range(4)
+        ]
+        try:
+            results = manager.run_tasks(tasks)
+        finally:
+            manager.stop()
+
+        assert [r.result for r in results] == [0, 1, 2, 3]
+        assert manager.result_queue.empty()
+
+    def test_failed_task_isolated(self):
+        """A failing task does not affect the rest of the batch"""
+        manager = ThreadManager({'max_concurrent_connections': 2})
+
+        def work(value):
+            if value == 1:
+                raise ValueError("boom")
+            return value
+
+        tasks = [
+            ThreadTask(task_id=f"t{i}", hostname=f"h{i}", ip_address='', task_function=work,
+                       task_args=(i,), task_kwargs={})
+            for i in range(3)
+        ]
+        try:
+            results = manager.run_tasks(tasks)
+        finally:
+            manager.stop()
+
+        assert [r.success for r in results] == [True, False, True]
+        assert 'boom' in results[1].error
@@ -0,0 +1,112 @@
+"""
+Unit tests for batched device persistence in DatabaseManager
+"""
+
+from unittest.mock import Mock
+
+import pyodbc
+import pytest
+
+from netwalker.connection.data_models import NeighborInfo, VLANInfo
+
+
+def make_device_info() -> dict:
+    return {
+        'hostname': 'test-switch',
+        'primary_ip': '192.168.1.1',
+        'serial_number': 'ABC123',
+        'platform': 'IOS',
+        'software_version': '15.2',
+        'interfaces': [],
+        'vlans': [
+            VLANInfo(vlan_id=10, vlan_name='DATA', port_count=12, portchannel_count=0,
+                     connected_port_count=8, device_hostname='test-switch', device_ip='192.168.1.1'),
+            {'vlan_id': 20, 'vlan_name': 'VOICE', 'port_count': 4},
+            {'vlan_id': 5000, 'vlan_name': 'INVALID', 'port_count': 0},
+        ],
+        'stack_members': [],
+        'neighbors': [
+            NeighborInfo(device_id='core-a', local_interface='Gi1/0/1', remote_interface='Te1/1/1',
+                         platform='cisco WS-C9500', capabilities=['Router'])
+        ],
+    }
+
+
+class TestBatchedProcessDeviceDiscovery:
+    """Unit tests for the single-transaction discovery write path"""
+
+    @pytest.fixture(autouse=True)
+    def batch_writes(self, db_manager):
+        db_manager.batch_writes = True
+
+    def test_batched_path_commits_once(self, db_manager):
+        """All device data is written in one transaction"""
+        db_manager._upsert_device_row = Mock(return_value=(7, True))
+        db_manager.resolve_neighbor_device_ids = Mock(return_value={'core-a': 3})
+
+        success, is_new = db_manager.process_device_discovery(make_device_info())
+
+        assert (success, is_new) == (True, True)
+        assert db_manager.connection.commit.call_count == 1
+        db_manager.connection.rollback.assert_not_called()
+
+    def test_sets_staged_with_fast_executemany(self, db_manager):
+        """VLAN and neighbor sets are bulk loaded rather than written row by row"""
+        db_manager._upsert_device_row = Mock(return_value=(7, False))
+        db_manager.resolve_neighbor_device_ids = Mock(return_value={'core-a': 3})
+        cursor = db_manager.connection.cursor.return_value
+
+        db_manager.process_device_discovery(make_device_info())
+
+        assert cursor.fast_executemany is True
+        staged = {call.args[0].split()[2]: call.args[1] for call in cursor.executemany.call_args_list}
+        assert staged['#nw_stage_vlans'] == [(10, 'DATA', 12), (20, 'VOICE', 4)], "Invalid VLAN should be dropped"
+        assert staged['#nw_stage_interfaces'] == [('Primary Management', '192.168.1.1', '', 'management')]
+        # Lower device_id becomes the source of the stored link
+        assert staged['#nw_stage_neighbors'][0][4:] == (3, 'TenGigabitEthernet1/1/1', 7, 'GigabitEthernet1/0/1')
+
+    def test_failure_rolls_back_whole_device(self, db_manager):
+        """An error part way through leaves nothing committed"""
+        db_manager._upsert_device_row = Mock(return_value=(7, False))
+        db_manager.resolve_neighbor_device_ids = Mock(return_value={'core-a': 3})
+        db_manager._merge_device_vlans = Mock(side_effect=RuntimeError("deadlock"))
+
+        success, is_new = db_manager.process_device_discovery(make_device_info())
+
+        assert (success, is_new) == (False, False)
+        db_manager.connection.commit.assert_not_called()
+        db_manager.connection.rollback.assert_called_once()
+
+    def test_failed_section_keeps_device_row(self, db_manager):
+        """A child MERGE that fails is rolled back to its savepoint and the device is committed"""
+        db_manager._upsert_device_row = Mock(return_value=(7, False))
+        db_manager.resolve_neighbor_device_ids = Mock(return_value={'core-a': 3})
+        db_manager._merge_device_vlans = Mock(side_effect=pyodbc.Error("String or binary data would be truncated"))
+        cursor = db_manager.connection.cursor.return_value
+
+        success, _ = db_manager.process_device_discovery(make_device_info())
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        assert success is True
+        assert 'ROLLBACK TRANSACTION nw_vlans' in statements
+        assert not any(statement.startswith('ROLLBACK') and statement != 'ROLLBACK TRANSACTION nw_vlans'
+                       for statement in statements)
+        assert '#nw_stage_neighbors' in [call.args[0].split()[2] for call in cursor.executemany.call_args_list]
+        db_manager.connection.commit.assert_called_once()
+        db_manager.connection.rollback.assert_not_called()
+
+    def test_per_row_path_when_disabled(self, db_manager):
+        """batch_writes = false keeps the original per-row upserts"""
+        db_manager.batch_writes = False
+        db_manager.upsert_device = Mock(return_value=(7, False))
+        db_manager.upsert_device_version = Mock(return_value=True)
+        db_manager.upsert_device_interface = Mock(return_value=True)
+        db_manager.upsert_device_vlan = Mock(return_value=True)
+        db_manager.upsert_device_neighbors = Mock(return_value=1)
+        db_manager._process_device_discovery_batched = Mock()
+
+        success, _ = db_manager.process_device_discovery(make_device_info())
+
+        assert success is True
+        assert db_manager.upsert_device_vlan.call_count == 3
+        db_manager._process_device_discovery_batched.assert_not_called()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the pooled database connection and lazy health checks
+"""
+
+import time
+from unittest.mock import Mock, MagicMock
+
+import pyodbc
+import pytest
+
+from netwalker.database.connection_pool import PooledConnection, is_connection_error
+from netwalker.database.database_manager import DatabaseManager
+
+
+def make_pool(interval: float = 60.0):
+    """Create a PooledConnection whose factory returns fresh MagicMock connections"""
+    factory = Mock(side_effect=lambda: MagicMock())
+    return PooledConnection(factory, health_check_interval=interval), factory
+
+
+class TestPooledConnection:
+    """Test idle-time probing and reconnect behaviour"""
+
+    def test_recently_used_connection_not_probed(self):
+        pool, _ = make_pool()
+        raw = pool._connection
+
+        assert pool.ensure_healthy() is True
+        assert pool.ensure_healthy() is True
+
+        raw.cursor.assert_not_called()
+        assert pool.get_stats()['probes'] == 0
+        assert pool.get_stats()['probes_skipped'] == 2
+
+    def test_idle_connection_probed(self):
+        pool, _ = make_pool(interval=0.01)
+        time.sleep(0.02)
+
+        assert pool.ensure_healthy() is True
+
+        pool._connection.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+        assert pool.get_stats()['probes'] == 1
+
+    def test_failed_probe_reconnects(self):
+        pool, factory = make_pool(interval=0)
+        dead = pool._connection
+        dead.cursor.side_effect = pyodbc.Error('08S01', 'Communication link failure')
+
+        assert pool.ensure_healthy() is True
+
+        assert factory.call_count == 2
+        assert pool._connection is not dead
+        assert pool.get_stats()['reconnects'] == 1
+
+    def test_connection_error_forces_next_check(self):
+        pool, factory = make_pool()
+        cursor = pool.cursor()
+        pool._connection.cursor.return_value.execute.side_effect = pyodbc.Error('08S01', 'link failure')
+
+        with pytest.raises(pyodbc.Error):
+            cursor.execute("SELECT device_id FROM devices")
+
+        pool._connection.cursor.side_effect = pyodbc.Error('08S01', 'link failure')
+        assert pool.ensure_healthy() is True
+        assert factory.call_count == 2, "Suspect connection should be probed and replaced"
+
+    def test_query_error_does_not_trigger_probe(self):
+        pool, _ = make_pool()
+        cursor = pool.cursor()
+        pool._connection.cursor.return_value.execute.side_effect = pyodbc.Error('42S02', 'Invalid object name')
+
+        with pytest.raises(pyodbc.Error):
+            cursor.execute("SELECT * FROM missing_table")
+
+        assert pool.ensure_healthy() is True
+        assert pool.get_stats()['probes'] == 0
+
+    def test_attributes_pass_through(self):
+        pool, _ = make_pool()
+        pool.autocommit = True
+        cursor = pool.cursor()
+        cursor.fast_executemany = True
+
+        assert pool._connection.autocommit is True
+        assert pool._connection.cursor.return_value.fast_executemany is True
+
+    def test_is_connection_error(self):
+        assert is_connection_error(pyodbc.Error('08S01', 'link failure'))
+        assert is_connection_error(pyodbc.Error('01002', 'disconnect error'))
+        assert not is_connection_error(pyodbc.Error('23000', 'constraint violation'))
+
+
+class TestDatabaseManagerHealthCheck:
+    """Test DatabaseManager.is_connected with pooled connections"""
+
+    def test_is_connected_uses_pool(self):
+        db_manager = DatabaseManager({'enabled': True})
+        pool, _ = make_pool()
+        db_manager.connection = pool
+
+        for _ in range(5):
+            assert db_manager.is_connected() is True
+
+        pool._connection.cursor.assert_not_called()
+        assert db_manager.get_connection_stats()['probes_skipped'] == 5
+
+    def test_raw_connection_still_probed(self):
+        db_manager = DatabaseManager({'enabled': True})
+        db_manager.connection = MagicMock()
+
+        assert db_manager.is_connected() is True
+        db_manager.connection.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+        assert db_manager.get_connection_stats() == {}
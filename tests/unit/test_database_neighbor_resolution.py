@@ -0,0 +1,103 @@
+"""
+Unit tests for set-based neighbor resolution and storage in DatabaseManager
+"""
+
+from unittest.mock import Mock
+
+from netwalker.connection.data_models import NeighborInfo
+
+
+def make_neighbor(hostname: str, platform: str = 'cisco WS-C3850', local: str = 'Gi1/0/1',
+                  remote: str = 'Gi1/0/48') -> NeighborInfo:
+    return NeighborInfo(device_id=hostname, local_interface=local, remote_interface=remote,
+                        platform=platform, capabilities=['Switch'])
+
+
+def executed_sql(cursor) -> list:
+    return [' '.join(call.args[0].split()) for call in cursor.execute.call_args_list]
+
+
+class TestResolveNeighborDeviceIds:
+    """Test bulk hostname resolution and placeholder creation"""
+
+    def test_existing_neighbors_resolved_in_one_query(self, db_manager):
+        cursor = db_manager.connection.cursor.return_value
+        cursor.fetchall.return_value = [('ACCESS-01', 11), ('access-02', 12), ('ACCESS-01', 99)]
+        neighbors = [make_neighbor('access-01.example.com'), make_neighbor('ACCESS-02'),
+                     make_neighbor('access-01')]
+
+        device_ids = db_manager.resolve_neighbor_device_ids(neighbors)
+
+        assert device_ids == {'access-01': 11, 'access-02': 12}, "Newest device should win"
+        assert len(executed_sql(cursor)) == 1
+        assert cursor.execute.call_args.args[1] == ('access-01', 'ACCESS-02')
+        db_manager.connection.commit.assert_not_called()
+
+    def test_missing_neighbors_inserted_together(self, db_manager):
+        cursor = db_manager.connection.cursor.return_value
+        cursor.fetchall.side_effect = [
+            [('ACCESS-01', 11)],
+            [('ap-01', 21), ('cam-01', 22)],
+        ]
+        neighbors = [
+            make_neighbor('ACCESS-01'),
+            make_neighbor('ap-01', platform='Aruba AP AP-515, serial CNXXXX'),
+            make_neighbor('cam-01', platform='AXIS'),
+        ]
+        db_manager._refresh_device_from_neighbor_platform = Mock()
+
+        device_ids = db_manager.resolve_neighbor_device_ids(neighbors)
+
+        assert device_ids == {'access-01': 11, 'ap-01': 21, 'cam-01': 22}
+        inserts = [sql for sql in executed_sql(cursor) if sql.startswith('INSERT INTO devices')]
+        assert len(inserts) == 1
+        assert inserts[0].count('(?, ?, ?, ?, ?, ?)') == 2
+        params = cursor.execute.call_args_list[1].args[1]
+        assert params[:6] == ('ap-01', 'unknown', 'Aruba AP', 'Unwalked Neighbor', 'Switch', 'active')
+        assert params[6:] == ('cam-01', 'unknown', 'AXIS', 'Unwalked Neighbor', 'Switch,camera', 'active')
+        db_manager.connection.commit.assert_called_once()
+        db_manager._refresh_device_from_neighbor_platform.assert_not_called()
+
+    def test_refresh_only_for_detailed_platforms(self, db_manager):
+        cursor = db_manager.connection.cursor.return_value
+        cursor.fetchall.return_value = [('AP-01', 21), ('ACCESS-01', 11)]
+        db_manager._refresh_device_from_neighbor_platform = Mock()
+
+        db_manager.resolve_neighbor_device_ids([
+            make_neighbor('AP-01', platform='Aruba AP AP-515'),
+            make_neighbor('ACCESS-01'),
+        ])
+
+        db_manager._refresh_device_from_neighbor_platform.assert_called_once_with(
+            cursor, 21, 'AP-01', 'Aruba AP AP-515'
+        )
+
+
+class TestUpsertDeviceNeighbors:
+    """Test that neighbor links are written with one merge and one commit"""
+
+    def test_single_merge_and_commit(self, db_manager):
+        db_manager.resolve_neighbor_device_ids = Mock(return_value={'core-a': 3, 'core-b': 9})
+        db_manager._merge_device_neighbors = Mock(return_value=2)
+        neighbors = [make_neighbor('core-a', local='Gi1/0/1', remote='Te1/1/1'),
+                     make_neighbor('core-b', local='Gi1/0/2', remote='Te1/1/1')]
+
+        assert db_manager.upsert_device_neighbors(7, neighbors) == 2
+
+        links = db_manager._merge_device_neighbors.call_args.args[2]
+        assert links == [
+            ('GigabitEthernet1/0/1', 3, 'TenGigabitEthernet1/1/1', 'CDP'),
+            ('GigabitEthernet1/0/2', 9, 'TenGigabitEthernet1/1/1', 'CDP'),
+        ]
+        db_manager.connection.commit.assert_called_once()
+
+    def test_protocol_parser_shared(self, db_manager):
+
+        assert db_manager._get_protocol_parser() is db_manager._get_protocol_parser()
+
+    def test_unresolved_neighbors_skipped(self, db_manager):
+        db_manager.resolve_neighbor_device_ids = Mock(return_value={})
+        db_manager._merge_device_neighbors = Mock()
+
+        assert db_manager.upsert_device_neighbors(7, [make_neighbor('ghost')]) == 0
+        db_manager._merge_device_neighbors.assert_not_called()
@@ -0,0 +1,121 @@
+"""
+Unit tests for the indexed DeviceInventory
+"""
+
+import threading
+
+import pytest
+
+from netwalker.discovery.discovery_engine import DeviceInventory, InventoryRecord
+
+
+def device(hostname, ip_address, platform='cisco WS-C3850'):
+    return {'hostname': hostname, 'primary_ip': ip_address, 'platform': platform}
+
+
+def site_of(hostname):
+    return hostname.split('-')[0] if '-CORE-' in hostname else None
+
+
+class TestInventoryIndexes:
+    """Test secondary index lookups"""
+
+    def test_lookups_by_status_platform_ip_and_site(self):
+        inventory = DeviceInventory(site_resolver=site_of)
+        inventory.add_device('BORO-CORE-A:10.1.0.1', device('BORO-CORE-A', '10.1.0.1', 'N9K-C93180YC-EX'), 'connected')
+        inventory.add_device('BORO-SW01:10.1.0.2', device('BORO-SW01', '10.1.0.2'), 'connected')
+        inventory.add_device('LUMT-CORE-A:10.2.0.1', device('LUMT-CORE-A', '10.2.0.1'), 'failed', 'timed out')
+
+        assert list(inventory.get_devices_by_status('connected')) == ['BORO-CORE-A:10.1.0.1', 'BORO-SW01:10.1.0.2']
+        assert list(inventory.get_devices_by_platform('Cisco WS-C3850')) == ['BORO-SW01:10.1.0.2',
+                                                                            'LUMT-CORE-A:10.2.0.1']
+        assert list(inventory.get_devices_by_ip('10.2.0.1')) == ['LUMT-CORE-A:10.2.0.1']
+        assert inventory.get_sites() == ['BORO', 'LUMT']
+        assert list(inventory.get_devices_by_site('BORO')) == ['BORO-CORE-A:10.1.0.1']
+        assert inventory.get_devices_by_status('boundary') == {}
+
+    def test_update_moves_device_between_indexes(self):
+        inventory = DeviceInventory()
+        inventory.add_device('SW01:10.1.0.2', device('SW01', '10.1.0.2'), 'failed', 'auth failed')
+
+        inventory.add_device('SW01:10.1.0.2', device('SW01', '10.1.0.2', 'IOS-XE'), 'connected')
+
+        assert inventory.get_devices_by_status('failed') == {}
+        assert list(inventory.get_devices_by_platform('ios-xe')) == ['SW01:10.1.0.2']
+        assert inventory.get_devices_by_platform('cisco WS-C3850') == {}
+        assert inventory.get_device_error('SW01:10.1.0.2') == 'auth failed'
+        assert len(inventory) == 1
+
+    def test_find_device_by_hostname(self):
+        inventory = DeviceInventory()
+        inventory.add_device('SW01:10.1.0.2', device('SW01', '10.1.0.2'), 'connected')
+        inventory.add_device('SW01:10.9.0.2', device('SW01', '10.9.0.2'), 'connected')
+
+        assert inventory.find_device_by_hostname('sw01') == ('SW01:10.1.0.2', device('SW01', '10.1.0.2'))
+        assert inventory.find_device_by_hostname('SW02') is None
+
+    def test_site_resolver_reindexes_existing_devices(self):
+        inventory = DeviceInventory()
+        inventory.add_device('BORO-CORE-A:10.1.0.1', device('BORO-CORE-A', '10.1.0.1'), 'connected')
+
+        inventory.set_site_resolver(site_of)
+
+        assert list(inventory.get_devices_by_site('BORO')) == ['BORO-CORE-A:10.1.0.1']
+
+    def test_record_has_no_instance_dict(self):
+        record = InventoryRecord(device('SW01', '10.1.0.2'), 'connected', None)
+
+        assert not hasattr(record, '__dict__')
+
+
+class TestInventorySnapshots:
+    """Test read-only snapshot views"""
+
+    def test_snapshot_reused_until_write(self):
+        inventory = DeviceInventory()
+        inventory.add_device('SW01:10.1.0.2', device('SW01', '10.1.0.2'), 'connected')
+
+        first = inventory.get_all_devices()
+        assert inventory.get_all_devices() is first
+
+        inventory.add_device('SW02:10.1.0.3', device('SW02', '10.1.0.3'), 'connected')
+        assert len(first) == 1
+        assert list(inventory.get_all_devices()) == ['SW01:10.1.0.2', 'SW02:10.1.0.3']
+
+    def test_snapshot_is_read_only(self):
+        inventory = DeviceInventory()
+        inventory.add_device('SW01:10.1.0.2', device('SW01', '10.1.0.2'), 'connected')
+
+        with pytest.raises(TypeError):
+            inventory.get_all_devices()['SW02:10.1.0.3'] = {}
+
+    def test_concurrent_writers_and_readers(self):
+        inventory = DeviceInventory(site_resolver=site_of)
+        errors = []
+
+        def writer(worker):
+            for i in range(500):
+                inventory.add_device(f"W{worker}-CORE-{i}:10.{worker}.{i // 250}.{i % 250}",
+                                     device(f"W{worker}-CORE-{i}", f"10.{worker}.{i // 250}.{i % 250}"),
+                                     'connected' if i % 2 else 'failed')
+
+        def reader():
+            try:
+                for _ in range(200):
+                    sum(1 for _ in inventory.get_all_devices().values())
+                    len(inventory.get_devices_by_status('connected'))
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert len(inventory) == 2000
+        assert len(inventory.get_devices_by_status('connected')) == 1000
+        assert inventory.get_discovery_stats()['failed_connections'] == 1000
+        assert len(inventory.get_sites()) == 4
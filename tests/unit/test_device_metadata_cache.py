@@ -0,0 +1,126 @@
+"""
+Unit tests for the preloaded device metadata cache
+"""
+
+from datetime import datetime
+
+import pytest
+
+from netwalker.database.metadata_cache import DeviceMetadataCache
+
+
+NEWER = datetime(2026, 1, 2)
+OLDER = datetime(2026, 1, 1)
+
+ROWS = [
+    (1, 'CORE-SW01', 'cisco_nxos', 0, NEWER, '10.0.0.1'),
+    (1, 'CORE-SW01', 'cisco_nxos', 0, NEWER, '10.0.1.1'),
+    (2, 'SITE-FW01', 'Palo Alto PA-3220', 4, NEWER, None),
+    (3, 'CORE-SW01', 'cisco_ios', 2, OLDER, '10.0.0.1'),
+]
+
+
+class TestDeviceMetadataCache:
+    """Test lookup semantics and write-through updates"""
+
+    def test_lookup_by_hostname_and_ip(self):
+        cache = DeviceMetadataCache()
+        cache.load(ROWS)
+
+        assert cache.lookup('core-sw01.example.com').platform == 'cisco_nxos'
+        assert cache.lookup('10.0.1.1').device_name == 'CORE-SW01'
+        assert cache.lookup('SITE-FW01').connection_failures == 4
+        assert cache.lookup('10.9.9.9') is None
+
+    def test_newest_device_wins(self):
+        cache = DeviceMetadataCache()
+        cache.load(ROWS)
+
+        assert cache.lookup('CORE-SW01').connection_failures == 0
+        assert cache.lookup('10.0.0.1').platform == 'cisco_nxos'
+
+    def test_hit_rate(self):
+        cache = DeviceMetadataCache()
+        cache.load(ROWS)
+
+        cache.lookup('CORE-SW01')
+        cache.lookup('SITE-FW01')
+        cache.lookup('UNKNOWN-SW')
+        stats = cache.get_stats()
+
+        assert stats['devices'] == 2
+        assert stats['lookups'] == 3
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+        assert abs(stats['hit_rate'] - 2 / 3) < 1e-9
+
+    def test_record_device_keeps_platform_when_empty(self):
+        cache = DeviceMetadataCache()
+        cache.load(ROWS)
+
+        cache.record_device('CORE-SW01', '', '10.0.2.1')
+        cache.record_device('NEW-SW01', 'cisco_ios')
+
+        assert cache.lookup('10.0.2.1').platform == 'cisco_nxos'
+        assert cache.lookup('new-sw01').platform == 'cisco_ios'
+        assert cache.lookup('new-sw01').connection_failures == 0
+
+
+class TestDatabaseManagerMetadataCache:
+    """Test DatabaseManager lookups served from the preloaded cache"""
+
+    @pytest.fixture(autouse=True)
+    def preload_rows(self, db_manager):
+        db_manager.connection.cursor.return_value.fetchall.return_value = ROWS
+
+    def test_lookups_do_not_query_after_load(self, db_manager):
+        assert db_manager.load_metadata_cache() is True
+        cursor = db_manager.connection.cursor.return_value
+        queries = cursor.execute.call_count
+
+        assert db_manager.get_device_platform('SITE-FW01') == 'Palo Alto PA-3220'
+        assert db_manager.get_device_platform('10.0.1.1') == 'cisco_nxos'
+        assert db_manager.get_device_platform('MISSING') is None
+        assert db_manager.get_connection_failures('SITE-FW01') == 4
+        assert db_manager.get_connection_failures('MISSING') == 0
+
+        assert cursor.execute.call_count == queries
+        assert db_manager.get_metadata_cache_stats()['lookups'] == 5
+
+    def test_failure_writes_update_cache(self, db_manager):
+        db_manager.load_metadata_cache()
+        cursor = db_manager.connection.cursor.return_value
+        cursor.rowcount = 1
+        cursor.fetchone.return_value = (5,)
+
+        assert db_manager.increment_connection_failures('SITE-FW01') is True
+        assert db_manager.get_connection_failures('SITE-FW01') == 5
+
+        assert db_manager.reset_connection_failures('SITE-FW01') is True
+        assert db_manager.get_connection_failures('SITE-FW01') == 0
+
+    def test_upsert_updates_cache(self, db_manager):
+        db_manager.load_metadata_cache()
+        cursor = db_manager.connection.cursor.return_value
+        cursor.fetchone.return_value = (7,)
+
+        db_manager.upsert_device({'hostname': 'EDGE-SW01', 'serial_number': 'FOC123',
+                                  'platform': 'cisco_ios', 'ip_address': '10.0.3.1'})
+
+        assert db_manager.get_device_platform('10.0.3.1') == 'cisco_ios'
+
+    def test_upsert_indexes_primary_ip(self, db_manager):
+        db_manager.load_metadata_cache()
+        cursor = db_manager.connection.cursor.return_value
+        cursor.fetchone.return_value = (8,)
+
+        db_manager.upsert_device({'hostname': 'EDGE-SW02', 'serial_number': 'FOC456',
+                                  'platform': 'cisco_ios', 'primary_ip': '10.0.4.1'})
+
+        assert db_manager.get_device_platform('10.0.4.1') == 'cisco_ios'
+
+    def test_preload_disabled(self, db_manager):
+        db_manager.preload_metadata = False
+
+        assert db_manager.load_metadata_cache() is False
+        assert db_manager.get_metadata_cache_stats() == {}
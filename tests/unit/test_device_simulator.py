@@ -0,0 +1,147 @@
+"""
+Unit tests for the device simulator
+"""
+
+import pytest
+
+from netwalker.config import Credentials
+from netwalker.connection.data_models import ConnectionStatus
+from netwalker.connection.output_archive import OutputArchive
+from netwalker.discovery.device_collector import DeviceCollector
+from netwalker.discovery.discovery_engine import DiscoveryEngine
+from netwalker.filtering.filter_manager import FilterManager
+from netwalker.simulator import (
+    DeviceBehavior, SimulatedConnection, SimulatedNetwork, SimulatorConnectionManager, render_output
+)
+
+CONFIG = {
+    'max_discovery_depth': 20,
+    'discovery_protocols': ['CDP'],
+    'site_boundary_pattern': None,
+}
+
+
+def make_engine(connection_manager, **overrides):
+    config = dict(CONFIG, **overrides)
+    return DiscoveryEngine(connection_manager, FilterManager(config), config, Credentials('admin', 'secret'))
+
+
+class TestSimulatedNetwork:
+    """Test synthetic mesh construction"""
+
+    def test_mesh_shape(self):
+        network = SimulatedNetwork.build_mesh(100, fanout=4, firewall_every=10)
+
+        platforms = [device.platform for device in network.devices]
+        assert len(network) == 100
+        assert platforms[0] == 'NX-OS'
+        assert set(platforms[1:5]) == {'IOS-XE'}
+        assert {'IOS', 'PAN-OS'} <= set(platforms)
+        # Every link is reported from both ends
+        assert sum(len(device.links) for device in network.devices) % 2 == 0
+
+    def test_lookup_by_ip_and_hostname(self):
+        network = SimulatedNetwork.build_mesh(10)
+        device = network.devices[3]
+
+        assert network.lookup(device.ip_address) is device
+        assert network.lookup(f"{device.hostname.lower()}.example.com") is device
+        assert network.lookup('192.0.2.1') is None
+
+    def test_auth_failures_are_per_host_and_repeatable(self):
+        behavior = DeviceBehavior(auth_failure_rate=0.5, seed=7)
+        hosts = [f"10.0.0.{i}" for i in range(1, 101)]
+
+        failing = [host for host in hosts if behavior.auth_fails(host)]
+
+        assert 20 < len(failing) < 80
+        assert failing == [host for host in hosts if DeviceBehavior(auth_failure_rate=0.5, seed=7).auth_fails(host)]
+
+
+class TestSimulatedOutputs:
+    """Test that collectors parse the rendered outputs"""
+
+    @pytest.mark.parametrize('index, platform', [(0, 'NX-OS'), (1, 'IOS-XE'), (10, 'IOS'), (20, 'PAN-OS')])
+    def test_device_collector_parses_platform(self, index, platform):
+        network = SimulatedNetwork.build_mesh(25, fanout=2, firewall_every=20)
+        device = network.devices[index]
+        assert device.platform == platform
+
+        connection = SimulatedConnection(device, DeviceBehavior())
+        device_info = DeviceCollector(CONFIG).collect_device_information(connection, device.ip_address, 'SSH', 1)
+
+        assert device_info.connection_status == 'success'
+        assert (device_info.hostname, device_info.platform, device_info.serial_number) == \
+            (device.hostname, platform, device.serial_number)
+        if platform != 'PAN-OS':
+            assert sorted(n.ip_address for n in device_info.neighbors) == sorted(l.remote_ip for l in device.links)
+
+    def test_unknown_command_rejected(self):
+        device = SimulatedNetwork.build_mesh(1).devices[0]
+
+        assert 'Invalid input' in render_output(device, 'show running-config')
+
+    def test_archived_outputs_replayed(self, tmp_path):
+        archive = OutputArchive(str(tmp_path))
+        capture = archive.begin_capture('10.9.9.9')
+        capture.store('show version', "Cisco IOS Software, Version 15.2(7)E8\nREPLAY-SW01 uptime is 1 day\n")
+        capture.finish(hostname='REPLAY-SW01', primary_ip='10.9.9.9')
+
+        network = SimulatedNetwork.from_archive(str(tmp_path))
+        device = network.lookup('REPLAY-SW01')
+
+        assert device.ip_address == '10.9.9.9'
+        assert 'REPLAY-SW01 uptime' in render_output(device, 'show version')
+        assert 'Invalid input' in render_output(device, 'show inventory')
+
+
+class TestSimulatedDiscovery:
+    """Test walking a simulated mesh end to end"""
+
+    @pytest.mark.parametrize('concurrent', [False, True])
+    def test_walks_whole_mesh(self, concurrent):
+        network = SimulatedNetwork.build_mesh(60, fanout=4, firewall_every=7)
+        connection_manager = SimulatorConnectionManager(network)
+        engine = make_engine(connection_manager, concurrent_discovery=concurrent, max_concurrent_connections=4)
+        core = network.devices[0]
+        engine.add_seed_device(core.hostname, core.ip_address)
+
+        summary = engine.discover_topology()
+
+        assert summary['successful_connections'] == 60
+        assert connection_manager.get_active_connection_count() == 0
+        hostnames = {device['hostname'] for device in engine.get_inventory().get_all_devices().values()}
+        assert hostnames == {device.hostname for device in network.devices}
+
+    def test_auth_failures_injected(self):
+        network = SimulatedNetwork.build_mesh(40, fanout=4)
+        behavior = DeviceBehavior(auth_failure_rate=0.2, seed=3)
+        connection_manager = SimulatorConnectionManager(network, behavior)
+
+        connection, result = connection_manager.connect_device(
+            next(d.ip_address for d in network.devices if behavior.auth_fails(d.ip_address)), Credentials('a', 'b'))
+
+        assert connection is None
+        assert result.status == ConnectionStatus.FAILED
+        assert connection_manager.get_stats()['auth_failures'] == 1
+
+
+class TestSimulatorSSHServer:
+    """Test serving devices over SSH to netmiko"""
+
+    def test_netmiko_session(self):
+        netmiko = pytest.importorskip('netmiko')
+        from netwalker.simulator import SimulatorSSHServer
+
+        network = SimulatedNetwork.build_mesh(3, address_base='127.0.0.0')
+        device = network.devices[0]  # 127.0.0.1
+        with SimulatorSSHServer(network, bind_address='127.0.0.1') as server:
+            connection = netmiko.ConnectHandler(device_type='cisco_ios', host=device.ip_address, port=server.port,
+                                                username='admin', password='secret', fast_cli=True,
+                                                allow_agent=False, use_keys=False)
+            try:
+                output = connection.send_command('show version')
+            finally:
+                connection.disconnect()
+
+        assert f"Device name: {device.hostname}" in output
@@ -0,0 +1,118 @@
+"""
+Unit tests for discovery checkpoints and --resume
+"""
+
+import time
+
+import pytest
+
+from netwalker.config import Credentials
+from netwalker.discovery.checkpoint import DiscoveryCheckpoint
+from netwalker.discovery.discovery_engine import DiscoveryEngine
+from netwalker.filtering.filter_manager import FilterManager
+from netwalker.simulator import SimulatedNetwork, SimulatorConnectionManager
+
+
+class InterruptingConnectionManager(SimulatorConnectionManager):
+    """Simulator that stops the walk like Ctrl+C after a number of logins"""
+
+    def __init__(self, network, interrupt_after=None):
+        super().__init__(network)
+        self.interrupt_after = interrupt_after
+        self.hosts_connected = []
+
+    def connect_device(self, host, credentials, db_manager=None, neighbor_platform=None):
+        if self.interrupt_after is not None and len(self.hosts_connected) >= self.interrupt_after:
+            raise KeyboardInterrupt
+        self.hosts_connected.append(host)
+        return super().connect_device(host, credentials, db_manager, neighbor_platform)
+
+
+def make_engine(network, checkpoint_file, resume=False, interrupt_after=None):
+    config = {'max_discovery_depth': 10, 'discovery_protocols': ['CDP'], 'site_boundary_pattern': None,
+              'checkpoint_file': checkpoint_file, 'checkpoint_interval_seconds': 1e-9,
+              'resume_discovery': resume}
+    connection_manager = InterruptingConnectionManager(network, interrupt_after)
+    engine = DiscoveryEngine(connection_manager, FilterManager(config), config, Credentials('admin', 'secret'))
+    engine.add_seed_device(network.devices[0].hostname, network.devices[0].ip_address)
+    return engine, connection_manager
+
+
+class TestDiscoveryCheckpoint:
+    """Test the checkpoint file"""
+
+    def test_save_load_round_trip(self, tmp_path):
+        checkpoint = DiscoveryCheckpoint(str(tmp_path / 'state' / 'checkpoint.db'))
+        node = {'hostname': 'SW02', 'ip_address': '10.1.0.3', 'depth': 1, 'parent_device': 'CORE-A:10.1.0.1',
+                'discovery_method': 'cdp', 'is_seed': False, 'platform': None}
+
+        checkpoint.save([node], {'CORE-A:10.1.0.1', 'SW09:10.1.0.9'}, {'SW09:10.1.0.9'},
+                        [('CORE-A:10.1.0.1', 'connected', None, {'hostname': 'CORE-A'}),
+                         ('SW09:10.1.0.9', 'failed', 'timed out', {'hostname': 'SW09'})],
+                        {'total_completed': 2})
+        checkpoint.save([], {'CORE-A:10.1.0.1', 'SW09:10.1.0.9'}, set(),
+                        [('SW09:10.1.0.9', 'connected', None, {'hostname': 'SW09', 'platform': 'IOS'})],
+                        {'total_completed': 3})
+
+        state = checkpoint.load()
+        assert state['queue'] == []
+        assert state['discovered'] == {'CORE-A:10.1.0.1', 'SW09:10.1.0.9'} and state['failed'] == set()
+        assert state['devices'] == [('CORE-A:10.1.0.1', 'connected', None, {'hostname': 'CORE-A'}),
+                                    ('SW09:10.1.0.9', 'connected', None, {'hostname': 'SW09', 'platform': 'IOS'})]
+        assert state['counters']['total_completed'] == 3
+        assert checkpoint.saves == 2
+
+        checkpoint.clear()
+        assert not checkpoint.exists()
+
+
+class TestResumeDiscovery:
+    """Test interrupting and resuming a walk"""
+
+    def test_resume_covers_network_without_revisiting(self, tmp_path):
+        network = SimulatedNetwork.build_mesh(40, fanout=4)
+        checkpoint_file = str(tmp_path / 'checkpoint.db')
+
+        engine, interrupted = make_engine(network, checkpoint_file, interrupt_after=15)
+        with pytest.raises(KeyboardInterrupt):
+            engine.discover_topology()
+        assert DiscoveryCheckpoint(checkpoint_file).exists()
+
+        engine, resumed = make_engine(network, checkpoint_file, resume=True)
+        summary = engine.discover_topology()
+
+        reference, _ = make_engine(network, str(tmp_path / 'reference.db'))
+        reference_summary = reference.discover_topology()
+
+        assert summary['total_devices'] == reference_summary['total_devices'] == 40
+        assert list(engine.get_inventory().get_all_devices()) == \
+            list(reference.get_inventory().get_all_devices())
+        assert len(interrupted.hosts_connected) + len(resumed.hosts_connected) == 40
+        assert not set(interrupted.hosts_connected) & set(resumed.hosts_connected)
+        assert not DiscoveryCheckpoint(checkpoint_file).exists()
+
+    def test_new_run_discards_old_checkpoint(self, tmp_path):
+        network = SimulatedNetwork.build_mesh(20, fanout=4)
+        checkpoint_file = str(tmp_path / 'checkpoint.db')
+
+        engine, _ = make_engine(network, checkpoint_file, interrupt_after=5)
+        with pytest.raises(KeyboardInterrupt):
+            engine.discover_topology()
+
+        engine, connection_manager = make_engine(network, checkpoint_file)
+        summary = engine.discover_topology()
+
+        assert summary['total_devices'] == 20
+        assert len(connection_manager.hosts_connected) == 20
+
+    def test_elapsed_time_survives_timeout_reset(self, tmp_path):
+        network = SimulatedNetwork.build_mesh(5, fanout=2)
+        engine, _ = make_engine(network, str(tmp_path / 'checkpoint.db'))
+        engine.discovery_timeout = engine.initial_discovery_timeout = 100
+        engine.discovery_start_time = engine.run_start_time = time.time() - 90
+
+        engine._reset_discovery_timeout_if_needed(5)
+        engine.save_checkpoint()
+
+        assert engine.timeout_resets == 1
+        assert DiscoveryCheckpoint(str(tmp_path / 'checkpoint.db')).load()['counters']['elapsed_seconds'] >= 90
@@ -0,0 +1,85 @@
+"""Unit tests for DiscoveryQueue membership tracking"""
+
+import copy
+from unittest.mock import Mock
+
+from netwalker.connection.data_models import NeighborInfo
+from netwalker.discovery.discovery_engine import DiscoveryEngine, DiscoveryNode, DiscoveryQueue
+
+
+def node(name: str, depth: int = 1) -> DiscoveryNode:
+    return DiscoveryNode(hostname=name, ip_address=f"10.1.1.{len(name)}", depth=depth)
+
+
+class TestDiscoveryQueue:
+    """Test that queued keys stay in sync with queue contents"""
+
+    def test_append_and_popleft(self):
+        queue = DiscoveryQueue()
+        queue.append(node('a'))
+        queue.append(node('bb'))
+
+        assert queue.contains_key('a:10.1.1.1')
+        assert queue.popleft().hostname == 'a'
+        assert not queue.contains_key('a:10.1.1.1')
+        assert queue.contains_key('bb:10.1.1.2')
+
+    def test_duplicate_keys_counted(self):
+        """A key stays queued until every copy is removed"""
+        queue = DiscoveryQueue([node('a'), node('a')])
+
+        queue.popleft()
+        assert queue.contains_key('a:10.1.1.1')
+        queue.pop()
+        assert not queue.contains_key('a:10.1.1.1')
+
+    def test_extendleft_remove_and_clear(self):
+        queue = DiscoveryQueue()
+        first, second = node('a'), node('bb')
+        queue.extendleft([first, second])
+
+        assert queue.queued_keys() == ['bb:10.1.1.2', 'a:10.1.1.1']
+        queue.remove(second)
+        assert not queue.contains_key('bb:10.1.1.2')
+        queue.clear()
+        assert not queue.contains_key('a:10.1.1.1')
+        assert len(queue) == 0
+
+    def test_item_assignment_and_deletion(self):
+        queue = DiscoveryQueue([node('a'), node('bb')])
+        queue[0] = node('ccc')
+        del queue[1]
+
+        assert queue.queued_keys() == ['ccc:10.1.1.3']
+        assert not queue.contains_key('a:10.1.1.1')
+        assert not queue.contains_key('bb:10.1.1.2')
+
+    def test_copy_preserves_tracking(self):
+        queue = DiscoveryQueue([node('a')])
+        clone = copy.copy(queue)
+        clone.popleft()
+
+        assert queue.contains_key('a:10.1.1.1')
+        assert not clone.contains_key('a:10.1.1.1')
+
+
+class TestProcessNeighborsQueueing:
+    """Test neighbor processing against the queue index"""
+
+    def test_duplicate_neighbors_queued_once(self):
+        filter_manager = Mock()
+        filter_manager.should_filter_device.return_value = False
+        engine = DiscoveryEngine(Mock(), filter_manager,
+                                 {'max_discovery_depth': 3, 'enable_progress_tracking': False}, Mock())
+        parent = DiscoveryNode(hostname='CORE', ip_address='10.0.0.1', depth=0)
+        neighbors = [
+            NeighborInfo(device_id=f"SW{i}", local_interface='Gi1/0/1', remote_interface='Gi1/0/2',
+                         platform='cisco WS-C3850', capabilities=['Switch'], ip_address=f"10.0.1.{i}")
+            for i in range(20)
+        ]
+
+        engine._process_neighbors(neighbors + neighbors, parent)
+
+        assert len(engine.discovery_queue) == 20
+        assert engine.total_queued == 20
+        assert engine.discovery_queue.contains_key('SW7:10.0.1.7')
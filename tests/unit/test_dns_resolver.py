@@ -0,0 +1,134 @@
+"""
+Unit tests for the shared caching DNS resolver
+"""
+
+import socket
+import threading
+import time
+from unittest.mock import Mock, patch
+
+from netwalker.connection.connection_manager import ConnectionManager
+from netwalker.connection.data_models import NeighborInfo
+from netwalker.discovery.discovery_engine import DiscoveryEngine, DiscoveryNode
+from netwalker.filtering.filter_manager import FilterManager
+from netwalker.validation.dns_resolver import DNSResolver
+from netwalker.validation.dns_validator import DNSValidator
+
+
+HOSTS = {'core-a': '10.0.0.1', 'core-b': '10.0.0.2', 'access-1': '10.0.1.1'}
+
+
+def fake_gethostbyname(hostname):
+    if hostname not in HOSTS:
+        raise socket.gaierror("Name or service not known")
+    return HOSTS[hostname]
+
+
+class TestDNSResolver:
+    """Test caching, negative caching, batching and timeouts"""
+
+    def test_repeat_lookup_served_from_cache(self):
+        resolver = DNSResolver()
+        with patch('socket.gethostbyname', side_effect=fake_gethostbyname) as mock_dns:
+            assert resolver.resolve('core-a') == '10.0.0.1'
+            assert resolver.resolve('core-a') == '10.0.0.1'
+
+        assert mock_dns.call_count == 1
+        stats = resolver.get_stats()
+        assert stats['lookups'] == 1
+        assert stats['cache_hits'] == 1
+
+    def test_failures_cached_until_negative_ttl(self):
+        resolver = DNSResolver(negative_ttl_seconds=0.05)
+        with patch('socket.gethostbyname', side_effect=fake_gethostbyname) as mock_dns:
+            assert resolver.resolve('ghost') is None
+            assert resolver.resolve('ghost') is None
+            assert mock_dns.call_count == 1
+
+            time.sleep(0.06)
+            assert resolver.resolve('ghost') is None
+            assert mock_dns.call_count == 2
+
+        assert resolver.get_stats()['negative_hits'] == 1
+        assert resolver.get_stats()['failures'] == 2
+
+    def test_resolve_many_runs_lookups_concurrently(self):
+        resolver = DNSResolver(max_workers=3)
+        active = {'now': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def slow_lookup(hostname):
+            with lock:
+                active['now'] += 1
+                active['peak'] = max(active['peak'], active['now'])
+            time.sleep(0.05)
+            with lock:
+                active['now'] -= 1
+            return fake_gethostbyname(hostname)
+
+        with patch('socket.gethostbyname', side_effect=slow_lookup):
+            results = resolver.resolve_many(['core-a', 'core-b', 'access-1', 'core-a', 'ghost'])
+
+        assert results == {'core-a': '10.0.0.1', 'core-b': '10.0.0.2',
+                           'access-1': '10.0.1.1', 'ghost': None}
+        assert active['peak'] > 1
+        assert resolver.get_stats()['lookups'] == 4
+        resolver.shutdown()
+
+    def test_slow_lookup_times_out(self):
+        resolver = DNSResolver(timeout=0.05)
+        release = threading.Event()
+
+        with patch('socket.gethostbyname', side_effect=lambda host: release.wait(1) and '10.9.9.9'):
+            start = time.monotonic()
+            assert resolver.resolve('slow-host') is None
+            assert time.monotonic() - start < 0.5
+            release.set()
+
+        assert resolver.get_stats()['timeouts'] == 1
+        resolver.shutdown()
+
+    def test_reverse_lookup(self):
+        resolver = DNSResolver()
+        with patch('socket.gethostbyaddr', return_value=('core-a.example.com', [], ['10.0.0.1'])):
+            assert resolver.reverse('10.0.0.1') == 'core-a.example.com'
+
+    def test_from_config(self):
+        resolver = DNSResolver.from_config({'max_concurrent_dns': 4, 'dns_timeout_seconds': 2,
+                                            'dns_cache_ttl_seconds': 30})
+
+        assert (resolver.max_workers, resolver.timeout, resolver.ttl_seconds) == (4, 2, 30)
+
+
+class TestSharedResolverUsers:
+    """Test that discovery and DNS validation go through the shared resolver"""
+
+    def test_neighbors_resolved_in_one_batch(self):
+        filter_manager = Mock(spec=FilterManager)
+        filter_manager.should_filter_device.return_value = False
+        resolver = Mock(spec=DNSResolver)
+        resolver.resolve_many.return_value = {'core-a': '10.0.0.1', 'core-b': None}
+        engine = DiscoveryEngine(Mock(spec=ConnectionManager), filter_manager,
+                                 {'max_discovery_depth': 3}, Mock(), dns_resolver=resolver)
+        neighbors = [
+            NeighborInfo(device_id='core-a.example.com', local_interface='Gi1/0/1', remote_interface='Gi1/0/2',
+                         platform='cisco WS-C3850', capabilities=['Switch']),
+            NeighborInfo(device_id='core-b', local_interface='Gi1/0/3', remote_interface='Gi1/0/2',
+                         platform='cisco WS-C3850', capabilities=['Switch']),
+            NeighborInfo(device_id='access-1', local_interface='Gi1/0/4', remote_interface='Gi1/0/2',
+                         platform='cisco WS-C3850', capabilities=['Switch'], ip_address='10.0.1.1'),
+        ]
+
+        engine._process_neighbors(neighbors, DiscoveryNode('root', '10.0.0.254', 0))
+
+        resolver.resolve_many.assert_called_once_with(['core-a', 'core-b'])
+        assert engine.discovery_queue.queued_keys() == ['core-a:10.0.0.1', 'access-1:10.0.1.1']
+
+    def test_validator_reuses_cached_lookups(self):
+        resolver = DNSResolver()
+        validator = DNSValidator({}, resolver)
+        with patch('socket.gethostbyname', side_effect=fake_gethostbyname) as mock_dns:
+            resolver.resolve('core-a')
+            assert validator._forward_dns_lookup('core-a') == (True, '10.0.0.1')
+
+        assert mock_dns.call_count == 1
@@ -0,0 +1,294 @@
+"""
+Unit tests for incremental rediscovery of unchanged devices
+"""
+
+import json
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from netwalker.connection.connection_manager import ConnectionManager
+from netwalker.connection.data_models import (
+    ConnectionMethod, ConnectionResult, ConnectionStatus, DeviceInfo, NeighborInfo
+)
+from netwalker.discovery.change_detector import DeviceChangeDetector
+from netwalker.discovery.device_collector import DeviceCollector
+from netwalker.discovery.discovery_engine import DiscoveryEngine, device_info_to_dict
+from netwalker.filtering.filter_manager import FilterManager
+
+
+IOS_VERSION = """Cisco IOS Software, C3850 Software, Version 16.12.4
+ACCESS-SW01 uptime is 2 weeks, 1 day
+Processor board ID FOC1234X0AB
+"""
+
+CDP_DETAIL = """-------------------------
+Device ID: CORE-SW01.example.com
+Entry address(es):
+  IP address: 10.0.0.1
+Platform: cisco WS-C9500-48Y4C,  Capabilities: Router Switch IGMP
+Interface: GigabitEthernet1/0/48,  Port ID (outgoing port): TenGigabitEthernet1/0/1
+"""
+
+# What the last walk stored for ACCESS-SW01: one week younger, same neighbors
+STORED = {
+    'device_id': 7,
+    'serial_number': 'FOC1234X0AB',
+    'software_version': '16.12.4',
+    'uptime_hours': 7 * 24.0,
+    'last_seen': datetime(2026, 1, 1),
+    'neighbors': {('GigabitEthernet1/0/48', 'core-sw01')},
+}
+
+
+# Stack members and VLANs stored by that walk
+STORED_DETAILS = {
+    'stack_members': [
+        {'switch_number': 1, 'role': 'Active', 'priority': 15, 'hardware_model': 'C9300-48P',
+         'serial_number': 'FOC1234X0AB', 'mac_address': 'aaaa.bbbb.0001', 'software_version': '16.12.4',
+         'state': 'Ready'},
+        {'switch_number': 2, 'role': 'Standby', 'priority': 14, 'hardware_model': 'C9300-48P',
+         'serial_number': 'FOC1234X0CD', 'mac_address': 'aaaa.bbbb.0002', 'software_version': '16.12.4',
+         'state': 'Ready'},
+    ],
+    'vlans': [{'vlan_number': 10, 'vlan_name': 'USERS', 'port_count': 40}],
+}
+
+
+OUTPUTS = {'show version': IOS_VERSION, 'show cdp neighbors detail': CDP_DETAIL}
+
+
+@pytest.fixture
+def walked_db_manager(db_manager):
+    """db_manager holding STORED and STORED_DETAILS as the last walk of every device"""
+    db_manager.get_device_fingerprint = Mock(return_value=STORED)
+    db_manager.get_stored_device_details = Mock(return_value=STORED_DETAILS)
+    return db_manager
+
+
+def make_device_info(**overrides):
+    fields = dict(
+        hostname='ACCESS-SW01', primary_ip='10.0.1.10', platform='IOS-XE', capabilities=['Switch'],
+        software_version='16.12.4', vtp_version=None, serial_number='FOC1234X0AB', hardware_model='C3850',
+        uptime='2 weeks, 1 day', discovery_timestamp=datetime.now(), discovery_depth=1, is_seed=False,
+        connection_method='SSH', connection_status='success', error_details=None,
+        neighbors=[NeighborInfo(device_id='CORE-SW01.example.com', local_interface='GigabitEthernet1/0/48',
+                                remote_interface='TenGigabitEthernet1/0/1', platform='cisco WS-C9500',
+                                capabilities=['Switch'])]
+    )
+    fields.update(overrides)
+    return DeviceInfo(**fields)
+
+
+class TestDeviceChangeDetector:
+    """Test which probe differences trigger a full refresh"""
+
+    def test_unchanged_device(self, walked_db_manager):
+        detector = DeviceChangeDetector(walked_db_manager)
+
+        assert detector.compare(make_device_info(), STORED) == (False, "unchanged")
+
+    def test_changes_detected(self, walked_db_manager):
+        detector = DeviceChangeDetector(walked_db_manager)
+        new_neighbor = NeighborInfo(device_id='CORE-SW02', local_interface='Gi1/0/47', remote_interface='Te1/0/1',
+                                    platform='cisco WS-C9500', capabilities=['Switch'])
+
+        cases = {
+            "not in database": (make_device_info(), None),
+            "serial number changed": (make_device_info(serial_number='FOC9999X9ZZ'), STORED),
+            "software version changed": (make_device_info(software_version='17.3.1'), STORED),
+            "device reloaded": (make_device_info(uptime='2 hours, 5 minutes'), STORED),
+            "neighbors changed": (make_device_info(neighbors=make_device_info().neighbors + [new_neighbor]), STORED),
+        }
+        for reason, (device_info, fingerprint) in cases.items():
+            assert detector.compare(device_info, fingerprint) == (True, reason)
+
+    def test_counts_skipped_and_refreshed(self, walked_db_manager):
+        detector = DeviceChangeDetector(walked_db_manager)
+        last_walk = detector.load_last_walk('ACCESS-SW01')
+
+        detector.needs_refresh(make_device_info(), last_walk)
+        detector.needs_refresh(make_device_info(software_version='17.3.1'), last_walk)
+
+        stats = detector.get_stats()
+        assert (stats['devices_skipped'], stats['devices_refreshed']) == (1, 1)
+        assert stats['refresh_reasons'] == {"software version changed": 1}
+
+    def test_unchanged_device_gets_stored_details(self, walked_db_manager):
+        detector = DeviceChangeDetector(walked_db_manager)
+        device_info = make_device_info()
+
+        assert detector.needs_refresh(device_info, detector.load_last_walk('ACCESS-SW01')) is False
+
+        walked_db_manager.get_stored_device_details.assert_called_once_with(7)
+        assert [m.serial_number for m in device_info.stack_members] == ['FOC1234X0AB', 'FOC1234X0CD']
+        assert device_info.is_stack is True
+        assert [(v.vlan_id, v.vlan_name, v.port_count, v.device_hostname) for v in device_info.vlans] == \
+            [(10, 'USERS', 40, 'ACCESS-SW01')]
+
+    def test_unreadable_details_force_refresh(self, walked_db_manager):
+        walked_db_manager.get_stored_device_details.return_value = None
+        detector = DeviceChangeDetector(walked_db_manager)
+
+        assert detector.needs_refresh(make_device_info(), detector.load_last_walk('ACCESS-SW01')) is True
+        assert detector.get_stats()['refresh_reasons'] == {"stored details unavailable": 1}
+
+    def test_unloaded_or_unreadable_walk_forces_refresh(self, walked_db_manager):
+        walked_db_manager.get_device_fingerprint.side_effect = RuntimeError('connection reset')
+        detector = DeviceChangeDetector(walked_db_manager)
+
+        assert detector.load_last_walk('ACCESS-SW01') == {'error': 'connection reset'}
+        assert detector.needs_refresh(make_device_info(), detector.load_last_walk('ACCESS-SW01')) is True
+        assert detector.needs_refresh(make_device_info(), None) is True
+        assert detector.get_stats()['refresh_reasons'] == {"fingerprint unavailable": 2}
+
+
+class TestIncrementalCollection:
+    """Test that unchanged devices skip the expensive collection"""
+
+    def test_unchanged_device_skips_stack_and_vlans(self, walked_db_manager, canned_connection):
+        detector = DeviceChangeDetector(walked_db_manager)
+        collector = DeviceCollector({'vlan_collection': {'enabled': True}}, change_detector=detector)
+        connection = canned_connection(OUTPUTS)
+
+        device_info = collector.collect_device_information(connection, '10.0.1.10', 'SSH', 1,
+                                                           last_walk=detector.load_last_walk('ACCESS-SW01'))
+
+        sent = [call.args[0] for call in connection.send_command.call_args_list]
+        assert device_info.refresh_skipped is True
+        assert device_info.vlan_collection_status == "skipped"
+        assert 'show switch' not in sent and 'show vlan brief' not in sent
+        assert [n.device_id for n in device_info.neighbors] == ['CORE-SW01']
+
+    def test_skipped_stack_keeps_members_in_inventory(self, walked_db_manager, canned_connection):
+        detector = DeviceChangeDetector(walked_db_manager)
+        collector = DeviceCollector({'vlan_collection': {'enabled': True}}, change_detector=detector)
+
+        device_info = collector.collect_device_information(canned_connection(OUTPUTS), '10.0.1.10', 'SSH', 1,
+                                                           last_walk=detector.load_last_walk('ACCESS-SW01'))
+        inventory_entry = device_info_to_dict(device_info, "cdp")
+
+        assert inventory_entry['refresh_skipped'] is True
+        assert inventory_entry['is_stack'] is True
+        assert [m.switch_number for m in inventory_entry['stack_members']] == [1, 2]
+        assert [v.vlan_id for v in inventory_entry['vlans']] == [10]
+
+    def test_changed_device_fully_collected(self, walked_db_manager, canned_connection):
+        walked_db_manager.get_device_fingerprint.return_value = None
+        detector = DeviceChangeDetector(walked_db_manager)
+        collector = DeviceCollector(change_detector=detector)
+        connection = canned_connection(OUTPUTS)
+
+        device_info = collector.collect_device_information(connection, '10.0.1.10', 'SSH', 1,
+                                                           last_walk=detector.load_last_walk('ACCESS-SW01'))
+
+        assert device_info.refresh_skipped is False
+        assert 'show switch' in [call.args[0] for call in connection.send_command.call_args_list]
+
+
+class TestConcurrentIncrementalDiscovery:
+    """Test incremental rediscovery with devices walked on worker threads"""
+
+    def test_database_read_on_coordinating_thread(self, walked_db_manager, canned_connection):
+        db_threads = []
+        collect_threads = []
+
+        def record(result):
+            def call(*args, **kwargs):
+                db_threads.append(threading.current_thread())
+                return result(*args) if callable(result) else result
+            return call
+
+        walked_db_manager.connection.cursor.side_effect = record(MagicMock())
+        walked_db_manager.get_device_fingerprint.side_effect = record(
+            lambda hostname: STORED if hostname == 'ACCESS-SW01' else None)
+        walked_db_manager.get_stored_device_details.side_effect = record(STORED_DETAILS)
+        for method, result in (('get_device_platform', None), ('get_connection_failures', 0),
+                               ('reset_connection_failures', True), ('process_device_discovery', (True, False)),
+                               ('load_metadata_cache', None)):
+            setattr(walked_db_manager, method, Mock(side_effect=record(result)))
+
+        def connect_device(host, *args):
+            connection = canned_connection(OUTPUTS)
+            version = IOS_VERSION if host == '10.0.1.10' else IOS_VERSION.replace('ACCESS-SW01', 'ACCESS-SW02')
+            send_command = connection.send_command.side_effect
+            connection.send_command.side_effect = lambda command: (
+                collect_threads.append(threading.current_thread()),
+                Mock(result=version) if command == 'show version' else send_command(command))[1]
+            return connection, ConnectionResult(host, ConnectionMethod.SSH, ConnectionStatus.SUCCESS)
+
+        connection_manager = Mock(spec=ConnectionManager)
+        connection_manager.connect_device.side_effect = connect_device
+        connection_manager.get_active_connection_count.return_value = 0
+        filter_manager = Mock(spec=FilterManager)
+        filter_manager.should_filter_device.return_value = False
+        filter_manager.get_filter_stats.return_value = {}
+        config = {'max_discovery_depth': 0, 'discovery_timeout_seconds': 60, 'concurrent_discovery': True,
+                  'max_concurrent_connections': 2, 'enable_progress_tracking': False,
+                  'incremental_discovery': True, 'vlan_collection': {'enabled': True}}
+        engine = DiscoveryEngine(connection_manager, filter_manager, config, Mock(), walked_db_manager)
+        engine.add_seed_device('ACCESS-SW01', '10.0.1.10')
+        engine.add_seed_device('ACCESS-SW02', '10.0.1.11')
+
+        engine.discover_topology()
+
+        devices = engine.get_inventory().get_all_devices()
+        assert devices['ACCESS-SW01:10.0.1.10']['refresh_skipped'] is True
+        assert [m.switch_number for m in devices['ACCESS-SW01:10.0.1.10']['stack_members']] == [1, 2]
+        assert devices['ACCESS-SW02:10.0.1.11']['refresh_skipped'] is False
+        assert collect_threads and threading.main_thread() not in collect_threads
+        assert db_threads and set(db_threads) == {threading.main_thread()}
+
+    def test_devices_deferred_at_timeout_drop_last_walk(self, walked_db_manager):
+        for method, result in (('get_device_platform', None), ('get_connection_failures', 0),
+                               ('load_metadata_cache', None)):
+            setattr(walked_db_manager, method, Mock(return_value=result))
+        filter_manager = Mock(spec=FilterManager)
+        filter_manager.should_filter_device.return_value = False
+        filter_manager.get_filter_stats.return_value = {}
+        config = {'discovery_timeout_seconds': 60, 'concurrent_discovery': True, 'max_concurrent_connections': 2,
+                  'enable_progress_tracking': False, 'incremental_discovery': True}
+        engine = DiscoveryEngine(Mock(spec=ConnectionManager, **{'get_active_connection_count.return_value': 0}),
+                                 filter_manager, config, Mock(), walked_db_manager)
+        engine.add_seed_device('ACCESS-SW01', '10.0.1.10')
+
+        def timed_out(node):
+            assert node.last_walk is not None
+            engine.discovery_timeout = 0
+            return None
+
+        engine._connect_and_discover_before_timeout = timed_out
+        engine.discover_topology()
+
+        # Deferred nodes go back in the queue, which checkpoints save as JSON
+        assert [node.last_walk for node in engine.discovery_queue] == [None]
+        json.dumps([asdict(node) for node in engine.discovery_queue])
+
+
+class TestDeviceFingerprint:
+    """Test reading the last walk from the database"""
+
+    def test_fingerprint_query(self, db_manager):
+        cursor = db_manager.connection.cursor.return_value
+        cursor.fetchone.return_value = (7, 'FOC1234X0AB', 168.0, datetime(2026, 1, 1), '16.12.4')
+        cursor.fetchall.return_value = [('Gi1/0/48', 'CORE-SW01')]
+
+        fingerprint = db_manager.get_device_fingerprint('access-sw01.example.com')
+
+        assert fingerprint['software_version'] == '16.12.4'
+        assert fingerprint['neighbors'] == db_manager.neighbor_fingerprint(make_device_info().neighbors)
+
+    def test_stored_details_query(self, db_manager):
+        cursor = db_manager.connection.cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(1, 'Active', 15, 'C9300-48P', 'FOC1234X0AB', 'aaaa.bbbb.0001', '16.12.4', 'Ready')],
+            [(10, 'USERS', 40)],
+        ]
+
+        details = db_manager.get_stored_device_details(7)
+
+        assert details['stack_members'][0]['serial_number'] == 'FOC1234X0AB'
+        assert details['vlans'] == [{'vlan_number': 10, 'vlan_name': 'USERS', 'port_count': 40}]
@@ -0,0 +1,81 @@
+"""
+Unit tests for the shared interface name normalizer
+"""
+
+import re
+
+import pytest
+
+from netwalker.interface_names import PHYSICAL_PORT_PATTERN, interface_match_key, normalize_interface_name
+
+
+def reference_normalize(interface_name, platform=None):
+    """The regex chain ProtocolParser used to normalize names with"""
+    if not interface_name or interface_name == "Unknown":
+        return interface_name
+    interface_name = interface_name.strip()
+    if not platform:
+        platform = 'NX-OS' if re.match(r'^Ethernet\d+/\d+', interface_name) else 'IOS'
+    if 'NX-OS' in platform.upper():
+        interface_name = re.sub(r'^port-channel(\d+)', r'Port-channel\1', interface_name, flags=re.IGNORECASE)
+        return re.sub(r'^mgmt(\d+)', r'Management\1', interface_name, flags=re.IGNORECASE)
+    interface_name = re.sub(r'^Gi(?:gabitEthernet)?(\d+(?:/\d+)*)', r'GigabitEthernet\1', interface_name, flags=re.IGNORECASE)
+    interface_name = re.sub(r'^Te(?:nGigabitEthernet)?(\d+(?:/\d+)*)', r'TenGigabitEthernet\1', interface_name, flags=re.IGNORECASE)
+    interface_name = re.sub(r'^Fa(?:stEthernet)?(\d+(?:/\d+)*)', r'FastEthernet\1', interface_name, flags=re.IGNORECASE)
+    interface_name = re.sub(r'^Fo(?:rtyGigabitEthernet)?(\d+(?:/\d+)*)', r'FortyGigabitEthernet\1', interface_name, flags=re.IGNORECASE)
+    interface_name = re.sub(r'^Po(?:rt-channel)?(\d+)', r'Port-channel\1', interface_name, flags=re.IGNORECASE)
+    interface_name = re.sub(r'^PortChannel(\d+)', r'Port-channel\1', interface_name, flags=re.IGNORECASE)
+    return re.sub(r'^mgmt(\d+)', r'Management\1', interface_name, flags=re.IGNORECASE)
+
+
+NAMES = [
+    'Gi1/0/1', 'GigabitEthernet1/0/1', 'gi1/0/1.100', ' Te2/1/1 ', 'TenGigabitEthernet2/1/1', 'Fa0/1',
+    'Fo1/1/1', 'Twe4/1/1', 'Hu1/0/49', 'Po1', 'Port-channel10', 'port-channel5', 'PortChannel3', 'mgmt0',
+    'Mgmt0', 'Ethernet1/1', 'Eth1/1', 'Vlan10', 'Loopback0', 'Gig1/0/1', 'Gi 1/0/1', 'Unknown', '',
+]
+
+
+class TestNormalizeInterfaceName:
+    """Test display normalization"""
+
+    @pytest.mark.parametrize('platform', [None, 'IOS', 'IOS-XE', 'NX-OS', 'cisco_nx-os'])
+    def test_matches_previous_protocol_parser_output(self, platform):
+        for name in NAMES:
+            assert normalize_interface_name(name, platform) == reference_normalize(name, platform), name
+
+    def test_examples(self):
+        assert normalize_interface_name('Gi1/0/1') == 'GigabitEthernet1/0/1'
+        assert normalize_interface_name('Po1') == 'Port-channel1'
+        assert normalize_interface_name('mgmt0') == 'Management0'
+        assert normalize_interface_name('Ethernet1/1') == 'Ethernet1/1'
+        assert normalize_interface_name('Gi1/0/1', 'NX-OS') == 'Gi1/0/1'
+
+    def test_results_are_interned_and_cached(self):
+        normalize_interface_name.cache_clear()
+
+        first = normalize_interface_name(''.join(['Gi', '1/0/7']))
+        second = normalize_interface_name(''.join(['GigabitEthernet', '1/0/7']))
+
+        assert first is second
+        assert normalize_interface_name.cache_info().misses == 2
+
+
+class TestInterfaceMatchKey:
+    """Test keys used to compare names across commands"""
+
+    def test_abbreviated_and_full_names_share_a_key(self):
+        pairs = [('Gi1/0/1', 'GigabitEthernet1/0/1'), ('Te1/1/1', 'TenGigabitEthernet1/1/1'),
+                 ('Twe4/1/1', 'TwentyFiveGigE4/1/1'), ('Hu1/0/49', 'HundredGigE1/0/49'),
+                 ('Eth1/1', 'Ethernet1/1'), ('Po1', 'Port-channel1'), ('po1', 'PortChannel1'),
+                 ('Gi 1/0/1', 'gi1/0/1')]
+        for short, full in pairs:
+            assert interface_match_key(short) == interface_match_key(full), short
+
+    def test_unknown_types_are_only_folded(self):
+        assert interface_match_key('Vlan10') == 'vlan10'
+        assert interface_match_key('Gig1/0/1') == 'gig1/0/1'
+
+    def test_physical_port_pattern(self):
+        ports = PHYSICAL_PORT_PATTERN.findall('Gi1/0/1, Twe4/1/1, Te1/1/1, Fo1/1/1, Eth1/1, Po1, Vlan10')
+
+        assert ports == ['Gi1/0/1', 'Twe4/1/1', 'Te1/1/1', 'Fo1/1/1', 'Eth1/1']
@@ -0,0 +1,108 @@
+"""
+Unit tests for queued logging setup and discovery log verbosity
+"""
+
+import logging
+import logging.handlers
+import threading
+
+import pytest
+
+from netwalker import logging_config
+from netwalker.config import Credentials
+from netwalker.discovery.discovery_engine import DiscoveryEngine
+from netwalker.filtering.filter_manager import FilterManager
+from netwalker.simulator import SimulatedNetwork, SimulatorConnectionManager
+
+
+@pytest.fixture
+def queued_logging(tmp_path):
+    """Run setup_logging on a root logger without handlers (pytest attaches its own) and restore it afterwards"""
+    root_logger = logging.getLogger()
+    saved = []
+
+    def setup():
+        saved.append((root_logger.handlers[:], root_logger.level))
+        root_logger.handlers.clear()
+        logging_config.setup_logging(str(tmp_path))
+        return root_logger
+
+    yield setup
+    logging_config.stop_logging()
+    for handler in root_logger.handlers:
+        handler.close()
+    if saved:
+        root_logger.handlers[:], level = saved[0]
+        root_logger.setLevel(level)
+
+
+class TestQueuedLogging:
+    """Test that file and console output runs behind a QueueListener"""
+
+    def test_root_logger_only_enqueues(self, queued_logging):
+        root_logger = queued_logging()
+
+        assert [type(h) for h in root_logger.handlers] == [logging.handlers.QueueHandler]
+
+    def test_records_from_worker_threads_reach_file(self, queued_logging, tmp_path):
+        queued_logging()
+        worker_logger = logging.getLogger('netwalker.test_worker')
+
+        workers = [threading.Thread(target=worker_logger.info, args=("worker %d done", i)) for i in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        logging_config.stop_logging()
+
+        log_text = next(tmp_path.glob('netwalker_*.log')).read_text()
+        assert all(f"worker {i} done" in log_text for i in range(8))
+
+    def test_stop_restores_direct_handlers(self, queued_logging, tmp_path):
+        root_logger = queued_logging()
+
+        logging_config.stop_logging()
+        logging_config.stop_logging()
+        logging.getLogger('netwalker.test_late').warning("written after stop")
+
+        assert logging.handlers.QueueHandler not in [type(h) for h in root_logger.handlers]
+        root_logger.handlers[0].flush()
+        assert "written after stop" in next(tmp_path.glob('netwalker_*.log')).read_text()
+
+
+class TestDiscoveryLogVerbosity:
+    """Test which discovery decision lines reach INFO under each profile"""
+
+    def walk(self, caplog, verbosity):
+        network = SimulatedNetwork.build_mesh(12, fanout=3)
+        config = {'max_discovery_depth': 10, 'discovery_protocols': ['CDP'], 'site_boundary_pattern': None,
+                  'discovery_log_verbosity': verbosity}
+        engine = DiscoveryEngine(SimulatorConnectionManager(network), FilterManager(config), config,
+                                 Credentials('admin', 'secret'))
+        engine.add_seed_device(network.devices[0].hostname, network.devices[0].ip_address)
+        with caplog.at_level(logging.INFO, logger='netwalker.discovery.discovery_engine'):
+            summary = engine.discover_topology()
+        messages = [r.getMessage() for r in caplog.records if r.levelno == logging.INFO]
+        return summary, messages
+
+    def test_summary_skips_per_device_lines(self, caplog):
+        summary, messages = self.walk(caplog, 'summary')
+
+        assert summary['successful_connections'] == 12
+        assert not any('[DISCOVERY DECISION]' in m or '[NEIGHBOR' in m for m in messages)
+
+    def test_device_profile(self, caplog):
+        _, messages = self.walk(caplog, 'device')
+
+        assert sum('[DISCOVERY DECISION]' in m for m in messages) == 12
+        assert not any('[NEIGHBOR' in m for m in messages)
+
+    def test_neighbor_profile(self, caplog):
+        _, messages = self.walk(caplog, 'neighbor')
+
+        assert sum('[NEIGHBOR QUEUED]' in m for m in messages) == 11
+
+    def test_unknown_profile_falls_back_to_summary(self, caplog):
+        _, messages = self.walk(caplog, 'chatty')
+
+        assert not any('[DISCOVERY DECISION]' in m for m in messages)
@@ -0,0 +1,120 @@
+"""
+Unit tests for the raw output archive and offline re-parse
+"""
+
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from netwalker.connection.output_archive import OutputArchive, ReplayConnection
+from netwalker.discovery.archive_reparser import ArchiveReparser
+from netwalker.discovery.device_collector import DeviceCollector
+
+
+IOS_VERSION = """Cisco IOS Software, C3850 Software, Version 16.12.4
+ACCESS-SW01 uptime is 2 weeks, 1 day
+Processor board ID FOC1234X0AB
+"""
+
+CDP_DETAIL = """-------------------------
+Device ID: CORE-SW01.example.com
+Entry address(es):
+  IP address: 10.0.0.1
+Platform: cisco WS-C9500-48Y4C,  Capabilities: Router Switch IGMP
+Interface: GigabitEthernet1/0/48,  Port ID (outgoing port): TenGigabitEthernet1/0/1
+"""
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    return str(tmp_path / "archive")
+
+
+@pytest.fixture
+def collect_into_archive(archive_dir, canned_connection):
+    def collect(host='10.0.1.10'):
+        archive = OutputArchive(archive_dir)
+        collector = DeviceCollector({'discovery_protocols': ['CDP']}, output_archive=archive)
+        connection = canned_connection({'show version': IOS_VERSION, 'show cdp neighbors detail': CDP_DETAIL})
+        return archive, collector.collect_device_information(connection, host, 'SSH', 1)
+    return collect
+
+
+class TestOutputArchive:
+    """Test blob storage and the capture index"""
+
+    def test_identical_outputs_stored_once(self, archive_dir):
+        archive = OutputArchive(archive_dir)
+
+        first = archive.put(IOS_VERSION)
+        second = archive.put(IOS_VERSION)
+
+        assert first == second
+        assert archive.get(first) == IOS_VERSION
+        assert archive.get_stats()['blobs_written'] == 1
+        assert archive.get_stats()['blobs_deduplicated'] == 1
+        assert os.path.exists(os.path.join(archive_dir, 'objects', first[:2], f"{first}.gz"))
+
+    def test_collection_archives_every_output(self, collect_into_archive):
+        archive, device_info = collect_into_archive()
+
+        [capture] = archive.captures()
+        assert capture.host == '10.0.1.10'
+        assert capture.hostname == device_info.hostname == 'ACCESS-SW01'
+        assert {'show version', 'show cdp neighbors detail'} <= set(capture.commands)
+        assert archive.load_outputs(capture)['show version'] == IOS_VERSION
+
+    def test_latest_capture_per_device(self, archive_dir):
+        archive = OutputArchive(archive_dir)
+        for output in ("first run", "second run"):
+            capture = archive.begin_capture('10.0.1.10')
+            capture.store('show version', output)
+            capture.finish()
+
+        [latest] = archive.latest_captures()
+        assert archive.load_outputs(latest) == {'show version': "second run"}
+
+    def test_replay_rejects_unarchived_command(self):
+        connection = ReplayConnection({'show version': IOS_VERSION}, host='10.0.1.10')
+
+        assert connection.send_command('show version') == IOS_VERSION
+        with pytest.raises(ValueError, match="Invalid input"):
+            connection.send_command('show inventory')
+
+
+class TestArchiveReparser:
+    """Test rebuilding inventory from the archive"""
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_reparse_matches_live_collection(self, archive_dir, collect_into_archive, workers):
+        _, live = collect_into_archive()
+
+        reparser = ArchiveReparser(archive_dir, {'discovery_protocols': ['CDP']}, max_workers=workers)
+        inventory = reparser.reparse()
+
+        device = inventory.get_device('ACCESS-SW01:10.0.1.10')
+        assert device is not None
+        assert (device['platform'], device['serial_number'], device['software_version']) == \
+            (live.platform, live.serial_number, live.software_version)
+        assert [n.device_id for n in device['neighbors']] == [n.device_id for n in live.neighbors]
+        assert reparser.get_stats()['devices_reparsed'] == 1
+
+    def test_reparse_does_not_rearchive(self, archive_dir, collect_into_archive):
+        collect_into_archive()
+
+        ArchiveReparser(archive_dir, {'archive_raw_output': True, 'archive_directory': archive_dir},
+                        max_workers=1).reparse()
+
+        assert len(OutputArchive(archive_dir).captures()) == 1
+
+    def test_store_inventory_writes_connected_devices(self, archive_dir, collect_into_archive):
+        collect_into_archive()
+        reparser = ArchiveReparser(archive_dir, max_workers=1)
+        db_manager = Mock()
+        db_manager.process_device_discovery.return_value = (True, False)
+
+        stored = reparser.store_inventory(db_manager, reparser.reparse())
+
+        assert stored == 1
+        assert db_manager.process_device_discovery.call_args.args[0]['hostname'] == 'ACCESS-SW01'
@@ -0,0 +1,203 @@
+"""
+Unit tests for batched per-VRF prefix collection
+"""
+
+import re
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from netwalker.ipv4_prefix.collector import (
+    NXOS_BGP_SECTION, NXOS_ROUTE_SECTION, CommandPipeline, PrefixCollector, split_vrf_sections
+)
+from netwalker.ipv4_prefix.data_models import IPv4PrefixConfig
+
+
+class SequentialDevice:
+    """Connection exposing only send_command"""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.commands = []
+
+    def send_command(self, command):
+        self.commands.append(command)
+        if command not in self.outputs:
+            return "% Invalid input detected at '^' marker."
+        return self.outputs[command]
+
+
+class ChannelDevice(SequentialDevice):
+    """Connection with netmiko-style channel access that echoes typed lines after a prompt"""
+
+    prompt = 'RTR01#'
+
+    def __init__(self, outputs):
+        super().__init__(outputs)
+        self.writes = []
+        self.pending = ''
+
+    def write_channel(self, text):
+        self.writes.append(text)
+        self.pending += text
+
+    def read_until_pattern(self, pattern, read_timeout=None):
+        stream = ''
+        for line in self.pending.splitlines():
+            self.commands.append(line)
+            stream += f"{self.prompt}{line}\n"
+            output = '' if line.startswith('!') else self.send_command(line)
+            if not line.startswith('!'):
+                self.commands.pop()
+            stream += f"{output}\n" if output else ''
+        stream += self.prompt
+        self.pending = ''
+        assert re.search(pattern, stream)
+        return stream
+
+
+def make_config(**overrides):
+    values = dict(collect_global_table=False, collect_per_vrf=True, collect_bgp=True,
+                  output_directory='./reports', create_summary_file=False, enable_database_storage=False,
+                  track_summarization=False, concurrent_devices=1, command_timeout=30)
+    values.update(overrides)
+    return IPv4PrefixConfig(**values)
+
+
+def collect(connection, platform, vrfs, **config):
+    manager = Mock()
+    manager.connect_device.return_value = (connection, None)
+    collector = PrefixCollector(make_config(**config), manager, None)
+    collector.vrf_discovery.discover_vrfs = Mock(return_value=vrfs)
+    device = SimpleNamespace(hostname='RTR01', platform=platform, ip_address='192.0.2.1')
+    return collector.collect_device(device)
+
+
+ROUTES = "C        10.1.1.0/24 is directly connected, Vlan10\nS        10.2.0.0/16 [1/0] via 10.1.1.1"
+BGP = "BGP table version is 5\n *>  10.9.0.0/16      0.0.0.0       0    32768 i"
+IOS_OUTPUTS = {
+    'show ip route vrf RED': ROUTES,
+    'show ip route vrf RED connected': ROUTES.splitlines()[0],
+    'show ip bgp vpnv4 vrf RED': BGP,
+    'show ip route vrf "BLUE ONE"': ROUTES,
+    'show ip route vrf "BLUE ONE" connected': '',
+    'show ip bgp vpnv4 vrf "BLUE ONE"': '% BGP not active',
+}
+
+
+class TestCommandPipeline:
+    """Test batched command execution"""
+
+    def test_batch_splits_outputs_per_command(self):
+        device = ChannelDevice(IOS_OUTPUTS)
+        commands = list(IOS_OUTPUTS)
+
+        outputs = CommandPipeline().run(device, commands)
+
+        assert outputs == {command: IOS_OUTPUTS[command] for command in commands}
+        assert len(device.writes) == 1
+
+    def test_batches_are_chunked(self):
+        device = ChannelDevice(IOS_OUTPUTS)
+
+        outputs = CommandPipeline(batch_size=4).run(device, list(IOS_OUTPUTS))
+
+        assert outputs == IOS_OUTPUTS
+        assert len(device.writes) == 2
+
+    def test_falls_back_to_send_command(self):
+        device = SequentialDevice(IOS_OUTPUTS)
+
+        assert CommandPipeline().run(device, list(IOS_OUTPUTS)) == IOS_OUTPUTS
+        assert device.commands == list(IOS_OUTPUTS)
+
+    def test_unsplittable_batch_is_rerun_sequentially(self):
+        device = ChannelDevice(IOS_OUTPUTS)
+        device.read_until_pattern = Mock(return_value='RTR01#garbled')
+
+        assert CommandPipeline().run(device, list(IOS_OUTPUTS)) == IOS_OUTPUTS
+
+    def test_timed_out_batch_resyncs_before_rerun(self):
+        device = ChannelDevice(IOS_OUTPUTS)
+        reads = []
+
+        def read_until_pattern(pattern, read_timeout=None):
+            reads.append(pattern)
+            if len(reads) == 1:
+                raise TimeoutError('pattern not detected')
+            # Late batch output arrives ahead of the resync marker and is discarded
+            stream = ChannelDevice.read_until_pattern(device, pattern, read_timeout)
+            assert 'resync' in stream
+            return stream
+
+        device.read_until_pattern = read_until_pattern
+
+        assert CommandPipeline().run(device, list(IOS_OUTPUTS)) == IOS_OUTPUTS
+        assert len(reads) == 2
+        assert device.writes[-1].startswith('! netwalker-resync-')
+
+    def test_failed_resync_drops_remaining_commands(self):
+        device = ChannelDevice(IOS_OUTPUTS)
+        device.read_until_pattern = Mock(side_effect=TimeoutError('pattern not detected'))
+        device.send_command = Mock()
+
+        outputs = CommandPipeline(batch_size=4).run(device, list(IOS_OUTPUTS))
+
+        assert outputs == dict.fromkeys(IOS_OUTPUTS)
+        device.send_command.assert_not_called()
+
+    def test_failed_command_returns_none(self):
+        device = SequentialDevice({})
+        device.send_command = Mock(side_effect=OSError('socket closed'))
+
+        assert CommandPipeline().run(device, ['show ip route vrf RED']) == {'show ip route vrf RED': None}
+
+
+class TestCollectVrfTables:
+    """Test per-VRF collection through the pipeline"""
+
+    def test_batched_matches_sequential_on_ios(self):
+        batched = collect(ChannelDevice(IOS_OUTPUTS), 'ios', ['RED', 'BLUE ONE', 'bad|vrf'],
+                          batch_vrf_commands=True)
+        sequential = collect(SequentialDevice(IOS_OUTPUTS), 'ios', ['RED', 'BLUE ONE', 'bad|vrf'])
+
+        assert batched.success
+        assert batched.raw_outputs == sequential.raw_outputs
+        assert list(batched.raw_outputs) == list(sequential.raw_outputs) == [
+            'show ip route vrf RED', 'show ip route vrf RED connected', 'show ip bgp vpnv4 vrf RED',
+            'show ip route vrf BLUE ONE',
+        ]
+
+    def test_nxos_uses_vrf_all_tables(self):
+        route_all = ('IP Route Table for VRF "default"\n10.0.0.0/8, ubest/mbest: 1/0\n'
+                     'IP Route Table for VRF "RED"\n10.1.1.0/24, ubest/mbest: 1/0, attached\n')
+        bgp_all = ('BGP routing table information for VRF RED, address family IPv4 Unicast\n'
+                   '*>l10.9.0.0/16        0.0.0.0             100      32768 i\n')
+        device = ChannelDevice({
+            'show ip route vrf all': route_all,
+            'show ip bgp vrf all': bgp_all,
+            'show ip route vrf RED connected': '',
+            'show ip route vrf default connected': '',
+            'show ip route vrf GREEN': 'IP Route Table for VRF "GREEN"\n',
+            'show ip route vrf GREEN connected': '',
+        })
+
+        result = collect(device, 'nxos', ['default', 'RED', 'GREEN'], batch_vrf_commands=True)
+
+        assert result.raw_outputs['show ip route vrf RED'] == route_all[route_all.index('IP Route Table for VRF "RED"'):]
+        assert result.raw_outputs['show ip bgp vrf RED'] == bgp_all
+        assert 'show ip bgp vrf default' not in result.raw_outputs
+        assert 'show ip bgp vrf GREEN' not in device.commands
+        assert 'show ip route vrf RED' not in device.commands
+        assert 'show ip route vrf GREEN' in device.commands
+        assert len(device.writes) == 2
+
+    def test_split_vrf_sections(self):
+        output = ('BGP routing table information for VRF A, address family IPv4 Unicast\nx\n'
+                  'BGP routing table information for VRF B-2, address family IPv4 Unicast\ny\n')
+
+        sections = split_vrf_sections(output, NXOS_BGP_SECTION)
+
+        assert list(sections) == ['A', 'B-2']
+        assert ''.join(sections.values()) == output
+        assert split_vrf_sections(None, NXOS_ROUTE_SECTION) == {}
+
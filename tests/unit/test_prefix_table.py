@@ -0,0 +1,102 @@
+"""
+Unit tests for the columnar prefix table
+"""
+
+import csv
+import ipaddress
+import os
+import random
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from netwalker.ipv4_prefix.data_models import NormalizedPrefix  # noqa: E402
+from netwalker.ipv4_prefix.exporter import CSVExporter  # noqa: E402
+from netwalker.ipv4_prefix.normalizer import PrefixDeduplicator  # noqa: E402
+from netwalker.ipv4_prefix.prefix_table import PrefixTable  # noqa: E402
+from netwalker.ipv4_prefix.summarization import SummarizationAnalyzer  # noqa: E402
+
+
+def random_prefixes(count, seed=3):
+    rng = random.Random(seed)
+    prefixes = []
+    for _ in range(count):
+        length = rng.choice([8, 16, 24, 24, 30, 32])
+        network = ipaddress.IPv4Network((10 << 24 | rng.getrandbits(10) << 8, length), strict=False)
+        prefixes.append(NormalizedPrefix(
+            device=rng.choice(['RTR-B', 'RTR-A', 'SW-C']),
+            platform='IOS-XE',
+            vrf=rng.choice(['global', 'MGMT', 'VOICE']),
+            prefix=str(network),
+            source=rng.choice(['rib', 'bgp']),
+            protocol=rng.choice(['C', 'S', 'O']),
+            raw_line='',
+            timestamp=datetime(2026, 1, 1, 12, rng.randrange(3)),
+            vlan=rng.choice([None, 10]),
+            interface=rng.choice([None, 'Vlan10'])
+        ))
+    return prefixes
+
+
+class TestPrefixTable:
+    """Test the columnar prefix operations against the list implementations"""
+
+    def test_round_trip(self):
+        prefixes = random_prefixes(50)
+        table = PrefixTable.from_prefixes(prefixes)
+
+        assert len(table) == 50
+        assert table.to_prefixes() == prefixes
+        assert table.prefix_lengths().tolist() == [int(p.prefix.split('/')[1]) for p in prefixes]
+
+    def test_deduplicate_by_device_matches_list(self):
+        prefixes = random_prefixes(2000)
+
+        deduplicated = PrefixTable.from_prefixes(prefixes).deduplicate_by_device()
+
+        assert deduplicated.to_prefixes() == PrefixDeduplicator().deduplicate_by_device(prefixes)
+
+    def test_deduplicate_by_vrf_matches_list(self):
+        prefixes = random_prefixes(2000)
+
+        assert PrefixTable.from_prefixes(prefixes).deduplicate_by_vrf() == \
+            PrefixDeduplicator().deduplicate_by_vrf(prefixes)
+
+    def test_groups(self):
+        prefixes = random_prefixes(300)
+        table = PrefixTable.from_prefixes(prefixes)
+
+        vrf_groups = table.vrf_groups()
+        assert list(vrf_groups) == list(dict.fromkeys(p.vrf for p in prefixes))
+        assert all(prefixes[i].vrf == vrf for vrf, rows in vrf_groups.items() for i in rows)
+
+        seen = 0
+        for device, vrf, rows in table.device_vrf_groups():
+            assert all((prefixes[i].device, prefixes[i].vrf) == (device, vrf) for i in rows)
+            seen += len(rows)
+        assert seen == len(prefixes)
+
+    def test_contained_in_matches_is_component_of(self):
+        prefixes = random_prefixes(500)
+        table = PrefixTable.from_prefixes(prefixes)
+        analyzer = SummarizationAnalyzer()
+
+        for summary in ('10.0.0.0/8', '10.1.0.0/16', '10.2.3.0/24', '192.168.0.0/16'):
+            expected = [i for i, p in enumerate(prefixes) if analyzer.is_component_of(p.prefix, summary)]
+            assert table.contained_in(summary).tolist() == expected
+
+    def test_csv_export_matches_list(self, tmp_path):
+        prefixes = random_prefixes(500)
+        exporter = CSVExporter()
+
+        list_file = exporter.export_prefixes(prefixes, str(tmp_path / 'list'))
+        table_file = exporter.export_prefixes(PrefixTable.from_prefixes(prefixes), str(tmp_path / 'table'))
+
+        with open(list_file, encoding='utf-8') as f:
+            list_rows = list(csv.reader(f))
+        with open(table_file, encoding='utf-8') as f:
+            table_rows = list(csv.reader(f))
+        assert os.path.basename(list_file) == os.path.basename(table_file)
+        assert table_rows == list_rows
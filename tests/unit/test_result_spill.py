@@ -0,0 +1,92 @@
+"""
+Unit tests for streaming-mode result spilling
+"""
+
+import os
+
+from netwalker.config import Credentials
+from netwalker.discovery.discovery_engine import DeviceInventory, DiscoveryEngine
+from netwalker.discovery.result_spill import ResultSpill, summarize_device_info
+from netwalker.filtering.filter_manager import FilterManager
+from netwalker.simulator import SimulatedNetwork, SimulatorConnectionManager
+
+FULL_INFO = {
+    'hostname': 'CORE-A',
+    'primary_ip': '10.1.0.1',
+    'platform': 'NX-OS',
+    'neighbors': [{'hostname': 'SW01'}, {'hostname': 'SW02'}],
+    'vlans': [],
+    'stack_members': [{'member': 1}],
+}
+
+
+class TestResultSpill:
+    """Test the spill file"""
+
+    def test_round_trip_and_overwrite(self, tmp_path):
+        spill = ResultSpill(str(tmp_path))
+
+        spill.write('CORE-A:10.1.0.1', FULL_INFO)
+        spill.write('SW01:10.1.0.2', {'hostname': 'SW01', 'neighbors': []})
+        spill.write('CORE-A:10.1.0.1', dict(FULL_INFO, platform='IOS-XE'))
+
+        assert spill.read('CORE-A:10.1.0.1') == dict(FULL_INFO, platform='IOS-XE')
+        assert spill.read('SW01:10.1.0.2') == {'hostname': 'SW01', 'neighbors': []}
+        assert spill.read('SW02:10.1.0.3') is None
+        assert len(spill) == 2
+
+    def test_close_removes_file(self, tmp_path):
+        spill = ResultSpill(str(tmp_path))
+        spill.write('CORE-A:10.1.0.1', FULL_INFO)
+
+        spill.close()
+        spill.close()
+
+        assert not os.path.exists(spill.path)
+
+    def test_summary_keeps_counts(self):
+        summary = summarize_device_info(FULL_INFO)
+
+        assert 'neighbors' not in summary and 'stack_members' not in summary
+        assert (summary['neighbors_count'], summary['vlans_count'], summary['stack_members_count']) == (2, 0, 1)
+        assert summary['hostname'] == 'CORE-A'
+
+
+class TestStreamingInventory:
+    """Test DeviceInventory with a spill file"""
+
+    def test_summary_in_memory_full_info_streamed(self, tmp_path):
+        inventory = DeviceInventory(spill=ResultSpill(str(tmp_path)))
+        inventory.add_device('CORE-A:10.1.0.1', FULL_INFO, 'connected')
+        inventory.add_device('SW09:10.1.0.9', {'hostname': 'SW09', 'primary_ip': '10.1.0.9'}, 'failed')
+
+        assert inventory.get_device('CORE-A:10.1.0.1')['neighbors_count'] == 2
+        assert list(inventory.get_devices_by_platform('nx-os')) == ['CORE-A:10.1.0.1']
+        assert inventory.load_device('CORE-A:10.1.0.1') == FULL_INFO
+
+        streamed = inventory.stream_devices()
+        assert len(streamed) == 2 and 'SW09:10.1.0.9' in streamed
+        assert dict(streamed.items()) == {'CORE-A:10.1.0.1': FULL_INFO,
+                                          'SW09:10.1.0.9': {'hostname': 'SW09', 'primary_ip': '10.1.0.9'}}
+        inventory.close()
+
+    def test_streaming_walk_matches_in_memory_walk(self, tmp_path):
+        network = SimulatedNetwork.build_mesh(30, fanout=4, firewall_every=7)
+        inventories = []
+        for stream_results in (False, True):
+            config = {'max_discovery_depth': 10, 'discovery_protocols': ['CDP'], 'site_boundary_pattern': None,
+                      'stream_results': stream_results, 'spill_directory': str(tmp_path)}
+            engine = DiscoveryEngine(SimulatorConnectionManager(network), FilterManager(config), config,
+                                     Credentials('admin', 'secret'))
+            engine.add_seed_device(network.devices[0].hostname, network.devices[0].ip_address)
+            summary = engine.discover_topology()
+            inventories.append((engine.get_inventory(), summary))
+
+        (in_memory, _), (streamed, summary) = inventories
+        assert summary['spill_stats']['devices_spilled'] == 30
+        assert all('neighbors' not in info for info in streamed.get_all_devices().values())
+        full = dict(streamed.stream_devices().items())
+        assert list(full) == list(in_memory.get_all_devices())
+        assert [len(info['neighbors']) for info in full.values()] == \
+            [len(info['neighbors']) for info in in_memory.get_all_devices().values()]
+        streamed.close()
@@ -0,0 +1,157 @@
+"""Unit tests for parallel site-specific collection"""
+
+import threading
+import time
+from collections import defaultdict
+from unittest.mock import Mock
+
+from netwalker.config.credentials import Credentials
+from netwalker.connection.connection_manager import ConnectionManager
+from netwalker.discovery.device_collector import DeviceCollector
+from netwalker.discovery.discovery_engine import DiscoveryNode
+from netwalker.discovery.site_device_walker import SiteDeviceWalker, SiteWalkResult
+from netwalker.discovery.site_specific_collection_manager import SiteSpecificCollectionManager
+
+
+SITES = ['BORO', 'KENT', 'LUMT']
+# Each site core has four access switches one hop away
+TOPOLOGY = {f"{site}-CORE-A": [f"{site}-SW0{i}" for i in range(1, 5)] for site in SITES}
+
+
+def make_manager(parallel: bool, per_site: int = 4, total: int = 10, sites: int = 3, delay: float = 0.0):
+    """Create a manager whose walker walks TOPOLOGY and records concurrency"""
+    config = {
+        'max_discovery_depth': 2,
+        'site_collection_parallel': parallel,
+        'site_collection_max_workers': sites,
+        'max_connections_per_site': per_site,
+        'max_concurrent_connections': total,
+    }
+    manager = SiteSpecificCollectionManager(Mock(spec=ConnectionManager), Mock(spec=DeviceCollector),
+                                            config, Mock())
+    manager.site_association_validator.determine_device_site = Mock(
+        side_effect=lambda hostname, ip, parent_site=None: hostname.split('-')[0]
+    )
+
+    state = {'active': 0, 'peak': 0, 'site_active': defaultdict(int), 'site_peak': defaultdict(int)}
+    lock = threading.Lock()
+
+    def fake_walk(device_node, site_name):
+        with lock:
+            state['active'] += 1
+            state['site_active'][site_name] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['site_peak'][site_name] = max(state['site_peak'][site_name], state['site_active'][site_name])
+        time.sleep(delay)
+        with lock:
+            state['active'] -= 1
+            state['site_active'][site_name] -= 1
+        neighbors = [{'hostname': name, 'ip_address': f"10.{SITES.index(site_name)}.0.{i + 1}", 'protocol': 'CDP'}
+                     for i, name in enumerate(TOPOLOGY.get(device_node.hostname, []))]
+        return SiteWalkResult(device_key=device_node.device_key, site_name=site_name, walk_success=True,
+                              device_info={'hostname': device_node.hostname}, neighbors_found=neighbors)
+
+    manager.site_device_walker.walk_site_device = Mock(side_effect=fake_walk)
+    manager.initialize_site_queues({site: [f"{site}-CORE-A"] for site in SITES})
+    return manager, state
+
+
+class TestParallelSiteCollection:
+    """Test site-parallel collection against the serial walk"""
+
+    def test_parallel_matches_serial(self):
+        serial, _ = make_manager(parallel=False)
+        parallel, _ = make_manager(parallel=True)
+
+        serial_results = serial.collect_sites(SITES)
+        parallel_results = parallel.collect_sites(SITES)
+
+        assert list(parallel_results) == SITES
+        for site in SITES:
+            assert list(parallel_results[site]['inventory']) == list(serial_results[site]['inventory'])
+            assert parallel_results[site]['statistics']['devices_successful'] == 5
+            assert parallel_results[site]['statistics']['neighbors_discovered'] == 4
+
+    def test_per_site_budget(self):
+        manager, state = make_manager(parallel=True, per_site=2, total=10, sites=1, delay=0.05)
+
+        manager.collect_sites(SITES)
+
+        assert max(state['site_peak'].values()) == 2
+
+    def test_global_budget_shared_across_sites(self):
+        manager, state = make_manager(parallel=True, per_site=4, total=3, sites=3, delay=0.05)
+
+        results = manager.collect_sites(SITES)
+
+        assert state['peak'] == 3
+        assert all(result['success'] for result in results.values())
+
+    def test_uninitialized_site_isolated(self):
+        manager, _ = make_manager(parallel=True)
+
+        results = manager.collect_sites(['BORO', 'MISSING'])
+
+        assert results['BORO']['success'] is True
+        assert results['MISSING']['success'] is False
+        assert results['MISSING']['error_message'] == "Site 'MISSING' not initialized"
+
+    def test_serial_mode_walks_one_device_at_a_time(self):
+        manager, state = make_manager(parallel=False, delay=0.01)
+
+        manager.collect_sites(SITES)
+
+        assert state['peak'] == 1
+
+
+CORE_VERSION = """Cisco IOS Software, C3850 Software, Version 16.12.4
+BORO-CORE-A uptime is 2 weeks, 1 day
+Processor board ID FOC1234X0AB
+"""
+CORE_CDP = """-------------------------
+Device ID: BORO-SW01
+Entry address(es):
+  IP address: 10.0.0.11
+Platform: cisco WS-C3850-48P,  Capabilities: Switch IGMP
+Interface: GigabitEthernet1/0/1,  Port ID (outgoing port): GigabitEthernet1/0/48
+"""
+
+
+def make_walker():
+    """SiteDeviceWalker over a real DeviceCollector and ConnectionManager with a fake netmiko session"""
+    outputs = {'show version': CORE_VERSION, 'show cdp neighbors detail': CORE_CDP}
+    connection = Mock(spec=['send_command', 'device_type', 'disconnect'])
+    connection.device_type = 'cisco_ios'
+    connection.send_command.side_effect = lambda command, **kwargs: outputs.get(command, '')
+
+    connection_manager = ConnectionManager(timeout=5)
+    connection_manager._establish_netmiko_connection = Mock(return_value=(connection, CORE_VERSION))
+    walker = SiteDeviceWalker(connection_manager, DeviceCollector(), Mock(), Credentials('user', 'pass'))
+    return walker, connection
+
+
+class TestSiteDeviceWalker:
+    """Test walking one site device through real collection"""
+
+    def test_walk_collects_and_closes_session(self):
+        walker, connection = make_walker()
+
+        result = walker.walk_site_device(DiscoveryNode('BORO-CORE-A', '10.0.0.1', 0), 'BORO')
+
+        assert result.walk_success, result.error_message
+        assert result.device_info['hostname'] == 'BORO-CORE-A'
+        assert [neighbor.device_id for neighbor in result.neighbors_found] == ['BORO-SW01']
+        assert result.neighbors_added_to_queue == 1
+        connection.disconnect.assert_called_once()
+        assert walker.connection_manager.get_active_connection_count() == 0
+
+    def test_failed_collection_still_closes_session(self):
+        walker, connection = make_walker()
+        walker.device_collector.collect_device_information = Mock(side_effect=RuntimeError('channel closed'))
+
+        result = walker.walk_site_device(DiscoveryNode('BORO-CORE-A', '10.0.0.1', 0), 'BORO')
+
+        assert result.walk_success is False
+        assert 'channel closed' in result.error_message
+        connection.disconnect.assert_called_once()
+        assert walker.connection_manager.get_active_connection_count() == 0
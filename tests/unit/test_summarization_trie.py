@@ -0,0 +1,117 @@
+"""
+Unit tests for the radix trie behind route summarization analysis
+"""
+
+import ipaddress
+import random
+from datetime import datetime
+
+from netwalker.ipv4_prefix.data_models import NormalizedPrefix
+from netwalker.ipv4_prefix.summarization import PrefixTrie, SummarizationAnalyzer
+
+
+def make_prefix(prefix, device='RTR01', vrf='global'):
+    return NormalizedPrefix(device=device, platform='IOS-XE', vrf=vrf, prefix=prefix, source='rib',
+                            protocol='S', raw_line='', timestamp=datetime(2026, 1, 1))
+
+
+def reference_relationships(prefixes):
+    """Pairwise scan over prefixes sorted shortest first, as the analysis used to run"""
+    def length(prefix):
+        try:
+            return ipaddress.IPv4Network(prefix, strict=False).prefixlen
+        except ValueError:
+            return 999
+
+    def contains(summary, component):
+        try:
+            summary_net = ipaddress.IPv4Network(summary, strict=False)
+            component_net = ipaddress.IPv4Network(component, strict=False)
+        except ValueError:
+            return False
+        return component_net.prefixlen > summary_net.prefixlen and component_net.subnet_of(summary_net)
+
+    groups = {}
+    for prefix in prefixes:
+        groups.setdefault((prefix.device, prefix.vrf), []).append(prefix)
+
+    relationships = []
+    for (device, vrf), group in groups.items():
+        ordered = sorted(group, key=lambda p: length(p.prefix))
+        for i, summary in enumerate(ordered):
+            for component in ordered[i + 1:]:
+                if contains(summary.prefix, component.prefix):
+                    relationships.append((summary.prefix, component.prefix, device, vrf))
+    return relationships
+
+
+def random_prefixes(count, seed):
+    rng = random.Random(seed)
+    prefixes = []
+    for _ in range(count):
+        length = rng.choice([8, 12, 16, 20, 22, 24, 24, 24, 28, 30, 32])
+        network = ipaddress.IPv4Network((rng.choice([10, 172, 192]) << 24 | rng.getrandbits(12) << 12, length),
+                                        strict=False)
+        prefixes.append(make_prefix(str(network), device=rng.choice(['RTR01', 'RTR02']),
+                                    vrf=rng.choice(['global', 'MGMT'])))
+    return prefixes
+
+
+class TestAnalyzeSummarization:
+    """Test relationships emitted from the trie"""
+
+    def test_multi_level_hierarchy(self):
+        prefixes = [make_prefix(p) for p in ('10.1.1.0/24', '10.0.0.0/8', '10.1.0.0/16', '192.168.1.0/24')]
+
+        relationships = SummarizationAnalyzer().analyze_summarization(prefixes)
+
+        assert [(r.summary_prefix, r.component_prefix) for r in relationships] == [
+            ('10.0.0.0/8', '10.1.0.0/16'),
+            ('10.0.0.0/8', '10.1.1.0/24'),
+            ('10.1.0.0/16', '10.1.1.0/24'),
+        ]
+
+    def test_matches_pairwise_scan(self):
+        prefixes = random_prefixes(400, seed=7)
+        prefixes += [make_prefix('0.0.0.0/0'), make_prefix('10.0.0.0/8'), make_prefix('10.0.0.0/8'),
+                     make_prefix('not-a-prefix'), make_prefix('10.1.2.3/16')]
+
+        relationships = SummarizationAnalyzer().analyze_summarization(prefixes)
+
+        assert [(r.summary_prefix, r.component_prefix, r.device, r.vrf)
+                for r in relationships] == reference_relationships(prefixes)
+
+    def test_groups_are_independent(self):
+        prefixes = [make_prefix('10.0.0.0/8', device='RTR01'), make_prefix('10.1.0.0/16', device='RTR02')]
+
+        assert SummarizationAnalyzer().analyze_summarization(prefixes) == []
+
+
+class TestFindComponents:
+    """Test component lookups"""
+
+    def test_list_and_trie_match_scan(self):
+        analyzer = SummarizationAnalyzer()
+        prefixes = random_prefixes(300, seed=11)
+        trie = PrefixTrie(prefixes)
+
+        for summary in ('10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16', '10.4.0.0/14', '0.0.0.0/0',
+                        prefixes[0].prefix, '10.0.0.1/32'):
+            expected = [p for p in prefixes if analyzer.is_component_of(p.prefix, summary)]
+            assert analyzer.find_components(summary, prefixes) == expected
+            assert trie.components(summary) == expected
+
+    def test_summary_not_in_trie(self):
+        trie = PrefixTrie([make_prefix('10.1.1.0/24'), make_prefix('10.1.2.0/24'), make_prefix('10.2.0.0/16')])
+
+        assert [p.prefix for p in trie.components('10.1.0.0/16')] == ['10.1.1.0/24', '10.1.2.0/24']
+        assert trie.components('10.3.0.0/16') == []
+        assert trie.components('bogus') == []
+
+    def test_is_component_of(self):
+        analyzer = SummarizationAnalyzer()
+
+        assert analyzer.is_component_of('192.168.1.0/24', '192.168.0.0/16')
+        assert not analyzer.is_component_of('192.168.0.0/16', '192.168.0.0/16')
+        assert not analyzer.is_component_of('10.1.0.0/16', '192.168.0.0/16')
+        assert not analyzer.is_component_of('garbage', '10.0.0.0/8')
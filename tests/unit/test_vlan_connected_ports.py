@@ -0,0 +1,78 @@
+"""
+Unit tests for connected port counting in VLANs
+"""
+
+from unittest.mock import Mock
+
+from netwalker.connection.data_models import VLANInfo
+from netwalker.vlan.vlan_collector import VLANCollector
+from netwalker.interface_names import interface_match_key
+from netwalker.vlan.vlan_parser import VLANParser
+
+
+def reference_count(parser, vlan_ports_str, interface_status):
+    """Per-port scan of every status entry, as the count used to be computed"""
+    count = 0
+    for port in parser.port_pattern.findall(vlan_ports_str):
+        for interface_name, status in interface_status.items():
+            if interface_match_key(interface_name) == interface_match_key(port) and status == 'connected':
+                count += 1
+                break
+    return count
+
+
+STATUS = {
+    'Gi1/0/1': 'connected',
+    'Gi1/0/2': 'notconnect',
+    'Te2/1/1': 'connected',
+    'Twe4/1/1': 'connected',
+    'Po1': 'connected',
+}
+
+
+class TestConnectedPortCounting:
+    """Test counting against the interface status map"""
+
+    def test_set_and_dict_match_reference(self):
+        parser = VLANParser()
+        connected = parser.build_connected_interface_set(STATUS)
+
+        for ports in ('Gi1/0/1, Gi1/0/2, Te2/1/1', 'gi1/0/1, Po1', 'Gi1/0/3', 'Te2/1/1, Te2/1/1', ''):
+            expected = reference_count(parser, ports, STATUS)
+            assert parser.count_connected_ports_in_vlan(ports, STATUS) == expected
+            assert parser.count_connected_ports_in_vlan(ports, connected) == expected
+
+    def test_connected_set_holds_normalized_connected_names(self):
+        parser = VLANParser()
+
+        assert parser.build_connected_interface_set(STATUS) == {
+            'gigabitethernet1/0/1', 'tengigabitethernet2/1/1', 'twentyfivegige4/1/1', 'portchannel1'
+        }
+
+    def test_normalizer_is_memoized(self):
+        interface_match_key.cache_clear()
+
+        for _ in range(3):
+            interface_match_key('Gi1/0/48')
+
+        info = interface_match_key.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_collector_updates_every_vlan(self):
+        collector = VLANCollector.__new__(VLANCollector)
+        collector.logger = Mock()
+        collector.vlan_parser = VLANParser()
+        vlan_output = (
+            "VLAN Name                             Status    Ports\n"
+            "---- -------------------------------- --------- -------------------------------\n"
+            "1    default                          active    Gi1/0/1, Gi1/0/2\n"
+            "20   USERS                            active    Te2/1/1, Gi1/0/2, Gi1/0/1\n"
+        )
+        vlans = [VLANInfo(vlan_id=1, vlan_name='default', port_count=2, portchannel_count=0,
+                          connected_port_count=0, device_hostname='SW01', device_ip='10.1.1.1'),
+                 VLANInfo(vlan_id=20, vlan_name='USERS', port_count=3, portchannel_count=0,
+                          connected_port_count=0, device_hostname='SW01', device_ip='10.1.1.1')]
+
+        collector._update_connected_port_counts(vlans, vlan_output, STATUS, 'IOS-XE')
+
+        assert [vlan.connected_port_count for vlan in vlans] == [1, 2]